@@ -26,6 +26,10 @@ import numpy as np
 
 # 프로젝트 루트
 PROJECT_ROOT = Path(__file__).parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backtest.intraday_replay import SnapshotReplay, add_signal_flags, assign_tiers
+
 SCORES_DIR = PROJECT_ROOT / "output" / "intraday_scores"
 
 
@@ -121,16 +125,42 @@ def get_timestamp_from_filename(filepath: Path) -> str:
     return filepath.stem.split('_')[1]
 
 
+# 직전 시점 값을 붙일 컬럼
+PREV_COLUMNS = ['v2', 'v4', 'v5', 'v3.5', 'v9_prob', 'close', 'volume']
+KIS_COLUMNS = ['buy_strength', 'foreign_net', 'inst_net', 'rel_strength']
+
+
+def add_deltas(merged: pd.DataFrame) -> pd.DataFrame:
+    """직전 시점 값(*_prev)이 붙은 행에 delta 계산"""
+    merged['v2_delta'] = merged['v2'] - merged['v2_prev']
+    merged['v4_delta'] = merged['v4'] - merged['v4_prev']
+    merged['v5_delta'] = merged['v5'] - merged['v5_prev']
+    merged['v35_delta'] = merged['v3.5'] - merged['v3.5_prev']
+    merged['v9_delta'] = merged['v9_prob'] - merged['v9_prob_prev']
+
+    # 가격/거래량 변화
+    merged['price_change'] = ((merged['close'] - merged['close_prev']) / merged['close_prev'] * 100).round(2)
+    merged['volume_ratio'] = (merged['volume'] / merged['volume_prev']).round(2)
+    merged['volume_ratio'] = merged['volume_ratio'].replace([np.inf, -np.inf], 0).fillna(0)
+
+    # 한투 API 데이터 delta (존재 시)
+    if 'buy_strength' in merged.columns and 'buy_strength_prev' in merged.columns:
+        merged['buy_strength_delta'] = merged['buy_strength'] - merged['buy_strength_prev']
+    if 'foreign_net' in merged.columns and 'foreign_net_prev' in merged.columns:
+        merged['foreign_net_delta'] = merged['foreign_net'] - merged['foreign_net_prev']
+
+    return merged
+
+
 def compare_two_csvs(prev_df: pd.DataFrame, curr_df: pd.DataFrame) -> pd.DataFrame:
     """두 CSV 비교하여 delta 계산"""
     global HAS_KIS_DATA
 
     # 기본 컬럼
-    prev_cols = ['code', 'v2', 'v4', 'v5', 'v3.5', 'v9_prob', 'close', 'volume']
+    prev_cols = ['code'] + PREV_COLUMNS
 
     # 한투 API 컬럼 존재 시 추가
-    kis_cols = ['buy_strength', 'foreign_net', 'inst_net', 'rel_strength']
-    available_kis_cols = [c for c in kis_cols if c in prev_df.columns and c in curr_df.columns]
+    available_kis_cols = [c for c in KIS_COLUMNS if c in prev_df.columns and c in curr_df.columns]
 
     if available_kis_cols:
         HAS_KIS_DATA = True
@@ -144,51 +174,38 @@ def compare_two_csvs(prev_df: pd.DataFrame, curr_df: pd.DataFrame) -> pd.DataFra
         suffixes=('', '_prev')
     )
 
-    # Delta 계산
-    merged['v2_delta'] = merged['v2'] - merged['v2_prev']
-    merged['v4_delta'] = merged['v4'] - merged['v4_prev']
-    merged['v5_delta'] = merged['v5'] - merged['v5_prev']
-    merged['v35_delta'] = merged['v3.5'] - merged['v3.5_prev']
-    merged['v9_delta'] = merged['v9_prob'] - merged['v9_prob_prev']
+    return add_deltas(merged)
 
-    # 가격/거래량 변화
-    merged['price_change'] = ((merged['close'] - merged['close_prev']) / merged['close_prev'] * 100).round(2)
-    merged['volume_ratio'] = (merged['volume'] / merged['volume_prev']).round(2)
-    merged['volume_ratio'] = merged['volume_ratio'].replace([np.inf, -np.inf], 0).fillna(0)
 
-    # 한투 API 데이터 delta (존재 시)
-    if 'buy_strength' in merged.columns and 'buy_strength_prev' in merged.columns:
-        merged['buy_strength_delta'] = merged['buy_strength'] - merged['buy_strength_prev']
-    if 'foreign_net' in merged.columns and 'foreign_net_prev' in merged.columns:
-        merged['foreign_net_delta'] = merged['foreign_net'] - merged['foreign_net_prev']
-
-    return merged
+def analyze_all_pairs(date_str: str) -> list:
+    """
+    하루 전체 CSV 쌍 분석
 
+    하루 스냅샷을 한 번에 (시간 × 종목) 패널로 읽어 모든 시점의 delta 를
+    한 번에 계산한 뒤 시점별로 나눈다 (CSV 쌍마다 merge 하지 않음).
+    """
+    global HAS_KIS_DATA
 
-def analyze_all_pairs(date_str: str) -> list:
-    """하루 전체 CSV 쌍 분석"""
     files = get_csv_files(date_str)
     if len(files) < 2:
         print(f"파일이 2개 미만입니다: {len(files)}개")
         return []
 
-    results = []
-    for i in range(1, len(files)):
-        prev_file = files[i-1]
-        curr_file = files[i]
-
-        prev_df = load_csv(prev_file)
-        curr_df = load_csv(curr_file)
-
-        merged = compare_two_csvs(prev_df, curr_df)
+    replay = SnapshotReplay.from_files(files, loader=load_csv)
+    available_kis_cols = [c for c in KIS_COLUMNS if c in replay.snapshots.columns]
+    if available_kis_cols:
+        HAS_KIS_DATA = True
 
-        prev_time = get_timestamp_from_filename(prev_file)
-        curr_time = get_timestamp_from_filename(curr_file)
+    day = add_deltas(replay.pairs(PREV_COLUMNS + available_kis_cols))
+    by_time = {t: group for t, group in day.groupby('_t', sort=True)}
 
+    results = []
+    for t in range(1, len(replay)):
+        merged = by_time.get(t, day.iloc[0:0])
         results.append({
-            'prev_time': prev_time,
-            'curr_time': curr_time,
-            'data': merged
+            'prev_time': replay.times[t - 1],
+            'curr_time': replay.times[t],
+            'data': merged.drop(columns=['_t', '_c']).reset_index(drop=True)
         })
 
     return results
@@ -197,101 +214,28 @@ def analyze_all_pairs(date_str: str) -> list:
 # ============================================================================
 # Tier 판정 함수
 # ============================================================================
-def has_volume_surge_signal(signals_str: str) -> bool:
-    """VOLUME_EXPLOSION 또는 VOLUME_SURGE_3X 시그널 확인"""
-    if pd.isna(signals_str):
-        return False
-    return 'VOLUME_EXPLOSION' in signals_str or 'VOLUME_SURGE_3X' in signals_str
-
-
-def has_pattern_signal(signals_str: str) -> bool:
-    """BB_SQUEEZE 또는 VCP_PATTERN 시그널 확인"""
-    if pd.isna(signals_str):
-        return False
-    return 'BB_SQUEEZE' in signals_str or 'VCP_PATTERN' in signals_str
-
-
-def check_tier1(row: pd.Series) -> bool:
-    """Tier 1 조건 확인"""
-    cfg = TIER_CONFIG['tier1']['conditions']
-
-    if row['v2'] < cfg['v2_min']:
-        return False
-    if row['v2_delta'] < cfg['v2_delta_min']:
-        return False
-    if not has_volume_surge_signal(row.get('signals', '')):
-        return False
-    if row['v4'] < cfg['v4_min']:
-        return False
-    # 거래대금은 prev_amount 컬럼 사용 (전일 거래대금)
-    # 장중에는 당일 거래대금을 알기 어려우므로 volume * close로 추정
-    est_amount = row['close'] * row['volume']
-    if est_amount < cfg['amount_min']:
-        return False
-
-    # 체결강도 조건 (한투 API 데이터 존재 시)
-    if HAS_KIS_DATA and 'buy_strength' in row:
-        buy_strength = row.get('buy_strength', 0)
-        if buy_strength > 0 and buy_strength < cfg.get('buy_strength_min', 0):
-            return False  # 체결강도 미달
-
-    return True
-
-
-def check_tier2(row: pd.Series) -> bool:
-    """Tier 2 조건 확인"""
-    cfg = TIER_CONFIG['tier2']['conditions']
-
-    if row['v2'] < cfg['v2_min']:
-        return False
-    if row['v2_delta'] < cfg['v2_delta_min']:
-        return False
-    if row['volume_ratio'] < cfg['volume_ratio_min']:
-        return False
-    # V3.5 >= 40 또는 V5 >= 50
-    if row['v3.5'] < cfg['v35_min'] and row['v5'] < cfg['v5_min']:
-        return False
-
-    # 체결강도 조건 (한투 API 데이터 존재 시)
-    if HAS_KIS_DATA and 'buy_strength' in row:
-        buy_strength = row.get('buy_strength', 0)
-        if buy_strength > 0 and buy_strength < cfg.get('buy_strength_min', 0):
-            return False
-
-    return True
-
-
-def check_tier3(row: pd.Series) -> bool:
-    """Tier 3 조건 확인"""
-    cfg = TIER_CONFIG['tier3']['conditions']
-
-    if row['v2'] < cfg['v2_min']:
-        return False
-    # 패턴 시그널 또는 V9 >= 55%
-    if not has_pattern_signal(row.get('signals', '')) and row['v9_prob'] < cfg['v9_min']:
-        return False
-
-    return True
-
-
 def detect_surge_candidates(merged_df: pd.DataFrame) -> dict:
-    """급등 후보 감지"""
-    candidates = {
-        'tier1': [],
-        'tier2': [],
-        'tier3': []
+    """
+    급등 후보 감지 (Tier 1 → 2 → 3 우선순위의 벡터 판정)
+
+    Returns:
+        {'tier1': DataFrame, 'tier2': DataFrame, 'tier3': DataFrame}
+    """
+    tier_config = {}
+    for tier_key, tier_info in TIER_CONFIG.items():
+        cfg = dict(tier_info['conditions'])
+        if not HAS_KIS_DATA:
+            cfg.pop('buy_strength_min', None)  # 체결강도 조건은 한투 API 데이터 존재 시만
+        tier_config[tier_key] = cfg
+
+    frame = add_signal_flags(merged_df.copy())
+    tier = assign_tiers(frame, tier_config)
+
+    return {
+        tier_key: merged_df[tier == tier_key]
+        for tier_key in ['tier1', 'tier2', 'tier3']
     }
 
-    for _, row in merged_df.iterrows():
-        if check_tier1(row):
-            candidates['tier1'].append(row)
-        elif check_tier2(row):
-            candidates['tier2'].append(row)
-        elif check_tier3(row):
-            candidates['tier3'].append(row)
-
-    return candidates
-
 
 # ============================================================================
 # 급락 경고 감지
@@ -450,12 +394,12 @@ def print_surge_candidates(candidates: dict, prev_time: str, curr_time: str):
         print(f"\n[{tier_info['name']}] {tier_info['desc']} - {len(tier_list)}개")
         print("-" * 70)
 
-        if not tier_list:
+        if tier_list.empty:
             print("  (해당 없음)")
             continue
 
-        # DataFrame으로 변환하여 정렬
-        df = pd.DataFrame(tier_list)
+        # 종합 스코어로 정렬
+        df = tier_list.copy()
         df['composite'] = df.apply(calculate_composite_score, axis=1)
         df = df.sort_values('composite', ascending=False)
 
@@ -548,15 +492,12 @@ def main():
         # 하루 전체 분석
         results = analyze_all_pairs(date_str)
 
-        # 전체 급등 후보 집계
-        all_tier1, all_tier2, all_tier3 = [], [], []
+        # 전체 급등 후보 집계 (하루 전체 행을 한 번에 판정)
+        day = pd.concat([r['data'].assign(time=r['curr_time']) for r in results], ignore_index=True)
+        candidates = detect_surge_candidates(day)
+        all_tier1, all_tier2, all_tier3 = candidates['tier1'], candidates['tier2'], candidates['tier3']
 
         for r in results:
-            candidates = detect_surge_candidates(r['data'])
-            all_tier1.extend([dict(row) | {'time': r['curr_time']} for row in candidates['tier1']])
-            all_tier2.extend([dict(row) | {'time': r['curr_time']} for row in candidates['tier2']])
-            all_tier3.extend([dict(row) | {'time': r['curr_time']} for row in candidates['tier3']])
-
             warnings = detect_drop_warnings(r['data'], watch_codes)
             print_drop_warnings(warnings, r['prev_time'], r['curr_time'])
 
@@ -578,15 +519,14 @@ def main():
         print(f"  Tier 3 감지: {len(all_tier3)}건")
 
         # 가장 자주 감지된 종목 Top 10
-        if all_tier1 or all_tier2:
+        if len(all_tier1) or len(all_tier2):
             from collections import Counter
-            all_codes = [r['code'] for r in all_tier1 + all_tier2]
-            top_codes = Counter(all_codes).most_common(args.top)
+            top12 = pd.concat([all_tier1, all_tier2])
+            top_codes = Counter(top12['code']).most_common(args.top)
+            names = top12.drop_duplicates('code').set_index('code')['name']
             print(f"\n  자주 감지된 종목 (Tier 1+2):")
             for code, cnt in top_codes:
-                # 최신 데이터에서 종목명 조회
-                name = next((r['name'] for r in all_tier1 + all_tier2 if r['code'] == code), code)
-                print(f"    {code} {name}: {cnt}회")
+                print(f"    {code} {names.get(code, code)}: {cnt}회")
 
     else:
         # 최신 2개 파일만 비교
@@ -47,9 +47,22 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠️ 펀더멘탈 스케줄러 시작 실패: {e}")
 
+    # 알림 디스패처 시작 (웹 푸시/텔레그램 큐 전송)
+    try:
+        from trading.notifications.dispatcher import start_dispatcher
+        start_dispatcher()
+        print("🔔 알림 디스패처 시작됨")
+    except Exception as e:
+        print(f"⚠️ 알림 디스패처 시작 실패: {e}")
+
     yield
 
     # 종료 시
+    try:
+        from trading.notifications.dispatcher import stop_dispatcher
+        stop_dispatcher()
+    except:
+        pass
     try:
         from api.services.scheduler import stop_scheduler
         stop_scheduler()
@@ -150,6 +163,16 @@ async def scheduler_status():
         return {"error": str(e)}
 
 
+@app.get("/api/notifications/status", tags=["스케줄러"])
+async def notification_status():
+    """알림 큐 상태 (대기 건수, 지연, 처리 건수)"""
+    try:
+        from trading.notifications.dispatcher import get_dispatcher
+        return get_dispatcher().stats()
+    except Exception as e:
+        return {"error": str(e)}
+
+
 @app.get("/api/scheduler/fundamental/status", tags=["스케줄러"])
 async def fundamental_scheduler_status():
     """펀더멘탈 스케줄러 상태 확인"""
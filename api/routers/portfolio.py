@@ -5,7 +5,6 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import sys
 import os
 
@@ -21,6 +20,7 @@ from api.schemas.portfolio import (
 )
 from api.dependencies import get_db, get_current_user_required
 from database.db_manager import DatabaseManager
+from api.services.price_snapshot import get_price_snapshot, get_analysis_cache
 
 # 주식 라이브러리 지연 임포트
 from api.routers.stocks import get_stock_libs
@@ -30,17 +30,10 @@ router = APIRouter()
 
 
 def get_current_price(code: str) -> Optional[int]:
-    """현재가 조회"""
+    """현재가 조회 (공용 스냅샷)"""
     try:
-        libs = get_stock_libs()
-        if not libs:
-            return None
-        get_ohlcv = libs['get_ohlcv']
-        ohlcv = get_ohlcv(code, 5)
-        if ohlcv.empty:
-            return None
-        return int(ohlcv.iloc[-1]['종가'])
-    except:
+        return get_price_snapshot().get_price_map([code]).get(code)
+    except Exception:
         return None
 
 
@@ -49,7 +42,7 @@ async def get_portfolio(
     current_user: dict = Depends(get_current_user_required),
     db: DatabaseManager = Depends(get_db)
 ):
-    """포트폴리오 조회 (현재가 병렬 조회)"""
+    """포트폴리오 조회 (현재가 일괄 조회)"""
     items = db.get_portfolio(current_user['id'])
 
     if not items:
@@ -64,18 +57,9 @@ async def get_portfolio(
             items=[]
         )
 
-    # 현재가 병렬 조회
-    price_map = {}
+    # 현재가 일괄 조회 (실시간 캐시 → price_cache → KIS → 종가)
     stock_codes = [item['stock_code'] for item in items]
-
-    with ThreadPoolExecutor(max_workers=min(len(stock_codes), 5)) as executor:
-        future_to_code = {executor.submit(get_current_price, code): code for code in stock_codes}
-        for future in as_completed(future_to_code):
-            code = future_to_code[future]
-            try:
-                price_map[code] = future.result()
-            except Exception:
-                price_map[code] = None
+    price_map = get_price_snapshot().get_price_map(stock_codes)
 
     portfolio_items = []
     total_investment = 0
@@ -267,7 +251,7 @@ def analyze_stock_technical(code: str) -> dict:
         # 기술적 분석
         from technical_analyst import TechnicalAnalyst
         analyst = TechnicalAnalyst()
-        result = analyst.analyze_full(ohlcv)
+        result = analyst.analyze_full(ohlcv, code=code)
 
         if result is None:
             score_tuple = analyst.analyze(ohlcv)
@@ -317,18 +301,10 @@ async def analyze_portfolio(
             recommendations=["보유종목을 추가해주세요."]
         )
 
-    # 기술적 분석 병렬 실행
-    analysis_map = {}
+    # 기술적 분석 (같은 종목 보유자끼리 결과 공유) + 현재가 일괄 조회
     stock_codes = [item['stock_code'] for item in items]
-
-    with ThreadPoolExecutor(max_workers=min(len(stock_codes), 5)) as executor:
-        future_to_code = {executor.submit(analyze_stock_technical, code): code for code in stock_codes}
-        for future in as_completed(future_to_code):
-            code = future_to_code[future]
-            try:
-                analysis_map[code] = future.result()
-            except Exception:
-                analysis_map[code] = None
+    analysis_map = get_analysis_cache().get_many('technical', stock_codes, analyze_stock_technical)
+    price_map = get_price_snapshot().get_price_map(stock_codes)
 
     # 분석 결과 처리
     analysis_results = []
@@ -348,7 +324,7 @@ async def analyze_portfolio(
         if result:
             opinion = result['opinion']
             score = result['score']
-            current_price = int(result['current_price'])
+            current_price = price_map.get(item['stock_code']) or int(result['current_price'])
         else:
             opinion = '분석불가'
             score = 0
@@ -459,18 +435,9 @@ async def get_portfolio_diagnosis(
     except Exception as e:
         print(f"진단 점수 조회 실패: {e}")
 
-    # 현재가만 실시간 조회 (점수는 JSON에서)
-    analysis_map = {}
+    # 현재가만 일괄 조회 (점수는 JSON에서)
     stock_codes = [item['stock_code'] for item in items]
-
-    with ThreadPoolExecutor(max_workers=min(len(stock_codes), 5)) as executor:
-        future_to_code = {executor.submit(analyze_stock_technical, code): code for code in stock_codes}
-        for future in as_completed(future_to_code):
-            code = future_to_code[future]
-            try:
-                analysis_map[code] = future.result()
-            except Exception:
-                analysis_map[code] = None
+    price_map = get_price_snapshot().get_price_map(stock_codes)
 
     diagnosed_holdings = []
     total_health = 0
@@ -479,10 +446,8 @@ async def get_portfolio_diagnosis(
 
     for item in items:
         code = item['stock_code']
-        analysis = analysis_map.get(code) or {}
-
         avg_price = item.get('buy_price', 0) or 0
-        current_price = analysis.get('current_price') or avg_price
+        current_price = price_map.get(code) or avg_price
         quantity = item.get('quantity', 0)
 
         # 수익률 계산
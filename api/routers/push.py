@@ -83,6 +83,9 @@ def send_push_notification(subscription: dict, title: str, body: str, url: str =
 def send_push_to_user(user_id: int, title: str, body: str, url: str = None) -> int:
     """특정 사용자에게 푸시 알림 전송 (외부 호출용)
 
+    실제 전송은 알림 디스패처가 백그라운드에서 처리 (호출자는 큐 적재만 기다림).
+    디스패처가 어디에도 실행 중이 아니면 (auto_trader 등 단독 실행) 이 프로세스에서 백그라운드로 시작.
+
     Args:
         user_id: 사용자 ID
         title: 알림 제목
@@ -90,23 +93,20 @@ def send_push_to_user(user_id: int, title: str, body: str, url: str = None) -> i
         url: 클릭 시 이동할 URL
 
     Returns:
-        성공한 알림 개수
+        예약된 알림 개수 (구독 수)
     """
     try:
+        from trading.notifications.dispatcher import enqueue_push
+
         db = DatabaseManager()
-        subscriptions = db.get_all_push_subscriptions_for_user(user_id)
+        queued = enqueue_push(db, user_id, title, body, url)
 
-        if not subscriptions:
+        if not queued:
             print(f"[푸시] user_id={user_id}: 등록된 구독 없음")
             return 0
 
-        success_count = 0
-        for sub in subscriptions:
-            if send_push_notification(sub, title, body, url):
-                success_count += 1
-
-        print(f"[푸시] user_id={user_id}: {success_count}/{len(subscriptions)}개 전송 성공")
-        return success_count
+        print(f"[푸시] user_id={user_id}: {queued}개 전송 예약")
+        return queued
     except Exception as e:
         print(f"[푸시] user_id={user_id} 전송 오류: {e}")
         return 0
@@ -3,12 +3,17 @@
 한국투자증권 API를 통한 실시간 주가 조회
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Dict, Tuple, Any
 from pydantic import BaseModel
 from datetime import datetime
+import asyncio
+import json
 import time
 
+from api.services.price_stream import get_price_stream, publish_price
+
 router = APIRouter()
 
 # 실시간 시세 캐시 (30초 TTL)
@@ -28,8 +33,9 @@ def get_cached_realtime(code: str) -> Optional[Dict]:
 
 
 def set_realtime_cache(code: str, data: Dict):
-    """실시간 시세 캐시 저장"""
+    """실시간 시세 캐시 저장 (스트리밍 구독자에게도 반영)"""
     _realtime_cache[code] = (data, time.time())
+    publish_price(code, data)
     # 캐시 크기 제한 (200개)
     if len(_realtime_cache) > 200:
         # 가장 오래된 항목 삭제
@@ -433,8 +439,8 @@ async def get_hybrid_prices(codes: str = Query(..., description="쉼표로 구
             try:
                 new_prices = kis.get_multiple_prices(missing_codes)
                 if new_prices:
-                    # 캐시에 저장
-                    db.bulk_upsert_price_cache(new_prices)
+                    # 캐시에 저장 (응답과 무관하므로 지연 일괄 반영)
+                    db.queue_price_cache(new_prices)
                     # 결과에 추가
                     for p in new_prices:
                         cached_list.append(p)
@@ -456,3 +462,94 @@ async def get_hybrid_prices(codes: str = Query(..., description="쉼표로 구
         cache_updated_at=last_updated,
         cache_count=cache_count
     )
+
+
+# ==================== 실시간 스트리밍 (WebSocket / SSE) ====================
+
+_STREAM_HEARTBEAT = 15  # 초
+
+
+def _stream_payload(message: Dict) -> str:
+    return json.dumps(message, ensure_ascii=False, separators=(',', ':'))
+
+
+@router.websocket("/ws")
+async def price_stream_ws(websocket: WebSocket, codes: str = ""):
+    """
+    실시간 시세 WebSocket (폴링 대체)
+
+    - 접속: /api/realtime/ws?codes=005930,000660
+    - 구독 변경: {"subscribe": ["035720"]} / {"unsubscribe": ["000660"]}
+    - 수신: {"type": "prices", "data": {종목코드: 변경 필드}} (최초 구독 시 전체 필드)
+    """
+    await websocket.accept()
+    hub = get_price_stream()
+    client = hub.open()
+    hub.subscribe(client, codes.split(','))
+
+    async def receive_loop():
+        while True:
+            msg = await websocket.receive_json()
+            if not isinstance(msg, dict):
+                continue
+            if msg.get('subscribe'):
+                hub.subscribe(client, msg['subscribe'])
+            if msg.get('unsubscribe'):
+                hub.unsubscribe(client, msg['unsubscribe'])
+
+    async def send_loop():
+        while True:
+            message = await hub.next_message(client, timeout=_STREAM_HEARTBEAT)
+            await websocket.send_text(_stream_payload(message or {"type": "ping"}))
+
+    tasks = [asyncio.create_task(receive_loop()), asyncio.create_task(send_loop())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            exc = task.exception()
+            if exc and not isinstance(exc, WebSocketDisconnect):
+                print(f"[PriceStream] WebSocket 오류: {exc}")
+    finally:
+        for task in tasks:
+            task.cancel()
+        hub.close(client)
+
+
+@router.get("/stream")
+async def price_stream_sse(request: Request, codes: str = Query(..., description="쉼표로 구분된 종목코드")):
+    """
+    실시간 시세 SSE 스트림 (WebSocket 미지원 환경용)
+
+    - **codes**: 쉼표로 구분된 종목코드 (최대 100개)
+    - 이벤트 data 형식은 WebSocket 과 동일
+    """
+    stock_codes = [c.strip() for c in codes.split(',') if c.strip()]
+    if len(stock_codes) > 100:
+        raise HTTPException(status_code=400, detail="최대 100개 종목까지 구독 가능")
+
+    hub = get_price_stream()
+
+    async def events():
+        client = hub.open()
+        hub.subscribe(client, stock_codes)
+        try:
+            while not await request.is_disconnected():
+                message = await hub.next_message(client, timeout=_STREAM_HEARTBEAT)
+                if message is None:
+                    yield ": ping\n\n"
+                else:
+                    yield f"data: {_stream_payload(message)}\n\n"
+        finally:
+            hub.close(client)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stream/status")
+async def price_stream_status():
+    """스트리밍 허브 상태 (연결 수, 구독 종목 수, 업스트림 조회 횟수)"""
+    return get_price_stream().stats()
@@ -1036,11 +1036,11 @@ async def analyze_stock(
         # 기술적 분석 (변별력 강화 버전 사용)
         from technical_analyst import TechnicalAnalyst
         analyst = TechnicalAnalyst()
-        result = analyst.analyze_trend_following_strict(ohlcv)
+        result = analyst.analyze_trend_following_strict(ohlcv, code=code)
 
         if result is None:
             # fallback: 기존 analyze_full 사용
-            result = analyst.analyze_full(ohlcv)
+            result = analyst.analyze_full(ohlcv, code=code)
             if result is None:
                 result = {'score': 50, 'indicators': {}, 'signals': []}
 
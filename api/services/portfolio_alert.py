@@ -5,8 +5,6 @@
 """
 
 import sys
-import os
-import json
 from pathlib import Path
 from datetime import datetime, timedelta
 
@@ -15,56 +13,19 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from database.db_manager import DatabaseManager
 
-# VAPID 설정
-VAPID_PRIVATE_KEY = os.getenv("VAPID_PRIVATE_KEY", "")
-VAPID_EMAIL = os.getenv("VAPID_EMAIL", "mailto:admin@example.com")
-
 # 마지막 알림 상태 저장 (메모리)
 # {user_id: {stock_code: {'opinion': str, 'profit_loss_rate': float, 'last_alert': datetime}}}
 _last_status = {}
 
 
-def send_push_notification(subscription: dict, title: str, body: str, url: str = None) -> bool:
-    """푸시 알림 전송"""
-    try:
-        from pywebpush import webpush, WebPushException
-
-        payload = json.dumps({
-            "title": title,
-            "body": body,
-            "icon": "/icons/icon-192x192.png",
-            "badge": "/icons/icon-72x72.png",
-            "url": url or "/"
-        })
-
-        webpush(
-            subscription_info={
-                "endpoint": subscription["endpoint"],
-                "keys": {
-                    "p256dh": subscription["p256dh"],
-                    "auth": subscription["auth"]
-                }
-            },
-            data=payload,
-            vapid_private_key=VAPID_PRIVATE_KEY,
-            vapid_claims={"sub": VAPID_EMAIL}
-        )
-        return True
-    except Exception as e:
-        print(f"[푸시] 알림 전송 실패: {e}")
-        return False
-
-
-def send_push_to_user(db: DatabaseManager, user_id: int, title: str, body: str, url: str = None) -> int:
-    """사용자의 모든 구독에 푸시 알림 전송"""
-    subscriptions = db.get_all_push_subscriptions_for_user(user_id)
-    success_count = 0
-
-    for sub in subscriptions:
-        if send_push_notification(sub, title, body, url):
-            success_count += 1
+def send_push_to_user(db: DatabaseManager, user_id: int, title: str, body: str, url: str = None,
+                      history: dict = None) -> int:
+    """사용자의 모든 구독에 푸시 알림 예약 (전송은 알림 디스패처)
 
-    return success_count
+    history 는 실제 전송에 성공했을 때 디스패처가 alert_history 에 기록한다.
+    """
+    from trading.notifications.dispatcher import enqueue_push
+    return enqueue_push(db, user_id, title, body, url, history=history)
 
 
 def analyze_stock_for_alert(code: str) -> dict:
@@ -99,7 +60,7 @@ def analyze_stock_for_alert(code: str) -> dict:
         # 기술적 분석
         from technical_analyst import TechnicalAnalyst
         analyst = TechnicalAnalyst()
-        result = analyst.analyze_full(ohlcv)
+        result = analyst.analyze_full(ohlcv, code=code)
 
         if result is None:
             score_tuple = analyst.analyze(ohlcv)
@@ -128,10 +89,150 @@ def analyze_stock_for_alert(code: str) -> dict:
         return None
 
 
+def plan_alert_sweep(db: DatabaseManager, user_ids: list) -> tuple:
+    """
+    알림 스윕 계획: 사용자별 보유 종목 (수량 0 이하 제외) + 전체 사용자의 중복 없는 종목코드
+
+    Returns:
+        ({user_id: [보유 항목]}, [종목코드])
+    """
+    holdings = {
+        user_id: [item for item in items if (item['quantity'] or 0) > 0]
+        for user_id, items in db.get_portfolios(user_ids).items()
+    }
+    codes = list(dict.fromkeys(item['stock_code'] for items in holdings.values() for item in items))
+    return holdings, codes
+
+
+def analyze_codes_for_alert(codes: list) -> dict:
+    """종목별 1회 분석 (공용 풀에서 병렬, 결과는 공유 분석 캐시에 보관)"""
+    from api.services.price_snapshot import get_analysis_cache
+    return get_analysis_cache().get_many('portfolio_alert', codes, analyze_stock_for_alert)
+
+
+def evaluate_user_alerts(user_id: int, holdings: list, analyses: dict) -> list:
+    """공유 분석 결과로 사용자 보유 종목별 알림 조건 판정 (_last_status 갱신)"""
+    if user_id not in _last_status:
+        _last_status[user_id] = {}
+
+    alerts_to_send = []
+
+    for item in holdings:
+        code = item['stock_code']
+        name = item['stock_name'] or code
+        buy_price = item['buy_price'] or 0
+
+        result = analyses.get(code)
+        if not result:
+            continue
+
+        current_price = result['current_price']
+        opinion = result['opinion']
+        score = result['score']
+
+        # 수익률 계산
+        if buy_price > 0:
+            profit_loss_rate = round((current_price - buy_price) / buy_price * 100, 2)
+        else:
+            profit_loss_rate = 0
+
+        # 이전 상태
+        last = _last_status[user_id].get(code, {})
+        last_opinion = last.get('opinion')
+        last_alert_time = last.get('last_alert')
+
+        # 중복 알림 방지 (같은 종목에 대해 1시간 내 재알림 안함)
+        if last_alert_time:
+            time_diff = datetime.now() - last_alert_time
+            if time_diff < timedelta(hours=1):
+                continue
+
+        # 알림 조건 체크
+        should_alert = False
+        alert_reason = ""
+
+        # 1. 의견이 '하락 신호'로 변경됨
+        if opinion == '하락 신호' and last_opinion != '하락 신호':
+            should_alert = True
+            alert_reason = "하락 신호 감지"
+
+        # 2. 의견이 '주의'로 변경됨
+        elif opinion == '주의' and last_opinion not in ['주의', '하락 신호', None]:
+            should_alert = True
+            alert_reason = "주의 신호 감지"
+
+        # 3. 손실률이 -5% 이하로 하락
+        elif profit_loss_rate <= -5 and last.get('profit_loss_rate', 0) > -5:
+            should_alert = True
+            alert_reason = "손실률 -5% 돌파"
+
+        # 4. 손실률이 -10% 이하로 하락
+        elif profit_loss_rate <= -10 and last.get('profit_loss_rate', 0) > -10:
+            should_alert = True
+            alert_reason = "손실률 -10% 돌파"
+
+        if should_alert:
+            alerts_to_send.append({
+                'code': code,
+                'name': name,
+                'reason': alert_reason,
+                'opinion': opinion,
+                'score': score,
+                'current_price': current_price,
+                'profit_loss_rate': profit_loss_rate
+            })
+
+        # 상태 업데이트
+        _last_status[user_id][code] = {
+            'opinion': opinion,
+            'profit_loss_rate': profit_loss_rate,
+            'last_alert': datetime.now() if should_alert else last_alert_time
+        }
+
+    return alerts_to_send
+
+
+def send_user_alerts(db: DatabaseManager, user, alerts_to_send: list):
+    """사용자 알림 발송 (알림 기록은 전송 성공 시 디스패처가 저장)"""
+    user_id = user['id']
+    username = user['username']
+    push_enabled = user['push_alerts_enabled']
+
+    for alert in alerts_to_send:
+        # 푸시 알림용 메시지
+        push_title = f"{alert['name']} - {alert['reason']}"
+        push_body = f"현재가: {alert['current_price']:,}원 | 수익률: {alert['profit_loss_rate']:+.2f}% | {alert['opinion']}"
+
+        push_count = 0
+
+        # 푸시 알림 발송
+        if push_enabled:
+            push_count = send_push_to_user(
+                db, user_id, push_title, push_body,
+                url=f"/stock/{alert['code']}",
+                history={
+                    'user_id': user_id,
+                    'stock_code': alert['code'],
+                    'stock_name': alert['name'],
+                    'alert_type': alert['reason'],
+                    'message': push_body,
+                }
+            )
+
+        if push_count > 0:
+            print(f"[푸시] 전송 예약: {username} - {alert['name']} ({push_count}개 기기)")
+        else:
+            print(f"[알림] 전송 실패: {username} - {alert['name']}")
+
+
 def check_portfolio_alerts():
-    """포트폴리오 알림 체크 및 발송"""
-    global _last_status
+    """
+    포트폴리오 알림 체크 및 발송
 
+    1) 계획: 알림 대상 사용자 전체의 보유 종목을 한 번에 조회 → 중복 없는 종목코드
+    2) 분석: 종목별 1회 (병렬) — 같은 종목을 여러 사용자가 보유해도 분석은 한 번
+    3) 판정/발송: 사용자별 매수가·이전 상태로 알림 조건 판정
+    """
     print(f"[알림] 포트폴리오 알림 체크 시작: {datetime.now()}")
 
     try:
@@ -150,134 +251,19 @@ def check_portfolio_alerts():
             print("[알림] 알림 활성화된 사용자 없음")
             return
 
-        print(f"[알림] {len(users)}명 사용자 체크")
+        holdings, codes = plan_alert_sweep(db, [user['id'] for user in users])
+        print(f"[알림] {len(users)}명 사용자 체크 (보유 종목 {len(codes)}개)")
 
-        for user in users:
-            user_id = user['id']
-            username = user['username']
-            push_enabled = user['push_alerts_enabled']
+        analyses = analyze_codes_for_alert(codes)
 
-            # 사용자 포트폴리오 조회
-            portfolio = db.get_portfolio(user_id)
-            if not portfolio:
+        for user in users:
+            user_holdings = holdings.get(user['id'])
+            if not user_holdings:
                 continue
 
-            # 사용자별 상태 초기화
-            if user_id not in _last_status:
-                _last_status[user_id] = {}
-
-            alerts_to_send = []
-
-            for item in portfolio:
-                code = item['stock_code']
-                name = item['stock_name'] or code
-                buy_price = item['buy_price'] or 0
-                quantity = item['quantity'] or 0
-
-                # 수량이 0 이하면 건너뛰기 (보유하지 않는 종목)
-                if quantity <= 0:
-                    continue
-
-                # 분석 실행
-                result = analyze_stock_for_alert(code)
-                if not result:
-                    continue
-
-                current_price = result['current_price']
-                opinion = result['opinion']
-                score = result['score']
-
-                # 수익률 계산
-                if buy_price > 0:
-                    profit_loss_rate = round((current_price - buy_price) / buy_price * 100, 2)
-                else:
-                    profit_loss_rate = 0
-
-                # 이전 상태
-                last = _last_status[user_id].get(code, {})
-                last_opinion = last.get('opinion')
-                last_alert_time = last.get('last_alert')
-
-                # 중복 알림 방지 (같은 종목에 대해 1시간 내 재알림 안함)
-                if last_alert_time:
-                    time_diff = datetime.now() - last_alert_time
-                    if time_diff < timedelta(hours=1):
-                        continue
-
-                # 알림 조건 체크
-                should_alert = False
-                alert_reason = ""
-
-                # 1. 의견이 '하락 신호'로 변경됨
-                if opinion == '하락 신호' and last_opinion != '하락 신호':
-                    should_alert = True
-                    alert_reason = "하락 신호 감지"
-
-                # 2. 의견이 '주의'로 변경됨
-                elif opinion == '주의' and last_opinion not in ['주의', '하락 신호', None]:
-                    should_alert = True
-                    alert_reason = "주의 신호 감지"
-
-                # 3. 손실률이 -5% 이하로 하락
-                elif profit_loss_rate <= -5 and last.get('profit_loss_rate', 0) > -5:
-                    should_alert = True
-                    alert_reason = "손실률 -5% 돌파"
-
-                # 4. 손실률이 -10% 이하로 하락
-                elif profit_loss_rate <= -10 and last.get('profit_loss_rate', 0) > -10:
-                    should_alert = True
-                    alert_reason = "손실률 -10% 돌파"
-
-                if should_alert:
-                    alerts_to_send.append({
-                        'code': code,
-                        'name': name,
-                        'reason': alert_reason,
-                        'opinion': opinion,
-                        'score': score,
-                        'current_price': current_price,
-                        'profit_loss_rate': profit_loss_rate
-                    })
-
-                # 상태 업데이트
-                _last_status[user_id][code] = {
-                    'opinion': opinion,
-                    'profit_loss_rate': profit_loss_rate,
-                    'last_alert': datetime.now() if should_alert else last_alert_time
-                }
-
-            # 알림 발송
+            alerts_to_send = evaluate_user_alerts(user['id'], user_holdings, analyses)
             if alerts_to_send:
-                for alert in alerts_to_send:
-                    # 푸시 알림용 메시지
-                    push_title = f"{alert['name']} - {alert['reason']}"
-                    push_body = f"현재가: {alert['current_price']:,}원 | 수익률: {alert['profit_loss_rate']:+.2f}% | {alert['opinion']}"
-
-                    push_success = False
-
-                    # 푸시 알림 발송
-                    if push_enabled:
-                        push_count = send_push_to_user(
-                            db, user_id, push_title, push_body,
-                            url=f"/stock/{alert['code']}"
-                        )
-                        if push_count > 0:
-                            push_success = True
-                            print(f"[푸시] 전송 성공: {username} - {alert['name']} ({push_count}개 기기)")
-
-                    # 알림 기록 저장 (KST 시간으로)
-                    if push_success:
-                        from datetime import timezone, timedelta as td
-                        kst = timezone(td(hours=9))
-                        now_kst = datetime.now(kst).strftime('%Y-%m-%d %H:%M:%S')
-                        with db.get_connection() as conn:
-                            conn.execute("""
-                                INSERT INTO alert_history (user_id, stock_code, stock_name, alert_type, message, created_at)
-                                VALUES (?, ?, ?, ?, ?, ?)
-                            """, (user_id, alert['code'], alert['name'], alert['reason'], push_body, now_kst))
-                            conn.commit()
-                    else:
-                        print(f"[알림] 전송 실패: {username} - {alert['name']}")
+                send_user_alerts(db, user, alerts_to_send)
 
         print(f"[알림] 포트폴리오 알림 체크 완료: {datetime.now()}")
 
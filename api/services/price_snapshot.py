@@ -0,0 +1,236 @@
+"""
+현재가 스냅샷 서비스
+- 프로세스 공용 현재가 조회 (종목 N개를 한 번에)
+  1) 실시간 시세 메모리 캐시 (realtime 라우터, 30초 TTL)
+  2) price_cache 테이블 (update_price_cache.py 가 장중 5분마다 갱신)
+     - 최대 15분(장외 4일) 지난 값이라 실시간 캐시/스트림에는 넣지 않고 호출자에게만 반환
+  3) 남은 종목만 KIS 일괄 조회 → 없으면 OHLCV 종가
+- 종목별 분석 결과 공유 캐시 (같은 종목을 보유한 사용자끼리 재사용)
+- 요청마다 스레드풀을 만들지 않고 모듈 전역 풀 1개 사용
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from database.db_manager import DatabaseManager
+
+
+# 전역 작업 풀 (OHLCV 조회 / 종목 분석)
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="price-snapshot")
+
+# price_cache 허용 나이 (장중에는 최근 갱신분만, 장외에는 마지막 종가 사용)
+_MARKET_HOURS_MAX_AGE = 15 * 60
+_OFF_HOURS_MAX_AGE = 4 * 24 * 3600  # 주말/연휴 포함
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """스냅샷/분석 공용 스레드풀"""
+    return _executor
+
+
+def _is_market_hours(now: datetime = None) -> bool:
+    now = now or datetime.now()
+    if now.weekday() >= 5:
+        return False
+    return (9, 0) <= (now.hour, now.minute) <= (15, 40)
+
+
+def _ohlcv_close(code: str) -> Optional[int]:
+    """OHLCV 종가 (최후 수단)"""
+    try:
+        from api.routers.stocks import get_stock_libs
+        libs = get_stock_libs()
+        if not libs:
+            return None
+        ohlcv = libs['get_ohlcv'](code, 5)
+        if ohlcv is None or ohlcv.empty:
+            return None
+        return int(ohlcv.iloc[-1]['종가'])
+    except Exception:
+        return None
+
+
+class PriceSnapshotService:
+    """프로세스 공용 현재가 스냅샷"""
+
+    def __init__(self, db: DatabaseManager = None, use_kis: bool = True):
+        """
+        Args:
+            db: price_cache 를 읽을 DatabaseManager (None이면 기본 DB)
+            use_kis: 캐시 미스 종목을 KIS 일괄 조회로 채울지 여부
+        """
+        self._db = db
+        self.use_kis = use_kis
+
+    @property
+    def db(self) -> DatabaseManager:
+        if self._db is None:
+            self._db = DatabaseManager()
+        return self._db
+
+    def get_prices(self, codes: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """
+        여러 종목 현재가 일괄 조회
+
+        Args:
+            codes: 종목코드 목록 (중복 허용)
+
+        Returns:
+            {stock_code: 시세 dict (current_price 포함) 또는 None}
+        """
+        codes = list(dict.fromkeys(c for c in codes if c))
+        result: Dict[str, Optional[Dict]] = {}
+        if not codes:
+            return result
+
+        # 1) 실시간 메모리 캐시
+        from api.routers.realtime import get_cached_realtime, set_realtime_cache
+        missing = []
+        for code in codes:
+            cached = get_cached_realtime(code)
+            if cached:
+                result[code] = cached
+            else:
+                missing.append(code)
+
+        # 2) price_cache 테이블 (한 번의 IN 쿼리) - 지난 시세라 실시간 캐시/스트림에 넣지 않음
+        if missing:
+            max_age = _MARKET_HOURS_MAX_AGE if _is_market_hours() else _OFF_HOURS_MAX_AGE
+            for row in self.db.get_cached_prices(missing, max_age_seconds=max_age):
+                if row.get('current_price'):
+                    result[row['stock_code']] = row
+            missing = [c for c in missing if c not in result]
+
+        # 3) KIS 일괄 조회
+        if missing and self.use_kis:
+            from api.routers.realtime import get_kis
+            kis = get_kis()
+            if kis:
+                try:
+                    fetched = kis.get_multiple_prices(missing) or []
+                except Exception as e:
+                    print(f"[PriceSnapshot] KIS 일괄 조회 실패: {e}")
+                    fetched = []
+                for p in fetched:
+                    if p.get('current_price'):
+                        result[p['stock_code']] = p
+                        set_realtime_cache(p['stock_code'], p)
+                if fetched:
+                    self.db.queue_price_cache(fetched)
+                missing = [c for c in missing if c not in result]
+
+        # 4) OHLCV 종가 (공용 풀에서 병렬)
+        if missing:
+            futures = {code: _executor.submit(_ohlcv_close, code) for code in missing}
+            for code, future in futures.items():
+                price = future.result()
+                result[code] = {'stock_code': code, 'current_price': price} if price else None
+
+        return {code: result.get(code) for code in codes}
+
+    def get_price_map(self, codes: Iterable[str]) -> Dict[str, Optional[int]]:
+        """{stock_code: 현재가(int) 또는 None}"""
+        return {
+            code: int(data['current_price']) if data and data.get('current_price') else None
+            for code, data in self.get_prices(codes).items()
+        }
+
+
+class SharedAnalysisCache:
+    """종목별 분석 결과 공유 캐시
+
+    같은 종목에 대한 동시 요청은 진행 중인 계산(Future)을 함께 기다리고,
+    완료된 결과는 TTL 동안 모든 사용자에게 재사용된다.
+    """
+
+    def __init__(self, ttl: int = 600, max_size: int = 2000):
+        """
+        Args:
+            ttl: 결과 유지 시간 (초)
+            max_size: 최대 보관 종목 수
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.RLock()  # 이미 끝난 Future 의 콜백은 잠금 보유 중 즉시 실행됨
+        self._results: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._stats = {"hits": 0, "computed": 0, "joined": 0}
+
+    def get_many(self, name: str, codes: Iterable[str], func: Callable[[str], Any]) -> Dict[str, Any]:
+        """
+        여러 종목 분석 결과 조회 (캐시 미스만 공용 풀에서 병렬 계산)
+
+        Args:
+            name: 분석 종류 (캐시 네임스페이스)
+            codes: 종목코드 목록
+            func: code -> 결과 계산 함수
+
+        Returns:
+            {stock_code: 결과 (실패 시 None)}
+        """
+        codes = list(dict.fromkeys(codes))
+        now = time.time()
+        results: Dict[str, Any] = {}
+        waiting: Dict[str, Future] = {}
+
+        with self._lock:
+            for code in codes:
+                key = (name, code)
+                cached = self._results.get(key)
+                if cached and now - cached[1] < self.ttl:
+                    results[code] = cached[0]
+                    self._stats["hits"] += 1
+                    continue
+
+                future = self._inflight.get(key)
+                if future is not None:
+                    self._stats["joined"] += 1
+                else:
+                    future = _executor.submit(func, code)
+                    self._inflight[key] = future
+                    future.add_done_callback(lambda f, key=key: self._store(key, f))
+                    self._stats["computed"] += 1
+                waiting[code] = future
+
+        for code, future in waiting.items():
+            try:
+                results[code] = future.result()
+            except Exception:
+                results[code] = None
+
+        return {code: results.get(code) for code in codes}
+
+    def _store(self, key: Tuple[str, str], future: Future):
+        with self._lock:
+            self._inflight.pop(key, None)
+            if future.exception() is not None or future.result() is None:
+                return  # 실패는 캐시하지 않음 (다음 요청에서 재시도)
+            self._results[key] = (future.result(), time.time())
+            if len(self._results) > self.max_size:
+                oldest = min(self._results.items(), key=lambda x: x[1][1])
+                del self._results[oldest[0]]
+
+    def stats(self) -> Dict:
+        """캐시 적중/계산/합류 횟수"""
+        with self._lock:
+            return dict(self._stats, size=len(self._results), inflight=len(self._inflight))
+
+
+_price_snapshot: Optional[PriceSnapshotService] = None
+_analysis_cache = SharedAnalysisCache()
+
+
+def get_price_snapshot() -> PriceSnapshotService:
+    """프로세스 공용 PriceSnapshotService"""
+    global _price_snapshot
+    if _price_snapshot is None:
+        _price_snapshot = PriceSnapshotService()
+    return _price_snapshot
+
+
+def get_analysis_cache() -> SharedAnalysisCache:
+    """프로세스 공용 SharedAnalysisCache"""
+    return _analysis_cache
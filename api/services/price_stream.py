@@ -0,0 +1,268 @@
+"""
+실시간 시세 스트리밍 허브 (WebSocket / SSE 공용)
+- 클라이언트별 구독 종목을 합쳐 업스트림(KIS 일괄 조회)은 프로세스당 1개만 실행
+- 다른 경로에서 받은 시세(set_realtime_cache)도 같은 스트림으로 전달
+- 종목별 변경 필드만 모아서(diff) min_interval 마다 한 번씩 전송
+- 느린 클라이언트는 대기 중인 diff 가 병합되어 최신 값만 받음
+
+메시지 형식:
+    {"type": "prices", "data": {"005930": {"current_price": 71200, "volume": 1234567}}, "ts": "..."}
+    - 클라이언트는 종목별로 기존 값에 필드를 덮어쓰면 됨 (최초 구독 시에는 전체 필드)
+"""
+
+import asyncio
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+
+# 스트리밍 대상 필드 (RealtimePrice 와 동일)
+PRICE_FIELDS = (
+    'stock_name', 'current_price', 'change', 'change_rate', 'volume', 'trading_value',
+    'open_price', 'high_price', 'low_price', 'prev_close',
+)
+
+DEFAULT_POLL_INTERVAL = 3.0   # 업스트림 조회 주기 (초)
+DEFAULT_MIN_INTERVAL = 1.0    # 클라이언트 전송 주기 (종목별 병합 단위, 초)
+MAX_CODES_PER_CLIENT = 100
+
+
+def _normalize(data: Dict) -> Dict:
+    """스트리밍 필드만 추출 + 장 시작 전(07:00~09:00) 등락률 0 처리"""
+    row = {k: data.get(k) for k in PRICE_FIELDS if data.get(k) is not None}
+    if 7 <= datetime.now().hour < 9:
+        row['change'] = 0
+        row['change_rate'] = 0.0
+    return row
+
+
+def _default_fetch(codes: List[str]) -> List[Dict]:
+    """KIS 일괄 조회 (실패/미설정 시 price_cache)"""
+    from api.routers.realtime import get_kis, set_realtime_cache
+
+    kis = get_kis()
+    if kis:
+        try:
+            prices = kis.get_multiple_prices(codes) or []
+            for p in prices:
+                set_realtime_cache(p['stock_code'], p)  # 캐시 저장 시 허브에도 반영됨
+            return prices
+        except Exception as e:
+            print(f"[PriceStream] KIS 조회 실패: {e}")
+
+    from database.db_manager import DatabaseManager
+    prices = DatabaseManager().get_cached_prices(codes)
+    get_price_stream().publish_many(prices)
+    return prices
+
+
+class StreamClient:
+    """스트리밍 연결 1개 (구독 종목 + 전송 대기 diff)"""
+
+    def __init__(self):
+        self.codes: Set[str] = set()
+        self.pending: Dict[str, Dict] = {}
+        self.event = asyncio.Event()
+
+
+class PriceStreamHub:
+    """구독 종목 합산 업스트림 + 종목별 diff 병합 전송"""
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], List[Dict]] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_codes_per_client: int = MAX_CODES_PER_CLIENT,
+    ):
+        """
+        Args:
+            fetch: codes -> 시세 목록 (None이면 KIS 일괄 조회). 결과는 publish 로 반영되어야 함
+            poll_interval: 업스트림 조회 주기 (초)
+            min_interval: 클라이언트 전송 주기 (초)
+            max_codes_per_client: 연결당 최대 구독 종목 수
+        """
+        self.fetch = fetch or _default_fetch
+        self.poll_interval = poll_interval
+        self.min_interval = min_interval
+        self.max_codes_per_client = max_codes_per_client
+
+        self._clients: Set[StreamClient] = set()
+        self._refcount: Dict[str, int] = {}
+
+        # publish 는 워커 스레드에서도 호출되므로 별도 잠금
+        self._lock = threading.Lock()
+        self._latest: Dict[str, Dict] = {}
+        self._dirty: Dict[str, Dict] = {}
+
+        self._task: Optional[asyncio.Task] = None
+        self._fetch_task: Optional[asyncio.Future] = None
+        self._stats = {"fetches": 0, "published": 0, "coalesced": 0, "sent": 0}
+
+    # ---------- 시세 입력 ----------
+
+    def publish(self, code: str, data: Dict):
+        """시세 반영 (변경 필드만 다음 전송에 포함, 스레드 안전)"""
+        row = _normalize(data)
+        with self._lock:
+            prev = self._latest.get(code, {})
+            diff = {k: v for k, v in row.items() if prev.get(k) != v}
+            if not diff:
+                return
+            self._latest[code] = {**prev, **row}
+            if code in self._dirty:
+                self._stats["coalesced"] += 1
+                self._dirty[code].update(diff)
+            else:
+                self._dirty[code] = diff
+            self._stats["published"] += 1
+
+    def publish_many(self, prices: Iterable[Dict]):
+        for p in prices:
+            if p and p.get('stock_code'):
+                self.publish(p['stock_code'], p)
+
+    # ---------- 연결/구독 ----------
+
+    def open(self) -> StreamClient:
+        """연결 등록 (이벤트 루프 안에서 호출)"""
+        client = StreamClient()
+        self._clients.add(client)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return client
+
+    def close(self, client: StreamClient):
+        """연결 해제 (구독 종목 정리)"""
+        self.unsubscribe(client, list(client.codes))
+        self._clients.discard(client)
+
+    def subscribe(self, client: StreamClient, codes: Iterable[str]) -> List[str]:
+        """
+        종목 구독 추가 (보유 중인 최신 시세는 즉시 전송 대기열에 넣음)
+
+        Returns:
+            새로 구독된 종목코드 (연결당 한도 초과분 제외)
+        """
+        added = []
+        for code in codes:
+            code = code.strip()
+            if not code or code in client.codes:
+                continue
+            if len(client.codes) >= self.max_codes_per_client:
+                break
+            client.codes.add(code)
+            self._refcount[code] = self._refcount.get(code, 0) + 1
+            added.append(code)
+
+        # 아직 flush 되지 않은 필드는 다음 flush 에서 전달되므로 스냅샷에서 제외 (중복 전송 방지)
+        snapshot = {}
+        with self._lock:
+            for code in added:
+                dirty = self._dirty.get(code, {})
+                fields = {k: v for k, v in self._latest.get(code, {}).items() if k not in dirty}
+                if fields:
+                    snapshot[code] = fields
+        if snapshot:
+            self._enqueue(client, snapshot)
+        return added
+
+    def unsubscribe(self, client: StreamClient, codes: Iterable[str]):
+        """종목 구독 해제"""
+        for code in codes:
+            if code not in client.codes:
+                continue
+            client.codes.discard(code)
+            client.pending.pop(code, None)
+            count = self._refcount.get(code, 0) - 1
+            if count > 0:
+                self._refcount[code] = count
+            else:
+                self._refcount.pop(code, None)
+
+    @property
+    def subscribed_codes(self) -> List[str]:
+        """전체 연결의 구독 종목 합집합"""
+        return list(self._refcount)
+
+    # ---------- 전송 ----------
+
+    def _enqueue(self, client: StreamClient, changes: Dict[str, Dict]):
+        for code, fields in changes.items():
+            if code in client.pending:
+                client.pending[code].update(fields)
+            else:
+                client.pending[code] = dict(fields)
+        client.event.set()
+
+    def flush(self):
+        """누적된 diff 를 구독 중인 연결에 분배 (이벤트 루프 안에서 호출)"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return
+        for client in self._clients:
+            changes = {code: fields for code, fields in dirty.items() if code in client.codes}
+            if changes:
+                self._enqueue(client, changes)
+
+    async def next_message(self, client: StreamClient, timeout: float = None) -> Optional[Dict]:
+        """
+        다음 전송 메시지 대기
+
+        Returns:
+            {"type": "prices", "data": {...}, "ts": ...} 또는 timeout 시 None (heartbeat 용)
+        """
+        try:
+            await asyncio.wait_for(client.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        client.event.clear()
+        data, client.pending = client.pending, {}
+        if not data:
+            return None
+        self._stats["sent"] += 1
+        return {"type": "prices", "data": data, "ts": datetime.now().isoformat(timespec='seconds')}
+
+    async def _run(self):
+        """업스트림 조회 + 주기적 flush (연결이 없으면 종료)"""
+        loop = asyncio.get_running_loop()
+        next_poll = 0.0
+        try:
+            while self._clients:
+                codes = self.subscribed_codes
+                if codes and loop.time() >= next_poll and (self._fetch_task is None or self._fetch_task.done()):
+                    next_poll = loop.time() + self.poll_interval
+                    self._stats["fetches"] += 1
+                    self._fetch_task = loop.run_in_executor(None, self._safe_fetch, codes)
+                self.flush()
+                await asyncio.sleep(self.min_interval)
+        finally:
+            self._task = None
+
+    def _safe_fetch(self, codes: List[str]):
+        try:
+            self.fetch(codes)
+        except Exception as e:
+            print(f"[PriceStream] 업스트림 조회 실패: {e}")
+
+    def stats(self) -> Dict:
+        """업스트림 조회/반영/병합/전송 횟수"""
+        return dict(self._stats, clients=len(self._clients), codes=len(self._refcount))
+
+
+_price_stream: Optional[PriceStreamHub] = None
+
+
+def get_price_stream() -> PriceStreamHub:
+    """프로세스 공용 PriceStreamHub"""
+    global _price_stream
+    if _price_stream is None:
+        _price_stream = PriceStreamHub()
+    return _price_stream
+
+
+def publish_price(code: str, data: Dict):
+    """허브가 생성된 경우에만 시세 반영 (스트리밍 미사용 시 비용 없음)"""
+    if _price_stream is not None:
+        _price_stream.publish(code, data)
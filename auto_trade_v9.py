@@ -7,7 +7,6 @@ V9 자동매매 - 갭 상승 확률 70%+ 종목 매수
 import sys
 sys.path.insert(0, '/home/kimhc/Stock')
 
-import pandas as pd
 import numpy as np
 from pykrx import stock
 from pykrx.website.krx.market.ticker import StockTicker
@@ -15,12 +14,15 @@ import pickle
 from datetime import datetime, timedelta
 import sqlite3
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 warnings.filterwarnings('ignore')
 
 from trading.trade_logger import TradeLogger
 from api.services.kis_client import KISClient
+from scoring.gap_features import apply_gap_filters, build_gap_panel, compute_gap_features, latest_gap_features
 
 PROB_THRESHOLD = 0.70
+FETCH_WORKERS = 8  # 일봉 조회 병렬 스레드 수
 MODEL_PATH = '/home/kimhc/Stock/models/gap_model_v9.pkl'
 DB_PATH = '/home/kimhc/Stock/database/auto_trade.db'
 LOG_FILE = '/home/kimhc/Stock/output/auto_trade_v9.log'
@@ -87,101 +89,35 @@ log(f"    {len(tickers)}개 종목")
 # =============================================================================
 # 4. 피처 계산 및 예측
 # =============================================================================
-def calc_features(df):
-    """백테스트와 동일한 20+ 피처 계산"""
-    if len(df) < 21:
+def fetch_ohlcv(ticker):
+    """최근 60일 일봉 (TARGET_DATE 거래 없는 종목/데이터 부족은 None)"""
+    try:
+        df = stock.get_market_ohlcv(start, TARGET_DATE, ticker)
+    except Exception:
         return None
-    idx = len(df) - 1
-    row = df.iloc[idx]
-    prev_rows = df.iloc[idx-20:idx]
-
-    o, h, l, c, v = row['시가'], row['고가'], row['저가'], row['종가'], row['거래량']
-    if o == 0 or c == 0 or v == 0:
+    if len(df) < 21 or df.index[-1].strftime('%Y%m%d') != TARGET_DATE:
         return None
-
-    f = {}
-    body = abs(c - o)
-    total_range = h - l if h > l else 1
-
-    f['close_pos'] = (c - l) / total_range if total_range > 0 else 0.5
-    f['close_high'] = (c - l) / (h - l) if h > l else 0.5
-    f['is_bull'] = 1 if c > o else 0
-    f['body_ratio'] = body / total_range if total_range > 0 else 0
-    f['upper_wick'] = (h - max(o, c)) / total_range if total_range > 0 else 0
-    f['lower_wick'] = (min(o, c) - l) / total_range if total_range > 0 else 0
-
-    prev_close = df.iloc[idx-1]['종가']
-    f['day_change'] = (c - prev_close) / prev_close * 100 if prev_close > 0 else 0
-
-    ma5 = prev_rows['종가'].tail(5).mean()
-    ma20 = prev_rows['종가'].mean()
-    f['dist_ma5'] = (c - ma5) / ma5 * 100 if ma5 > 0 else 0
-    f['dist_ma20'] = (c - ma20) / ma20 * 100 if ma20 > 0 else 0
-
-    avg_vol = prev_rows['거래량'].mean()
-    f['vol_ratio'] = v / avg_vol if avg_vol > 0 else 1
-
-    recent_vol = prev_rows['거래량'].tail(5).mean()
-    older_vol = prev_rows['거래량'].head(15).mean()
-    f['vol_declining'] = 1 if recent_vol < older_vol * 0.7 else 0
-
-    changes = prev_rows['종가'].diff()
-    gains = changes.where(changes > 0, 0).mean()
-    losses = (-changes.where(changes < 0, 0)).mean()
-    f['rsi'] = gains / (gains + losses) * 100 if gains + losses > 0 else 50
-    f['rsi_overbought'] = 1 if f['rsi'] > 70 else 0
-
-    recent_5 = df.iloc[idx-4:idx+1]
-    f['consec_bull'] = sum(1 for i in range(len(recent_5))
-                           if recent_5.iloc[i]['종가'] > recent_5.iloc[i]['시가'])
-
-    ma5_val = df.iloc[idx-4:idx+1]['종가'].mean()
-    ma10_val = df.iloc[idx-9:idx+1]['종가'].mean()
-    ma20_val = df.iloc[idx-19:idx+1]['종가'].mean()
-    f['aligned'] = 1 if c > ma5_val > ma10_val > ma20_val else 0
-
-    high_20d = prev_rows['고가'].max()
-    low_20d = prev_rows['저가'].min()
-    f['near_high_20d'] = c / high_20d if high_20d > 0 else 0
-    f['from_low_20d'] = (c - low_20d) / low_20d * 100 if low_20d > 0 else 0
-
-    f['volatility'] = prev_rows['종가'].pct_change().std() * 100
-    f['trade_value'] = row['거래량'] * c / 100000000
-    f['is_surge'] = 1 if f['day_change'] >= 15 else 0
-
-    if idx >= 2:
-        prev_prev_close = df.iloc[idx-2]['종가']
-        two_day_change = (c - prev_prev_close) / prev_prev_close * 100
-        f['two_day_surge'] = 1 if two_day_change >= 20 else 0
-    else:
-        f['two_day_surge'] = 0
-
-    f['close'] = c
-    return f
+    return df
 
 log(f"[4] {TARGET_DATE} 종목 스캔...")
 start = (datetime.strptime(TARGET_DATE, '%Y%m%d') - timedelta(days=60)).strftime('%Y%m%d')
 
-predictions = []
-for i, ticker in enumerate(tickers):
-    if (i + 1) % 500 == 0:
-        log(f"    {i+1}/{len(tickers)}...")
-    try:
-        df = stock.get_market_ohlcv(start, TARGET_DATE, ticker)
-        if len(df) < 21:
-            continue
-        if df.index[-1].strftime('%Y%m%d') != TARGET_DATE:
-            continue
-
-        f = calc_features(df)
-        if f is None or f['trade_value'] < 50:
-            continue
-        if not (-15 <= f['day_change'] <= 25):
-            continue
+all_data = {}
+with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+    for i, (ticker, df) in enumerate(zip(tickers, executor.map(fetch_ohlcv, tickers))):
+        if (i + 1) % 500 == 0:
+            log(f"    {i+1}/{len(tickers)}...")
+        if df is not None:
+            all_data[ticker] = df
 
-        close = f.pop('close')
-        prob = model.predict_proba(pd.DataFrame([f])[fcols])[0][1]
+# 전 종목 피처 일괄 계산 → 종목별 마지막 행 → 일괄 예측
+features = compute_gap_features(build_gap_panel(all_data))
+latest = apply_gap_filters(latest_gap_features(features, TARGET_DATE))
 
+predictions = []
+if not latest.empty:
+    probs = model.predict_proba(latest[fcols])[:, 1]
+    for ticker, close, prob in zip(latest['code'], latest['close'], probs):
         if prob >= PROB_THRESHOLD:
             predictions.append({
                 'ticker': ticker,
@@ -189,8 +125,6 @@ for i, ticker in enumerate(tickers):
                 'prob': prob,
                 'close': int(close)
             })
-    except:
-        pass
 
 predictions.sort(key=lambda x: x['prob'], reverse=True)
 log(f"    {len(predictions)}개 종목 선정")
@@ -636,7 +636,7 @@ class AutoTrader:
                 return 70
 
             # 변별력 강화 버전 사용 (래치 전략)
-            result = self.analyst.analyze_trend_following_strict(df)
+            result = self.analyst.analyze_trend_following_strict(df, code=stock_code)
             if result:
                 score = result.get("score", 70)
                 signals = result.get("signals", [])
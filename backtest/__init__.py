@@ -0,0 +1,66 @@
+"""
+통합 백테스트 모듈
+
+구성:
+- panel: 종목별 OHLCV 컬럼형 패널 + 일괄 로딩 (프로세스 내 재사용)
+- exits: ATR 목표가/손절가, 본전 트레일링, 조기/시간 청산 일괄 판정
+- strategies: 진입 신호 어댑터 (scoring 엔진 점수 / trading.strategies 전략)
+- engine: 신호 → 다음날 시가 진입 → 청산 시뮬레이션
+- result: 공통 결과 형식 (요약/청산유형별/일별, JSON 저장)
+- sweep: 파라미터 그리드 병렬 탐색 + 체크포인트 (임계값/ATR 배수 최적화)
+- score_cache: 종목×날짜 점수 디스크 캐시 (스코어러 소스 해시로 자동 무효화)
+- intraday_replay: 장중 스냅샷 (시간 × 종목) 리플레이 + Tier 벡터 판정
+
+사용법:
+    from backtest import PanelBacktest, load_price_panel, swing_adapters, compare_results
+
+    panel = load_price_panel('2025-01-01', '2025-12-31')
+    engine = PanelBacktest(panel, top_n=10, allocation=300_000)
+    results = engine.run_many(swing_adapters(('v6', 'v7', 'v8')))
+    print(compare_results(results))
+"""
+
+from .panel import PricePanel, load_price_panel, load_stock_universe
+from .exits import (
+    ExitRules,
+    SWING_V6_RULES,
+    SWING_V7_RULES,
+    EXIT_REASONS,
+    evaluate_exit,
+    evaluate_exits,
+)
+from .strategies import ScoreAdapter, StrategyAdapter, swing_adapters
+from .engine import PanelBacktest
+from .result import BacktestResult, compare_results
+from .sweep import SweepRunner, expand_grid, file_fingerprint, memoize
+from .score_cache import ScoreCache, get_score_cache, scorer_hash
+from .intraday_replay import SnapshotReplay, assign_tiers, load_replays
+
+
+__all__ = [
+    'PricePanel',
+    'load_price_panel',
+    'load_stock_universe',
+    'ExitRules',
+    'SWING_V6_RULES',
+    'SWING_V7_RULES',
+    'EXIT_REASONS',
+    'evaluate_exit',
+    'evaluate_exits',
+    'ScoreAdapter',
+    'StrategyAdapter',
+    'swing_adapters',
+    'PanelBacktest',
+    'BacktestResult',
+    'compare_results',
+    'SweepRunner',
+    'expand_grid',
+    'file_fingerprint',
+    'memoize',
+    'ScoreCache',
+    'get_score_cache',
+    'scorer_hash',
+    'SnapshotReplay',
+    'assign_tiers',
+    'load_replays',
+]
@@ -0,0 +1,171 @@
+"""
+통합 백테스트 엔진
+
+흐름 (이벤트: 신호 → 다음날 시가 진입 → 청산):
+    1. 어댑터가 전 기간 진입 신호 생성 (종목별 점수 시계열 1회 계산)
+    2. 날짜별 TOP N 선정 (1주도 못 사는 종목 제외, priority 순)
+    3. 진입일 갭 필터 + 수량 계산
+    4. 모든 거래의 청산을 (거래 수 × 최대 보유일) 배열로 한 번에 판정
+
+사용법:
+    from backtest import PanelBacktest, load_price_panel, swing_adapters
+
+    panel = load_price_panel('2025-01-01', '2025-12-31')
+    engine = PanelBacktest(panel, top_n=10, allocation=300_000)
+    results = engine.run_many(swing_adapters(), start='2025-01-01', end='2025-12-31')
+"""
+
+import time
+from dataclasses import asdict
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from .exits import evaluate_exits
+from .panel import PricePanel
+from .result import BacktestResult, TRADE_COLUMNS
+
+
+class PanelBacktest:
+    """PricePanel 기반 스윙 백테스트 엔진"""
+
+    def __init__(self, panel: PricePanel, top_n: int = 10, allocation: int = 300_000):
+        """
+        Args:
+            panel: 가격 패널 (여러 전략이 공유)
+            top_n: 날짜별 최대 진입 종목 수
+            allocation: 종목당 투자 금액
+        """
+        self.panel = panel
+        self.top_n = top_n
+        self.allocation = allocation
+
+    def select(self, signals: pd.DataFrame) -> pd.DataFrame:
+        """날짜별 TOP N 선정 (신호 일봉 위치 bar, 순위 rank 추가)"""
+        panel = self.panel
+        signals = signals.copy()
+        signals['bar'] = panel.bar_index(signals['code'], signals['date'])
+        signals = signals[signals['bar'] >= 0]
+        signals['close'] = panel.close[signals['bar'].to_numpy()]
+
+        # 1주도 못 사는 종목은 순위에서 제외
+        signals = signals[signals['close'] <= self.allocation]
+        signals = signals.sort_values(['date', 'priority', 'score'], ascending=[True, False, False], kind='stable')
+        selected = signals.groupby('date', sort=False).head(self.top_n).copy()
+        selected['rank'] = selected.groupby('date', sort=False).cumcount() + 1
+        return selected.reset_index(drop=True)
+
+    def simulate(self, selected: pd.DataFrame, rules) -> Dict[str, pd.DataFrame]:
+        """선정 종목 진입/청산 일괄 시뮬레이션"""
+        panel = self.panel
+        bar = selected['bar'].to_numpy(dtype=np.int64)
+        end = panel.end_of(bar)
+
+        # 다음날 시가 진입 (진입일 다음 일봉이 최소 1개 있어야 함)
+        entry_bar = bar + 1
+        tradable = entry_bar + 1 < end
+        selected, bar, end, entry_bar = selected[tradable], bar[tradable], end[tradable], entry_bar[tradable]
+
+        prev_close = panel.close[bar]
+        entry = panel.open[entry_bar]
+        gap_pct = (entry - prev_close) / prev_close * 100
+
+        skip = np.zeros(len(selected), dtype=bool)
+        if rules.max_gap_pct is not None:
+            skip = gap_pct >= rules.max_gap_pct
+        skipped = selected.loc[skip, ['date', 'code', 'score', 'rank', 'close']].assign(
+            gap_pct=np.round(gap_pct[skip], 2), reason='GAP_UP_SKIP')
+
+        shares = np.zeros(len(selected), dtype=np.int64)
+        ok = ~skip & (entry > 0)
+        shares[ok] = (self.allocation // entry[ok]).astype(np.int64)
+        ok &= shares > 0
+
+        selected, bar, end, entry_bar = selected[ok], bar[ok], end[ok], entry_bar[ok]
+        prev_close, entry, gap_pct, shares = prev_close[ok], entry[ok], gap_pct[ok], shares[ok]
+        atr = selected['atr'].to_numpy(dtype=np.float64)
+        target, stop, trigger = rules.levels(entry, atr)
+
+        # 보유일 1..H 위치를 모아서 판정
+        hold = np.arange(1, rules.time_stop_days + 1)
+        idx = entry_bar[:, None] + hold[None, :]
+        valid = idx < end[:, None]
+        idx = np.where(valid, idx, 0)
+        exits = evaluate_exits(
+            entry, target, stop,
+            panel.high[idx], panel.low[idx], panel.close[idx], valid,
+            trailing_trigger=trigger, early_exit_day=rules.early_exit_day,
+        )
+
+        hold_days = exits['hold_days']
+        exited = hold_days > 0
+        exit_bar = np.where(exited, entry_bar + hold_days, entry_bar)
+        exit_price = exits['exit_price']
+        invested = shares * entry
+
+        trades = pd.DataFrame({
+            'signal_date': selected['date'].to_numpy(),
+            'entry_date': panel.dates[entry_bar],
+            'exit_date': np.where(exited, panel.dates[exit_bar], np.datetime64('NaT')),
+            'code': selected['code'].to_numpy(),
+            'name': selected['code'].map(panel.names).fillna('').to_numpy(),
+            'score': selected['score'].to_numpy(),
+            'rank': selected['rank'].to_numpy(),
+            'prev_close': prev_close,
+            'entry_price': entry,
+            'gap_pct': np.round(gap_pct, 2),
+            'target_price': np.round(target, 2),
+            'stop_price': np.round(stop, 2),
+            'shares': shares,
+            'invested': invested,
+            'exit_price': exit_price,
+            'exit_reason': exits['exit_reason'],
+            'hold_days': hold_days,
+            'pnl': np.round(shares * exit_price - invested, 0),
+            'return_pct': np.round((exit_price - entry) / entry * 100, 2),
+        }, columns=TRADE_COLUMNS)
+        return {'trades': trades[exited].reset_index(drop=True), 'skipped': skipped.reset_index(drop=True)}
+
+    def run(self, adapter, start=None, end=None) -> BacktestResult:
+        """
+        어댑터 1개 백테스트
+
+        Args:
+            adapter: ScoreAdapter / StrategyAdapter (signals(), exit_rules, name)
+            start, end: 신호 날짜 범위
+        """
+        rules = adapter.exit_rules
+        config = {
+            'top_n': self.top_n,
+            'allocation': self.allocation,
+            'start': str(start) if start is not None else None,
+            'end': str(end) if end is not None else None,
+            'exit_rules': asdict(rules),
+        }
+        if hasattr(adapter, 'min_score'):
+            config['min_score'] = adapter.min_score
+
+        signals = adapter.signals(self.panel, start, end)
+        if signals.empty:
+            return BacktestResult(adapter.name, config=config)
+
+        out = self.simulate(self.select(signals), rules)
+        return BacktestResult(adapter.name, out['trades'], out['skipped'], config)
+
+    def run_many(self, adapters: Dict, start=None, end=None, verbose: bool = True) -> Dict[str, BacktestResult]:
+        """
+        여러 어댑터를 같은 패널로 실행 (가격/점수 시계열은 패널에서 재사용)
+
+        Returns:
+            {이름: BacktestResult}
+        """
+        results = {}
+        for name, adapter in adapters.items():
+            t0 = time.time()
+            results[name] = self.run(adapter, start, end)
+            if verbose:
+                s = results[name].summary()
+                print(f"    [{name}] {s['total_trades']}회, 승률 {s['win_rate']}%, "
+                      f"수익률 {s['return_pct']:+.2f}% ({time.time() - t0:.1f}s)")
+        return results
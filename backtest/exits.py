@@ -0,0 +1,163 @@
+"""
+청산 규칙 평가 (ATR 목표가/손절가, 본전 트레일링, 조기 청산, 시간 손절)
+
+backtest_swing_v6/v7/v8 의 일별 루프와 같은 순서로 판정하되
+N개 거래 × H일을 한 번에 배열 연산으로 평가한다.
+
+같은 날 판정 순서 (스윙 백테스트 기준):
+    1. 트레일링 활성화 (고가 >= 진입가 + ATR × trailing_start_atr → 손절가를 본전으로)
+    2. 목표가 도달 (고가 >= 목표가)            → TARGET_HIT, 목표가 청산
+    3. 손절가 이탈 (저가 <= 손절가)            → STOP_HIT / TRAILING_STOP, 손절가 청산
+    4. 조기 청산 (early_exit_day 이후 종가 < 진입가) → EARLY_EXIT, 종가 청산
+    5. 마지막 보유일                           → TIME_EXIT, 종가 청산
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+EXIT_TARGET = 'TARGET_HIT'
+EXIT_STOP = 'STOP_HIT'
+EXIT_TRAILING = 'TRAILING_STOP'
+EXIT_EARLY = 'EARLY_EXIT'
+EXIT_TIME = 'TIME_EXIT'
+
+EXIT_REASONS = (EXIT_TARGET, EXIT_STOP, EXIT_TRAILING, EXIT_EARLY, EXIT_TIME)
+
+
+@dataclass
+class ExitRules:
+    """청산 규칙 (BaseStrategy.exit_rules 와 같은 키)"""
+    target_atr_mult: float = 1.5
+    stop_atr_mult: float = 0.8
+    time_stop_days: int = 3
+    trailing_start_atr: Optional[float] = None  # None이면 트레일링 미사용
+    early_exit_day: Optional[int] = None        # N일차부터 종가 < 진입가 시 청산
+    max_gap_pct: Optional[float] = None         # 진입일 갭상승 이상이면 진입 생략
+
+    @classmethod
+    def from_dict(cls, rules: Dict, **overrides) -> "ExitRules":
+        """전략 설정(exit_rules dict) → ExitRules"""
+        params = {k: rules[k] for k in cls.__dataclass_fields__ if k in rules}
+        params.update(overrides)
+        return cls(**params)
+
+    def levels(self, entry: np.ndarray, atr: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """진입가/ATR → (목표가, 손절가, 트레일링 활성화 가격)"""
+        target = entry + atr * self.target_atr_mult
+        stop = entry - atr * self.stop_atr_mult
+        trigger = entry + atr * self.trailing_start_atr if self.trailing_start_atr is not None else None
+        return target, stop, trigger
+
+
+# 스윙 백테스트 스크립트 기본값
+SWING_V6_RULES = ExitRules(target_atr_mult=2.0, stop_atr_mult=1.0, time_stop_days=5, max_gap_pct=15.0)
+SWING_V7_RULES = ExitRules(target_atr_mult=1.5, stop_atr_mult=0.8, time_stop_days=3,
+                           trailing_start_atr=0.5, early_exit_day=2, max_gap_pct=10.0)
+
+
+def evaluate_exits(
+    entry: np.ndarray,
+    target: np.ndarray,
+    stop: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    valid: np.ndarray,
+    trailing_trigger: np.ndarray = None,
+    early_exit_day: int = None,
+) -> Dict[str, np.ndarray]:
+    """
+    N개 거래의 청산일/청산가/사유 일괄 판정
+
+    Args:
+        entry, target, stop: (N,) 진입가/목표가/손절가
+        high, low, close: (N, H) 진입 다음날부터 H일간 가격
+        valid: (N, H) 일봉 존재 여부 (앞에서부터 연속)
+        trailing_trigger: (N,) 본전 트레일링 활성화 가격 (None이면 미사용)
+        early_exit_day: 이 보유일부터 종가 < 진입가 시 청산 (None이면 미사용)
+
+    Returns:
+        {'hold_days': (N,) 1부터, 청산 없음은 0,
+         'exit_price': (N,) 청산 없음은 NaN,
+         'exit_reason': (N,) object, 청산 없음은 None}
+    """
+    n, h = high.shape
+    if h == 0:
+        return {
+            'hold_days': np.zeros(n, dtype=np.int64),
+            'exit_price': np.full(n, np.nan),
+            'exit_reason': np.full(n, None, dtype=object),
+        }
+    offsets = np.arange(1, h + 1)
+
+    if trailing_trigger is not None:
+        # 한 번 활성화되면 유지 → 누적 OR
+        active = np.logical_or.accumulate(valid & (high >= trailing_trigger[:, None]), axis=1)
+        stop_matrix = np.where(active, np.maximum(stop, entry)[:, None], stop[:, None])
+    else:
+        active = np.zeros((n, h), dtype=bool)
+        stop_matrix = np.broadcast_to(stop[:, None], (n, h))
+
+    hit_target = valid & (high >= target[:, None])
+    hit_stop = valid & (low <= stop_matrix)
+    if early_exit_day is not None:
+        hit_early = valid & (offsets >= early_exit_day)[None, :] & (close < entry[:, None])
+    else:
+        hit_early = np.zeros((n, h), dtype=bool)
+    last = valid.sum(axis=1)
+    hit_time = offsets[None, :] == last[:, None]
+
+    any_hit = hit_target | hit_stop | hit_early | hit_time
+    has_exit = any_hit.any(axis=1)
+    first = any_hit.argmax(axis=1)
+    rows = np.arange(n)
+
+    t, s, e = hit_target[rows, first], hit_stop[rows, first], hit_early[rows, first]
+    stop_reason = np.where(active[rows, first], EXIT_TRAILING, EXIT_STOP)
+    reason = np.where(t, EXIT_TARGET, np.where(s, stop_reason, np.where(e, EXIT_EARLY, EXIT_TIME))).astype(object)
+    price = np.where(t, target, np.where(s, stop_matrix[rows, first], close[rows, first]))
+
+    reason[~has_exit] = None
+    return {
+        'hold_days': np.where(has_exit, first + 1, 0),
+        'exit_price': np.where(has_exit, price, np.nan),
+        'exit_reason': reason,
+    }
+
+
+def evaluate_exit(
+    entry_price: float,
+    target_price: float,
+    stop_price: float,
+    high, low, close,
+    trailing_trigger: float = None,
+    early_exit_day: int = None,
+) -> Tuple[int, Optional[float], Optional[str]]:
+    """
+    단일 거래 청산 판정 (evaluate_exits 1건 버전)
+
+    Args:
+        high, low, close: 진입 다음날부터 최대 보유일까지의 가격 시퀀스
+
+    Returns:
+        (보유일, 청산가, 청산 사유) - 청산 없음은 (0, None, None)
+    """
+    high = np.asarray(high, dtype=np.float64)[None, :]
+    result = evaluate_exits(
+        np.array([entry_price], dtype=np.float64),
+        np.array([target_price], dtype=np.float64),
+        np.array([stop_price], dtype=np.float64),
+        high,
+        np.asarray(low, dtype=np.float64)[None, :],
+        np.asarray(close, dtype=np.float64)[None, :],
+        np.ones(high.shape, dtype=bool),
+        None if trailing_trigger is None else np.array([trailing_trigger], dtype=np.float64),
+        early_exit_day,
+    )
+    hold_days = int(result['hold_days'][0])
+    if hold_days == 0:
+        return 0, None, None
+    return hold_days, float(result['exit_price'][0]), result['exit_reason'][0]
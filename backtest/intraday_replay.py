@@ -0,0 +1,270 @@
+"""
+장중 스코어 스냅샷 리플레이 (intraday_scores CSV → 시간 × 종목 패널)
+
+구조:
+- 하루치 스냅샷(10분 간격 CSV)을 하나의 긴 테이블로 이어 붙이고 (_t: 시점, _c: 종목 위치)
+  숫자 컬럼은 필요할 때 (시점 × 종목) 배열로 펼친다
+- 직전 시점 값/미래 가격은 배열 [t-1, c], [t+k, c] 위치 조회로 한 번에 계산
+  (시점 쌍마다 merge 하지 않음)
+- Tier 1/2/3 판정은 종목 행 단위 조건을 그대로 옮긴 벡터 마스크
+  (`값 < 임계값 → 탈락` 비교라 NaN 은 통과하는 점까지 동일)
+
+사용법:
+    from backtest.intraday_replay import SnapshotReplay, load_replays, assign_tiers
+
+    replays = load_replays(files_by_date)             # 날짜별 CSV 병렬 로드
+    prepared = replays['20260128'].candidates('20260128')
+    prepared['tier'] = assign_tiers(prepared, tier_config)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+# 직전 시점 값을 붙일 컬럼
+PREV_COLUMNS = ['v2', 'v4', 'v5', 'v3.5', 'v9_prob', 'close', 'volume']
+
+# 미래 수익률 (스냅샷 10분 간격 기준 시점 오프셋)
+FORWARD_OFFSETS = {'10min': 1, '30min': 3, '60min': 6}
+
+VOLUME_SURGE_SIGNALS = ('VOLUME_EXPLOSION', 'VOLUME_SURGE_3X')
+PATTERN_SIGNALS = ('BB_SQUEEZE', 'VCP_PATTERN')
+
+
+# ============================================================================
+# 스냅샷 로드
+# ============================================================================
+def snapshot_time(filepath: Path) -> str:
+    """파일명에서 시간 추출 (20260128_0910.csv → '0910')"""
+    return Path(filepath).stem.split('_')[1]
+
+
+def snapshot_minutes(filepath: Path) -> int:
+    """파일명 시간을 분 단위로 (0900 → 540)"""
+    time_str = snapshot_time(filepath)
+    return int(time_str[:2]) * 60 + int(time_str[2:4])
+
+
+def load_snapshot(filepath: Path) -> pd.DataFrame:
+    """스냅샷 CSV 로드 (컬럼명 정규화: v3 → v3.5, amount → prev_amount, 누락 컬럼 0)"""
+    df = pd.read_csv(filepath)
+    df['code'] = df['code'].astype(str).str.zfill(6)
+
+    if 'v3' in df.columns and 'v3.5' not in df.columns:
+        df = df.rename(columns={'v3': 'v3.5'})
+    if 'amount' in df.columns and 'prev_amount' not in df.columns:
+        df = df.rename(columns={'amount': 'prev_amount'})
+    if 'marcap' in df.columns and 'prev_marcap' not in df.columns:
+        df = df.rename(columns={'marcap': 'prev_marcap'})
+
+    for col in ['v3.5', 'v8', 'v9_prob']:
+        if col not in df.columns:
+            df[col] = 0
+
+    return df
+
+
+# ============================================================================
+# 시그널 플래그 / Tier 마스크
+# ============================================================================
+def signal_flags(signals: pd.Series, keywords: Sequence[str]) -> pd.Series:
+    """signals 문자열에 키워드 포함 여부 (NaN → False)"""
+    text = signals.where(signals.notna(), '').astype(str)
+    flags = pd.Series(False, index=signals.index)
+    for kw in keywords:
+        flags |= text.str.contains(kw, regex=False)
+    return flags
+
+
+def add_signal_flags(frame: pd.DataFrame) -> pd.DataFrame:
+    """volume_surge / pattern 플래그 컬럼 추가"""
+    signals = frame['signals'] if 'signals' in frame.columns else pd.Series(np.nan, index=frame.index)
+    frame['volume_surge'] = signal_flags(signals, VOLUME_SURGE_SIGNALS)
+    frame['pattern'] = signal_flags(signals, PATTERN_SIGNALS)
+    return frame
+
+
+def _not_below(values: pd.Series, threshold) -> pd.Series:
+    """`값 < 임계값 → 탈락` (NaN 은 비교 결과가 False 라 통과)"""
+    return ~(values < threshold)
+
+
+def _buy_strength_ok(frame: pd.DataFrame, cfg: dict) -> pd.Series:
+    """체결강도 조건 (컬럼이 있을 때만, 0 이하는 데이터 없음으로 통과)"""
+    if 'buy_strength' not in frame.columns:
+        return pd.Series(True, index=frame.index)
+    strength = frame['buy_strength']
+    return ~((strength > 0) & (strength < cfg.get('buy_strength_min', 0)))
+
+
+def tier1_mask(frame: pd.DataFrame, cfg: dict) -> pd.Series:
+    """Tier 1: V2/ΔV2/거래량 급증 시그널/V4/추정 거래대금 (+체결강도)"""
+    return (
+        _not_below(frame['v2'], cfg.get('v2_min', 70))
+        & _not_below(frame['v2_delta'], cfg.get('v2_delta_min', 8))
+        & frame['volume_surge']
+        & _not_below(frame['v4'], cfg.get('v4_min', 50))
+        & _not_below(frame['close'] * frame['volume'], cfg.get('amount_min', 10_000_000_000))
+        & _buy_strength_ok(frame, cfg)
+    )
+
+
+def tier2_mask(frame: pd.DataFrame, cfg: dict) -> pd.Series:
+    """Tier 2: V2/ΔV2/거래량 배율, V3.5 또는 V5 (+체결강도)"""
+    weak = (frame['v3.5'] < cfg.get('v35_min', 40)) & (frame['v5'] < cfg.get('v5_min', 50))
+    return (
+        _not_below(frame['v2'], cfg.get('v2_min', 65))
+        & _not_below(frame['v2_delta'], cfg.get('v2_delta_min', 5))
+        & _not_below(frame['volume_ratio'], cfg.get('volume_ratio_min', 2.0))
+        & ~weak
+        & _buy_strength_ok(frame, cfg)
+    )
+
+
+def tier3_mask(frame: pd.DataFrame, cfg: dict) -> pd.Series:
+    """Tier 3: V2, 패턴 시그널 또는 V9"""
+    weak = ~frame['pattern'] & (frame['v9_prob'] < cfg.get('v9_min', 55))
+    return _not_below(frame['v2'], cfg.get('v2_min', 60)) & ~weak
+
+
+def assign_tiers(frame: pd.DataFrame, tier_config: dict, masks: dict = None) -> np.ndarray:
+    """
+    Tier 판정 (Tier 1 → 2 → 3 우선순위, 해당 없음은 '')
+
+    Args:
+        frame: v2_delta/volume_ratio/volume_surge/pattern 컬럼이 있는 후보 행
+        tier_config: {'tier1': {...}, 'tier2': {...}, 'tier3': {...}} (조건 dict)
+        masks: 미리 계산한 Tier 마스크 (스윕에서 재사용, 선택)
+    """
+    masks = masks or {}
+    builders = {'tier1': tier1_mask, 'tier2': tier2_mask, 'tier3': tier3_mask}
+    conditions = [
+        masks[tier] if tier in masks else builders[tier](frame, tier_config.get(tier, {}))
+        for tier in ('tier1', 'tier2', 'tier3')
+    ]
+    return np.select(conditions, ['tier1', 'tier2', 'tier3'], default='')
+
+
+# ============================================================================
+# 리플레이 패널
+# ============================================================================
+class SnapshotReplay:
+    """하루치 장중 스냅샷 패널 (시간 × 종목)"""
+
+    def __init__(self, frames: List[pd.DataFrame], times: List[str]):
+        """
+        Args:
+            frames: 시간순 스냅샷 DataFrame 목록 (code 컬럼 필수)
+            times: 스냅샷 시간 라벨 ('0910' 등, frames 와 같은 순서)
+        """
+        self.times = list(times)
+        frames = [df.assign(_t=t) for t, df in enumerate(frames) if df is not None]
+        if frames:
+            snapshots = pd.concat(frames, ignore_index=True)
+            # 한 스냅샷 안의 중복 종목은 첫 행만 사용
+            snapshots = snapshots.drop_duplicates(['_t', 'code'], keep='first').reset_index(drop=True)
+        else:
+            snapshots = pd.DataFrame(columns=['code', '_t'])
+        self.codes, positions = np.unique(snapshots['code'].to_numpy(dtype=str), return_inverse=True)
+        snapshots['_c'] = positions
+
+        self.snapshots = snapshots
+        self._t = snapshots['_t'].to_numpy(dtype=np.int64)
+        self._c = snapshots['_c'].to_numpy(dtype=np.int64)
+        self.present = np.zeros((len(self.times), len(self.codes)), dtype=bool)
+        self.present[self._t, self._c] = True
+        self._grids: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_files(cls, files: Sequence[Path], loader: Callable[[Path], pd.DataFrame] = load_snapshot) -> 'SnapshotReplay':
+        files = sorted(files, key=snapshot_minutes)
+        return cls([loader(f) for f in files], [snapshot_time(f) for f in files])
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def grid(self, column: str) -> np.ndarray:
+        """숫자 컬럼의 (시점 × 종목) 배열 (없는 종목/컬럼은 NaN)"""
+        if column not in self._grids:
+            values = np.full((len(self.times), len(self.codes)), np.nan)
+            if column in self.snapshots.columns:
+                values[self._t, self._c] = pd.to_numeric(self.snapshots[column], errors='coerce').to_numpy(dtype=float)
+            self._grids[column] = values
+        return self._grids[column]
+
+    def pairs(self, prev_columns: Sequence[str] = PREV_COLUMNS, t_min: int = 1, t_max: int = None) -> pd.DataFrame:
+        """
+        시점 t 의 행에 직전 시점(t-1) 값을 붙인 테이블 (연속 CSV 쌍 inner merge 와 동일)
+
+        Returns:
+            스냅샷 컬럼 + {col}_prev + _t, _c  (시점 순, 시점 안에서는 CSV 행 순서)
+        """
+        t_max = len(self.times) if t_max is None else t_max
+        keep = (self._t >= max(t_min, 1)) & (self._t < t_max)
+        keep[keep] = self.present[self._t[keep] - 1, self._c[keep]]
+
+        rows = self.snapshots[keep].reset_index(drop=True)
+        t, c = self._t[keep], self._c[keep]
+        for col in prev_columns:
+            rows[f'{col}_prev'] = self.grid(col)[t - 1, c]
+        return rows
+
+    def forward_return(self, rows: pd.DataFrame, offset: int) -> np.ndarray:
+        """offset 시점 뒤 종가 기준 수익률(%) (패널 범위 밖/해당 시점에 없으면 NaN)"""
+        t = rows['_t'].to_numpy(dtype=np.int64) + offset
+        c = rows['_c'].to_numpy(dtype=np.int64)
+        valid = t < len(self.times)
+        future = np.where(valid, self.grid('close')[np.minimum(t, len(self.times) - 1), c], np.nan)
+        entry = rows['close'].to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (future - entry) / entry * 100
+
+    def eod_return(self, rows: pd.DataFrame) -> np.ndarray:
+        """마지막 스냅샷 종가 기준 수익률(%)"""
+        c = rows['_c'].to_numpy(dtype=np.int64)
+        last = self.grid('close')[len(self.times) - 1, c]
+        entry = rows['close'].to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (last - entry) / entry * 100
+
+    def candidates(self, date_str: str = None) -> pd.DataFrame:
+        """
+        백테스트 후보 행 (임계값과 무관한 부분만 계산)
+
+        시점 1..N-2 (마지막 시점은 미래 데이터 필요) 에 v2_delta/volume_ratio,
+        시그널 플래그, 10분/30분/60분/장마감 수익률을 붙인다.
+        """
+        if len(self.times) < 3:
+            return pd.DataFrame()
+
+        rows = self.pairs(PREV_COLUMNS, t_min=1, t_max=len(self.times) - 1)
+        if rows.empty:
+            return pd.DataFrame()
+
+        rows['v2_delta'] = rows['v2'] - rows['v2_prev']
+        rows['volume_ratio'] = (rows['volume'] / rows['volume_prev']).replace([np.inf, -np.inf], 0).fillna(0)
+        rows['time'] = np.asarray(self.times, dtype=object)[rows['_t'].to_numpy(dtype=np.int64)]
+        for label, offset in FORWARD_OFFSETS.items():
+            rows[f'return_{label}'] = self.forward_return(rows, offset)
+        rows['return_eod'] = self.eod_return(rows)
+        add_signal_flags(rows)
+        if date_str is not None:
+            rows['date'] = date_str
+        return rows
+
+
+def load_replays(files_by_date: Dict[str, Sequence[Path]], loader: Callable[[Path], pd.DataFrame] = load_snapshot,
+                 max_workers: int = 8) -> Dict[str, SnapshotReplay]:
+    """날짜별 스냅샷 CSV 를 병렬로 읽어 리플레이 패널 생성"""
+    ordered = {date: sorted(files, key=snapshot_minutes) for date, files in sorted(files_by_date.items())}
+    all_files = [f for files in ordered.values() for f in files]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        loaded = dict(zip(all_files, executor.map(loader, all_files)))
+    return {
+        date: SnapshotReplay([loaded[f] for f in files], [snapshot_time(f) for f in files])
+        for date, files in ordered.items()
+    }
@@ -0,0 +1,209 @@
+"""
+백테스트용 가격 패널 (종목별 OHLCV 를 하나의 컬럼형 배열로 보관)
+
+구조:
+- 종목별 일봉을 코드 순서대로 이어 붙인 1차원 배열 (open/high/low/close/volume/dates)
+- ptr[c] ~ ptr[c+1] 구간이 c 번째 종목의 일봉 (종목마다 거래정지 등으로 날짜가 달라도 됨)
+- 진입/청산 평가는 "신호 일봉 + k" 위치를 한 번에 모아(gather) 벡터 연산
+
+데이터 로딩(load_price_panel)은 프로세스 안에서 캐시되어
+여러 엔진/전략 비교 시 한 번만 내려받는다.
+"""
+
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+# 스윙 백테스트 공통 종목 제외 키워드 (backtest_swing_v6/v7/v8 와 동일)
+EXCLUDE_KEYWORDS = [
+    '스팩', 'SPAC', '리츠', 'ETF', 'ETN', '인버스', '레버리지',
+    '합병', '정리매매', '관리종목', '투자주의', '투자경고', '투자위험',
+    '1호', '2호', '3호', '4호', '5호', '6호', '7호', '8호', '9호', '10호',
+]
+
+
+class PricePanel:
+    """종목별 OHLCV 컬럼형 패널"""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], info: pd.DataFrame = None):
+        """
+        Args:
+            frames: {종목코드: OHLCV DataFrame (DatetimeIndex 오름차순)}
+            info: 종목 정보 (Code, Name, Market 컬럼, 선택)
+        """
+        self.frames = {code: df for code, df in frames.items() if df is not None and not df.empty}
+        self.codes: List[str] = sorted(self.frames)
+        self._code_pos = {code: i for i, code in enumerate(self.codes)}
+
+        lengths = np.array([len(self.frames[c]) for c in self.codes], dtype=np.int64)
+        self.ptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+
+        def column(name):
+            if not self.codes:
+                return np.empty(0, dtype=np.float64)
+            return np.concatenate([self.frames[c][name].to_numpy(dtype=np.float64) for c in self.codes])
+
+        self.open = column('Open')
+        self.high = column('High')
+        self.low = column('Low')
+        self.close = column('Close')
+        self.volume = column('Volume')
+        self.dates = (np.concatenate([self.frames[c].index.to_numpy(dtype='datetime64[ns]') for c in self.codes])
+                      if self.codes else np.empty(0, dtype='datetime64[ns]'))
+        self.code_of = np.repeat(np.arange(len(self.codes)), lengths)
+
+        self.names: Dict[str, str] = {}
+        self.markets: Dict[str, str] = {}
+        if info is not None and not info.empty:
+            for row in info.itertuples(index=False):
+                code = str(getattr(row, 'Code'))
+                self.names[code] = getattr(row, 'Name', '')
+                self.markets[code] = getattr(row, 'Market', '')
+
+        self._atr: Optional[np.ndarray] = None
+        self._score_cache: Dict[Tuple, pd.DataFrame] = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def trading_days(self) -> pd.DatetimeIndex:
+        """전체 종목 거래일 합집합"""
+        return pd.DatetimeIndex(np.unique(self.dates))
+
+    def code_pos(self, code: str) -> int:
+        return self._code_pos[code]
+
+    def bar_index(self, codes: Iterable[str], dates: Iterable) -> np.ndarray:
+        """
+        (종목, 날짜) → 1차원 배열 위치 (해당 날짜 일봉이 없으면 -1)
+        """
+        codes = pd.Series(list(codes), dtype=object)
+        dates = pd.DatetimeIndex(list(dates)).to_numpy(dtype='datetime64[ns]')
+        out = np.full(len(codes), -1, dtype=np.int64)
+        for code, rows in codes.groupby(codes).groups.items():
+            pos = self._code_pos.get(code)
+            if pos is None:
+                continue
+            rows = np.asarray(rows)
+            lo, hi = self.ptr[pos], self.ptr[pos + 1]
+            seg = self.dates[lo:hi]
+            idx = np.searchsorted(seg, dates[rows])
+            found = (idx < len(seg)) & (seg[np.minimum(idx, len(seg) - 1)] == dates[rows])
+            out[rows[found]] = lo + idx[found]
+        return out
+
+    def end_of(self, bars: np.ndarray) -> np.ndarray:
+        """각 위치가 속한 종목 구간의 끝 (exclusive)"""
+        return self.ptr[self.code_of[bars] + 1]
+
+    @property
+    def atr(self) -> np.ndarray:
+        """ATR(14) 단순평균 (V7/V8 과 동일, 신호에 ATR 이 없는 전략용)"""
+        if self._atr is None:
+            prev_close = np.empty_like(self.close)
+            prev_close[1:] = self.close[:-1]
+            prev_close[self.ptr[:-1]] = np.nan  # 종목 첫 일봉은 전일 종가 없음
+            tr = np.fmax(self.high - self.low,
+                         np.fmax(np.abs(self.high - prev_close), np.abs(self.low - prev_close)))
+            atr = np.empty_like(tr)
+            for i in range(len(self.codes)):
+                lo, hi = self.ptr[i], self.ptr[i + 1]
+                atr[lo:hi] = pd.Series(tr[lo:hi]).rolling(14, min_periods=1).mean().to_numpy()
+            self._atr = atr
+        return self._atr
+
+    def score_series(self, version: str, code: str, start=None, end=None, **kwargs) -> pd.DataFrame:
+        """종목별 전 구간 점수 시계열 (같은 패널에서 재사용)"""
+        key = (version, code, str(start), str(end), tuple(sorted(kwargs.items())))
+        if key not in self._score_cache:
+            from scoring import calculate_score_series
+            self._score_cache[key] = calculate_score_series(
+                self.frames[code], version, start=start, end=end, **kwargs)
+        return self._score_cache[key]
+
+
+def load_stock_universe(
+    min_marcap: int = 30_000_000_000,
+    max_marcap: Optional[int] = 1_000_000_000_000,
+) -> pd.DataFrame:
+    """스윙 백테스트 공통 종목 리스트 (시총 필터 + 제외 키워드 + 보통주)"""
+    import FinanceDataReader as fdr
+
+    krx = fdr.StockListing("KRX")
+    df = krx[['Code', 'Name', 'Market', 'Marcap', 'Amount', 'Close']].copy()
+    df['Code'] = df['Code'].astype(str).str.zfill(6)
+
+    df = df[df['Marcap'] >= min_marcap]
+    if max_marcap:
+        df = df[df['Marcap'] <= max_marcap]
+
+    for kw in EXCLUDE_KEYWORDS:
+        df = df[~df['Name'].str.contains(kw, case=False, na=False)]
+
+    df = df[df['Code'].str[-1] == '0']
+    return df
+
+
+_panel_cache: Dict[Tuple, PricePanel] = {}
+
+
+def load_price_panel(
+    start_date: str,
+    end_date: str,
+    stocks: pd.DataFrame = None,
+    warmup_days: int = 400,
+    min_bars: int = 60,
+    max_workers: int = 10,
+) -> PricePanel:
+    """
+    종목 OHLCV 일괄 로딩 → PricePanel (같은 인자는 프로세스 안에서 재사용)
+
+    Args:
+        start_date, end_date: 백테스트 기간 (YYYY-MM-DD)
+        stocks: 종목 리스트 (None이면 load_stock_universe)
+        warmup_days: 지표 계산용 선행 기간 (일)
+        min_bars: 이보다 짧은 종목 제외
+        max_workers: 다운로드 병렬 수
+    """
+    import FinanceDataReader as fdr
+
+    if stocks is None:
+        stocks = load_stock_universe()
+
+    codes = tuple(stocks['Code'].tolist())
+    key = (codes, start_date, end_date, warmup_days, min_bars)
+    if key in _panel_cache:
+        return _panel_cache[key]
+
+    load_start = (datetime.strptime(start_date, "%Y-%m-%d") - timedelta(days=warmup_days)).strftime("%Y-%m-%d")
+    load_end = (datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=10)).strftime("%Y-%m-%d")
+
+    def load_single(code):
+        try:
+            df = fdr.DataReader(code, load_start, load_end)
+            if df is not None and not df.empty and len(df) >= min_bars:
+                return code, df[list(PRICE_COLUMNS)]
+        except Exception:
+            pass
+        return code, None
+
+    frames = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(load_single, code) for code in codes]
+        for done, future in enumerate(as_completed(futures), start=1):
+            code, df = future.result()
+            if df is not None:
+                frames[code] = df
+            if done % 100 == 0:
+                print(f"    → {done}/{len(codes)} 처리 ({len(frames)} 성공)")
+
+    panel = PricePanel(frames, stocks)
+    _panel_cache[key] = panel
+    return panel
@@ -0,0 +1,114 @@
+"""
+백테스트 결과 (전략/엔진 공통 형식)
+
+trades 컬럼:
+    signal_date, entry_date, exit_date, code, name, score, rank,
+    prev_close, entry_price, gap_pct, target_price, stop_price,
+    shares, invested, exit_price, exit_reason, hold_days, pnl, return_pct
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+from .exits import EXIT_REASONS
+
+
+TRADE_COLUMNS = [
+    'signal_date', 'entry_date', 'exit_date', 'code', 'name', 'score', 'rank',
+    'prev_close', 'entry_price', 'gap_pct', 'target_price', 'stop_price',
+    'shares', 'invested', 'exit_price', 'exit_reason', 'hold_days', 'pnl', 'return_pct',
+]
+
+
+@dataclass
+class BacktestResult:
+    """백테스트 1회 결과"""
+    name: str
+    trades: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=TRADE_COLUMNS))
+    skipped: pd.DataFrame = field(default_factory=pd.DataFrame)  # 갭상승 등으로 진입 생략
+    config: Dict = field(default_factory=dict)
+
+    def summary(self) -> Dict:
+        """요약 통계 (스윙 백테스트 JSON summary 와 같은 키 + 평균 홀딩일)"""
+        trades = self.trades
+        total = len(trades)
+        if total == 0:
+            return {'total_trades': 0, 'wins': 0, 'win_rate': 0, 'total_invested': 0,
+                    'total_pnl': 0, 'return_pct': 0, 'avg_hold_days': 0, 'skipped': len(self.skipped)}
+
+        wins = int((trades['pnl'] > 0).sum())
+        invested = float(trades['invested'].sum())
+        pnl = float(trades['pnl'].sum())
+        return {
+            'total_trades': total,
+            'wins': wins,
+            'win_rate': round(wins / total * 100, 1),
+            'total_invested': int(invested),
+            'total_pnl': int(pnl),
+            'return_pct': round(pnl / invested * 100, 2) if invested > 0 else 0,
+            'avg_hold_days': round(float(trades['hold_days'].mean()), 1),
+            'skipped': len(self.skipped),
+        }
+
+    def by_exit_reason(self) -> pd.DataFrame:
+        """청산 유형별 성과"""
+        rows = []
+        for reason in EXIT_REASONS:
+            part = self.trades[self.trades['exit_reason'] == reason]
+            if part.empty:
+                continue
+            rows.append({
+                'exit_reason': reason,
+                'trades': len(part),
+                'win_rate': round((part['pnl'] > 0).mean() * 100, 1),
+                'total_pnl': int(part['pnl'].sum()),
+                'avg_return_pct': round(float(part['return_pct'].mean()), 2),
+            })
+        return pd.DataFrame(rows, columns=['exit_reason', 'trades', 'win_rate', 'total_pnl', 'avg_return_pct'])
+
+    def daily(self) -> pd.DataFrame:
+        """스크리닝일별 거래 수/투자액/손익"""
+        if self.trades.empty:
+            return pd.DataFrame(columns=['signal_date', 'trades', 'invested', 'pnl', 'wins'])
+        grouped = self.trades.groupby('signal_date')
+        return pd.DataFrame({
+            'trades': grouped.size(),
+            'invested': grouped['invested'].sum(),
+            'pnl': grouped['pnl'].sum(),
+            'wins': grouped['pnl'].apply(lambda p: int((p > 0).sum())),
+        }).reset_index()
+
+    def to_dict(self, include_trades: bool = True) -> Dict:
+        data = {
+            'name': self.name,
+            'config': self.config,
+            'summary': self.summary(),
+            'by_exit_reason': self.by_exit_reason().to_dict('records'),
+        }
+        if include_trades:
+            trades = self.trades.copy()
+            for col in ('signal_date', 'entry_date', 'exit_date'):
+                if col in trades:
+                    trades[col] = pd.to_datetime(trades[col]).dt.strftime('%Y-%m-%d')
+            data['trades'] = json.loads(trades.to_json(orient='records', force_ascii=False))
+        return data
+
+    def save(self, path) -> Path:
+        """JSON 저장"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2, default=str)
+        return path
+
+
+def compare_results(results: Dict[str, BacktestResult]) -> pd.DataFrame:
+    """여러 결과 요약을 한 표로"""
+    rows: List[Dict] = []
+    for name, result in results.items():
+        rows.append({'name': name, **result.summary()})
+    return pd.DataFrame(rows).set_index('name') if rows else pd.DataFrame()
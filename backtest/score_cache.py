@@ -0,0 +1,354 @@
+"""
+백테스트용 점수 디스크 캐시 (스코어러 버전 해시 × 종목 × 날짜)
+
+- 같은 날짜 구간을 여러 백테스트가 반복 채점하지 않도록 점수 결과를 디스크에 보관
+- 키: (버전, 스코어러 소스 해시, 종목코드, 기준일, 입력 구간)
+  스코어러 모듈 + 같은 패키지에서 (간접적으로) import 하는 모듈 + 그 패키지의 YAML 설정이
+  바뀌면 해시가 바뀌어 자동 무효화
+- 저장: {root}/{버전}-{해시}/{기준일}.parquet (날짜별 컬럼형 파티션: code, window, score, signals, result)
+  pyarrow/fastparquet 이 없으면 같은 구조의 pickle 로 저장
+- 기준일 = 스코어러에 넘긴 DataFrame 의 마지막 일봉 날짜
+- 입력 구간 = 시작일-봉 수-OHLCV 해시 (점수는 전체 입력 구간에 따라 달라지므로
+  조회 기간이 다른 스크립트끼리는 공유하지 않음)
+- 장 마감 전 오늘 봉(형성 중)으로 계산한 점수는 저장하지 않음
+- 적중/미적중 모두 JSON 왕복한 결과를 반환 (numpy 값 → float, 튜플 → 리스트 등 타입이 항상 같음)
+- 스크립트 안의 스코어러는 함수 소스만 해시 - 함수가 호출하는 스크립트 내 헬퍼를 고치면
+  자동 무효화되지 않으므로 버전 이름을 바꿔야 함 (예: 'bt1y_technical' → 'bt1y_technical.2')
+
+사용법:
+    from backtest.score_cache import get_score_cache
+
+    cache = get_score_cache()
+    score_v2 = cache.cached_scorer('v2', calculate_score_v2)
+    result = score_v2(df, code)      # 캐시에 있으면 재계산 없음
+    cache.flush()                    # 새로 계산한 점수 저장
+"""
+
+import ast
+import hashlib
+import importlib.util
+import inspect
+import json
+import shutil
+import sys
+import threading
+import types
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / "output" / "score_cache"
+
+_HAS_PARQUET = any(importlib.util.find_spec(m) is not None for m in ('pyarrow', 'fastparquet'))
+PARTITION_SUFFIX = '.parquet' if _HAS_PARQUET else '.pkl'
+
+PARTITION_COLUMNS = ['code', 'window', 'score', 'signals', 'result']
+
+# 키 구성/파티션 형식이 바뀌면 올림 (기존 캐시 디렉토리 무효화)
+KEY_FORMAT = b'window-v2'
+
+WINDOW_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+CONFIG_PATTERNS = ('*.yaml', '*.yml')
+
+_hash_cache: Dict[Tuple, str] = {}
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def _module_path(name: str) -> Optional[str]:
+    mod = sys.modules.get(name)
+    if mod is not None:
+        return getattr(mod, '__file__', None)
+    try:
+        return getattr(importlib.util.find_spec(name), 'origin', None)
+    except (ImportError, AttributeError, ValueError):
+        return None  # 모듈이 아닌 이름 (from .x import 함수)
+
+
+def _imported_names(path: str, package: str, top: str) -> set:
+    """파일의 import 문 중 최상위 패키지(top) 안의 모듈 이름"""
+    names = set()
+    for node in ast.walk(ast.parse(Path(path).read_text(encoding='utf-8'))):
+        if isinstance(node, ast.ImportFrom):
+            base = importlib.util.resolve_name('.' * node.level + (node.module or ''), package) \
+                if node.level else node.module
+            if base and base.split('.')[0] == top:
+                names.add(base)
+                # from .pkg import submodule
+                names.update(f"{base}.{alias.name}" for alias in node.names)
+        elif isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names if alias.name.split('.')[0] == top)
+    return names
+
+
+def _dependency_files(module: types.ModuleType) -> list:
+    """
+    모듈 + 같은 최상위 패키지에서 (간접적으로) import 하는 모듈 파일 + 그 디렉토리의 YAML 설정
+
+    최상위 패키지 __init__ (전 버전 re-export) 은 따라가지 않는다.
+    """
+    top = module.__name__.split('.')[0]
+    files = set()
+    visited = set()
+    queue = [module.__name__]
+    while queue:
+        name = queue.pop()
+        if name in visited:
+            continue
+        visited.add(name)
+        path = _module_path(name)
+        if not path or not path.endswith('.py'):
+            continue
+        is_package = path.endswith('__init__.py')
+        if is_package and name == top:
+            continue
+        files.add(path)
+        queue.extend(_imported_names(path, name if is_package else name.rpartition('.')[0], top))
+
+    for directory in {Path(p).parent for p in files}:
+        for pattern in CONFIG_PATTERNS:
+            files.update(str(p) for p in directory.glob(pattern))
+    return sorted(files)
+
+
+def scorer_hash(func: Callable) -> str:
+    """
+    스코어러 소스 해시 (12자리)
+
+    패키지 모듈 함수(scoring.*)는 모듈 파일과 같은 패키지 의존 모듈 파일(간접 의존 포함) + YAML 설정,
+    스크립트 안의 함수/메서드는 함수 소스 기준.
+
+    주의: 스크립트 함수는 자기 소스만 보므로 그 함수가 호출하는 헬퍼(같은 스크립트의 다른 함수,
+    패키지 밖 모듈)를 고쳐도 해시가 그대로다 → 이전 점수가 계속 적중한다.
+    이런 변경 후에는 get_or_compute/cached_scorer 에 넘기는 version 을 바꿔 새 네임스페이스를 쓸 것.
+    """
+    func = getattr(func, '__func__', func)
+    module = inspect.getmodule(func)
+    key = (getattr(module, '__name__', None), getattr(func, '__qualname__', repr(func)))
+    if key in _hash_cache:
+        return _hash_cache[key]
+
+    digest = hashlib.sha1(KEY_FORMAT)
+    if module is not None and '.' in module.__name__:
+        for path in _dependency_files(module):
+            digest.update(Path(path).read_bytes())
+    else:
+        digest.update(inspect.getsource(func).encode('utf-8'))
+
+    _hash_cache[key] = digest.hexdigest()[:12]
+    return _hash_cache[key]
+
+
+class ScoreCache:
+    """날짜 파티션 단위 점수 디스크 캐시 (스레드 안전)"""
+
+    def __init__(self, root: Path = None):
+        self.root = Path(root) if root else DEFAULT_CACHE_DIR
+        self._lock = threading.RLock()
+        self._partitions: Dict[Tuple[str, str], Dict[Tuple, Tuple]] = {}   # (네임스페이스, 날짜) → {(code, window): 행}
+        self._dirty: Dict[Tuple[str, str], Dict[Tuple, Tuple]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # ---------- 키 ----------
+
+    @staticmethod
+    def namespace(version: str, func: Callable) -> str:
+        return f"{version}-{scorer_hash(func)}"
+
+    @staticmethod
+    def date_key(date) -> str:
+        return pd.Timestamp(date).strftime('%Y-%m-%d')
+
+    @staticmethod
+    def window_key(df: pd.DataFrame) -> str:
+        """입력 구간: 시작일-봉 수-OHLCV 해시 (기준일이 같아도 조회 기간/데이터가 다르면 다른 키)"""
+        columns = [c for c in WINDOW_COLUMNS if c in df.columns]
+        hashed = pd.util.hash_pandas_object(df[columns], index=True).to_numpy()
+        digest = hashlib.sha1(hashed.tobytes()).hexdigest()[:12]
+        return f"{pd.Timestamp(df.index[0]).strftime('%Y%m%d')}-{len(df)}-{digest}"
+
+    @staticmethod
+    def is_forming(date) -> bool:
+        """오늘 봉이고 아직 장 마감 전 (점수가 장중에 바뀜 → 저장하지 않음)"""
+        from scoring.cycle import MARKET_CLOSE
+
+        now = datetime.now()
+        return pd.Timestamp(date).normalize() >= pd.Timestamp(now.date()) and now.time() < MARKET_CLOSE
+
+    def _path(self, namespace: str, date: str) -> Path:
+        return self.root / namespace / f"{date}{PARTITION_SUFFIX}"
+
+    # ---------- 파티션 입출력 ----------
+
+    def _read(self, path: Path) -> pd.DataFrame:
+        return pd.read_parquet(path) if _HAS_PARQUET else pd.read_pickle(path)
+
+    def _write(self, frame: pd.DataFrame, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + '.tmp')
+        if _HAS_PARQUET:
+            frame.to_parquet(tmp, index=False)
+        else:
+            frame.to_pickle(tmp)
+        tmp.replace(path)
+
+    def _partition(self, namespace: str, date: str) -> Dict[Tuple, Tuple]:
+        key = (namespace, date)
+        part = self._partitions.get(key)
+        if part is None:
+            part = {}
+            path = self._path(namespace, date)
+            if path.exists():
+                try:
+                    frame = self._read(path)
+                    part = {(row[0], row[1]): tuple(row[2:])
+                            for row in frame[PARTITION_COLUMNS].itertuples(index=False)}
+                except Exception:
+                    part = {}  # 손상된 파티션은 다시 채움
+            self._partitions[key] = part
+        return part
+
+    # ---------- 조회/저장 ----------
+
+    def lookup(self, namespace: str, code: str, df: pd.DataFrame) -> Tuple[bool, Optional[Dict]]:
+        """
+        Args:
+            df: 스코어러 입력 (마지막 일봉 날짜 + 입력 구간이 키)
+
+        Returns:
+            (적중 여부, 점수 결과 dict 또는 None)  — 스코어러가 None 을 돌려준 경우도 적중으로 저장됨
+        """
+        date = self.date_key(df.index[-1])
+        window = self.window_key(df)
+        with self._lock:
+            row = self._partition(namespace, date).get((code, window))
+            if row is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+        payload = row[2]
+        return True, (json.loads(payload) if payload else None)
+
+    @staticmethod
+    def _encode(result: Optional[Dict]) -> Tuple:
+        """결과 → 파티션 행 (score, signals, JSON)"""
+        if result is None:
+            return (np.nan, '', '')
+        return (
+            float(result.get('score', np.nan)),
+            ','.join(result.get('signals') or []),
+            json.dumps(result, ensure_ascii=False, default=_json_default),
+        )
+
+    def store(self, namespace: str, code: str, df: pd.DataFrame, result: Optional[Dict]) -> Optional[Dict]:
+        """
+        Returns:
+            저장된 형태의 결과 (JSON 왕복 - 이후 적중 시 돌려줄 값과 같음)
+        """
+        date = self.date_key(df.index[-1])
+        window = self.window_key(df)
+        row = self._encode(result)
+        with self._lock:
+            self._partition(namespace, date)[(code, window)] = row
+            self._dirty.setdefault((namespace, date), {})[(code, window)] = row
+        return json.loads(row[2]) if row[2] else None
+
+    def get_or_compute(self, version: str, func: Callable, code: str, df: pd.DataFrame,
+                       compute: Callable[[], Optional[Dict]] = None) -> Optional[Dict]:
+        """
+        캐시 조회 후 없으면 계산하여 저장
+
+        Args:
+            version: 스코어러 버전 이름 ('v2', 'bt1y_technical' 등)
+            func: 스코어러 (해시 기준)
+            code: 종목코드
+            df: 기준일까지의 OHLCV (마지막 일봉 날짜가 기준일, 전체 구간이 키)
+            compute: 실제 계산 (None이면 func(df))
+
+        Returns:
+            JSON 왕복한 점수 결과 (적중/미적중/저장 안 하는 형성 중 봉 모두 같은 타입)
+        """
+        namespace = self.namespace(version, func)
+        if self.is_forming(df.index[-1]):
+            payload = self._encode(compute() if compute is not None else func(df))[2]
+            return json.loads(payload) if payload else None
+        hit, result = self.lookup(namespace, code, df)
+        if hit:
+            return result
+        result = compute() if compute is not None else func(df)
+        return self.store(namespace, code, df, result)
+
+    def cached_scorer(self, version: str, func: Callable) -> Callable[[pd.DataFrame, str], Optional[Dict]]:
+        """func(df) 를 (df, code) 캐시 버전으로 감싼 함수"""
+        def scorer(df: pd.DataFrame, code: str) -> Optional[Dict]:
+            return self.get_or_compute(version, func, code, df)
+        scorer.__name__ = getattr(func, '__name__', 'scorer')
+        return scorer
+
+    def flush(self) -> int:
+        """새로 계산된 점수를 날짜 파티션에 병합 저장. 저장한 행 수 반환"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            written = 0
+            for (namespace, date), rows in dirty.items():
+                part = self._partitions.get((namespace, date), rows)
+                frame = pd.DataFrame(
+                    [(code, window, *row) for (code, window), row in part.items()],
+                    columns=PARTITION_COLUMNS,
+                )
+                self._write(frame, self._path(namespace, date))
+                written += len(rows)
+            return written
+
+    def release(self, date=None):
+        """메모리의 파티션 해제 (저장하지 않은 점수는 먼저 flush)"""
+        self.flush()
+        with self._lock:
+            if date is None:
+                self._partitions.clear()
+            else:
+                date = self.date_key(date)
+                for key in [k for k in self._partitions if k[1] == date]:
+                    del self._partitions[key]
+
+    def prune(self, version: str, func: Callable) -> int:
+        """현재 해시가 아닌 같은 버전의 캐시 디렉토리 삭제. 삭제한 디렉토리 수 반환"""
+        current = self.namespace(version, func)
+        removed = 0
+        if self.root.exists():
+            for path in self.root.glob(f"{version}-*"):
+                if path.is_dir() and path.name != current:
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed += 1
+        return removed
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total * 100, 1) if total else 0.0,
+        }
+
+
+_score_cache: Optional[ScoreCache] = None
+
+
+def get_score_cache() -> ScoreCache:
+    """프로세스 공용 ScoreCache"""
+    global _score_cache
+    if _score_cache is None:
+        _score_cache = ScoreCache()
+    return _score_cache
@@ -0,0 +1,177 @@
+"""
+백테스트 전략 어댑터
+
+어댑터는 패널 전체 기간의 진입 신호를 한 번에 만든다.
+    signals(panel, start, end) -> DataFrame
+        date, code, score, atr, priority (+ 전략별 부가 컬럼)
+
+- ScoreAdapter: scoring 엔진 점수 (calculate_score_series) 기준 진입
+- StrategyAdapter: trading/strategies 의 BaseStrategy (filter_candidates/evaluate) 기준 진입
+
+청산 규칙(exit_rules)도 어댑터가 가진다.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .exits import ExitRules, SWING_V6_RULES, SWING_V7_RULES
+
+
+SIGNAL_COLUMNS = ['date', 'code', 'score', 'atr', 'priority']
+
+
+def _empty_signals() -> pd.DataFrame:
+    return pd.DataFrame(columns=SIGNAL_COLUMNS)
+
+
+def _score_rows(panel, version: str, code: str, start, end, min_score: float) -> Optional[pd.DataFrame]:
+    """종목 1개의 점수 시계열 중 min_score 이상인 날짜"""
+    series = panel.score_series(version, code, start=start, end=end)
+    series = series[series['score'] >= min_score]
+    if series.empty:
+        return None
+    rows = pd.DataFrame({
+        'date': series.index,
+        'code': code,
+        'score': series['score'].to_numpy(),
+        'result': series['result'].to_numpy(),
+    })
+    return rows
+
+
+def _fill_atr(panel, signals: pd.DataFrame) -> pd.DataFrame:
+    """점수 결과에 ATR 이 없으면 패널 ATR(14) 사용"""
+    atr = signals['result'].map(lambda r: (r.get('exit_strategy') or {}).get('atr') if r else None)
+    missing = atr.isna().to_numpy()
+    if missing.any():
+        bars = panel.bar_index(signals.loc[missing, 'code'], signals.loc[missing, 'date'])
+        atr = atr.to_numpy(dtype=float, copy=True)
+        atr[missing] = np.where(bars >= 0, panel.atr[np.maximum(bars, 0)], np.nan)
+    signals['atr'] = np.asarray(atr, dtype=float)
+    return signals
+
+
+class ScoreAdapter:
+    """scoring 엔진 점수 기준 진입 (backtest_swing_v6/v7/v8 과 동일한 선정 방식)"""
+
+    def __init__(
+        self,
+        version: str,
+        min_score: float,
+        exit_rules: ExitRules = None,
+        result_filter: Callable[[Dict], bool] = None,
+        name: str = None,
+    ):
+        """
+        Args:
+            version: scoring 버전 ('v6', 'v7', ...)
+            min_score: 진입 최소 점수
+            exit_rules: 청산 규칙 (None이면 기본 ExitRules)
+            result_filter: 점수 결과 dict → 진입 여부 (추가 조건, 선택)
+            name: 결과 표시 이름 (None이면 version)
+        """
+        self.version = version
+        self.min_score = min_score
+        self.exit_rules = exit_rules or ExitRules()
+        self.result_filter = result_filter
+        self.name = name or version
+
+    def signals(self, panel, start=None, end=None) -> pd.DataFrame:
+        frames = []
+        for code in panel.codes:
+            rows = _score_rows(panel, self.version, code, start, end, self.min_score)
+            if rows is not None:
+                frames.append(rows)
+        if not frames:
+            return _empty_signals()
+
+        signals = pd.concat(frames, ignore_index=True)
+        keep = signals['result'].map(lambda r: not r.get('disqualified'))
+        if self.result_filter is not None:
+            keep &= signals['result'].map(self.result_filter)
+        signals = signals[keep.astype(bool)].reset_index(drop=True)
+        signals['priority'] = signals['score']
+        return _fill_atr(panel, signals)
+
+
+class StrategyAdapter:
+    """trading/strategies 의 BaseStrategy 기준 진입 (장중 매매 전략의 일봉 백테스트)"""
+
+    def __init__(self, strategy, exit_rules: ExitRules = None, name: str = None, context: Dict = None):
+        """
+        Args:
+            strategy: BaseStrategy 인스턴스 (StrategyV2Trend, StrategyV8Bounce 등)
+            exit_rules: 청산 규칙 (None이면 strategy.exit_rules 로 구성)
+            name: 결과 표시 이름 (None이면 strategy.NAME)
+            context: get_entry_signals 에 넘길 시장 컨텍스트
+        """
+        self.strategy = strategy
+        self.version = strategy.SCORE_COLUMN
+        self.exit_rules = exit_rules or self._exit_rules_from(strategy)
+        self.name = name or strategy.NAME
+        self.context = context
+
+    @staticmethod
+    def _exit_rules_from(strategy) -> ExitRules:
+        rules = dict(strategy.exit_rules)
+        # 전략이 트레일링을 끄는 경우 (V8: get_exit_params 의 use_trailing=False)
+        if strategy.get_exit_params(1, 1).get('use_trailing', True) is False:
+            rules.pop('trailing_start_atr', None)
+        return ExitRules.from_dict(rules)
+
+    def _score_frame(self, panel, start, end) -> pd.DataFrame:
+        """스코어 CSV 와 같은 형식의 날짜×종목 행 (code, name, close, vN, signals, change_pct, prev_amount)"""
+        frames = []
+        for code in panel.codes:
+            rows = _score_rows(panel, self.version, code, start, end, self.strategy.score_threshold)
+            if rows is not None:
+                frames.append(rows)
+        if not frames:
+            return pd.DataFrame()
+
+        rows = pd.concat(frames, ignore_index=True)
+        bars = panel.bar_index(rows['code'], rows['date'])
+        prev_close = np.where(np.isin(bars, panel.ptr[:-1]), np.nan, panel.close[np.maximum(bars - 1, 0)])
+        rows['name'] = rows['code'].map(panel.names).fillna('')
+        rows['close'] = panel.close[bars]
+        rows['change_pct'] = (rows['close'] / prev_close - 1) * 100
+        rows['prev_amount'] = rows['close'] * panel.volume[bars]
+        rows[self.version] = rows['score']
+        rows['signals'] = rows['result'].map(lambda r: ','.join(r.get('signals') or []))
+        return rows
+
+    def signals(self, panel, start=None, end=None) -> pd.DataFrame:
+        rows = self._score_frame(panel, start, end)
+        if rows.empty:
+            return _empty_signals()
+
+        out: List[Dict] = []
+        for date, day in rows.groupby('date', sort=True):
+            context = dict(self.context) if self.context else None
+            picks = self.strategy.get_entry_signals(day, context)
+            for rank, pick in enumerate(picks):
+                out.append({
+                    'date': date,
+                    'code': pick['code'],
+                    'score': pick.get('score', 0),
+                    'confidence': pick.get('confidence', 0),
+                    'priority': len(picks) - rank,  # 전략이 정한 순서 유지
+                })
+        if not out:
+            return _empty_signals()
+
+        signals = pd.DataFrame(out)
+        signals = signals.merge(rows[['date', 'code', 'result']], on=['date', 'code'], how='left')
+        return _fill_atr(panel, signals)
+
+
+def swing_adapters(versions=('v6', 'v7', 'v8')) -> Dict[str, ScoreAdapter]:
+    """backtest_swing_v6/v7/v8 기본 설정 어댑터"""
+    presets = {
+        'v6': lambda: ScoreAdapter('v6', 75, SWING_V6_RULES),
+        'v7': lambda: ScoreAdapter('v7', 60, SWING_V7_RULES),
+        'v8': lambda: ScoreAdapter('v8', 45, SWING_V7_RULES),
+    }
+    return {v: presets[v]() for v in versions}
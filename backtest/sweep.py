@@ -0,0 +1,254 @@
+"""
+파라미터 스윕 (임계값/ATR 배수 등 그리드 탐색) 병렬 실행기
+
+- 데이터는 부모 프로세스에서 1번만 로드 → 워커 초기화 시 전달
+  (Linux fork 에서는 복사 없이 공유 페이지로 상속)
+- 그리드 포인트를 프로세스 풀로 분산, group_by 파라미터가 같은 포인트는 같은 작업으로 묶어
+  워커 캐시(memoize)에 저장된 중간 결과(종목별 신호 시계열 등)를 재사용
+- 완료된 포인트는 체크포인트(JSONL)에 즉시 추가 → 중단 후 재실행 시 이어서 진행
+- 체크포인트 첫 줄에 입력 지문(fingerprint: 모델/데이터 파일 크기·수정 시각 등)을 기록,
+  입력이 바뀌었으면 이전 결과를 버리고 새로 시작
+
+사용법:
+    from backtest.sweep import SweepRunner, memoize
+
+    def evaluate(params, data):
+        signals = memoize(('signals', params['v2_min']), lambda: build_signals(data, params['v2_min']))
+        return {'win_rate': ..., 'avg_return': ...}
+
+    runner = SweepRunner(evaluate, {'v2_min': [60, 65, 70], 'atr_mult': [1.0, 1.5]},
+                         shared=data, checkpoint='output/sweeps/v2.jsonl', group_by=['v2_min'],
+                         fingerprint=file_fingerprint(csv_files))
+    table = runner.run()
+"""
+
+import hashlib
+import itertools
+import json
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+
+# ---------- 워커 상태 ----------
+
+_worker_evaluate: Optional[Callable] = None
+_worker_shared: Any = None
+_worker_cache: Dict = {}
+
+
+def _init_worker(evaluate: Callable, shared: Any):
+    global _worker_evaluate, _worker_shared, _worker_cache
+    _worker_evaluate = evaluate
+    _worker_shared = shared
+    _worker_cache = {}
+
+
+def memoize(key, compute: Callable[[], Any]):
+    """
+    워커(프로세스) 단위 캐시
+
+    여러 그리드 포인트가 공유하는 중간 결과를 한 번만 계산한다.
+    (같은 group_by 값의 포인트는 같은 워커에서 연속 실행됨)
+    """
+    if key not in _worker_cache:
+        _worker_cache[key] = compute()
+    return _worker_cache[key]
+
+
+def _evaluate_chunk(chunk: List[Dict]) -> List[Dict]:
+    """그리드 포인트 묶음 평가 (워커에서 실행)"""
+    rows = []
+    for params in chunk:
+        t0 = time.time()
+        try:
+            metrics = _worker_evaluate(params, _worker_shared) or {}
+            error = None
+        except Exception as e:
+            metrics, error = {}, f"{type(e).__name__}: {e}"
+        rows.append({**params, **metrics, '_key': _point_key(params), '_error': error,
+                     '_elapsed': round(time.time() - t0, 3)})
+    return rows
+
+
+# ---------- 그리드 ----------
+
+def expand_grid(grid: Dict[str, Sequence]) -> List[Dict]:
+    """{'a': [1, 2], 'b': [x]} → [{'a': 1, 'b': x}, {'a': 2, 'b': x}]"""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def _point_key(params: Dict) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def file_fingerprint(paths: Iterable) -> str:
+    """입력 파일 지문 (경로 + 크기 + 수정 시각, 파일 내용은 읽지 않음)"""
+    digest = hashlib.sha1()
+    for path in sorted(Path(p) for p in paths):
+        try:
+            stat = path.stat()
+            digest.update(f"{path}|{stat.st_size}|{stat.st_mtime_ns}\n".encode('utf-8'))
+        except OSError:
+            digest.update(f"{path}|missing\n".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class SweepRunner:
+    """그리드 탐색 병렬 실행 + 체크포인트"""
+
+    def __init__(
+        self,
+        evaluate: Callable[[Dict, Any], Dict],
+        grid,
+        shared: Any = None,
+        checkpoint=None,
+        max_workers: int = None,
+        group_by: Iterable[str] = None,
+        fingerprint: str = None,
+    ):
+        """
+        Args:
+            evaluate: (params, shared) -> 지표 dict (모듈 최상위 함수여야 함, 프로세스 풀에 전달)
+            grid: {파라미터: 값 목록} 또는 파라미터 dict 목록
+            shared: 모든 포인트가 공유하는 데이터 (한 번 로드한 가격/스코어 등)
+            checkpoint: 체크포인트 JSONL 경로 (완료된 포인트는 건너뜀, 결과표는 같은 이름의 .csv)
+            max_workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 순차 실행)
+            group_by: 같은 작업으로 묶을 파라미터 (memoize 재사용 단위)
+            fingerprint: 입력 지문 (체크포인트의 지문과 다르면 체크포인트 폐기)
+        """
+        self.evaluate = evaluate
+        self.points = expand_grid(grid) if isinstance(grid, dict) else [dict(p) for p in grid]
+        self.shared = shared
+        self.checkpoint = Path(checkpoint) if checkpoint else None
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.group_by = list(group_by or [])
+        self.fingerprint = fingerprint
+
+    # ---------- 체크포인트 ----------
+
+    def _load_checkpoint(self) -> pd.DataFrame:
+        if self.checkpoint is None or not self.checkpoint.exists():
+            return pd.DataFrame()
+        rows, header = [], {}
+        with open(self.checkpoint, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 중단 시 마지막 줄이 잘린 경우
+                if '_fingerprint' in row:
+                    header = row
+                else:
+                    rows.append(row)
+        if self.fingerprint is not None and header.get('_fingerprint') != self.fingerprint:
+            print("    체크포인트 입력 변경 (모델/데이터) - 이전 결과 폐기")
+            self.checkpoint.unlink()
+            return pd.DataFrame()
+        return pd.DataFrame(rows)
+
+    def _done_keys(self, done: pd.DataFrame) -> set:
+        if done.empty or '_key' not in done.columns:
+            return set()
+        return set(done.loc[done['_error'].isna(), '_key'])
+
+    def _append(self, rows: List[Dict]):
+        if self.checkpoint is None or not rows:
+            return
+        self.checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        new_file = not self.checkpoint.exists()
+        with open(self.checkpoint, 'a', encoding='utf-8') as f:
+            if new_file and self.fingerprint is not None:
+                f.write(json.dumps({'_fingerprint': self.fingerprint}) + "\n")
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+
+    # ---------- 실행 ----------
+
+    def _chunks(self, points: List[Dict]) -> List[List[Dict]]:
+        if not self.group_by:
+            return [[p] for p in points]
+        groups: Dict[str, List[Dict]] = {}
+        for p in points:
+            groups.setdefault(_point_key({k: p.get(k) for k in self.group_by}), []).append(p)
+        return list(groups.values())
+
+    def run(self, resume: bool = True, sort_by: str = None, ascending: bool = False) -> pd.DataFrame:
+        """
+        스윕 실행
+
+        Args:
+            resume: 체크포인트의 완료 포인트 건너뛰기 (False면 체크포인트 새로 작성)
+            sort_by: 결과 정렬 기준 지표
+            ascending: 정렬 방향
+
+        Returns:
+            파라미터 + 지표 DataFrame (체크포인트 결과 포함)
+        """
+        if not resume and self.checkpoint is not None and self.checkpoint.exists():
+            self.checkpoint.unlink()
+
+        done = self._load_checkpoint()
+        done_keys = self._done_keys(done)
+        todo = [p for p in self.points if _point_key(p) not in done_keys]
+        if done_keys:
+            print(f"    체크포인트: {len(self.points) - len(todo)}/{len(self.points)} 완료, {len(todo)}개 남음")
+
+        rows: List[Dict] = []
+        chunks = self._chunks(todo)
+        finished = 0
+
+        def collect(chunk_rows):
+            nonlocal finished
+            rows.extend(chunk_rows)
+            self._append(chunk_rows)
+            finished += len(chunk_rows)
+            print(f"\r    스윕 {finished}/{len(todo)}", end="", flush=True)
+
+        if chunks and (self.max_workers <= 1 or len(chunks) == 1):
+            _init_worker(self.evaluate, self.shared)
+            for chunk in chunks:
+                collect(_evaluate_chunk(chunk))
+        elif chunks:
+            ctx = mp.get_context('fork') if 'fork' in mp.get_all_start_methods() else None
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(chunks)), mp_context=ctx,
+                                     initializer=_init_worker, initargs=(self.evaluate, self.shared)) as pool:
+                futures = [pool.submit(_evaluate_chunk, chunk) for chunk in chunks]
+                for future in as_completed(futures):
+                    collect(future.result())
+        if todo:
+            print()
+
+        table = pd.DataFrame(rows)
+        if not done.empty:
+            table = pd.concat([done[done['_key'].isin(done_keys)], table], ignore_index=True)
+        if not table.empty:
+            # 현재 그리드 포인트만, 그리드 순서대로 (동점이면 앞 포인트가 best)
+            order = {_point_key(p): i for i, p in enumerate(self.points)}
+            table = table[table['_key'].isin(order)].drop_duplicates('_key', keep='last')
+            table = table.iloc[table['_key'].map(order).argsort(kind='stable')].reset_index(drop=True)
+        failed = table['_error'].notna().sum() if '_error' in table.columns else 0
+        if failed:
+            print(f"    실패 {failed}개 (_error 컬럼 참조)")
+        if sort_by and sort_by in table.columns:
+            table = table.sort_values(sort_by, ascending=ascending, na_position='last').reset_index(drop=True)
+        if self.checkpoint is not None and not table.empty:
+            table.drop(columns=['_key']).to_csv(self.checkpoint.with_suffix('.csv'), index=False, encoding='utf-8-sig')
+        return table
+
+    @staticmethod
+    def best(table: pd.DataFrame, metric: str, maximize: bool = True) -> Optional[Dict]:
+        """지표 기준 최적 포인트 (파라미터 + 지표)"""
+        if table.empty or metric not in table.columns:
+            return None
+        valid = table[table[metric].notna()]
+        if valid.empty:
+            return None
+        row = valid.loc[valid[metric].idxmax() if maximize else valid[metric].idxmin()]
+        return {k: (v.item() if hasattr(v, 'item') else v) for k, v in row.items() if not str(k).startswith('_')}
@@ -30,6 +30,7 @@ import time
 warnings.filterwarnings("ignore")
 
 from config import OUTPUT_DIR, get_signal_kr
+from backtest.score_cache import get_score_cache
 
 # 백테스트 결과 저장 경로
 BACKTEST_DIR = OUTPUT_DIR / "backtest_1year"
@@ -43,14 +44,16 @@ REPORT_FILE = BACKTEST_DIR / "backtest_1year_report.md"
 class BacktestAnalyzer:
     """1년 백테스트 분석기"""
 
-    def __init__(self, weeks: int = 52, top_n: int = 100):
+    def __init__(self, weeks: int = 52, top_n: int = 100, use_score_cache: bool = True):
         """
         Args:
             weeks: 백테스트 기간 (주 단위, 기본 52주 = 1년)
             top_n: 일별 선정 종목 수
+            use_score_cache: 종목×날짜 점수 디스크 캐시 사용 (점수 로직 소스가 바뀌면 자동 무효화)
         """
         self.weeks = weeks
         self.top_n = top_n
+        self.score_cache = get_score_cache() if use_score_cache else None
         self.trading_days = []
         self.all_stocks_cache = {}
         self.price_cache = {}
@@ -336,8 +339,16 @@ class BacktestAnalyzer:
                 if 'Volume' in df.columns and last_row['Volume'] < 10000:
                     return None
 
-                # 기술적 분석
-                score, signals, indicators = self.calculate_technical_score(df)
+                # 기술적 분석 (캐시에 있으면 재계산 없음)
+                if self.score_cache is not None:
+                    cached = self.score_cache.get_or_compute(
+                        'bt1y_technical', BacktestAnalyzer.calculate_technical_score, code, df,
+                        compute=lambda: dict(zip(('score', 'signals', 'indicators'),
+                                                 self.calculate_technical_score(df))),
+                    )
+                    score, signals, indicators = cached['score'], cached['signals'], cached['indicators']
+                else:
+                    score, signals, indicators = self.calculate_technical_score(df)
 
                 if score < 30:  # 최소 점수 기준
                     return None
@@ -472,6 +483,8 @@ class BacktestAnalyzer:
 
             # 해당일 top100 분석
             day_results = self.analyze_single_day(analysis_date, stock_list)
+            if self.score_cache is not None:
+                self.score_cache.release()
 
             if not day_results:
                 print("(데이터 없음)")
@@ -904,10 +917,14 @@ def main():
         "--report-only", action="store_true",
         help="기존 결과로 리포트만 생성"
     )
+    parser.add_argument(
+        "--no-score-cache", action="store_true",
+        help="점수 디스크 캐시 사용 안 함"
+    )
 
     args = parser.parse_args()
 
-    analyzer = BacktestAnalyzer(weeks=args.weeks, top_n=args.top)
+    analyzer = BacktestAnalyzer(weeks=args.weeks, top_n=args.top, use_score_cache=not args.no_score_cache)
 
     if args.report_only:
         if CHECKPOINT_FILE.exists():
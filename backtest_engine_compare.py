@@ -14,9 +14,13 @@ import time
 
 from scoring import SCORING_FUNCTIONS
 from config import calculate_signal_weight
+from backtest.score_cache import get_score_cache
 
 warnings.filterwarnings("ignore")
 
+# 점수 디스크 캐시 사용 (--no-score-cache 로 끔)
+USE_SCORE_CACHE = True
+
 
 def get_trading_days(n_days=6):
     """
@@ -132,7 +136,7 @@ def get_stock_ohlcv_all(code: str, start_date: datetime, end_date: datetime):
 
 
 def analyze_stock_for_date(code: str, name: str, market: str, screening_date: datetime,
-                           scoring_func, ohlcv_cache: dict = None) -> dict:
+                           scoring_func, ohlcv_cache: dict = None, scoring_version: str = None) -> dict:
     """
     특정 날짜 기준으로 종목 분석
 
@@ -143,6 +147,7 @@ def analyze_stock_for_date(code: str, name: str, market: str, screening_date: da
         screening_date: 스크리닝 기준 날짜
         scoring_func: 스코어링 함수
         ohlcv_cache: OHLCV 데이터 캐시 (선택)
+        scoring_version: 스코어링 버전 (지정 시 점수 디스크 캐시 사용)
 
     Returns:
         dict: 분석 결과
@@ -170,8 +175,11 @@ def analyze_stock_for_date(code: str, name: str, market: str, screening_date: da
         if len(df) < 60:
             return None
 
-        # 스코어링 수행
-        result = scoring_func(df)
+        # 스코어링 수행 (캐시에 있으면 재계산 없음)
+        if scoring_version and USE_SCORE_CACHE:
+            result = get_score_cache().get_or_compute(scoring_version, scoring_func, code, df)
+        else:
+            result = scoring_func(df)
 
         if result is None:
             return None
@@ -232,7 +240,7 @@ def run_screening_for_date(stock_list: pd.DataFrame, screening_date: datetime,
             executor.submit(
                 analyze_stock_for_date,
                 stock["Code"], stock["Name"], stock.get("Market", ""),
-                screening_date, scoring_func, ohlcv_cache
+                screening_date, scoring_func, ohlcv_cache, scoring_version
             ): stock
             for stock in stocks_to_analyze
         }
@@ -405,6 +413,10 @@ def run_backtest(days: int = 5, top_n: int = 100, engines: list = None, max_work
 
             print(f"      완료: {processed}/{len(top_stocks)}개")
 
+        # 새로 계산한 점수 저장
+        if USE_SCORE_CACHE:
+            get_score_cache().release()
+
         # 메모리 해제
         del ohlcv_cache
 
@@ -417,6 +429,9 @@ def run_backtest(days: int = 5, top_n: int = 100, engines: list = None, max_work
 
     elapsed = time.time() - start_time
     print(f"\n총 소요시간: {elapsed/60:.1f}분")
+    if USE_SCORE_CACHE:
+        stats = get_score_cache().stats()
+        print(f"점수 캐시: 적중 {stats['hits']:,}건, 계산 {stats['misses']:,}건 ({stats['hit_rate']}%)")
 
     return df
 
@@ -600,9 +615,13 @@ def main():
     parser.add_argument('--workers', type=int, default=10, help='병렬 처리 워커 수')
     parser.add_argument('--output', type=str, default=None,
                         help='출력 파일 경로 (기본: output/backtest_v1_v2_v4_5days_YYYYMMDD.xlsx)')
+    parser.add_argument('--no-score-cache', action='store_true', help='점수 디스크 캐시 사용 안 함')
 
     args = parser.parse_args()
 
+    global USE_SCORE_CACHE
+    USE_SCORE_CACHE = not args.no_score_cache
+
     # 백테스트 실행
     df = run_backtest(
         days=args.days,
@@ -10,7 +10,8 @@
 사용법:
     python backtest_intraday_signals.py                     # 전체 데이터 백테스트
     python backtest_intraday_signals.py --date 20260128     # 특정 날짜만
-    python backtest_intraday_signals.py --optimize          # 임계값 최적화
+    python backtest_intraday_signals.py --optimize          # 임계값 최적화 (병렬, 체크포인트 이어하기)
+    python backtest_intraday_signals.py --optimize --workers 8 --no-resume
 """
 
 import os
@@ -26,61 +27,18 @@ from collections import defaultdict
 
 # 프로젝트 루트
 PROJECT_ROOT = Path(__file__).parent
-SCORES_DIR = PROJECT_ROOT / "output" / "intraday_scores"
+sys.path.insert(0, str(PROJECT_ROOT))
 
+from backtest.intraday_replay import (
+    SnapshotReplay,
+    assign_tiers,
+    load_replays,
+    load_snapshot,
+    snapshot_minutes,
+    tier3_mask,
+)
 
-# ============================================================================
-# Tier 조건 (analyze_score_changes.py와 동일)
-# ============================================================================
-def has_volume_surge_signal(signals_str: str) -> bool:
-    if pd.isna(signals_str):
-        return False
-    return 'VOLUME_EXPLOSION' in signals_str or 'VOLUME_SURGE_3X' in signals_str
-
-
-def has_pattern_signal(signals_str: str) -> bool:
-    if pd.isna(signals_str):
-        return False
-    return 'BB_SQUEEZE' in signals_str or 'VCP_PATTERN' in signals_str
-
-
-def check_tier1(row: pd.Series, v2_delta: float, cfg: dict) -> bool:
-    """Tier 1 조건 확인 (동적 임계값)"""
-    if row['v2'] < cfg.get('v2_min', 70):
-        return False
-    if v2_delta < cfg.get('v2_delta_min', 8):
-        return False
-    if not has_volume_surge_signal(row.get('signals', '')):
-        return False
-    if row['v4'] < cfg.get('v4_min', 50):
-        return False
-    # 거래대금 추정
-    est_amount = row['close'] * row['volume']
-    if est_amount < cfg.get('amount_min', 10_000_000_000):
-        return False
-    return True
-
-
-def check_tier2(row: pd.Series, v2_delta: float, volume_ratio: float, cfg: dict) -> bool:
-    """Tier 2 조건 확인"""
-    if row['v2'] < cfg.get('v2_min', 65):
-        return False
-    if v2_delta < cfg.get('v2_delta_min', 5):
-        return False
-    if volume_ratio < cfg.get('volume_ratio_min', 2.0):
-        return False
-    if row['v3.5'] < cfg.get('v35_min', 40) and row['v5'] < cfg.get('v5_min', 50):
-        return False
-    return True
-
-
-def check_tier3(row: pd.Series, cfg: dict) -> bool:
-    """Tier 3 조건 확인"""
-    if row['v2'] < cfg.get('v2_min', 60):
-        return False
-    if not has_pattern_signal(row.get('signals', '')) and row['v9_prob'] < cfg.get('v9_min', 55):
-        return False
-    return True
+SCORES_DIR = PROJECT_ROOT / "output" / "intraday_scores"
 
 
 # ============================================================================
@@ -100,136 +58,69 @@ def get_all_csv_files() -> dict:
 
 def load_csv(filepath: Path) -> pd.DataFrame:
     """CSV 파일 로드 (컬럼명 정규화)"""
-    df = pd.read_csv(filepath)
-    df['code'] = df['code'].astype(str).str.zfill(6)
-
-    # 컬럼명 정규화 (v3 → v3.5, amount → prev_amount)
-    if 'v3' in df.columns and 'v3.5' not in df.columns:
-        df = df.rename(columns={'v3': 'v3.5'})
-    if 'amount' in df.columns and 'prev_amount' not in df.columns:
-        df = df.rename(columns={'amount': 'prev_amount'})
-    if 'marcap' in df.columns and 'prev_marcap' not in df.columns:
-        df = df.rename(columns={'marcap': 'prev_marcap'})
-
-    # 필수 컬럼 없으면 0으로 채움
-    for col in ['v3.5', 'v8', 'v9_prob']:
-        if col not in df.columns:
-            df[col] = 0
-
-    return df
+    return load_snapshot(filepath)
 
 
 def get_time_from_filename(filepath: Path) -> int:
     """파일명에서 분 단위 시간 추출 (0900 → 540)"""
-    time_str = filepath.stem.split('_')[1]
-    hours = int(time_str[:2])
-    minutes = int(time_str[2:])
-    return hours * 60 + minutes
+    return snapshot_minutes(filepath)
 
 
 # ============================================================================
 # 백테스트 로직
 # ============================================================================
-def run_backtest_for_date(date_str: str, files: list, tier_config: dict) -> list:
-    """하루치 데이터 백테스트"""
+def prepare_date(date_str: str, files: list) -> pd.DataFrame:
+    """
+    하루치 후보 행 준비 (임계값과 무관한 부분만 1번 계산)
+
+    하루 스냅샷을 (시간 × 종목) 패널로 읽어 시점 i(1..N-2)별 직전 시점 값,
+    v2_delta/volume_ratio, 시그널 플래그, 10분/30분/60분/장마감 수익률을 붙인다.
+    """
     if len(files) < 3:
+        return pd.DataFrame()
+    return SnapshotReplay.from_files(files, loader=load_csv).candidates(date_str)
+
+
+def prepare_all(all_files: dict, max_workers: int = 8) -> dict:
+    """전체 날짜 후보 행 준비 (스냅샷 CSV 병렬 로드)"""
+    enough = {date_str: files for date_str, files in all_files.items() if len(files) >= 3}
+    replays = load_replays(enough, loader=load_csv, max_workers=max_workers)
+    return {
+        date_str: replays[date_str].candidates(date_str) if date_str in replays else pd.DataFrame()
+        for date_str in sorted(all_files)
+    }
+
+
+RESULT_COLUMNS = [
+    'date', 'time', 'code', 'name', 'tier', 'entry_price', 'v2', 'v2_delta', 'v4', 'v5', 'v9_prob',
+    'return_10min', 'return_30min', 'return_60min', 'return_eod',
+]
+
+
+def detect_signals(prepared: pd.DataFrame, tier_config: dict, masks: dict = None) -> list:
+    """
+    준비된 후보 행에서 Tier 판정 (Tier 1 → 2 → 3 우선순위)
+
+    Args:
+        prepared: prepare_date() 결과
+        tier_config: {'tier1': {...}, 'tier2': {...}, 'tier3': {...}}
+        masks: 미리 계산한 Tier 마스크 (스윕에서 재사용, 선택)
+    """
+    if prepared is None or prepared.empty:
         return []
 
-    # 파일을 시간순 정렬
-    files = sorted(files, key=get_time_from_filename)
-
-    # 모든 파일 로드
-    data_by_time = {}
-    times = []
-    for f in files:
-        time_min = get_time_from_filename(f)
-        data_by_time[time_min] = load_csv(f)
-        times.append(time_min)
-
-    results = []
-
-    # 각 시점에서 시그널 감지 후 미래 수익률 측정
-    for i in range(1, len(times) - 1):  # 마지막은 미래 데이터 필요
-        prev_time = times[i-1]
-        curr_time = times[i]
-
-        prev_df = data_by_time[prev_time]
-        curr_df = data_by_time[curr_time]
-
-        # 공통 종목
-        merged = curr_df.merge(
-            prev_df[['code', 'v2', 'v4', 'v5', 'v3.5', 'v9_prob', 'close', 'volume']],
-            on='code',
-            how='inner',
-            suffixes=('', '_prev')
-        )
-
-        # Delta 계산
-        merged['v2_delta'] = merged['v2'] - merged['v2_prev']
-        merged['volume_ratio'] = (merged['volume'] / merged['volume_prev']).replace([np.inf, -np.inf], 0).fillna(0)
-
-        # 각 종목 Tier 판정
-        for _, row in merged.iterrows():
-            tier = None
-
-            if check_tier1(row, row['v2_delta'], tier_config.get('tier1', {})):
-                tier = 'tier1'
-            elif check_tier2(row, row['v2_delta'], row['volume_ratio'], tier_config.get('tier2', {})):
-                tier = 'tier2'
-            elif check_tier3(row, tier_config.get('tier3', {})):
-                tier = 'tier3'
-
-            if tier is None:
-                continue
+    tier = assign_tiers(prepared, tier_config, masks)
+    hit = tier != ''
+    if not hit.any():
+        return []
 
-            entry_price = row['close']
-            code = row['code']
-
-            # 10분/30분/60분 후 가격 조회
-            returns = {}
-            for offset, label in [(1, '10min'), (3, '30min'), (6, '60min')]:
-                future_idx = i + offset
-                if future_idx < len(times):
-                    future_time = times[future_idx]
-                    future_df = data_by_time[future_time]
-                    future_row = future_df[future_df['code'] == code]
-                    if not future_row.empty:
-                        future_price = future_row.iloc[0]['close']
-                        returns[label] = ((future_price - entry_price) / entry_price * 100)
-                    else:
-                        returns[label] = np.nan
-                else:
-                    returns[label] = np.nan
-
-            # 장 마감 가격 (마지막 파일)
-            last_time = times[-1]
-            last_df = data_by_time[last_time]
-            last_row = last_df[last_df['code'] == code]
-            if not last_row.empty:
-                eod_price = last_row.iloc[0]['close']
-                returns['eod'] = ((eod_price - entry_price) / entry_price * 100)
-            else:
-                returns['eod'] = np.nan
-
-            results.append({
-                'date': date_str,
-                'time': f"{curr_time // 60:02d}{curr_time % 60:02d}",
-                'code': code,
-                'name': row['name'],
-                'tier': tier,
-                'entry_price': entry_price,
-                'v2': row['v2'],
-                'v2_delta': row['v2_delta'],
-                'v4': row['v4'],
-                'v5': row['v5'],
-                'v9_prob': row['v9_prob'],
-                'return_10min': returns.get('10min', np.nan),
-                'return_30min': returns.get('30min', np.nan),
-                'return_60min': returns.get('60min', np.nan),
-                'return_eod': returns.get('eod', np.nan),
-            })
-
-    return results
+    detected = prepared[hit].assign(tier=tier[hit], entry_price=prepared.loc[hit, 'close'])
+    return detected[RESULT_COLUMNS].to_dict('records')
+
+
+def run_backtest_for_date(date_str: str, files: list, tier_config: dict) -> list:
+    """하루치 데이터 백테스트"""
+    return detect_signals(prepare_date(date_str, files), tier_config)
 
 
 def analyze_results(results: list) -> dict:
@@ -313,97 +204,108 @@ def print_analysis(analysis: dict):
 # ============================================================================
 # 임계값 최적화
 # ============================================================================
-def optimize_thresholds(all_files: dict) -> dict:
-    """임계값 최적화"""
-    print(f"\n{'='*80}")
-    print(f"  임계값 최적화")
-    print(f"{'='*80}")
+def build_tier_config(v2_min: float, v2_delta_min: float, v4_min: float) -> dict:
+    """Tier 1 임계값에서 Tier 2/3 설정 유도"""
+    return {
+        'tier1': {
+            'v2_min': v2_min,
+            'v2_delta_min': v2_delta_min,
+            'v4_min': v4_min,
+            'amount_min': 10_000_000_000,
+        },
+        'tier2': {
+            'v2_min': v2_min - 5,
+            'v2_delta_min': v2_delta_min - 3,
+            'volume_ratio_min': 2.0,
+            'v35_min': 40,
+            'v5_min': 50,
+        },
+        'tier3': {
+            'v2_min': v2_min - 10,
+            'v9_min': 55,
+        }
+    }
 
-    # 테스트할 파라미터 범위
-    v2_min_range = [60, 65, 70, 75]
-    v2_delta_range = [5, 8, 10, 12]
-    v4_min_range = [40, 50, 60]
-
-    best_result = None
-    best_params = None
-    best_score = -np.inf
-
-    total_tests = len(v2_min_range) * len(v2_delta_range) * len(v4_min_range)
-    test_num = 0
-
-    for v2_min in v2_min_range:
-        for v2_delta_min in v2_delta_range:
-            for v4_min in v4_min_range:
-                test_num += 1
-                if test_num % 10 == 0:
-                    print(f"  테스트 {test_num}/{total_tests}...")
-
-                config = {
-                    'tier1': {
-                        'v2_min': v2_min,
-                        'v2_delta_min': v2_delta_min,
-                        'v4_min': v4_min,
-                        'amount_min': 10_000_000_000,
-                    },
-                    'tier2': {
-                        'v2_min': v2_min - 5,
-                        'v2_delta_min': v2_delta_min - 3,
-                        'volume_ratio_min': 2.0,
-                        'v35_min': 40,
-                        'v5_min': 50,
-                    },
-                    'tier3': {
-                        'v2_min': v2_min - 10,
-                        'v9_min': 55,
-                    }
-                }
 
-                # 백테스트 실행
-                all_results = []
-                for date_str, files in all_files.items():
-                    results = run_backtest_for_date(date_str, files, config)
-                    all_results.extend(results)
+def evaluate_thresholds(params: dict, prepared_by_date: dict) -> dict:
+    """
+    그리드 포인트 1개 평가 (SweepRunner 워커에서 실행)
 
-                if not all_results:
-                    continue
+    Tier 3 마스크는 v2_min 에만 의존하므로 같은 v2_min 포인트끼리 재사용한다.
+    """
+    from backtest.sweep import memoize
 
-                analysis = analyze_results(all_results)
+    config = build_tier_config(params['v2_min'], params['v2_delta_min'], params['v4_min'])
+    all_results = []
+    for date_str, prepared in prepared_by_date.items():
+        if prepared.empty:
+            continue
+        masks = {
+            'tier3': memoize(('tier3', date_str, params['v2_min']),
+                             lambda: tier3_mask(prepared, config['tier3'])),
+        }
+        all_results.extend(detect_signals(prepared, config, masks))
+
+    tier1 = analyze_results(all_results).get('tier1', {}) if all_results else {}
+    ret_30 = tier1.get('return_30min') or {}
+    count = tier1.get('count', 0)
+
+    # 스코어 = 평균수익률 × 승률 (Tier 1 최소 5건 이상)
+    score = ret_30['mean'] * ret_30['win_rate'] / 100 if ret_30 and count >= 5 else np.nan
+    return {
+        'score': score,
+        'signals': len(all_results),
+        'tier1_count': count,
+        'tier1_ret30_mean': ret_30.get('mean', np.nan),
+        'tier1_ret30_win_rate': ret_30.get('win_rate', np.nan),
+    }
 
-                # Tier 1 기준 스코어 계산
-                tier1 = analysis.get('tier1', {})
-                if not tier1:
-                    continue
 
-                ret_30 = tier1.get('return_30min', {})
-                if not ret_30:
-                    continue
+def optimize_thresholds(all_files: dict, max_workers: int = None, resume: bool = True) -> dict:
+    """임계값 최적화 (날짜별 후보 1번 준비 → 그리드 병렬 평가)"""
+    from backtest.sweep import SweepRunner, file_fingerprint
 
-                # 스코어 = 평균수익률 × 승률 / 감지건수 (과적합 방지)
-                count = tier1.get('count', 1)
-                if count < 5:  # 최소 5건 이상
-                    continue
+    print(f"\n{'='*80}")
+    print(f"  임계값 최적화")
+    print(f"{'='*80}")
+
+    # 테스트할 파라미터 범위
+    grid = {
+        'v2_min': [60, 65, 70, 75],
+        'v2_delta_min': [5, 8, 10, 12],
+        'v4_min': [40, 50, 60],
+    }
 
-                score = ret_30['mean'] * ret_30['win_rate'] / 100
+    prepared_by_date = prepare_all(all_files)
 
-                if score > best_score:
-                    best_score = score
-                    best_params = config
-                    best_result = analysis
+    checkpoint = PROJECT_ROOT / "output" / "sweeps" / f"intraday_thresholds_{min(all_files)}_{max(all_files)}.jsonl"
+    # 스냅샷 CSV 가 추가/재생성되면 이전 체크포인트 폐기
+    fingerprint = file_fingerprint(f for files in all_files.values() for f in files)
+    runner = SweepRunner(evaluate_thresholds, grid, shared=prepared_by_date, checkpoint=checkpoint,
+                         max_workers=max_workers, group_by=['v2_min'], fingerprint=fingerprint)
+    table = runner.run(resume=resume)
+    best = SweepRunner.best(table, 'score')
 
     print(f"\n{'='*80}")
     print(f"  최적 파라미터")
     print(f"{'='*80}")
 
-    if best_params:
+    if best:
+        best_params = build_tier_config(best['v2_min'], best['v2_delta_min'], best['v4_min'])
         print(f"\nTier 1:")
         for k, v in best_params['tier1'].items():
             print(f"  {k}: {v}")
-        print(f"\n최적 스코어: {best_score:.2f}")
-        print_analysis(best_result)
-    else:
-        print("최적화 실패 (데이터 부족)")
+        print(f"\n최적 스코어: {best['score']:.2f}")
+        print(f"결과표: {checkpoint.with_suffix('.csv')}")
+
+        best_results = []
+        for prepared in prepared_by_date.values():
+            best_results.extend(detect_signals(prepared, best_params))
+        print_analysis(analyze_results(best_results))
+        return best_params
 
-    return best_params
+    print("최적화 실패 (데이터 부족)")
+    return None
 
 
 # ============================================================================
@@ -466,6 +368,8 @@ def main():
     parser.add_argument('--optimize', action='store_true', help='임계값 최적화')
     parser.add_argument('--detail', action='store_true', help='상세 결과 출력')
     parser.add_argument('--save', type=str, help='결과 CSV 저장 경로', default=None)
+    parser.add_argument('--workers', type=int, help='최적화 병렬 프로세스 수', default=None)
+    parser.add_argument('--no-resume', action='store_true', help='최적화 체크포인트 무시')
     args = parser.parse_args()
 
     print(f"\n{'#'*80}")
@@ -486,7 +390,7 @@ def main():
 
     # 임계값 최적화
     if args.optimize:
-        optimize_thresholds(all_files)
+        optimize_thresholds(all_files, max_workers=args.workers, resume=not args.no_resume)
         return
 
     # 기본 백테스트
@@ -521,9 +425,9 @@ def main():
     print(f"\n백테스트 실행 중...")
     all_results = []
 
-    for date_str, files in sorted(all_files.items()):
+    for date_str, prepared in prepare_all(all_files).items():
         print(f"  {date_str} 처리 중...")
-        results = run_backtest_for_date(date_str, files, default_config)
+        results = detect_signals(prepared, default_config)
         all_results.extend(results)
         print(f"    → {len(results)}건 감지")
 
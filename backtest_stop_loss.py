@@ -2,6 +2,7 @@
 """
 손절 기준별 1개월 백테스트
 - 손절 10%, 6%, 손절없음 비교
+- 점수/가격은 1번만 로드하고 시나리오는 SweepRunner 로 병렬 실행
 """
 
 import sys
@@ -10,10 +11,12 @@ import json
 from datetime import datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config import OUTPUT_DIR
+from backtest.sweep import SweepRunner
 from technical_analyst import TechnicalAnalyst
 
 def load_daily_scores(date_str):
@@ -68,7 +71,34 @@ def get_stock_price_history(code, days=40):
     return prices
 
 
-def run_backtest(stop_loss_pct, days=30, initial_capital=10000000, max_holdings=10, buy_amount=1000000):
+def load_backtest_data(days=30, max_workers=10):
+    """
+    시나리오 공통 데이터 1회 로드 (날짜별 점수 + 매수 후보 종목 가격)
+
+    Returns:
+        {'days': [(date_str, daily_scores), ...], 'prices': {code: {date_str: ohlc}}}
+    """
+    end_date = datetime.now()
+    current_date = end_date - timedelta(days=days)
+
+    daily = []
+    while current_date <= end_date:
+        # 주말 스킵
+        if current_date.weekday() < 5:
+            date_str = current_date.strftime('%Y%m%d')
+            daily.append((date_str, load_daily_scores(date_str)))
+        current_date += timedelta(days=1)
+
+    # 매수 가능한 종목(75점 이상)만 가격 조회
+    codes = sorted({code for _, scores in daily for code, info in scores.items() if info.get('score', 0) >= 75})
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        histories = executor.map(lambda code: get_stock_price_history(code, days=days + 30), codes)
+        prices = dict(zip(codes, histories))
+
+    return {'days': daily, 'prices': prices}
+
+
+def run_backtest(stop_loss_pct, days=30, initial_capital=10000000, max_holdings=10, buy_amount=1000000, data=None):
     """
     백테스트 실행
 
@@ -78,9 +108,10 @@ def run_backtest(stop_loss_pct, days=30, initial_capital=10000000, max_holdings=
         initial_capital: 초기 자본금
         max_holdings: 최대 보유 종목 수
         buy_amount: 종목당 투자금
+        data: load_backtest_data() 결과 (None이면 새로 로드)
     """
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days)
+    if data is None:
+        data = load_backtest_data(days)
 
     # 상태 변수
     cash = initial_capital
@@ -88,32 +119,20 @@ def run_backtest(stop_loss_pct, days=30, initial_capital=10000000, max_holdings=
     trades = []  # 거래 기록
     daily_values = []  # 일별 평가금액
 
-    # 가격 캐시
-    price_cache = {}
+    # 가격 캐시 (공통 데이터 + 누락 종목만 추가 조회)
+    price_cache = data['prices']
 
     def get_price(code, date_str):
         """특정 날짜의 종가 조회"""
         if code not in price_cache:
-            price_cache[code] = get_stock_price_history(code, days=60)
+            price_cache[code] = get_stock_price_history(code, days=days + 30)
         return price_cache[code].get(date_str, {}).get('close', 0)
 
     # 날짜별 시뮬레이션
-    current_date = start_date
     prev_scores = {}
 
-    while current_date <= end_date:
-        date_str = current_date.strftime('%Y%m%d')
-
-        # 주말 스킵
-        if current_date.weekday() >= 5:
-            current_date += timedelta(days=1)
-            continue
-
-        # 당일 스크리닝 점수 로드
-        daily_scores = load_daily_scores(date_str)
-
+    for date_str, daily_scores in data['days']:
         if not daily_scores:
-            current_date += timedelta(days=1)
             prev_scores = daily_scores
             continue
 
@@ -245,7 +264,6 @@ def run_backtest(stop_loss_pct, days=30, initial_capital=10000000, max_holdings=
         })
 
         prev_scores = daily_scores
-        current_date += timedelta(days=1)
 
     # 최종 결과 계산
     final_value = daily_values[-1]['total_value'] if daily_values else initial_capital
@@ -283,6 +301,12 @@ def run_backtest(stop_loss_pct, days=30, initial_capital=10000000, max_holdings=
     }
 
 
+def evaluate_scenario(params, data):
+    """시나리오 1개 평가 (SweepRunner 워커에서 실행, 거래 내역 제외 요약만 반환)"""
+    result = run_backtest(data=data, **params)
+    return {k: v for k, v in result.items() if k not in ('stop_loss', 'trades', 'daily_values')}
+
+
 def main():
     print("=" * 60)
     print("  1개월 백테스트: 손절 기준별 수익률 비교")
@@ -309,19 +333,27 @@ def main():
         (None, "손절 없음"),
     ]
 
+    print("[데이터 로드]")
+    data = load_backtest_data(days)
+    print(f"  {len(data['days'])}일, 후보 종목 {len(data['prices'])}개")
+    print()
+
+    grid = {
+        'stop_loss_pct': [stop_loss for stop_loss, _ in scenarios],
+        'days': [days],
+        'initial_capital': [initial_capital],
+        'max_holdings': [max_holdings],
+        'buy_amount': [buy_amount],
+    }
+    table = SweepRunner(evaluate_scenario, grid, shared=data).run()
+
     results = []
-    for stop_loss, name in scenarios:
-        print(f"[{name}] 백테스트 실행 중...")
-        result = run_backtest(
-            stop_loss_pct=stop_loss,
-            days=days,
-            initial_capital=initial_capital,
-            max_holdings=max_holdings,
-            buy_amount=buy_amount,
-        )
+    for (stop_loss, name), (_, row) in zip(scenarios, table.iterrows()):
+        result = {k: v for k, v in row.items() if not str(k).startswith('_')}
+        result['stop_loss'] = stop_loss
         result['scenario_name'] = name
         results.append(result)
-        print(f"  완료: 수익률 {result['total_return']:+.2f}%")
+        print(f"[{name}] 수익률 {result['total_return']:+.2f}%")
 
     # 결과 리포트
     print()
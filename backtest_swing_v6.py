@@ -36,6 +36,7 @@ CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
 
 # 스코어링 함수 import
 from scoring import calculate_score_v6
+from backtest.exits import evaluate_exit
 
 
 class SwingBacktestV6:
@@ -303,33 +304,16 @@ class SwingBacktestV6:
         }
 
         # 홀딩 기간 동안 시뮬레이션 (진입일 제외, 그 다음날부터)
-        for day_offset in range(1, min(len(future_df), self.max_hold_days + 1)):
-            day_data = future_df.iloc[day_offset]
-            day_date = future_df.index[day_offset]
-
-            # 장중 고점이 목표가 도달
-            if day_data['High'] >= target_price:
-                result['exit_date'] = day_date.strftime("%Y-%m-%d")
-                result['exit_price'] = target_price
-                result['exit_reason'] = 'TARGET_HIT'
-                result['hold_days'] = day_offset
-                break
-
-            # 장중 저점이 손절가 이탈
-            if day_data['Low'] <= stop_price:
-                result['exit_date'] = day_date.strftime("%Y-%m-%d")
-                result['exit_price'] = stop_price
-                result['exit_reason'] = 'STOP_HIT'
-                result['hold_days'] = day_offset
-                break
-
-            # 마지막 날이면 종가 청산
-            if day_offset == self.max_hold_days or day_offset == len(future_df) - 1:
-                result['exit_date'] = day_date.strftime("%Y-%m-%d")
-                result['exit_price'] = day_data['Close']
-                result['exit_reason'] = 'TIME_EXIT'
-                result['hold_days'] = day_offset
-                break
+        holding = future_df.iloc[1:self.max_hold_days + 1]
+        hold_days, exit_price, exit_reason = evaluate_exit(
+            entry_price, target_price, stop_price,
+            holding['High'], holding['Low'], holding['Close'],
+        )
+        if exit_reason:
+            result['exit_date'] = holding.index[hold_days - 1].strftime("%Y-%m-%d")
+            result['exit_price'] = exit_price
+            result['exit_reason'] = exit_reason
+            result['hold_days'] = hold_days
 
         # 수익률 계산
         if result['exit_price']:
@@ -35,6 +35,7 @@ CHECKPOINT_DIR = OUTPUT_DIR / "backtest_v8"
 CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
 
 from scoring import calculate_score_v8
+from backtest.exits import evaluate_exit
 
 
 class SwingBacktestV8:
@@ -240,7 +241,6 @@ class SwingBacktestV8:
         target_price = entry_price + (atr * self.target_mult)
         stop_price = entry_price - (atr * self.stop_mult)
         trailing_trigger = entry_price + (atr * 0.5)
-        trailing_active = False
 
         shares = int(self.allocation // entry_price)
         if shares == 0:
@@ -280,46 +280,17 @@ class SwingBacktestV8:
             'warnings': stock['warnings'],
         }
 
-        for day_offset in range(1, min(len(future_df), self.max_hold_days + 1)):
-            day_data = future_df.iloc[day_offset]
-            day_date = future_df.index[day_offset]
-
-            # 트레일링 스탑 활성화
-            if day_data['High'] >= trailing_trigger and not trailing_active:
-                trailing_active = True
-                stop_price = max(stop_price, entry_price)
-
-            # 목표가 도달
-            if day_data['High'] >= target_price:
-                result['exit_date'] = day_date.strftime("%Y-%m-%d")
-                result['exit_price'] = target_price
-                result['exit_reason'] = 'TARGET_HIT'
-                result['hold_days'] = day_offset
-                break
-
-            # 손절가 이탈
-            if day_data['Low'] <= stop_price:
-                result['exit_date'] = day_date.strftime("%Y-%m-%d")
-                result['exit_price'] = stop_price
-                result['exit_reason'] = 'TRAILING_STOP' if trailing_active else 'STOP_HIT'
-                result['hold_days'] = day_offset
-                break
-
-            # 2일차 손실 시 조기 청산
-            if day_offset >= 2 and day_data['Close'] < entry_price:
-                result['exit_date'] = day_date.strftime("%Y-%m-%d")
-                result['exit_price'] = day_data['Close']
-                result['exit_reason'] = 'EARLY_EXIT'
-                result['hold_days'] = day_offset
-                break
-
-            # 마지막 날 종가 청산
-            if day_offset == self.max_hold_days or day_offset == len(future_df) - 1:
-                result['exit_date'] = day_date.strftime("%Y-%m-%d")
-                result['exit_price'] = day_data['Close']
-                result['exit_reason'] = 'TIME_EXIT'
-                result['hold_days'] = day_offset
-                break
+        holding = future_df.iloc[1:self.max_hold_days + 1]
+        hold_days, exit_price, exit_reason = evaluate_exit(
+            entry_price, target_price, stop_price,
+            holding['High'], holding['Low'], holding['Close'],
+            trailing_trigger=trailing_trigger, early_exit_day=2,
+        )
+        if exit_reason:
+            result['exit_date'] = holding.index[hold_days - 1].strftime("%Y-%m-%d")
+            result['exit_price'] = exit_price
+            result['exit_reason'] = exit_reason
+            result['hold_days'] = hold_days
 
         if result['exit_price']:
             revenue = shares * result['exit_price']
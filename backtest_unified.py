@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+통합 백테스트 (여러 엔진/전략을 한 프로세스에서 비교)
+
+- 종목 데이터는 한 번만 로드하여 모든 엔진이 공유 (backtest.PricePanel)
+- 종목별 점수는 전 구간 시계열로 1회 계산 (날짜별 재계산 없음)
+- 청산 규칙은 backtest_swing_v6/v7/v8 과 동일 (backtest.exits)
+
+사용법:
+    python backtest_unified.py --weeks 52 --engines v6,v7,v8
+    python backtest_unified.py --weeks 26 --engines v7 --strategies v2_trend,v8_bounce
+"""
+
+import argparse
+import warnings
+from datetime import datetime, timedelta
+from pathlib import Path
+
+warnings.filterwarnings("ignore")
+
+from backtest import (
+    PanelBacktest,
+    StrategyAdapter,
+    compare_results,
+    load_price_panel,
+    load_stock_universe,
+    swing_adapters,
+)
+
+BASE_DIR = Path(__file__).parent
+OUTPUT_DIR = BASE_DIR / "output" / "backtest_unified"
+
+
+def build_strategy_adapters(names):
+    """trading/strategies 전략 어댑터"""
+    from trading.strategies.strategy_v2_trend import StrategyV2Trend
+    from trading.strategies.strategy_v8_bounce import StrategyV8Bounce
+
+    available = {
+        'v2_trend': StrategyV2Trend,
+        'v8_bounce': StrategyV8Bounce,
+    }
+    adapters = {}
+    for name in names:
+        if name not in available:
+            raise ValueError(f"Unknown strategy: {name}. Available: {list(available)}")
+        adapters[name] = StrategyAdapter(available[name]())
+    return adapters
+
+
+def main():
+    parser = argparse.ArgumentParser(description='통합 백테스트 (엔진/전략 비교)')
+    parser.add_argument('--weeks', type=int, default=52, help='백테스트 기간 (주 단위)')
+    parser.add_argument('--engines', type=str, default='v6,v7,v8', help='스윙 엔진 (콤마 구분)')
+    parser.add_argument('--strategies', type=str, default='', help='장중 전략 (v2_trend,v8_bounce)')
+    parser.add_argument('--top-n', type=int, default=10, help='TOP N 종목 수')
+    parser.add_argument('--allocation', type=int, default=300_000, help='종목당 투자 금액')
+    parser.add_argument('--workers', type=int, default=10, help='데이터 로딩 병렬 수')
+    parser.add_argument('--no-marcap-limit', action='store_true', help='시총 상한 제거')
+    args = parser.parse_args()
+
+    end_date = datetime.now() - timedelta(days=10)
+    start_date = end_date - timedelta(weeks=args.weeks)
+    start_str, end_str = start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+
+    print("=" * 80)
+    print("  통합 백테스트")
+    print(f"  기간: {start_str} ~ {end_str} ({args.weeks}주)")
+    print(f"  TOP {args.top_n} 종목 각 {args.allocation:,}원")
+    print("=" * 80)
+
+    adapters = {}
+    engines = [e.strip() for e in args.engines.split(',') if e.strip()]
+    if engines:
+        adapters.update(swing_adapters(engines))
+    strategies = [s.strip() for s in args.strategies.split(',') if s.strip()]
+    if strategies:
+        adapters.update(build_strategy_adapters(strategies))
+
+    print("\n[1] 종목 데이터 로딩...")
+    stocks = load_stock_universe(max_marcap=None if args.no_marcap_limit else 1_000_000_000_000)
+    panel = load_price_panel(start_str, end_str, stocks, max_workers=args.workers)
+    print(f"    → {len(panel)}개 종목")
+
+    print(f"\n[2] 백테스트 실행 ({', '.join(adapters)})...")
+    engine = PanelBacktest(panel, top_n=args.top_n, allocation=args.allocation)
+    results = engine.run_many(adapters, start=start_str, end=end_str)
+
+    print("\n[3] 결과 저장...")
+    date_str = datetime.now().strftime("%Y%m%d")
+    for name, result in results.items():
+        path = result.save(OUTPUT_DIR / f"{name}_{date_str}.json")
+        print(f"    → {path}")
+
+    print("\n" + "=" * 80)
+    print(compare_results(results).to_string())
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+스코어링/스크리닝/백테스트 성능 벤치마크 (고정 합성 시장 데이터)
+
+- 시드 고정 합성 OHLCV 유니버스 (기본 2,500종목 × 3년) 생성 → 네트워크 없이 반복 측정
+- FinanceDataReader 는 로컬 스텁으로 대체 (MarketScreener, 10분 기록기가 그대로 동작)
+- 측정 항목:
+    indicators        calculate_base_indicators
+    score_v*          SCORING_FUNCTIONS 버전별 단일 종목 채점
+    batch_scorer      BatchScorer.score_batch (V1/V2/V4/V5, 병렬)
+    screen_quick/full MarketScreener.screen_all
+    intraday_cycle    record_intraday_scores 10분 사이클 (전 종목 V1/V2/V4/V5) — 600초 마감
+    panel_backtest    PanelBacktest.run_many (V6/V7/V8 스윙)
+- 결과는 JSON 리포트로 저장 → --compare 로 커밋 간 비교 (느려진 항목/마감 초과 시 종료코드 1)
+
+사용법:
+    python benchmark_backtest.py                          # 전체 (2,500종목 × 3년)
+    python benchmark_backtest.py --tickers 500 --years 2  # 축소
+    python benchmark_backtest.py --cases score_v2,intraday_cycle
+    python benchmark_backtest.py --compare output/benchmarks/base.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import io
+import platform
+import subprocess
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+warnings.filterwarnings('ignore')
+
+PROJECT_ROOT = Path(__file__).parent
+OUTPUT_DIR = PROJECT_ROOT / "output" / "benchmarks"
+
+CYCLE_DEADLINE = 600          # 10분 기록 사이클 마감 (초)
+DEFAULT_TOLERANCE = 0.2       # 비교 시 20% 이상 느려지면 회귀
+END_DATE = '2025-12-30'       # 합성 데이터 마지막 거래일 (고정)
+
+
+# ============================================================================
+# 합성 시장 데이터
+# ============================================================================
+def make_universe(n_tickers: int = 2500, years: int = 3, seed: int = 42,
+                  end: str = END_DATE) -> Tuple[Dict[str, pd.DataFrame], pd.DataFrame]:
+    """
+    시드 고정 합성 OHLCV 유니버스
+
+    시장 팩터 + 종목 고유 변동성 + 간헐적 급등락, 거래량은 변동폭과 함께 증가.
+
+    Returns:
+        ({종목코드: OHLCV DataFrame}, 종목 리스트 (Code, Name, Market, Marcap, Volume, Amount, Close))
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=end, periods=years * 250)
+    n_days = len(dates)
+
+    market = rng.normal(0.0003, 0.01, n_days)
+    beta = rng.uniform(0.3, 1.5, n_tickers)
+    sigma = rng.uniform(0.01, 0.04, n_tickers)
+    drift = rng.normal(0.0002, 0.001, n_tickers)
+    jumps = rng.random((n_days, n_tickers)) < 0.01
+    returns = (market[:, None] * beta + drift + rng.normal(0, 1, (n_days, n_tickers)) * sigma
+               + jumps * rng.normal(0.05, 0.08, (n_days, n_tickers)))
+    returns = np.clip(returns, -0.3, 0.3)
+
+    close = rng.uniform(1_000, 100_000, n_tickers) * np.exp(np.cumsum(np.log1p(returns), axis=0))
+    gap = rng.normal(0, 0.4, (n_days, n_tickers)) * sigma
+    open_ = np.vstack([close[:1], close[:-1]]) * (1 + gap)
+    wick = np.abs(rng.normal(0, 0.5, (2, n_days, n_tickers))) * sigma
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    base_volume = rng.lognormal(12, 1.2, n_tickers)
+    volume = base_volume * rng.lognormal(0, 0.4, (n_days, n_tickers)) * (1 + 20 * np.abs(returns))
+
+    codes = [f"{i * 10:06d}" for i in range(1, n_tickers + 1)]   # 보통주 (끝자리 0)
+    frames = {}
+    for k, code in enumerate(codes):
+        frames[code] = pd.DataFrame({
+            'Open': np.round(open_[:, k]),
+            'High': np.round(high[:, k]),
+            'Low': np.round(low[:, k]),
+            'Close': np.round(close[:, k]),
+            'Volume': np.round(volume[:, k]).astype(np.int64),
+            'Change': returns[:, k],
+        }, index=dates)
+
+    last_close = np.round(close[-1])
+    listing = pd.DataFrame({
+        'Code': codes,
+        'Name': [f"합성{i:04d}" for i in range(1, n_tickers + 1)],
+        'Market': np.where(np.arange(n_tickers) % 3 == 0, 'KOSPI', 'KOSDAQ'),
+        'Marcap': np.round(last_close * rng.uniform(1e6, 5e7, n_tickers)),
+        'Volume': np.round(volume[-1]).astype(np.int64),
+        'Amount': np.round(volume[-1] * last_close),
+        'Close': last_close,
+    })
+    return frames, listing
+
+
+class LocalDataReader:
+    """
+    FinanceDataReader 로컬 스텁 (DataReader / StockListing)
+
+    조회 기간은 "오늘" 기준 상대 구간으로 보고 합성 데이터 마지막 거래일에 맞춰 자른다.
+    (datetime.now() - 365일 → 마지막 거래일 - 365일)
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], listing: pd.DataFrame):
+        self.frames = frames
+        self.listing = listing
+        last = max(df.index[-1] for df in frames.values()) if frames else pd.Timestamp(END_DATE)
+        self._offset = last - pd.Timestamp(datetime.now().date())
+
+    def DataReader(self, symbol, start=None, end=None, *args, **kwargs) -> pd.DataFrame:
+        df = self.frames.get(str(symbol).zfill(6))
+        if df is None:
+            return pd.DataFrame()
+        if start is not None:
+            df = df[df.index >= pd.Timestamp(start) + self._offset]
+        if end is not None:
+            df = df[df.index <= pd.Timestamp(end) + self._offset]
+        return df.copy()
+
+    def StockListing(self, market: str = 'KRX', *args, **kwargs) -> pd.DataFrame:
+        return self.listing.copy()
+
+
+@contextmanager
+def local_market_data(frames: Dict[str, pd.DataFrame], listing: pd.DataFrame):
+    """fdr 을 쓰는 모듈들의 fdr 참조를 로컬 스텁으로 교체"""
+    import market_screener
+    import technical_analyst
+    import record_intraday_scores
+
+    stub = LocalDataReader(frames, listing)
+    with ExitStack() as stack:
+        for module in (market_screener, technical_analyst, record_intraday_scores):
+            stack.enter_context(mock.patch.object(module, 'fdr', stub))
+        yield stub
+
+
+# ============================================================================
+# 벤치마크 항목
+# ============================================================================
+class BenchContext:
+    """벤치마크 공통 입력 (유니버스, 채점 표본)"""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], listing: pd.DataFrame, sample: int, workers: int,
+                 backtest_sample: int = 20):
+        self.frames = frames
+        self.listing = listing
+        self.codes = list(frames)
+        self.sample_codes = self.codes[:sample]
+        self.backtest_codes = self.codes[:backtest_sample]   # 점수 시계열 백테스트는 종목당 수 초
+        self.workers = workers
+        # 단일 종목 채점 입력: 최근 1년 (스크리너 get_ohlcv 와 같은 길이)
+        self.year_frames = {code: frames[code].iloc[-250:] for code in self.sample_codes}
+
+
+def _bench_indicators(ctx: BenchContext) -> int:
+    from scoring.indicators import calculate_base_indicators
+    for df in ctx.year_frames.values():
+        calculate_base_indicators(df)
+    return len(ctx.year_frames)
+
+
+def _bench_scorer(version: str) -> Callable[[BenchContext], int]:
+    def run(ctx: BenchContext) -> int:
+        from scoring import SCORING_FUNCTIONS
+        func = SCORING_FUNCTIONS[version]
+        if version == 'v10':
+            today_changes = {code: float(df['Change'].iloc[-1] * 100) for code, df in ctx.year_frames.items()}
+            for code, df in ctx.year_frames.items():
+                func(df, code, today_changes)
+        else:
+            for df in ctx.year_frames.values():
+                func(df)
+        return len(ctx.year_frames)
+    return run
+
+
+def _bench_batch_scorer(ctx: BenchContext) -> int:
+    from scoring import BatchScorer
+    scorer = BatchScorer(versions=['v1', 'v2', 'v4', 'v5'])
+    scorer.score_batch(ctx.year_frames, parallel=True, max_workers=ctx.workers)
+    return len(ctx.year_frames)
+
+
+def _bench_screen(mode: str) -> Callable[[BenchContext], int]:
+    def run(ctx: BenchContext) -> int:
+        from market_screener import MarketScreener
+        screener = MarketScreener(max_workers=ctx.workers, scoring_version='v2')
+        screener.filtered_stocks = ctx.listing[ctx.listing['Code'].isin(ctx.sample_codes)]
+        screener.screen_all(mode=mode, progress_interval=10 ** 9)
+        return len(screener.filtered_stocks)
+    return run
+
+
+def _bench_intraday_cycle(ctx: BenchContext) -> int:
+    """10분 기록 사이클: 전 종목 120일 조회 + V1/V2/V4/V5 채점 (기록기와 같은 스레드 수)"""
+    import record_intraday_scores as recorder
+
+    def score(code):
+        df = recorder.get_stock_data(code, days=120)
+        if df is not None and len(df) >= 60:
+            recorder.calculate_scores(df)
+
+    with ThreadPoolExecutor(max_workers=recorder.MAX_WORKERS) as executor:
+        list(executor.map(score, ctx.codes))
+    return len(ctx.codes)
+
+
+def _bench_panel_backtest(ctx: BenchContext) -> int:
+    from backtest import PanelBacktest, PricePanel, swing_adapters
+    panel = PricePanel({code: ctx.frames[code] for code in ctx.backtest_codes})
+    start = panel.trading_days[-250]
+    PanelBacktest(panel).run_many(swing_adapters(('v6', 'v7', 'v8')), start=start, verbose=False)
+    return len(ctx.backtest_codes)
+
+
+def _setup_v10(ctx: BenchContext):
+    """V10 합성 레퍼런스 (표본 종목 수익률 상관관계)"""
+    from scoring.correlation_engine import build_reference_map, classify_pairs, correlation_matrix, correlation_pairs
+    from scoring.score_v10_leader_follower import set_reference
+
+    returns = pd.DataFrame({code: df['Change'] for code, df in ctx.year_frames.items()})
+    pairs = correlation_pairs(correlation_matrix(returns.to_numpy()), list(returns.columns), min_corr=0.3)
+    caps = ctx.listing.rename(columns={'Code': 'ticker', 'Name': 'name', 'Marcap': '시가총액'})
+    set_reference(build_reference_map(classify_pairs(pairs, caps), min_corr=0.3))
+
+
+def benchmark_cases() -> Dict[str, Tuple[Callable[[BenchContext], int], Optional[float]]]:
+    """{항목: (실행 함수 → 처리 종목 수, 마감 초 또는 None)}"""
+    from scoring import SCORING_FUNCTIONS
+
+    cases = {'indicators': (_bench_indicators, None)}
+    for version in SCORING_FUNCTIONS:
+        cases[f"score_{version}"] = (_bench_scorer(version), None)
+    cases.update({
+        'batch_scorer': (_bench_batch_scorer, None),
+        'screen_quick': (_bench_screen('quick'), None),
+        'screen_full': (_bench_screen('full'), None),
+        'intraday_cycle': (_bench_intraday_cycle, CYCLE_DEADLINE),
+        'panel_backtest': (_bench_panel_backtest, None),
+    })
+    return cases
+
+
+def select_cases(cases: Dict, patterns: Optional[List[str]]) -> Dict:
+    """--cases 필터 (정확히 일치 또는 접두어)"""
+    if not patterns:
+        return cases
+    return {name: case for name, case in cases.items()
+            if any(name == p or name.startswith(p) for p in patterns)}
+
+
+def run_benchmarks(ctx: BenchContext, cases: Dict, repeat: int = 1, verbose: bool = True) -> Dict[str, Dict]:
+    """항목별 repeat 회 실행 → 최소 소요시간 기준 결과"""
+    from scoring.indicators import clear_global_cache
+
+    if any(name == 'score_v10' for name in cases):
+        _setup_v10(ctx)
+
+    results = {}
+    for name, (func, budget) in cases.items():
+        timings = []
+        items = 0
+        error = None
+        for _ in range(repeat):
+            clear_global_cache()
+            t0 = time.perf_counter()
+            try:
+                with redirect_stdout(io.StringIO()):   # 스코어러/스크리너 진행 출력 숨김
+                    items = func(ctx)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                break
+            timings.append(time.perf_counter() - t0)
+
+        if error:
+            results[name] = {'error': error}
+            if verbose:
+                print(f"  {name:<16} 실패: {error}")
+            continue
+
+        seconds = min(timings)
+        per_item = seconds / items * 1000 if items else 0.0
+        results[name] = {
+            'seconds': round(seconds, 4),
+            'items': items,
+            'per_item_ms': round(per_item, 3),
+            'universe_seconds': round(per_item * len(ctx.codes) / 1000, 2),
+            'budget_seconds': budget,
+            'over_budget': bool(budget is not None and seconds > budget),
+        }
+        if verbose:
+            flag = ' ⚠ 마감 초과' if results[name]['over_budget'] else ''
+            print(f"  {name:<16} {seconds:>9.3f}s  ({items:,}종목, {per_item:.2f}ms/종목, "
+                  f"전종목 환산 {results[name]['universe_seconds']:.1f}s){flag}")
+    return results
+
+
+# ============================================================================
+# 리포트
+# ============================================================================
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def build_report(results: Dict[str, Dict], params: Dict) -> Dict:
+    return {
+        'meta': {
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            **params,
+        },
+        'cases': results,
+    }
+
+
+def compare_reports(base: Dict, current: Dict, tolerance: float = DEFAULT_TOLERANCE,
+                    cases: Iterable[str] = None) -> List[Dict]:
+    """
+    두 리포트 비교 (기준 리포트에서 측정된 항목)
+
+    기준에는 있는데 이번 실행에서 빠졌거나 실패한 항목도 회귀로 판정한다.
+
+    Args:
+        cases: 비교할 항목 (--cases 로 일부만 실행한 경우, None이면 기준 리포트 전체)
+
+    Returns:
+        [{case, base, current, ratio, regression, error}] — ratio = current / base (per_item_ms 기준),
+        빠졌거나 실패한 항목은 current/ratio 가 None
+    """
+    selected = set(cases) if cases is not None else None
+    rows = []
+    for name, old in base.get('cases', {}).items():
+        if 'per_item_ms' not in old or (selected is not None and name not in selected):
+            continue
+        cur = current.get('cases', {}).get(name)
+        if cur is None or 'per_item_ms' not in cur:
+            rows.append({
+                'case': name,
+                'base': old['per_item_ms'],
+                'current': None,
+                'ratio': None,
+                'regression': True,
+                'error': (cur or {}).get('error', '누락'),
+            })
+            continue
+        ratio = cur['per_item_ms'] / old['per_item_ms'] if old['per_item_ms'] else float('inf')
+        rows.append({
+            'case': name,
+            'base': old['per_item_ms'],
+            'current': cur['per_item_ms'],
+            'ratio': round(ratio, 3),
+            'regression': ratio > 1 + tolerance,
+            'error': None,
+        })
+    return rows
+
+
+def save_report(report: Dict, path: Path = None) -> Path:
+    if path is None:
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        path = OUTPUT_DIR / f"benchmark_{report['meta'].get('commit') or 'local'}_{stamp}.json"
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='스코어링/백테스트 성능 벤치마크 (합성 데이터)')
+    parser.add_argument('--tickers', type=int, default=2500, help='합성 종목 수 (기본: 2500)')
+    parser.add_argument('--years', type=int, default=3, help='합성 데이터 기간 (년, 기본: 3)')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+    parser.add_argument('--sample', type=int, default=500, help='종목별 채점 항목 표본 수 (기본: 500)')
+    parser.add_argument('--backtest-sample', type=int, default=20, help='panel_backtest 표본 수 (기본: 20)')
+    parser.add_argument('--workers', type=int, default=8, help='병렬 항목 워커 수 (기본: 8)')
+    parser.add_argument('--repeat', type=int, default=1, help='항목별 반복 횟수 (최소값 기록)')
+    parser.add_argument('--cases', type=str, default=None, help='측정 항목 (쉼표 구분, 접두어 허용)')
+    parser.add_argument('--output', type=str, default=None, help='리포트 저장 경로')
+    parser.add_argument('--compare', type=str, default=None, help='비교 기준 리포트 JSON')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='회귀 판정 허용치 (기본: 0.2)')
+    args = parser.parse_args()
+
+    print(f"합성 유니버스 생성: {args.tickers:,}종목 × {args.years}년 (seed {args.seed})")
+    t0 = time.perf_counter()
+    frames, listing = make_universe(args.tickers, args.years, args.seed)
+    print(f"    → {time.perf_counter() - t0:.1f}s")
+
+    ctx = BenchContext(frames, listing, sample=min(args.sample, args.tickers), workers=args.workers,
+                       backtest_sample=min(args.backtest_sample, args.tickers))
+    cases = select_cases(benchmark_cases(), args.cases.split(',') if args.cases else None)
+
+    print(f"벤치마크 {len(cases)}개 항목 (표본 {len(ctx.sample_codes):,}종목, 반복 {args.repeat}회)")
+    print("-" * 70)
+    with local_market_data(frames, listing):
+        results = run_benchmarks(ctx, cases, repeat=args.repeat)
+
+    report = build_report(results, {
+        'tickers': args.tickers, 'years': args.years, 'seed': args.seed,
+        'sample': len(ctx.sample_codes), 'backtest_sample': len(ctx.backtest_codes), 'workers': args.workers, 'repeat': args.repeat,
+    })
+    path = save_report(report, args.output)
+    print("-" * 70)
+    print(f"리포트 저장: {path}")
+
+    failed = any(r.get('over_budget') or 'error' in r for r in results.values())
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+        rows = compare_reports(base, report, args.tolerance, cases=list(cases) if args.cases else None)
+        print(f"\n[비교] 기준: {args.compare} (commit {base['meta'].get('commit')})")
+        for row in rows:
+            if row['current'] is None:
+                print(f"  {row['case']:<16} {row['base']:>9.2f} → {'-':>9} ms/종목  ⚠ 회귀 ({row['error']})")
+                continue
+            mark = ' ⚠ 회귀' if row['regression'] else ''
+            print(f"  {row['case']:<16} {row['base']:>9.2f} → {row['current']:>9.2f} ms/종목  "
+                  f"x{row['ratio']:.2f}{mark}")
+        failed = failed or any(row['regression'] for row in rows)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
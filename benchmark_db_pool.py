@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+SQLite 커넥션 풀 벤치마크
+- 기존 방식 (쿼리마다 sqlite3.connect, 롤백 저널) vs 풀 방식 (스레드별 커넥션 + WAL)
+- 자동매매 사이클처럼 작은 쿼리 다수를 여러 스레드에서 실행하여 queries/sec 비교
+
+사용법:
+    python benchmark_db_pool.py
+    python benchmark_db_pool.py --queries 5000 --threads 8
+"""
+
+import sys
+import os
+import sqlite3
+import argparse
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database.connection_pool import SQLitePool
+
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS trade_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        trade_date TEXT NOT NULL,
+        trade_time TEXT NOT NULL,
+        stock_code TEXT NOT NULL,
+        side TEXT NOT NULL,
+        quantity INTEGER NOT NULL,
+        price INTEGER,
+        status TEXT DEFAULT 'pending'
+    );
+    CREATE INDEX IF NOT EXISTS idx_trade_log_user ON trade_log(user_id);
+"""
+
+
+@contextmanager
+def legacy_connection(db_path):
+    """기존 TradeLogger._get_connection 과 동일한 방식"""
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def run_workload(get_conn, db_path, queries: int, threads: int, write_ratio: float) -> dict:
+    """스레드별로 읽기/쓰기 쿼리 혼합 실행"""
+    per_thread = queries // threads
+    write_every = max(1, int(1 / write_ratio)) if write_ratio > 0 else 0
+    errors = []
+
+    def worker(user_id):
+        for i in range(per_thread):
+            try:
+                with get_conn(db_path) as conn:
+                    if write_every and i % write_every == 0:
+                        conn.execute(
+                            "INSERT INTO trade_log (user_id, trade_date, trade_time, stock_code, side, quantity, price) "
+                            "VALUES (?, '2026-01-02', '09:00:00', ?, 'buy', 1, 10000)",
+                            (user_id, f"{i % 500:06d}")
+                        )
+                    else:
+                        conn.execute(
+                            "SELECT COUNT(*) FROM trade_log WHERE user_id = ?", (user_id,)
+                        ).fetchone()
+            except sqlite3.OperationalError as e:
+                errors.append(str(e))
+
+    workers = [threading.Thread(target=worker, args=(uid,)) for uid in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    done = per_thread * threads
+    return {
+        'queries': done,
+        'seconds': elapsed,
+        'qps': done / elapsed if elapsed > 0 else 0,
+        'errors': len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite 커넥션 풀 벤치마크')
+    parser.add_argument('--queries', type=int, default=20000, help='총 쿼리 수')
+    parser.add_argument('--threads', type=int, default=4, help='동시 스레드 수')
+    parser.add_argument('--write-ratio', type=float, default=0.1, help='쓰기 쿼리 비율')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = Path(tmp) / "legacy.db"
+        pooled_db = Path(tmp) / "pooled.db"
+        for path in (legacy_db, pooled_db):
+            conn = sqlite3.connect(str(path))
+            conn.executescript(SCHEMA)
+            conn.close()
+
+        pool = SQLitePool()
+
+        print(f"쿼리 {args.queries:,}개 / 스레드 {args.threads}개 / 쓰기 비율 {args.write_ratio:.0%}")
+        print("-" * 60)
+
+        before = run_workload(legacy_connection, legacy_db, args.queries, args.threads, args.write_ratio)
+        print(f"[기존] connect-per-query : {before['qps']:>10,.0f} q/s "
+              f"({before['seconds']:.2f}s, locked {before['errors']})")
+
+        after = run_workload(pool.connection, pooled_db, args.queries, args.threads, args.write_ratio)
+        print(f"[풀]   pooled + WAL      : {after['qps']:>10,.0f} q/s "
+              f"({after['seconds']:.2f}s, locked {after['errors']})")
+
+        if before['qps'] > 0:
+            print(f"\n속도 향상: {after['qps'] / before['qps']:.1f}x")
+        print(f"풀 통계: {pool.stats()}")
+        pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,7 @@ import FinanceDataReader as fdr
 
 from scoring import SCORING_FUNCTIONS
 from config import OUTPUT_DIR
+from backtest.score_cache import get_score_cache
 
 warnings.filterwarnings("ignore")
 
@@ -30,6 +31,7 @@ MIN_MARKET_CAP = 30_000_000_000
 MAX_MARKET_CAP = 1_000_000_000_000
 MIN_TRADING_AMOUNT = 300_000_000
 MAX_WORKERS = 5
+USE_SCORE_CACHE = True  # 점수 디스크 캐시 (--no-score-cache 로 끔)
 
 
 def get_kis_client():
@@ -100,12 +102,13 @@ def get_ohlcv(code: str, target_date: str) -> pd.DataFrame:
         return None
 
 
-def calculate_scores(df: pd.DataFrame) -> dict:
-    """V1-V4 점수 계산"""
+def calculate_scores(df: pd.DataFrame, code: str = None) -> dict:
+    """V1-V4 점수 계산 (code 지정 시 점수 디스크 캐시 사용)"""
     results = {}
+    cache = get_score_cache() if code and USE_SCORE_CACHE else None
     for version, func in SCORING_FUNCTIONS.items():
         try:
-            result = func(df)
+            result = cache.get_or_compute(version, func, code, df) if cache else func(df)
             results[version] = result['score'] if result else 0
         except:
             results[version] = 0
@@ -200,7 +203,7 @@ def analyze_stock_prev_day(stock_info: dict, prev_date: str) -> dict:
         if df is None or len(df) < 60:
             return None
 
-        scores = calculate_scores(df)
+        scores = calculate_scores(df, code)
         prev_data = get_prev_day_data(code, prev_date)
 
         if prev_data is None:
@@ -260,7 +263,7 @@ def analyze_date_pair(prev_date: str, curr_date: str, kis_client, top_n: int = 3
         # 당일 점수 계산
         df = get_ohlcv(code, curr_date)
         if df is not None and len(df) >= 60:
-            curr_score_cache[code] = calculate_scores(df)
+            curr_score_cache[code] = calculate_scores(df, code)
         else:
             curr_score_cache[code] = {}
 
@@ -274,6 +277,9 @@ def analyze_date_pair(prev_date: str, curr_date: str, kis_client, top_n: int = 3
             print(f"     → {i + 1}/{len(selected_codes)}")
         time.sleep(0.15)  # API 속도 제한
 
+    if USE_SCORE_CACHE:
+        get_score_cache().release()
+
     # 최종 결과 조합
     for version in SCORING_FUNCTIONS.keys():
         final_list = []
@@ -346,8 +352,12 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--days', type=int, default=20)
     parser.add_argument('--top', type=int, default=30)
+    parser.add_argument('--no-score-cache', action='store_true', help='점수 디스크 캐시 사용 안 함')
     args = parser.parse_args()
 
+    global USE_SCORE_CACHE
+    USE_SCORE_CACHE = not args.no_score_cache
+
     print("\n" + "=" * 60)
     print(f"  V1-V4 상위 {args.top}종목 데이터 추출")
     print(f"  기간: {args.days}일, 실행: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
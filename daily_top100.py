@@ -8,6 +8,14 @@
     python daily_top100.py --top 50     # 상위 50개만
     python daily_top100.py --email      # 실행 후 이메일 발송
     python daily_top100.py --schedule   # 스케줄러 모드 (18:00 자동 실행 + 이메일)
+    python daily_top100.py --resume <run_id>            # 실패한 실행을 이어서 진행
+    python daily_top100.py --resume <run_id> --rerun pdf  # 그 실행의 PDF(+이메일)만 다시 생성
+
+파이프라인 (stage_pipeline):
+    yesterday ─┐
+    screening ─┴→ prepare → excel / json / csv / pdf / email_body (병렬 프로세스) → email
+    - 스테이지 결과는 output/pipeline/{날짜}_{시각}_{버전}_{모드}_top{N}/ 에 캐시 (실행마다 새 디렉토리)
+    - --resume <run_id> 로 실패한 실행을 이어가면 완료된 스테이지(스크리닝 등)는 캐시에서 로드
 """
 
 import argparse
@@ -17,6 +25,9 @@ import sys
 from datetime import datetime
 import pandas as pd
 import time
+from functools import partial
+
+from stage_pipeline import Stage, StagePipeline, purge_runs
 
 from market_screener import MarketScreener, SignalFilter, format_result_table
 from config import (
@@ -27,7 +38,7 @@ from config import (
     SIGNAL_NAMES_KR,
     get_signal_kr,
 )
-from email_sender import send_daily_report
+from email_sender import create_email_body, send_daily_report
 from pdf_generator import generate_detailed_pdf
 from result_tracker import update_with_next_day_results, get_previous_result_file, get_yesterday_results, create_two_sheet_excel
 from streak_tracker import (
@@ -110,26 +121,16 @@ def categorize_results(results):
     return categorized
 
 
-def save_results(results, top_n=100, yesterday_df=None, yesterday_summary=None, stats=None, apply_improvements=True):
-    """결과 저장 (Excel 2시트, JSON, CSV, PDF)
+PIPELINE_DIR = OUTPUT_DIR / "pipeline"
+PIPELINE_RETENTION_DAYS = 14   # 실행 디렉토리 보관 기간 (이후 --resume 불가)
 
-    파일명 형식: top100_{version}_{date}.{ext}
-    - v2는 기본값이므로 버전 생략: top100_20260123.pdf
-    - v1, v3, v4는 버전 포함: top100_v4_20260123.pdf
 
-    Args:
-        results: 스크리닝 결과
-        top_n: 상위 N개 선정
-        yesterday_df: 전날 결과
-        yesterday_summary: 전날 요약
-        stats: 통계 정보
-        apply_improvements: 신뢰도 개선 적용 여부
-    """
-    # 스크리닝 버전 설정 (파일명에 반영)
-    scoring_version = stats.get('scoring_version', 'v2') if stats else 'v2'
-    OutputConfig.set_version(scoring_version)
-    print("\n[저장] 결과 파일 생성 중...")
+def prepare_results(results, top_n=100, stats=None, apply_improvements=True):
+    """상위 N개 추출 + 연속 출현/순위 변동 + 2단계 분류 (파일 저장 전 단계)
 
+    Returns:
+        dict: top_results (상위 N개), results (전체 - 상위 N개는 분류 정보 포함), stats
+    """
     # 상위 N개만 추출
     top_results = results[:top_n]
 
@@ -174,32 +175,215 @@ def save_results(results, top_n=100, yesterday_df=None, yesterday_summary=None,
     if stats:
         stats['streak_stats'] = streak_stats
 
-    # DataFrame 생성 (CSV용)
-    df = create_dataframe(top_results)
+    return {
+        "top_results": top_results,
+        "results": top_results + results[len(top_results):],
+        "stats": stats,
+    }
 
-    # 1. Excel 저장 (2개 시트: 내일의 관심종목 + 전일 결과)
-    excel_path = OutputConfig.get_filepath("excel")
-    create_two_sheet_excel(top_results, yesterday_df, yesterday_summary, excel_path)
+
+def render_excel(excel_path, prepared, yesterday):
+    """Excel 저장 (2개 시트: 내일의 관심종목 + 전일 결과)"""
+    yesterday_df, yesterday_summary = yesterday
+    create_two_sheet_excel(prepared["top_results"], yesterday_df, yesterday_summary, excel_path)
     print(f"    → Excel: {excel_path} (2개 시트)")
+    return str(excel_path)
+
 
-    # 2. JSON 저장
-    json_path = OutputConfig.get_filepath("json")
-    save_json(top_results, json_path, stats=stats)
+def render_json(json_path, prepared):
+    """JSON 저장"""
+    save_json(prepared["top_results"], json_path, stats=prepared["stats"])
     print(f"    → JSON: {json_path}")
+    return str(json_path)
+
 
-    # 3. CSV 저장
-    csv_path = OutputConfig.get_filepath("csv")
+def render_csv(csv_path, prepared):
+    """CSV 저장"""
+    df = create_dataframe(prepared["top_results"])
     df.to_csv(csv_path, index=False, encoding="utf-8-sig")
     print(f"    → CSV: {csv_path}")
+    return str(csv_path)
 
-    # 4. PDF 저장 (통계 포함)
-    pdf_path = OutputConfig.get_filepath("pdf")
-    generate_detailed_pdf(top_results, pdf_path, stats=stats)
+
+def render_pdf(pdf_path, prepared):
+    """PDF 저장 (통계 포함)"""
+    generate_detailed_pdf(prepared["top_results"], pdf_path, stats=prepared["stats"])
     print(f"    → PDF: {pdf_path}")
+    return str(pdf_path)
+
+
+def render_email_body(date_str, prepared):
+    """이메일 본문 HTML 생성"""
+    return create_email_body(prepared["results"], date_str)
+
+
+def save_results(results, top_n=100, yesterday_df=None, yesterday_summary=None, stats=None, apply_improvements=True):
+    """결과 저장 (Excel 2시트, JSON, CSV, PDF)
+
+    파일명 형식: top100_{version}_{date}.{ext}
+    - v2는 기본값이므로 버전 생략: top100_20260123.pdf
+    - v1, v3, v4는 버전 포함: top100_v4_20260123.pdf
+
+    Args:
+        results: 스크리닝 결과
+        top_n: 상위 N개 선정
+        yesterday_df: 전날 결과
+        yesterday_summary: 전날 요약
+        stats: 통계 정보
+        apply_improvements: 신뢰도 개선 적용 여부
+    """
+    # 스크리닝 버전 설정 (파일명에 반영)
+    scoring_version = stats.get('scoring_version', 'v2') if stats else 'v2'
+    OutputConfig.set_version(scoring_version)
+    print("\n[저장] 결과 파일 생성 중...")
+
+    prepared = prepare_results(results, top_n=top_n, stats=stats, apply_improvements=apply_improvements)
+
+    excel_path = render_excel(OutputConfig.get_filepath("excel"), prepared, (yesterday_df, yesterday_summary))
+    json_path = render_json(OutputConfig.get_filepath("json"), prepared)
+    csv_path = render_csv(OutputConfig.get_filepath("csv"), prepared)
+    render_pdf(OutputConfig.get_filepath("pdf"), prepared)
 
     return excel_path, json_path, csv_path
 
 
+def load_yesterday_results():
+    """전날 선정 종목 실적 추적
+
+    Returns:
+        (yesterday_df, yesterday_summary) - 전날 파일이 없으면 (None, None)
+    """
+    print("\n[1단계] 전날 선정 종목 실적 추적")
+    print("-" * 50)
+    prev_file = get_previous_result_file()
+    yesterday_df, yesterday_summary = None, None
+    if prev_file:
+        yesterday_df, yesterday_summary = get_yesterday_results(prev_file)
+        if yesterday_summary:
+            print(f"[추적] 전날 파일: {prev_file}")
+            print(f"    - 총 투자금: {yesterday_summary.get('total_investment', 0):,}원")
+            print(f"    - 총 회수금: {yesterday_summary.get('total_returns', 0):,}원")
+            print(f"    - 총 수익금: {yesterday_summary.get('total_profit', 0):,}원 ({yesterday_summary.get('total_profit_rate', 0)}%)")
+            print(f"    - 수익 종목: {yesterday_summary.get('success_count', 0)}개")
+            print(f"    - 손실 종목: {yesterday_summary.get('fail_count', 0)}개")
+    else:
+        print("[추적] 전날 파일 없음")
+    return yesterday_df, yesterday_summary
+
+
+def new_run_id(mode="full", top_n=100, scoring_version="v2", fetch_investor_data=False):
+    """실행마다 새 run_id (같은 날 여러 번 실행해도 스크리닝 캐시를 공유하지 않음)"""
+    run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{scoring_version}_{mode}_top{top_n}"
+    if fetch_investor_data:
+        run_id += "_investor"
+    return run_id
+
+
+def build_pipeline(mode="full", top_n=100, scoring_version="v2", fetch_investor_data=False,
+                   save=True, send_email=False, workers=4, run_id=None):
+    """TOP100 스테이지 파이프라인 구성
+
+    Args:
+        run_id: 이어서 실행할 run_id (None이면 새 실행 - 캐시 없이 처음부터)
+
+    Returns:
+        (StagePipeline, 최종 스테이지 목록)
+    """
+    OutputConfig.set_version(scoring_version)
+    today = datetime.now()
+    run_id = run_id or new_run_id(mode, top_n, scoring_version, fetch_investor_data)
+
+    def screening():
+        print("\n[2단계] 오늘의 스크리닝 실행")
+        print("-" * 50)
+        results, stats = run_screening(
+            mode=mode, top_n=top_n, scoring_version=scoring_version, fetch_investor_data=fetch_investor_data
+        )
+        if not results:
+            # 캐시하지 않도록 실패 처리
+            raise RuntimeError("스크리닝 결과가 없습니다.")
+        return results, stats
+
+    def prepare(screened):
+        results, stats = screened
+        return prepare_results(results, top_n=top_n, stats=stats)
+
+    def email(body, pdf_path=None):
+        # 실패는 캐시하지 않음 → --resume 재실행 시 이메일만 다시 시도 (성공 건은 중복 발송 안 함)
+        if not send_daily_report(None, pdf_path=pdf_path, body=body):
+            raise RuntimeError("이메일 발송 실패")
+        return True
+
+    # 렌더링 스테이지는 별도 프로세스 - 경로 인자를 partial 로 고정 (피클 가능)
+    paths = {kind: str(OutputConfig.get_filepath(kind)) for kind in ("excel", "json", "csv", "pdf")}
+    stages = [
+        Stage("yesterday", load_yesterday_results),
+        Stage("screening", screening),
+        Stage("prepare", prepare, deps=("screening",)),
+        Stage("excel", partial(render_excel, paths["excel"]), deps=("prepare", "yesterday"),
+              parallel=True, output=paths["excel"]),
+        Stage("json", partial(render_json, paths["json"]), deps=("prepare",), parallel=True, output=paths["json"]),
+        Stage("csv", partial(render_csv, paths["csv"]), deps=("prepare",), parallel=True, output=paths["csv"]),
+        Stage("pdf", partial(render_pdf, paths["pdf"]), deps=("prepare",), parallel=True, output=paths["pdf"]),
+        Stage("email_body", partial(render_email_body, today.strftime("%Y-%m-%d")), deps=("prepare",),
+              parallel=True),
+        # --no-save 면 PDF 없이 본문만 발송
+        Stage("email", email, deps=("email_body", "pdf") if save else ("email_body",)),
+    ]
+
+    targets = ["yesterday", "prepare"]
+    if save:
+        targets += ["excel", "json", "csv", "pdf"]
+    if send_email:
+        targets.append("email")
+
+    return StagePipeline(PIPELINE_DIR / run_id, stages, workers=workers), targets
+
+
+def run_pipeline(mode="full", top_n=100, scoring_version="v2", fetch_investor_data=False,
+                 save=True, send_email=False, workers=4, fresh=False, rerun=(), resume=None):
+    """스테이지 파이프라인 실행
+
+    캐시는 실패 후 이어서 실행할 때만 사용한다. resume 없이 실행하면 매번 새 run_id 로
+    스크리닝부터 다시 한다 (장전/장중/장마감 실행이 서로 결과를 재사용하지 않음).
+
+    Args:
+        fresh: resume 한 실행의 캐시 삭제 후 처음부터
+        rerun: 강제로 다시 실행할 스테이지 (하위 스테이지 포함)
+        resume: 이어서 실행할 run_id (실패 시 출력되는 값)
+
+    Returns:
+        (prepared 또는 None, pipeline) - prepared 는 prepare_results 결과
+    """
+    if resume and not (PIPELINE_DIR / resume).is_dir():
+        raise ValueError(f"이어서 실행할 파이프라인 없음: {resume}")
+    removed = purge_runs(PIPELINE_DIR, PIPELINE_RETENTION_DAYS, keep=[resume] if resume else ())
+    if removed:
+        print(f"[파이프라인] {PIPELINE_RETENTION_DAYS}일 지난 실행 {len(removed)}개 삭제")
+
+    pipeline, targets = build_pipeline(
+        mode=mode, top_n=top_n, scoring_version=scoring_version, fetch_investor_data=fetch_investor_data,
+        save=save, send_email=send_email, workers=workers, run_id=resume
+    )
+    if fresh:
+        pipeline.clear()
+    print(f"[파이프라인] run_id: {pipeline.run_dir.name}")
+
+    started = time.perf_counter()
+    results = pipeline.run(targets, force=rerun)
+    elapsed = time.perf_counter() - started
+
+    timings = pipeline.timings()
+    print(f"\n[파이프라인] 총 {elapsed:.1f}초 | " + ", ".join(
+        f"{name} {timings.get(name, 0):.1f}s" for name in pipeline.ancestors(targets)
+    ))
+    if pipeline.failed:
+        print(f"[파이프라인] 실패: {', '.join(pipeline.failed)} "
+              f"(--resume {pipeline.run_dir.name} 로 이 스테이지부터 이어서 진행)")
+
+    return results.get("prepare"), pipeline
+
+
 def create_dataframe(results):
     """결과를 DataFrame으로 변환"""
     rows = []
@@ -417,38 +601,14 @@ def run_with_schedule(send_email=True):
     def job():
         print(f"\n[스케줄] 자동 실행 시작: {datetime.now()}")
 
-        # 전날 결과 추적
-        print("\n[1단계] 전날 선정 종목 실적 추적")
-        print("-" * 50)
-        prev_file = get_previous_result_file()
-        yesterday_df, yesterday_summary = None, None
-        if prev_file:
-            yesterday_df, yesterday_summary = get_yesterday_results(prev_file)
-            if yesterday_summary:
-                print(f"[추적] 전날 파일: {prev_file}")
-                print(f"    - 총 투자금: {yesterday_summary.get('total_investment', 0):,}원")
-                print(f"    - 총 회수금: {yesterday_summary.get('total_returns', 0):,}원")
-                print(f"    - 총 수익금: {yesterday_summary.get('total_profit', 0):,}원 ({yesterday_summary.get('total_profit_rate', 0)}%)")
-        else:
-            print("[추적] 전날 파일 없음")
-
-        # 스크리닝 실행
-        print("\n[2단계] 오늘의 스크리닝 실행")
-        print("-" * 50)
-        results, stats = run_screening(mode=ScreeningConfig.MODE, top_n=ScreeningConfig.TOP_N)
-
-        if not results:
+        prepared, _ = run_pipeline(
+            mode=ScreeningConfig.MODE, top_n=ScreeningConfig.TOP_N, send_email=send_email
+        )
+        if prepared is None:
             print("[스케줄] 스크리닝 결과 없음")
             return
 
-        categorized = categorize_results(results)
-        save_results(results, top_n=ScreeningConfig.TOP_N, yesterday_df=yesterday_df, yesterday_summary=yesterday_summary, stats=stats)
-        print_summary(results, categorized)
-
-        # 이메일 발송
-        if send_email:
-            pdf_path = OutputConfig.get_filepath("pdf")
-            send_daily_report(results, pdf_path=pdf_path)
+        print_summary(prepared["results"], categorize_results(prepared["results"]))
 
     # 스케줄 등록
     run_time = f"{ScheduleConfig.RUN_HOUR:02d}:{ScheduleConfig.RUN_MINUTE:02d}"
@@ -481,6 +641,8 @@ def main():
   python daily_top100.py --full       # 전체 분석 (더 정확, 더 느림)
   python daily_top100.py --top 50     # 상위 50개만 선정
   python daily_top100.py --schedule   # 18:00 자동 실행 모드
+  python daily_top100.py --resume 20260115_180002_v2_full_top100            # 실패한 스테이지부터 이어서
+  python daily_top100.py --resume 20260115_180002_v2_full_top100 --rerun pdf  # PDF만 다시 생성
         """,
     )
 
@@ -506,6 +668,20 @@ def main():
         "--investor", action="store_true",
         help="네이버 금융 기관/외국인 수급 데이터 포함 (v4 전용)"
     )
+    parser.add_argument(
+        "--resume", metavar="RUN_ID", help="실패한 실행을 이어서 진행 (캐시된 스테이지 재사용)"
+    )
+    parser.add_argument(
+        "--fresh", action="store_true", help="--resume 실행의 캐시 무시하고 처음부터 실행"
+    )
+    parser.add_argument(
+        "--rerun", action="append", default=[], metavar="STAGE",
+        choices=["yesterday", "screening", "prepare", "excel", "json", "csv", "pdf", "email_body", "email"],
+        help="지정 스테이지(+하위)만 다시 실행"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="리포트 병렬 렌더링 프로세스 수 (기본: 4)"
+    )
 
     args = parser.parse_args()
 
@@ -522,61 +698,35 @@ def main():
     mode = "full"
 
     try:
-        # 전날 결과 추적 (다음날 실적 기록)
-        print("\n[1단계] 전날 선정 종목 실적 추적")
-        print("-" * 50)
-        prev_file = get_previous_result_file()
-        yesterday_df, yesterday_summary = None, None
-        if prev_file:
-            yesterday_df, yesterday_summary = get_yesterday_results(prev_file)
-            if yesterday_summary:
-                print(f"[추적] 전날 파일: {prev_file}")
-                print(f"    - 총 투자금: {yesterday_summary.get('total_investment', 0):,}원")
-                print(f"    - 총 회수금: {yesterday_summary.get('total_returns', 0):,}원")
-                print(f"    - 총 수익금: {yesterday_summary.get('total_profit', 0):,}원 ({yesterday_summary.get('total_profit_rate', 0)}%)")
-                print(f"    - 수익 종목: {yesterday_summary.get('success_count', 0)}개")
-                print(f"    - 손실 종목: {yesterday_summary.get('fail_count', 0)}개")
-        else:
-            print("[추적] 전날 파일 없음")
-
-        # 스크리닝 실행
-        print("\n[2단계] 오늘의 스크리닝 실행")
-        print("-" * 50)
-        results, stats = run_screening(
+        prepared, pipeline = run_pipeline(
             mode=mode,
             top_n=args.top,
             scoring_version=args.version,
-            fetch_investor_data=args.investor
+            fetch_investor_data=args.investor,
+            save=not args.no_save,
+            send_email=args.email,
+            workers=args.workers,
+            fresh=args.fresh,
+            rerun=args.rerun,
+            resume=args.resume,
         )
 
-        if not results:
+        if prepared is None:
             print("\n[오류] 스크리닝 결과가 없습니다.")
             sys.exit(1)
 
-        # 결과 분류
-        categorized = categorize_results(results)
-
-        # 결과 저장 (args.top 개수만큼)
-        if not args.no_save:
-            excel_path, json_path, csv_path = save_results(
-                results, top_n=args.top,
-                yesterday_df=yesterday_df,
-                yesterday_summary=yesterday_summary,
-                stats=stats
-            )
-
         # 요약 출력
-        print_summary(results, categorized)
-
-        # 이메일 발송
-        if args.email:
-            pdf_path = OutputConfig.get_filepath("pdf")
-            send_daily_report(results, pdf_path=pdf_path)
+        results = prepared["results"]
+        print_summary(results, categorize_results(results))
 
         print("\n" + "=" * 70)
         print(f"  완료: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 70 + "\n")
 
+        # 파일 생성 실패 시 비정상 종료 (이메일 실패는 로그만)
+        if [name for name in pipeline.failed if name != "email"]:
+            sys.exit(1)
+
     except KeyboardInterrupt:
         print("\n[중단] 사용자에 의해 중단되었습니다.")
         sys.exit(0)
@@ -10,12 +10,11 @@ import sys
 import argparse
 from datetime import datetime, timedelta
 from pathlib import Path
-from weasyprint import HTML, CSS
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from trading.trade_logger import TradeLogger
-from pdf_generator import get_base_css
+from pdf_generator import get_base_css, get_pdf_renderer, render_many
 
 
 def get_daily_report_css():
@@ -619,8 +618,12 @@ def generate_daily_report_html(user_id: int, report_date: str = None, save_snaps
     return html
 
 
-def generate_daily_report_pdf(user_id: int, output_path: str = None, report_date: str = None, save_snapshot: bool = True):
-    """일일 보고서 PDF 생성"""
+def build_daily_report(user_id: int, output_path: str = None, report_date: str = None, save_snapshot: bool = True):
+    """일일 보고서 HTML + 저장 경로
+
+    Returns:
+        (html, output_path) 또는 None (API 키 미설정)
+    """
     if report_date is None:
         report_date = datetime.now().strftime("%Y-%m-%d")
 
@@ -644,13 +647,50 @@ def generate_daily_report_pdf(user_id: int, output_path: str = None, report_date
         print(f"사용자 {user_id}의 API 키가 설정되지 않았습니다.")
         return None
 
-    css = CSS(string=get_daily_report_css())
-    HTML(string=html).write_pdf(output_path, stylesheets=[css])
+    return html, output_path
+
+
+def generate_daily_report_pdf(user_id: int, output_path: str = None, report_date: str = None, save_snapshot: bool = True):
+    """일일 보고서 PDF 생성"""
+    report = build_daily_report(user_id, output_path, report_date, save_snapshot=save_snapshot)
+    if report is None:
+        return None
+
+    html, output_path = report
+    get_pdf_renderer().render(html, output_path, css=get_daily_report_css())
 
     print(f"일일 보고서 생성 완료: {output_path}")
     return output_path
 
 
+def generate_all_daily_reports(users: list, save_snapshot: bool = True, workers: int = 4) -> dict:
+    """여러 사용자 보고서 생성 (HTML 은 순차, PDF 렌더링은 프로세스 풀)
+
+    Returns:
+        {user_id: pdf 경로} - 성공한 사용자만
+    """
+    css = get_daily_report_css()
+    user_ids, jobs = [], []
+    for user_id in users:
+        try:
+            report = build_daily_report(user_id, save_snapshot=save_snapshot)
+        except Exception as e:
+            print(f"  [{user_id}] 에러: {e}")
+            continue
+        if report is not None:
+            user_ids.append(user_id)
+            jobs.append((report[0], report[1], css))
+
+    pdf_paths = {}
+    for user_id, result in zip(user_ids, render_many(jobs, workers=workers)):
+        if isinstance(result, Exception):
+            print(f"  [{user_id}] PDF 생성 에러: {result}")
+            continue
+        print(f"일일 보고서 생성 완료: {result}")
+        pdf_paths[user_id] = result
+    return pdf_paths
+
+
 def save_all_users_snapshot():
     """모든 자동매매 사용자의 자산 스냅샷 저장 (크론용)"""
     logger = TradeLogger()
@@ -769,13 +809,13 @@ def generate_all_reports_and_email():
 
     print(f"일일 보고서 생성 시작 ({len(users)}명)")
 
-    for user_id in users:
+    # 보고서 생성 (스냅샷 저장 포함)
+    pdf_paths = generate_all_daily_reports(users, save_snapshot=True)
+
+    for user_id, pdf_path in pdf_paths.items():
         try:
-            # 보고서 생성 (스냅샷 저장 포함)
-            pdf_path = generate_daily_report_pdf(user_id=user_id, save_snapshot=True)
-            if pdf_path:
-                # 이메일 발송
-                send_report_email(user_id, pdf_path)
+            # 이메일 발송
+            send_report_email(user_id, pdf_path)
         except Exception as e:
             print(f"  [{user_id}] 에러: {e}")
 
@@ -809,8 +849,7 @@ def main():
                 cursor.execute("SELECT DISTINCT user_id FROM api_key_settings WHERE app_key IS NOT NULL")
                 users = [row['user_id'] for row in cursor.fetchall()]
             print(f"일일 보고서 생성 시작 ({len(users)}명)")
-            for user_id in users:
-                generate_daily_report_pdf(user_id=user_id, save_snapshot=not args.no_save)
+            generate_all_daily_reports(users, save_snapshot=not args.no_save)
         return
 
     # 단일 사용자 보고서
@@ -517,7 +517,7 @@ def run_analysis(stock, fund, tech, sent):
     try:
         td = tech.get_ohlcv(stock['code'])
         if td is not None and len(td) >= 60:
-            full_result = tech.analyze_full(td)
+            full_result = tech.analyze_full(td, code=stock['code'])
 
             if full_result:
                 # 기술적 점수 (60점 만점으로 정규화)
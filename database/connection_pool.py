@@ -0,0 +1,202 @@
+"""
+SQLite 커넥션 풀 모듈
+- DB 파일별 + 스레드별 커넥션 재사용 (쿼리마다 connect/close 하지 않음)
+- WAL 저널링 + synchronous/cache_size/mmap PRAGMA 튜닝
+- busy_timeout 으로 "database is locked" 대신 대기
+- sqlite3 statement cache 로 동일 SQL 재준비(prepare) 방지
+
+사용법:
+    from database.connection_pool import pooled_connection
+
+    with pooled_connection(db_path) as conn:
+        conn.execute("SELECT ...")
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+
+# 기본 PRAGMA (커넥션 생성 시 1회 적용)
+DEFAULT_PRAGMAS = {
+    "synchronous": "NORMAL",      # WAL 모드에서는 NORMAL 로도 커밋 내구성 보장
+    "cache_size": -20000,         # 음수 = KiB 단위 (약 20MB)
+    "mmap_size": 268435456,       # 256MB 메모리 맵 읽기
+    "temp_store": "MEMORY",
+}
+
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_CACHED_STATEMENTS = 256
+
+
+class _PooledConnection:
+    """풀에 보관되는 커넥션 + 중첩 사용 깊이"""
+
+    __slots__ = ("conn", "depth", "pid")
+
+    def __init__(self, conn: sqlite3.Connection, pid: int):
+        self.conn = conn
+        self.depth = 0
+        self.pid = pid
+
+
+class SQLitePool:
+    """스레드별 SQLite 커넥션 풀
+
+    sqlite3 커넥션은 스레드 간 공유가 안전하지 않으므로 (DB 경로, 스레드) 단위로
+    1개씩 유지한다. 같은 스레드에서 컨텍스트가 중첩되면 동일 커넥션을 재사용하고,
+    가장 바깥 컨텍스트에서만 commit/rollback 한다.
+    """
+
+    def __init__(
+        self,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+        pragmas: Optional[Dict] = None,
+        wal: bool = True,
+    ):
+        """
+        Args:
+            busy_timeout_ms: 잠금 대기 시간 (ms)
+            cached_statements: 커넥션당 prepared statement 캐시 크기
+            pragmas: 추가/변경할 PRAGMA (None이면 DEFAULT_PRAGMAS)
+            wal: WAL 저널 모드 사용 여부
+        """
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.wal = wal
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: list = []  # close_all() 용 (모든 스레드의 커넥션)
+        self._stats = {"created": 0, "reused": 0}
+
+    def _connections(self) -> Dict[Tuple[str, bool], _PooledConnection]:
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = {}
+            self._local.conns = conns
+        return conns
+
+    def _create(self, db_path: str, foreign_keys: bool) -> sqlite3.Connection:
+        """새 커넥션 생성 + PRAGMA 적용"""
+        conn = sqlite3.connect(
+            db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            cached_statements=self.cached_statements,
+            check_same_thread=False,  # close_all() 에서만 다른 스레드가 닫음
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+
+        if self.wal and db_path != ":memory:":
+            try:
+                conn.execute("PRAGMA journal_mode = WAL")
+            except sqlite3.OperationalError:
+                pass  # 읽기 전용/네트워크 FS 등 (기본 저널 모드 유지)
+
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+
+        if foreign_keys:
+            conn.execute("PRAGMA foreign_keys = ON")
+
+        with self._lock:
+            self._all.append(conn)
+            self._stats["created"] += 1
+        return conn
+
+    def _acquire(self, db_path, foreign_keys: bool) -> _PooledConnection:
+        key = (str(db_path), foreign_keys)
+        conns = self._connections()
+        pooled = conns.get(key)
+        pid = os.getpid()
+
+        # fork 된 자식 프로세스는 부모 커넥션을 쓰면 안 됨
+        if pooled is not None and pooled.pid != pid:
+            pooled = None
+
+        if pooled is None:
+            pooled = _PooledConnection(self._create(key[0], foreign_keys), pid)
+            conns[key] = pooled
+        else:
+            with self._lock:
+                self._stats["reused"] += 1
+        return pooled
+
+    @contextmanager
+    def connection(self, db_path, commit: bool = True, foreign_keys: bool = False):
+        """풀 커넥션 컨텍스트 매니저
+
+        Args:
+            db_path: DB 파일 경로
+            commit: True면 정상 종료 시 자동 commit (TradeLogger 방식),
+                    False면 호출자가 직접 commit (DatabaseManager 방식)
+                    - 커밋되지 않은 변경은 종료 시 rollback (기존 close() 와 동일)
+            foreign_keys: PRAGMA foreign_keys = ON 적용 여부
+        """
+        pooled = self._acquire(db_path, foreign_keys)
+        conn = pooled.conn
+        pooled.depth += 1
+        try:
+            yield conn
+            if pooled.depth == 1 and conn.in_transaction:
+                if commit:
+                    conn.commit()
+                else:
+                    conn.rollback()
+        except BaseException:
+            if pooled.depth == 1 and conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            pooled.depth -= 1
+
+    def close_thread(self):
+        """현재 스레드의 커넥션 모두 닫기"""
+        conns = self._connections()
+        for pooled in conns.values():
+            self._close(pooled.conn)
+        conns.clear()
+
+    def close_all(self):
+        """모든 스레드의 커넥션 닫기 (프로세스 종료/테스트 정리용)"""
+        with self._lock:
+            all_conns, self._all = self._all, []
+        for conn in all_conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def _close(self, conn: sqlite3.Connection):
+        with self._lock:
+            if conn in self._all:
+                self._all.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def stats(self) -> Dict:
+        """커넥션 생성/재사용 횟수"""
+        with self._lock:
+            return dict(self._stats, open=len(self._all))
+
+
+# 프로세스 전역 기본 풀
+_default_pool = SQLitePool()
+
+
+def get_pool() -> SQLitePool:
+    """기본 커넥션 풀 반환"""
+    return _default_pool
+
+
+def pooled_connection(db_path, commit: bool = True, foreign_keys: bool = False):
+    """기본 풀에서 커넥션 컨텍스트 획득 (SQLitePool.connection 참조)"""
+    return _default_pool.connection(db_path, commit=commit, foreign_keys=foreign_keys)
@@ -6,7 +6,36 @@ SQLite 데이터베이스 관리 모듈
 import sqlite3
 from pathlib import Path
 from datetime import datetime
-from contextlib import contextmanager
+
+from .connection_pool import pooled_connection
+from .write_batcher import get_write_batcher
+
+
+PRICE_CACHE_UPSERT_SQL = """
+    INSERT INTO price_cache (stock_code, stock_name, current_price, change, change_rate,
+        volume, trading_value, open_price, high_price, low_price, prev_close, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(stock_code) DO UPDATE SET
+        stock_name = excluded.stock_name,
+        current_price = excluded.current_price,
+        change = excluded.change,
+        change_rate = excluded.change_rate,
+        volume = excluded.volume,
+        trading_value = excluded.trading_value,
+        open_price = excluded.open_price,
+        high_price = excluded.high_price,
+        low_price = excluded.low_price,
+        prev_close = excluded.prev_close,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+def _price_cache_params(p):
+    """현재가 dict → PRICE_CACHE_UPSERT_SQL 바인딩 파라미터"""
+    return (p.get('stock_code'), p.get('stock_name'), p.get('current_price'),
+            p.get('change'), p.get('change_rate'), p.get('volume'),
+            p.get('trading_value'), p.get('open_price'), p.get('high_price'),
+            p.get('low_price'), p.get('prev_close'))
 
 
 class DatabaseManager:
@@ -19,16 +48,9 @@ class DatabaseManager:
         self.db_path.parent.mkdir(exist_ok=True)
         self.init_db()
 
-    @contextmanager
     def get_connection(self):
-        """데이터베이스 연결 컨텍스트 매니저"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """데이터베이스 연결 컨텍스트 매니저 (스레드별 풀 커넥션, 커밋은 호출자 담당)"""
+        return pooled_connection(self.db_path, commit=False, foreign_keys=True)
 
     def init_db(self):
         """테이블 생성"""
@@ -145,6 +167,17 @@ class DatabaseManager:
             self._migrate_push_columns(conn)
             self._migrate_profile_picture_column(conn)
             self._migrate_score_version_column(conn)
+            self._migrate_alert_history_columns(conn)
+
+    def _migrate_alert_history_columns(self, conn):
+        """alert_history 테이블에 종목명 컬럼 추가 (마이그레이션)"""
+        cursor = conn.execute("PRAGMA table_info(alert_history)")
+        columns = [row[1] for row in cursor.fetchall()]
+
+        if 'stock_name' not in columns:
+            conn.execute("ALTER TABLE alert_history ADD COLUMN stock_name TEXT")
+
+        conn.commit()
 
     def _migrate_telegram_columns(self, conn):
         """users 테이블에 telegram 관련 컬럼 추가 (마이그레이션)"""
@@ -404,6 +437,25 @@ class DatabaseManager:
             )
             return [dict(row) for row in cursor.fetchall()]
 
+    def get_portfolios(self, user_ids):
+        """여러 사용자의 포트폴리오 일괄 조회 {user_id: [항목]} (포트폴리오 없는 사용자는 빈 리스트)"""
+        user_ids = list(dict.fromkeys(user_ids))
+        portfolios = {user_id: [] for user_id in user_ids}
+        if not user_ids:
+            return portfolios
+        with self.get_connection() as conn:
+            for i in range(0, len(user_ids), 500):  # SQLite 바인딩 변수 수 제한
+                chunk = user_ids[i:i + 500]
+                cursor = conn.execute(
+                    f"SELECT user_id, id, stock_code, stock_name, buy_price, quantity, buy_date, memo FROM portfolios "
+                    f"WHERE user_id IN ({','.join('?' * len(chunk))}) ORDER BY created_at",
+                    chunk
+                )
+                for row in cursor.fetchall():
+                    item = dict(row)
+                    portfolios[item.pop('user_id')].append(item)
+        return portfolios
+
     def add_portfolio_item(self, user_id, stock_code, stock_name, buy_price, quantity, buy_date=None, memo=None):
         """포트폴리오 항목 추가"""
         with self.get_connection() as conn:
@@ -680,6 +732,39 @@ class DatabaseManager:
                 conn.execute("UPDATE users SET push_alerts_enabled = 0 WHERE id = ?", (user_id,))
             conn.commit()
 
+    def remove_push_subscriptions_by_endpoint(self, endpoints):
+        """만료된 푸시 구독 일괄 삭제 (알림 디스패처용)
+
+        구독이 모두 사라진 사용자는 푸시 알림 비활성화
+
+        Returns:
+            삭제된 구독 수
+        """
+        endpoints = list(dict.fromkeys(endpoints))
+        if not endpoints:
+            return 0
+
+        removed = 0
+        user_ids = set()
+        with self.get_connection() as conn:
+            for start in range(0, len(endpoints), 500):
+                chunk = endpoints[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                user_ids.update(row['user_id'] for row in conn.execute(
+                    f"SELECT DISTINCT user_id FROM push_subscriptions WHERE endpoint IN ({placeholders})", chunk
+                ).fetchall())
+                cursor = conn.execute(f"DELETE FROM push_subscriptions WHERE endpoint IN ({placeholders})", chunk)
+                removed += cursor.rowcount
+            if user_ids:
+                placeholders = ','.join('?' * len(user_ids))
+                conn.execute(f"""
+                    UPDATE users SET push_alerts_enabled = 0
+                    WHERE id IN ({placeholders})
+                    AND NOT EXISTS (SELECT 1 FROM push_subscriptions WHERE push_subscriptions.user_id = users.id)
+                """, tuple(user_ids))
+            conn.commit()
+        return removed
+
     def get_push_subscriptions(self, user_id):
         """사용자의 푸시 구독 목록"""
         with self.get_connection() as conn:
@@ -741,63 +826,56 @@ class DatabaseManager:
                            volume, trading_value, open_price, high_price, low_price, prev_close):
         """현재가 캐시 업데이트 (있으면 갱신, 없으면 삽입)"""
         with self.get_connection() as conn:
-            conn.execute("""
-                INSERT INTO price_cache (stock_code, stock_name, current_price, change, change_rate,
-                    volume, trading_value, open_price, high_price, low_price, prev_close, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(stock_code) DO UPDATE SET
-                    stock_name = excluded.stock_name,
-                    current_price = excluded.current_price,
-                    change = excluded.change,
-                    change_rate = excluded.change_rate,
-                    volume = excluded.volume,
-                    trading_value = excluded.trading_value,
-                    open_price = excluded.open_price,
-                    high_price = excluded.high_price,
-                    low_price = excluded.low_price,
-                    prev_close = excluded.prev_close,
-                    updated_at = CURRENT_TIMESTAMP
-            """, (stock_code, stock_name, current_price, change, change_rate,
-                  volume, trading_value, open_price, high_price, low_price, prev_close))
+            conn.execute(PRICE_CACHE_UPSERT_SQL, (
+                stock_code, stock_name, current_price, change, change_rate,
+                volume, trading_value, open_price, high_price, low_price, prev_close
+            ))
             conn.commit()
 
     def bulk_upsert_price_cache(self, prices):
-        """현재가 캐시 일괄 업데이트"""
-        with self.get_connection() as conn:
-            for p in prices:
-                conn.execute("""
-                    INSERT INTO price_cache (stock_code, stock_name, current_price, change, change_rate,
-                        volume, trading_value, open_price, high_price, low_price, prev_close, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    ON CONFLICT(stock_code) DO UPDATE SET
-                        stock_name = excluded.stock_name,
-                        current_price = excluded.current_price,
-                        change = excluded.change,
-                        change_rate = excluded.change_rate,
-                        volume = excluded.volume,
-                        trading_value = excluded.trading_value,
-                        open_price = excluded.open_price,
-                        high_price = excluded.high_price,
-                        low_price = excluded.low_price,
-                        prev_close = excluded.prev_close,
-                        updated_at = CURRENT_TIMESTAMP
-                """, (p.get('stock_code'), p.get('stock_name'), p.get('current_price'),
-                      p.get('change'), p.get('change_rate'), p.get('volume'),
-                      p.get('trading_value'), p.get('open_price'), p.get('high_price'),
-                      p.get('low_price'), p.get('prev_close')))
+        """현재가 캐시 일괄 업데이트 (executemany + 단일 트랜잭션)"""
+        rows = [_price_cache_params(p) for p in prices]
+        if not rows:
+            return
+        with self.get_connection() as conn:
+            conn.executemany(PRICE_CACHE_UPSERT_SQL, rows)
             conn.commit()
 
-    def get_cached_prices(self, stock_codes=None):
-        """캐시된 현재가 조회"""
-        with self.get_connection() as conn:
-            if stock_codes:
-                placeholders = ','.join('?' * len(stock_codes))
-                cursor = conn.execute(
-                    f"SELECT * FROM price_cache WHERE stock_code IN ({placeholders})",
-                    stock_codes
-                )
-            else:
-                cursor = conn.execute("SELECT * FROM price_cache")
+    def queue_price_cache(self, prices):
+        """현재가 캐시 지연 일괄 업데이트 (write-behind, 같은 종목은 마지막 값만 반영)
+
+        응답에 DB 반영 결과가 필요 없는 경로용. 즉시 반영은 flush_price_cache() 호출.
+        """
+        batcher = get_write_batcher(self.db_path)
+        for p in prices:
+            batcher.add(PRICE_CACHE_UPSERT_SQL, _price_cache_params(p), key=("price_cache", p.get('stock_code')))
+
+    def flush_price_cache(self):
+        """지연된 현재가 캐시 쓰기 즉시 반영"""
+        return get_write_batcher(self.db_path).flush()
+
+    def get_cached_prices(self, stock_codes=None, max_age_seconds=None):
+        """캐시된 현재가 조회
+
+        Args:
+            stock_codes: 종목코드 목록 (None이면 전체)
+            max_age_seconds: 이 시간(초)보다 오래된 캐시는 제외 (None이면 제한 없음)
+        """
+        where, params = [], []
+        if stock_codes:
+            stock_codes = list(stock_codes)
+            where.append(f"stock_code IN ({','.join('?' * len(stock_codes))})")
+            params.extend(stock_codes)
+        if max_age_seconds is not None:
+            # updated_at 은 CURRENT_TIMESTAMP (UTC)
+            where.append("updated_at >= datetime('now', ?)")
+            params.append(f"-{int(max_age_seconds)} seconds")
+
+        sql = "SELECT * FROM price_cache"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        with self.get_connection() as conn:
+            cursor = conn.execute(sql, params)
             return [dict(row) for row in cursor.fetchall()]
 
     def get_cached_price(self, stock_code):
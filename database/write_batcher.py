@@ -0,0 +1,180 @@
+"""
+SQLite 쓰기 배치 모듈 (write-behind)
+- 작은 INSERT/UPDATE 를 메모리에 모았다가 executemany + 단일 트랜잭션으로 일괄 반영
+- 건수(max_rows) 또는 경과 시간(max_delay) 초과 시 자동 flush
+- 주문 기록처럼 즉시 반영이 필요한 쓰기는 flush() 후 동기 실행
+- DB 파일당 1개를 프로세스 전체가 공유 → 미반영 값은 pending_params 로 어느 인스턴스에서나 조회
+
+사용법:
+    from database.write_batcher import get_write_batcher
+
+    batcher = get_write_batcher(db_path)
+    batcher.add("UPDATE holdings SET peak_profit_rate = ? WHERE id = ?", (3.2, 7), key=("peak", 7))
+    batcher.flush()  # 필요 시 즉시 반영
+"""
+
+import atexit
+import logging
+import threading
+from typing import Dict, Hashable, List, Optional, Sequence
+
+from .connection_pool import get_pool, pooled_connection
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_ROWS = 500
+DEFAULT_MAX_DELAY = 2.0  # 초
+
+
+class WriteBatcher:
+    """DB 파일 단위 write-behind 배치
+
+    같은 SQL 은 executemany 한 번으로 실행한다. SQL 간 실행 순서는 각 SQL 이
+    처음 추가된 순서를 따르므로, 서로 독립적인 upsert/update 에만 사용한다.
+    key 를 지정하면 같은 key 의 이전 대기 행을 덮어쓴다 (마지막 값만 반영).
+    """
+
+    def __init__(self, db_path, max_rows: int = DEFAULT_MAX_ROWS, max_delay: float = DEFAULT_MAX_DELAY):
+        """
+        Args:
+            db_path: DB 파일 경로
+            max_rows: 대기 행 수가 이 값 이상이면 즉시 flush
+            max_delay: 첫 대기 행 이후 이 시간(초)이 지나면 백그라운드 flush
+        """
+        self.db_path = db_path
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+
+        self._lock = threading.RLock()
+        self._pending: Dict[str, Dict[Hashable, Sequence]] = {}
+        self._count = 0
+        self._timer: Optional[threading.Timer] = None
+        self._seq = 0
+        self._stats = {"rows": 0, "flushes": 0, "coalesced": 0, "dropped": 0}
+
+    def add(self, sql: str, params: Sequence, key: Hashable = None):
+        """쓰기 대기열에 추가
+
+        Args:
+            sql: 실행할 SQL (플레이스홀더 포함)
+            params: 바인딩 파라미터
+            key: 중복 병합 키 (None이면 병합하지 않음)
+        """
+        with self._lock:
+            rows = self._pending.setdefault(sql, {})
+            if key is None:
+                self._seq += 1
+                key = ("_seq", self._seq)
+            if key in rows:
+                self._stats["coalesced"] += 1
+            else:
+                self._count += 1
+            rows[key] = tuple(params)
+
+            if self._count >= self.max_rows:
+                self.flush()
+            elif self._timer is None and self.max_delay > 0:
+                self._timer = threading.Timer(self.max_delay, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def add_many(self, sql: str, rows: List[Sequence]):
+        """여러 행 한 번에 추가 (병합 없음)"""
+        for params in rows:
+            self.add(sql, params)
+
+    def flush(self) -> int:
+        """대기 중인 쓰기를 단일 트랜잭션으로 반영
+
+        Returns:
+            반영한 행 수
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            if not self._count:
+                return 0
+
+            pending, self._pending = self._pending, {}
+            count, self._count = self._count, 0
+
+            # 실패 시 트랜잭션 전체 롤백 + 해당 배치 폐기 (스키마 오류 등으로 대기열이 막히지 않도록)
+            try:
+                with pooled_connection(self.db_path) as conn:
+                    for sql, rows in pending.items():
+                        conn.executemany(sql, list(rows.values()))
+            except Exception as e:
+                self._stats["dropped"] += count
+                logger.error(f"배치 쓰기 실패, {count}행 폐기 ({self.db_path}): {e}")
+                raise
+
+            self._stats["rows"] += count
+            self._stats["flushes"] += 1
+            return count
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            pass  # flush() 에서 로깅
+        finally:
+            # 타이머 스레드는 1회용이므로 풀 커넥션도 함께 정리
+            get_pool().close_thread()
+
+    def pending_params(self, sql: str, key: Hashable) -> Optional[tuple]:
+        """아직 반영되지 않은 key 행의 파라미터 (없으면 None)
+
+        flush 중에는 커밋이 끝날 때까지 기다리므로, DB 조회 전에 호출하면
+        (대기 값, DB 값) 중 하나에는 항상 최신 값이 있다.
+        """
+        with self._lock:
+            return self._pending.get(sql, {}).get(key)
+
+    def pending_rows(self, sql: str) -> Dict[Hashable, tuple]:
+        """아직 반영되지 않은 SQL 의 대기 행 {key: 파라미터} 사본"""
+        with self._lock:
+            return dict(self._pending.get(sql, {}))
+
+    @property
+    def pending_count(self) -> int:
+        """대기 중인 행 수"""
+        return self._count
+
+    def stats(self) -> Dict:
+        """반영 행 수 / flush 횟수 / 병합 횟수 / 폐기 행 수"""
+        with self._lock:
+            return dict(self._stats, pending=self._count)
+
+
+_batchers: Dict[str, WriteBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_write_batcher(db_path, **kwargs) -> WriteBatcher:
+    """DB 파일별 프로세스 공용 WriteBatcher 반환"""
+    key = str(db_path)
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            batcher = WriteBatcher(db_path, **kwargs)
+            _batchers[key] = batcher
+        return batcher
+
+
+def flush_all():
+    """모든 배치 대기열 반영 (프로세스 종료 시 자동 호출)"""
+    with _batchers_lock:
+        batchers = list(_batchers.values())
+    for batcher in batchers:
+        try:
+            batcher.flush()
+        except Exception:
+            pass  # flush() 에서 로깅
+
+
+atexit.register(flush_all)
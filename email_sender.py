@@ -326,13 +326,14 @@ def create_email_body(results, date_str=None):
     return html
 
 
-def send_daily_report(results, pdf_path=None):
+def send_daily_report(results, pdf_path=None, body=None):
     """
     일일 리포트 발송
 
     Args:
         results: 스크리닝 결과 리스트
         pdf_path: PDF 첨부파일 경로
+        body: 미리 생성한 본문 HTML (None이면 results로 생성)
     """
     sender = EmailSender(use_db_subscribers=True)
 
@@ -348,7 +349,8 @@ def send_daily_report(results, pdf_path=None):
     date_str = datetime.now().strftime("%Y-%m-%d")
     subject = f"[Kim's AI] 내일의 관심 종목 TOP 100 ({date_str})"
 
-    body = create_email_body(results, date_str)
+    if body is None:
+        body = create_email_body(results, date_str)
 
     attachments = []
     if pdf_path and Path(pdf_path).exists():
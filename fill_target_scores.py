@@ -12,7 +12,7 @@ from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
-from scoring import SCORING_FUNCTIONS
+from scoring import SCORING_FUNCTIONS, IndicatorContext
 
 INPUT_FILE = '/home/kimhc/Stock/output/target_stocks.xlsx'
 OUTPUT_FILE = '/home/kimhc/Stock/output/target_stocks_filled.xlsx'
@@ -30,11 +30,12 @@ def get_ohlcv(code: str, target_date: str) -> pd.DataFrame:
 
 
 def calculate_scores(df: pd.DataFrame) -> dict:
-    """V1-V4 점수 계산"""
+    """V1-V4 점수 계산 (지표는 버전 간 공유)"""
     results = {}
+    ctx = IndicatorContext(df)
     for version, func in SCORING_FUNCTIONS.items():
         try:
-            result = func(df)
+            result = func(df, ctx=ctx)
             results[version] = result['score'] if result else None
         except:
             results[version] = None
@@ -32,6 +32,7 @@ from scoring import (
     SCORING_FUNCTIONS,
 )
 from config import OUTPUT_DIR
+from backtest.score_cache import get_score_cache
 
 warnings.filterwarnings("ignore")
 
@@ -40,6 +41,7 @@ MIN_MARKET_CAP = 30_000_000_000  # 최소 시총 300억
 MAX_MARKET_CAP = 1_000_000_000_000  # 최대 시총 1조
 MIN_TRADING_AMOUNT = 300_000_000  # 최소 거래대금 3억
 MAX_WORKERS = 5  # 병렬 처리 워커 수
+USE_SCORE_CACHE = True  # 점수 디스크 캐시 (--no-score-cache 로 끔)
 
 
 def get_trading_days(num_days: int = 20) -> list:
@@ -162,9 +164,9 @@ def get_next_day_return(code: str, target_date: str) -> tuple:
         return None, None
 
 
-def calculate_all_versions_score(df: pd.DataFrame) -> dict:
+def calculate_all_versions_score(df: pd.DataFrame, code: str = None) -> dict:
     """
-    모든 버전의 점수 계산
+    모든 버전의 점수 계산 (code 지정 시 점수 디스크 캐시 사용)
 
     Returns:
         {
@@ -174,10 +176,11 @@ def calculate_all_versions_score(df: pd.DataFrame) -> dict:
         }
     """
     results = {}
+    cache = get_score_cache() if code and USE_SCORE_CACHE else None
 
     for version, func in SCORING_FUNCTIONS.items():
         try:
-            result = func(df)
+            result = cache.get_or_compute(version, func, code, df) if cache else func(df)
             if result:
                 results[version] = {
                     'score': result['score'],
@@ -205,7 +208,7 @@ def analyze_single_stock(stock_info: dict, target_date: str) -> dict:
             return None
 
         # 모든 버전 점수 계산
-        scores = calculate_all_versions_score(df)
+        scores = calculate_all_versions_score(df, code)
 
         # 다음날 수익률
         next_return, next_close = get_next_day_return(code, target_date)
@@ -264,6 +267,8 @@ def analyze_date(date_str: str, top_n: int = 20) -> dict:
 
     elapsed = time.time() - start_time
     print(f"  → {len(all_results)}개 종목 완료 ({elapsed:.1f}초)")
+    if USE_SCORE_CACHE:
+        get_score_cache().release()
 
     # 버전별 상위 N개 선정
     version_results = {'date': date_str}
@@ -428,8 +433,12 @@ def main():
     parser = argparse.ArgumentParser(description='V1-V4 스코어링 버전별 적중률 비교')
     parser.add_argument('--days', type=int, default=20, help='분석할 거래일 수 (기본: 20)')
     parser.add_argument('--top', type=int, default=20, help='버전별 상위 종목 수 (기본: 20)')
+    parser.add_argument('--no-score-cache', action='store_true', help='점수 디스크 캐시 사용 안 함')
     args = parser.parse_args()
 
+    global USE_SCORE_CACHE
+    USE_SCORE_CACHE = not args.no_score_cache
+
     print("\n" + "=" * 70)
     print(f"  V1-V4 스코어링 버전별 적중률 비교 분석")
     print(f"  분석 기간: {args.days} 거래일, 버전별 상위 {args.top}종목")
@@ -278,6 +278,9 @@ def get_short_data_batch(stock_codes: List[str], days: int = 10, max_workers: in
     """
     여러 종목의 공매도 정보 일괄 조회
 
+    공용 수급 캐시(services.flow_cache)를 거쳐 당일 이미 조회한 종목은 다시 조회하지 않는다.
+    속도 제한은 캐시의 토큰 버킷이 담당한다.
+
     Args:
         stock_codes: 종목코드 리스트
         days: 조회할 일수
@@ -286,29 +289,10 @@ def get_short_data_batch(stock_codes: List[str], days: int = 10, max_workers: in
     Returns:
         {종목코드: 공매도정보} 딕셔너리
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-
-    results = {}
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_code = {
-            executor.submit(get_short_data, code, days): code
-            for code in stock_codes
-        }
-
-        for future in as_completed(future_to_code):
-            code = future_to_code[future]
-            try:
-                result = future.result()
-                if result:
-                    results[code] = result
-            except Exception:
-                pass
-
-            # Rate limiting
-            time.sleep(0.1)
+    from services.flow_cache import get_flow_cache
 
-    return results
+    results = get_flow_cache().get_short_many(stock_codes, days=days, max_workers=max_workers)
+    return {code: data for code, data in results.items() if data}
 
 
 # 테스트
@@ -214,7 +214,7 @@ class MarketScreener:
                 return None
             # 분석 수행
             if mode == "quick":
-                result = self.tech_analyst.get_quick_score(df)
+                result = self.tech_analyst.get_quick_score(df, code=code)
                 if result is None:
                     return None
                 return {
@@ -234,7 +234,7 @@ class MarketScreener:
                     result = self.scoring_func(df)
                 else:
                     # 기본: 변별력 강화 버전 (래치 전략)
-                    result = self.tech_analyst.analyze_trend_following_strict(df)
+                    result = self.tech_analyst.analyze_trend_following_strict(df, code=code)
 
                 if result is None:
                     return None
@@ -398,7 +398,9 @@ class MarketScreener:
 
     def enrich_with_investor_data(self, results, max_stocks=200):
         """
-        상위 종목에 네이버 금융 수급 데이터 추가 (V4 전용)
+        상위 종목에 외국인/기관 수급 데이터 추가 (V4 전용)
+
+        공용 수급 캐시(services.flow_cache)에서 읽으며, 당일 아직 조회하지 않은 종목만 일괄 조회한다.
 
         Args:
             results: 스크리닝 결과 리스트
@@ -416,15 +418,15 @@ class MarketScreener:
         print(f"    → 상위 {min(len(results), max_stocks)}개 종목 수급 데이터 조회 중...")
 
         try:
-            from naver_investor import get_investor_trends_batch
-            from scoring.scoring_v4 import calculate_score_v4
+            from services.flow_cache import get_flow_cache
 
             # 상위 종목 코드 추출
             codes = [r['code'] for r in results[:max_stocks]]
 
-            # 일괄 조회
+            # 일괄 조회 (캐시 미스 종목만)
             start_time = time.time()
-            investor_data = get_investor_trends_batch(codes, days=5, max_workers=self.max_workers)
+            flows = get_flow_cache().get_investor_many(codes, days=5, max_workers=self.max_workers)
+            investor_data = {code: inv for code, inv in flows.items() if inv}
             elapsed = time.time() - start_time
             print(f"    → 수급 데이터 조회 완료: {len(investor_data)}개 ({elapsed:.1f}초)")
 
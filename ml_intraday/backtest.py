@@ -8,6 +8,7 @@
     python ml_intraday/backtest.py                     # 기본 백테스트
     python ml_intraday/backtest.py --report            # 상세 리포트
     python ml_intraday/backtest.py --threshold 0.7    # 확률 임계값 변경
+    python ml_intraday/backtest.py --loop             # 행 단위 루프 시뮬레이션 (검증용)
 """
 
 import os
@@ -257,41 +258,24 @@ def load_test_data(horizon: str = '10min') -> pd.DataFrame:
     return test_df
 
 
-def run_backtest(
-    horizon: str = '10min',
-    min_probability: float = 0.6,
-    max_positions: int = 5,
-    position_size: float = 0.1,  # 총 자산의 10%
-    use_scores: bool = True
-) -> Dict:
+def prepare_backtest_data(horizon: str = '10min') -> pd.DataFrame:
     """
-    백테스트 실행
-
-    Args:
-        horizon: 예측 범위
-        min_probability: 최소 BUY 확률
-        max_positions: 최대 포지션 수
-        position_size: 포지션 크기 (자산 대비 비율)
-        use_scores: V2/V4 스코어 필터 사용
+    모델 로드 + 테스트 데이터 로드 + 예측 (임계값과 무관, 1번만 실행)
 
     Returns:
-        백테스트 결과
+        buy_prob/sell_prob/pred 가 붙은 날짜+시간순 DataFrame (실패 시 빈 DataFrame)
     """
-    print("=" * 60)
-    print("  백테스트")
-    print("=" * 60)
-
     # 모델 로드
     print(f"\n[1] 모델 로드 (horizon={horizon})...")
     model, feature_names = load_model(horizon)
     if model is None:
-        return {}
+        return pd.DataFrame()
 
     # 데이터 로드
     print(f"\n[2] 테스트 데이터 로드...")
     df = load_test_data(horizon)
     if df.empty:
-        return {}
+        return pd.DataFrame()
 
     print(f"  {len(df):,}샘플, {df['date'].nunique()}일")
 
@@ -305,12 +289,143 @@ def run_backtest(
     df['sell_prob'] = proba[:, LABEL_ENCODING['SELL']]
     df['pred'] = model.predict(X)
 
-    # 백테스트 엔진
-    print(f"\n[4] 백테스트 실행...")
+    # 날짜+시간순 정렬
+    return df.sort_values(['date', 'time']).reset_index(drop=True)
+
+
+def _last_close_by_day(day_ids: np.ndarray, codes: np.ndarray, close: np.ndarray, mask: np.ndarray = None) -> Dict:
+    """일별 {종목: 마지막 행 종가} (mask 가 있으면 해당 행만)"""
+    frame = pd.DataFrame({'day': day_ids, 'code': codes, 'close': close})
+    if mask is not None:
+        frame = frame[mask]
+    last = frame.drop_duplicates(['day', 'code'], keep='last')
+    return {day: dict(zip(g['code'], g['close'])) for day, g in last.groupby('day', sort=False)}
+
+
+def simulate(
+    df: pd.DataFrame,
+    min_probability: float = 0.6,
+    max_positions: int = 5,
+    position_size: float = 0.1,
+    use_scores: bool = True,
+    vectorized: bool = True
+) -> Tuple[BacktestEngine, int, int]:
+    """
+    예측 결과로 매매 시뮬레이션
+
+    simulate_loop() 와 같은 규칙/비용(BacktestEngine.buy/sell)으로 동작하되
+    - 컬럼을 numpy 배열로 꺼내 행 단위 Series 생성 없이 순회
+    - 종목의 첫 BUY 신호 이전 행은 (보유 불가능하므로) 건너뜀
+    - 포트폴리오 평가용 일별 종목 종가/장마감 청산가는 미리 1번 계산
+
+    Args:
+        vectorized: False면 simulate_loop() 사용
+
+    Returns:
+        (엔진, BUY 신호 수, 스코어 필터 수)
+    """
+    if not vectorized:
+        return simulate_loop(df, min_probability, max_positions, position_size, use_scores)
+
     engine = BacktestEngine()
+    if df.empty:
+        return engine, 0, 0
+
+    # 처리 순서: 날짜 첫 등장 순 → 날짜 안에서는 원래 행 순서
+    day_ids, day_values = pd.factorize(df['date'])
+    order = np.argsort(day_ids, kind='stable')
+    day_ids = day_ids[order]
+
+    codes = df['code'].to_numpy(dtype=object)[order]
+    times = df['time'].to_numpy(dtype=object)[order]
+    dates = df['date'].to_numpy(dtype=object)[order]
+    close = df['close'].to_numpy(dtype=float)[order]
+    buy_prob = df['buy_prob'].to_numpy(dtype=float)[order]
+    sell_prob = df['sell_prob'].to_numpy(dtype=float)[order]
+    v2 = df['v2_score'].to_numpy(dtype=float)[order] if 'v2_score' in df.columns else np.zeros(len(df))
+    v4 = df['v4_score'].to_numpy(dtype=float)[order] if 'v4_score' in df.columns else np.zeros(len(df))
+
+    signal = buy_prob >= min_probability
+    # 종목별 첫 BUY 신호 이후 행만 보유/매매 가능
+    active = pd.Series(signal).groupby(pd.factorize(codes)[0]).cummax().to_numpy()
+
+    # 보유 종목 평가가 (당일 마지막 종가) / 장마감 청산가 (150000 이후 마지막 종가)
+    last_close = _last_close_by_day(day_ids, codes, close)
+    closing_close = _last_close_by_day(day_ids, codes, close, mask=df['time'].to_numpy()[order] >= '150000')
+
+    stop_loss = BACKTEST_CONFIG['stop_loss'] * 100
+    take_profit = BACKTEST_CONFIG['take_profit'] * 100
+    min_v2 = BACKTEST_CONFIG['min_score_v2']
+    min_v4 = BACKTEST_CONFIG['min_score_v4']
 
-    # 날짜+시간순 정렬
-    df = df.sort_values(['date', 'time']).reset_index(drop=True)
+    buy_signals = 0
+    filtered_by_score = 0
+
+    bounds = np.searchsorted(day_ids, np.arange(len(day_values) + 1))
+    for day in range(len(day_values)):
+        start, end = bounds[day], bounds[day + 1]
+        day_prices = last_close[day]
+
+        for i in np.flatnonzero(active[start:end]) + start:
+            code = codes[i]
+            price = close[i]
+
+            # 매도 조건 체크 (보유 종목)
+            pos = engine.positions.get(code)
+            if pos is not None:
+                pnl_pct = (price - pos['avg_price']) / pos['avg_price'] * 100
+
+                if pnl_pct <= stop_loss:
+                    engine.sell(code, price, f"{dates[i]}_{times[i]}", 'stop_loss')
+                    continue
+                if pnl_pct >= take_profit:
+                    engine.sell(code, price, f"{dates[i]}_{times[i]}", 'take_profit')
+                    continue
+                if sell_prob[i] > 0.6:
+                    engine.sell(code, price, f"{dates[i]}_{times[i]}", 'ml_signal')
+                    continue
+
+            # 매수 조건 체크
+            if not signal[i]:
+                continue
+            buy_signals += 1
+
+            if len(engine.positions) >= max_positions:
+                continue
+
+            if use_scores and (v2[i] < min_v2 or v4[i] < min_v4):
+                filtered_by_score += 1
+                continue
+
+            portfolio_value = engine.get_portfolio_value(day_prices)
+            engine.buy(code, price, portfolio_value * position_size, f"{dates[i]}_{times[i]}", buy_prob[i])
+
+        # 일말 청산 (장 종료 시 모든 포지션 청산)
+        closing = closing_close.get(day, {})
+        for code in list(engine.positions.keys()):
+            if code in closing:
+                engine.sell(code, closing[code], f"{day_values[day]}_closing", 'day_end')
+
+        # 자산 기록
+        engine.record_equity(day_values[day], day_prices)
+
+    return engine, buy_signals, filtered_by_score
+
+
+def simulate_loop(
+    df: pd.DataFrame,
+    min_probability: float = 0.6,
+    max_positions: int = 5,
+    position_size: float = 0.1,
+    use_scores: bool = True
+) -> Tuple[BacktestEngine, int, int]:
+    """
+    예측 결과로 매매 시뮬레이션 (행 단위 루프, simulate() 검증용 기준 구현)
+
+    Returns:
+        (엔진, BUY 신호 수, 스코어 필터 수)
+    """
+    engine = BacktestEngine()
 
     # 시뮬레이션
     buy_signals = 0
@@ -388,6 +503,46 @@ def run_backtest(
         # 자산 기록
         engine.record_equity(date, current_prices)
 
+    return engine, buy_signals, filtered_by_score
+
+
+def run_backtest(
+    horizon: str = '10min',
+    min_probability: float = 0.6,
+    max_positions: int = 5,
+    position_size: float = 0.1,  # 총 자산의 10%
+    use_scores: bool = True,
+    data: pd.DataFrame = None,
+    vectorized: bool = True
+) -> Dict:
+    """
+    백테스트 실행
+
+    Args:
+        horizon: 예측 범위
+        min_probability: 최소 BUY 확률
+        max_positions: 최대 포지션 수
+        position_size: 포지션 크기 (자산 대비 비율)
+        use_scores: V2/V4 스코어 필터 사용
+        data: prepare_backtest_data() 결과 (None이면 새로 로드/예측)
+        vectorized: False면 행 단위 루프(simulate_loop) 사용
+
+    Returns:
+        백테스트 결과
+    """
+    print("=" * 60)
+    print("  백테스트")
+    print("=" * 60)
+
+    df = prepare_backtest_data(horizon) if data is None else data
+    if df.empty:
+        return {}
+
+    # 백테스트 엔진
+    print(f"\n[4] 백테스트 실행...")
+    engine, buy_signals, filtered_by_score = simulate(df, min_probability, max_positions, position_size, use_scores,
+                                                      vectorized=vectorized)
+
     # 결과 분석
     print(f"\n[5] 결과 분석...")
     results = analyze_results(engine, buy_signals, filtered_by_score)
@@ -398,9 +553,10 @@ def run_backtest(
 def analyze_results(
     engine: BacktestEngine,
     total_signals: int,
-    filtered_signals: int
+    filtered_signals: int,
+    verbose: bool = True
 ) -> Dict:
-    """백테스트 결과 분석"""
+    """백테스트 결과 분석 (verbose=False면 출력 생략, 스윕용)"""
     trades_df = pd.DataFrame(engine.trades)
     equity_df = pd.DataFrame(engine.equity_curve)
 
@@ -414,7 +570,8 @@ def analyze_results(
     }
 
     if sell_trades.empty:
-        print("  거래 없음")
+        if verbose:
+            print("  거래 없음")
         return results
 
     # 승률
@@ -459,31 +616,32 @@ def analyze_results(
     }).round(2)
 
     # 출력
-    print("\n" + "=" * 40)
-    print("  백테스트 결과")
-    print("=" * 40)
-    print(f"\n[거래 통계]")
-    print(f"  총 신호: {results['total_signals']:,}")
-    print(f"  스코어 필터: {results['filtered_by_score']:,}")
-    print(f"  실행 거래: {results['total_trades']:,}")
-    print(f"  승: {results['wins']:,}, 패: {results['losses']:,}")
-    print(f"  승률: {results['win_rate']*100:.1f}%")
-
-    print(f"\n[수익률]")
-    print(f"  평균: {results['avg_return']:.2f}%")
-    print(f"  중앙값: {results['median_return']:.2f}%")
-    print(f"  표준편차: {results['std_return']:.2f}%")
-    print(f"  총 수익: {results['total_profit']:,.0f}원")
-
-    print(f"\n[포트폴리오]")
-    print(f"  초기 자산: {engine.initial_capital:,.0f}원")
-    print(f"  최종 자산: {results['final_equity']:,.0f}원")
-    print(f"  총 수익률: {results['total_return']:.2f}%")
-    print(f"  최대 낙폭: {results['max_drawdown']:.2f}%")
-    print(f"  Sharpe Ratio: {results['sharpe_ratio']:.2f}")
-
-    print(f"\n[매도 사유별]")
-    print(reason_stats.to_string())
+    if verbose:
+        print("\n" + "=" * 40)
+        print("  백테스트 결과")
+        print("=" * 40)
+        print(f"\n[거래 통계]")
+        print(f"  총 신호: {results['total_signals']:,}")
+        print(f"  스코어 필터: {results['filtered_by_score']:,}")
+        print(f"  실행 거래: {results['total_trades']:,}")
+        print(f"  승: {results['wins']:,}, 패: {results['losses']:,}")
+        print(f"  승률: {results['win_rate']*100:.1f}%")
+
+        print(f"\n[수익률]")
+        print(f"  평균: {results['avg_return']:.2f}%")
+        print(f"  중앙값: {results['median_return']:.2f}%")
+        print(f"  표준편차: {results['std_return']:.2f}%")
+        print(f"  총 수익: {results['total_profit']:,.0f}원")
+
+        print(f"\n[포트폴리오]")
+        print(f"  초기 자산: {engine.initial_capital:,.0f}원")
+        print(f"  최종 자산: {results['final_equity']:,.0f}원")
+        print(f"  총 수익률: {results['total_return']:.2f}%")
+        print(f"  최대 낙폭: {results['max_drawdown']:.2f}%")
+        print(f"  Sharpe Ratio: {results['sharpe_ratio']:.2f}")
+
+        print(f"\n[매도 사유별]")
+        print(reason_stats.to_string())
 
     # 결과 저장
     results['trades'] = trades_df.to_dict('records')
@@ -519,47 +677,69 @@ def save_backtest_report(results: Dict, horizon: str = '10min'):
     print(f"요약: {summary_path}")
 
 
-def optimize_threshold(horizon: str = '10min'):
+def evaluate_threshold(params: Dict, df: pd.DataFrame) -> Dict:
+    """그리드 포인트 1개 평가 (SweepRunner 워커에서 실행)"""
+    engine, buy_signals, filtered = simulate(
+        df,
+        min_probability=params['threshold'],
+        max_positions=params.get('max_positions', 5),
+        position_size=params.get('position_size', 0.1),
+        use_scores=params.get('use_scores', True),
+    )
+    results = analyze_results(engine, buy_signals, filtered, verbose=False)
+    return {
+        'win_rate': results.get('win_rate', 0),
+        'avg_return': results.get('avg_return', 0),
+        'total_trades': results.get('total_trades', 0),
+        'sharpe_ratio': results.get('sharpe_ratio', 0),
+        'max_drawdown': results.get('max_drawdown', 0),
+    }
+
+
+def optimize_threshold(horizon: str = '10min', max_workers: int = None, resume: bool = True):
     """
     최적 확률 임계값 탐색
+
+    모델 예측은 1번만 수행하고 임계값별 시뮬레이션만 병렬 실행
     """
+    from backtest.sweep import SweepRunner, file_fingerprint
+
     print("=" * 60)
     print("  임계값 최적화")
     print("=" * 60)
 
-    thresholds = [0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8]
-    results_list = []
-
-    for threshold in thresholds:
-        print(f"\n--- 임계값: {threshold} ---")
-        results = run_backtest(
-            horizon=horizon,
-            min_probability=threshold,
-            use_scores=True
-        )
+    df = prepare_backtest_data(horizon)
+    if df.empty:
+        return None
 
-        if results:
-            results['threshold'] = threshold
-            results_list.append({
-                'threshold': threshold,
-                'win_rate': results.get('win_rate', 0),
-                'avg_return': results.get('avg_return', 0),
-                'total_trades': results.get('total_trades', 0),
-                'sharpe_ratio': results.get('sharpe_ratio', 0),
-                'max_drawdown': results.get('max_drawdown', 0),
-            })
+    grid = {
+        'threshold': [0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8],
+        'use_scores': [True],
+    }
+    # 모델/테스트 데이터가 바뀌면 이전 체크포인트 폐기
+    checkpoint = OUTPUT_DIR / "sweeps" / f"threshold_{horizon}.jsonl"
+    fingerprint = file_fingerprint([MODEL_DIR / f"intraday_lgbm_{horizon}.pkl",
+                                    OUTPUT_DIR / f"labeled_{horizon}.parquet"])
+    runner = SweepRunner(evaluate_threshold, grid, shared=df, checkpoint=checkpoint, max_workers=max_workers,
+                         fingerprint=fingerprint)
+    compare_df = runner.run(resume=resume)
 
     # 결과 비교
-    if results_list:
-        compare_df = pd.DataFrame(results_list)
-        print("\n" + "=" * 60)
-        print("  임계값별 결과 비교")
-        print("=" * 60)
-        print(compare_df.to_string(index=False))
-
-        # 최적 임계값 (Sharpe 기준)
-        best = compare_df.loc[compare_df['sharpe_ratio'].idxmax()]
+    if compare_df.empty:
+        return None
+
+    print("\n" + "=" * 60)
+    print("  임계값별 결과 비교")
+    print("=" * 60)
+    columns = ['threshold', 'win_rate', 'avg_return', 'total_trades', 'sharpe_ratio', 'max_drawdown']
+    print(compare_df[[c for c in columns if c in compare_df.columns]].to_string(index=False))
+
+    # 최적 임계값 (Sharpe 기준)
+    best = SweepRunner.best(compare_df, 'sharpe_ratio')
+    if best:
         print(f"\n최적 임계값 (Sharpe 기준): {best['threshold']}")
+        return best['threshold']
+    return None
 
 
 def main():
@@ -587,21 +767,38 @@ def main():
         action="store_true",
         help="임계값 최적화"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="최적화 병렬 프로세스 수"
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="최적화 체크포인트 무시"
+    )
     parser.add_argument(
         "--no-scores",
         action="store_true",
         help="스코어 필터 비활성화"
     )
+    parser.add_argument(
+        "--loop",
+        action="store_true",
+        help="행 단위 루프 시뮬레이션 (검증용)"
+    )
 
     args = parser.parse_args()
 
     if args.optimize:
-        optimize_threshold(args.horizon)
+        optimize_threshold(args.horizon, max_workers=args.workers, resume=not args.no_resume)
     else:
         results = run_backtest(
             horizon=args.horizon,
             min_probability=args.threshold,
-            use_scores=not args.no_scores
+            use_scores=not args.no_scores,
+            vectorized=not args.loop
         )
 
         if args.report and results:
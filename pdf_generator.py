@@ -1,18 +1,38 @@
 """
 PDF 생성 모듈
 스크리닝 결과를 PDF로 변환 (초기버전 형식)
+
+- PDFRenderer: 폰트 설정(fontconfig + FontConfiguration)과 파싱된 스타일시트를
+  프로세스당 1회만 생성해 재사용 (매 호출 임시 fontconfig 생성/폰트 캐시 워밍업 제거)
+- 종목별 HTML 조각은 종목 데이터가 같으면 캐시 재사용 (사용자별 리포트 등 반복 렌더링)
+- render_many: 여러 리포트를 프로세스 풀에서 렌더링 (워커마다 렌더러 1개)
+
+사용법:
+    from pdf_generator import get_pdf_renderer, render_many
+
+    get_pdf_renderer().render(html, "report.pdf")                 # 기본 CSS
+    get_pdf_renderer().render(html, "report.pdf", css=extra_css)  # CSS 문자열 (파싱 결과 캐시)
+    render_many([(html1, "a.pdf"), (html2, "b.pdf")], workers=4)
 """
 
+import hashlib
+import json
 import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from weasyprint import HTML, CSS
 
 # 폰트 경로
 FONT_DIR = Path(__file__).parent / "fonts"
 FONT_REGULAR = FONT_DIR / "NanumBarunpenR.ttf"
 FONT_BOLD = FONT_DIR / "NanumBarunpenB.ttf"
 
+# fontconfig 설정/캐시 디렉토리 (프로세스 간 공유 → 폰트 캐시 재사용)
+FONTCONFIG_DIR = Path(tempfile.gettempdir()) / f"stock_fontconfig_{os.getuid() if hasattr(os, 'getuid') else 0}"
+
 
 def get_base_css():
     """기본 CSS 스타일 (한글 폰트 포함)"""
@@ -489,6 +509,246 @@ def format_streak_html(streak):
         return f'{streak}일'
 
 
+class FragmentCache:
+    """종목별 HTML 조각 LRU 캐시 (키 + 종목 데이터 지문이 같으면 재사용)"""
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(data) -> str:
+        """종목 데이터 지문 (numpy 값 등은 문자열로)"""
+        raw = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key, data, builder, *args):
+        """캐시된 조각 반환, 없으면 builder(*args) 결과 저장"""
+        full_key = (key, self.fingerprint(data))
+        with self._lock:
+            fragment = self._items.get(full_key)
+            if fragment is not None:
+                self._items.move_to_end(full_key)
+                self.hits += 1
+                return fragment
+
+        fragment = builder(*args)
+        with self._lock:
+            self.misses += 1
+            self._items[full_key] = fragment
+            if len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return fragment
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+
+_fragments = FragmentCache()
+
+
+def create_stock_section_html(i, r, scoring_ver="v2"):
+    """상위 종목 상세 분석 섹션 HTML (순위 i, 종목 r)"""
+    code = r["code"]
+    name = r["name"]
+    market = r["market"]
+    score = r["score"]
+    close = r.get("close", 0)
+    change = r.get("change_pct", 0)
+    change_sign = "+" if change >= 0 else ""
+
+    # 연속 출현 및 순위 변동
+    streak = r.get("streak", 1)
+    rank_change = r.get("rank_change")
+    rank_change_html = format_rank_change_html(rank_change)
+    streak_html = format_streak_html(streak)
+
+    signals = r.get("signals", [])
+    indicators = r.get("indicators", {})
+
+    # === 점수 분석 ===
+    trend_score = r.get("trend_score", indicators.get("trend_score", 0)) or 0
+    momentum_score = r.get("momentum_score", indicators.get("momentum_score", 0)) or 0
+    volume_score = r.get("volume_score", indicators.get("volume_score", 0)) or 0
+    pattern_score = r.get("pattern_score", indicators.get("pattern_score", 0)) or 0
+    sma20_slope = r.get("sma20_slope", indicators.get("sma20_slope", 0))
+    trading_value = r.get("trading_value_억", indicators.get("trading_value_억", 0))
+    high_60d_pct = r.get("high_60d_pct", indicators.get("high_60d_pct", 0))
+    ma_status = r.get("ma_status", indicators.get("ma_status", ""))
+    selection_reasons = r.get("selection_reasons", [])
+
+    # 스크리닝 엔진 버전에 따른 점수 테이블
+    if scoring_ver == 'v4':
+        # V4: 추세(30) + 수급(30) + 패턴(20) + 모멘텀(20)
+        score_breakdown = f"""
+        <table class="indicator-table">
+            <tr><th colspan="3" style="text-align:center; background:#2c5282; color:white;">점수 분석 (총 {score}점) - V4 Hybrid Sniper</th></tr>
+            <tr style="background:#e8f0fe;"><td><strong>추세 점수</strong></td><td style="text-align:right; font-weight:bold;">{trend_score}/30점</td><td>정배열, 20일선 기울기, 구름대, MACD</td></tr>
+            <tr><td><strong>수급 점수</strong></td><td style="text-align:right; font-weight:bold;">{volume_score}/30점</td><td>거래량, 거래대금, 기관/외국인</td></tr>
+            <tr style="background:#e8f0fe;"><td><strong>패턴 점수</strong></td><td style="text-align:right; font-weight:bold;">{pattern_score}/20점</td><td>VCP 패턴, OBV 다이버전스</td></tr>
+            <tr><td><strong>모멘텀 점수</strong></td><td style="text-align:right; font-weight:bold;">{momentum_score}/20점</td><td>RSI, StochRSI, 60일 신고가</td></tr>
+        </table>
+        """
+    else:
+        # V1-V3: 추세(30) + 모멘텀(35) + 거래량(35)
+        score_breakdown = f"""
+        <table class="indicator-table">
+            <tr><th colspan="3" style="text-align:center; background:#2c5282; color:white;">점수 분석 (총 {score}점)</th></tr>
+            <tr style="background:#e8f0fe;"><td><strong>추세 점수</strong></td><td style="text-align:right; font-weight:bold;">{trend_score}/30점</td><td>이평선 정배열, 20일선 기울기</td></tr>
+            <tr><td><strong>모멘텀 점수</strong></td><td style="text-align:right; font-weight:bold;">{momentum_score}/35점</td><td>RSI, 60일 신고가</td></tr>
+            <tr style="background:#e8f0fe;"><td><strong>거래량 점수</strong></td><td style="text-align:right; font-weight:bold;">{volume_score}/35점</td><td>거래량/거래대금</td></tr>
+        </table>
+        """
+
+    # 지표 테이블 생성
+    indicator_rows = ""
+
+    # 20일선 기울기 (변별력 강화 핵심)
+    if sma20_slope:
+        if sma20_slope > 3:
+            interp = "🔥 급등 추세"
+        elif sma20_slope > 1.5:
+            interp = "📈 상승 추세"
+        elif sma20_slope > 0.5:
+            interp = "완만한 상승"
+        else:
+            interp = "횡보"
+        highlight = " class='highlight'" if sma20_slope > 3 else ""
+        indicator_rows += f"<tr><td>20일선 기울기</td><td{highlight}>{sma20_slope:.1f}%</td><td>{interp}</td></tr>"
+
+    # RSI
+    rsi = r.get("rsi", indicators.get("rsi"))
+    if rsi:
+        if 60 <= rsi <= 75:
+            interp = "✅ 최적 구간 (Sweet Spot)"
+        elif rsi > 80:
+            interp = "⚡ 강세 지속"
+        elif 50 <= rsi < 60:
+            interp = "안정적 상승"
+        elif rsi < 30:
+            interp = "⚠️ 과매도"
+        else:
+            interp = "중립"
+        highlight = " class='highlight'" if 60 <= rsi <= 75 else ""
+        indicator_rows += f"<tr><td>RSI (14)</td><td{highlight}>{rsi:.1f}</td><td>{interp}</td></tr>"
+
+    # 거래량 배율
+    vol_ratio = r.get("volume_ratio", indicators.get("volume_ratio"))
+    if vol_ratio:
+        if vol_ratio >= 5:
+            interp = "🔥 폭발적 거래량"
+        elif vol_ratio >= 3:
+            interp = "📈 3배 이상 급증"
+        elif vol_ratio >= 2:
+            interp = "높은 거래량"
+        else:
+            interp = "보통"
+        highlight = " class='highlight'" if vol_ratio >= 3 else ""
+        indicator_rows += f"<tr><td>거래량 비율</td><td{highlight}>{vol_ratio:.1f}배</td><td>{interp}</td></tr>"
+
+    # 거래대금
+    if trading_value:
+        if trading_value >= 500:
+            interp = "🔥 초대형 거래"
+        elif trading_value >= 100:
+            interp = "✅ 대형 거래"
+        elif trading_value >= 30:
+            interp = "보통"
+        else:
+            interp = "⚠️ 소형"
+        highlight = " class='highlight'" if trading_value >= 100 else ""
+        indicator_rows += f"<tr><td>거래대금</td><td{highlight}>{trading_value:.0f}억원</td><td>{interp}</td></tr>"
+
+    # 60일 고가 대비
+    if high_60d_pct is not None:
+        if high_60d_pct >= 0:
+            interp = "🔥 60일 신고가 돌파"
+        elif high_60d_pct >= -3:
+            interp = "📈 고가 근접"
+        elif high_60d_pct >= -5:
+            interp = "고가 접근 중"
+        else:
+            interp = f"고가 대비 {high_60d_pct:.1f}%"
+        highlight = " class='highlight'" if high_60d_pct >= -3 else ""
+        indicator_rows += f"<tr><td>60일 고가 대비</td><td{highlight}>{high_60d_pct:+.1f}%</td><td>{interp}</td></tr>"
+
+    # 이평선 상태
+    if ma_status:
+        ma_text = {"aligned": "✅ 정배열", "partial": "일부 정배열", "reverse_aligned": "❌ 역배열"}.get(ma_status, ma_status)
+        indicator_rows += f"<tr><td>이평선 상태</td><td>{ma_text}</td><td>5일 > 20일 > 60일</td></tr>"
+
+    # 지표 테이블이 비어있으면 기본값
+    if not indicator_rows:
+        indicator_rows = f"""
+        <tr><td>RSI</td><td>-</td><td>-</td></tr>
+        <tr><td>거래량 배율</td><td>-</td><td>-</td></tr>
+        """
+
+    indicator_table = f"""
+    {score_breakdown}
+    <table class="indicator-table" style="margin-top:10px;">
+        <tr><th>핵심 지표</th><th>값</th><th>해석</th></tr>
+        {indicator_rows}
+    </table>
+    """
+
+    # 선정 이유 추가
+    if selection_reasons:
+        reasons_html = "<div style='margin-top:8px; padding:8px; background:#f8f9fa; border-radius:4px;'>"
+        reasons_html += "<strong>📌 선정 이유:</strong> " + ", ".join(selection_reasons[:5])
+        reasons_html += "</div>"
+        indicator_table += reasons_html
+
+    # 발생 신호 해석
+    signal_interpretations = generate_signal_interpretation(signals, indicators)
+    signals_html = ""
+    if signal_interpretations:
+        signals_html = "<div class='signals-section'><h4>발생 신호</h4><ul class='signals-list'>"
+        for interp in signal_interpretations:
+            signals_html += f"<li>{interp}</li>"
+        signals_html += "</ul></div>"
+
+    # 종목 섹션
+    return f"""
+    <div class="stock-section">
+        <div class="stock-title">{i}위. {name} ({code}) - {market} | {rank_change_html} | 연속 {streak_html}</div>
+        <div class="stock-summary">
+            <span class="score">종합점수: {score}점</span> | 현재가: {close:,.0f}원 | 등락률: {change_sign}{change:.2f}%
+        </div>
+        <h4>선정 이유</h4>
+        {indicator_table}
+        {signals_html}
+    </div>
+    """
+
+
+def create_remaining_row_html(i, r):
+    """나머지 종목 테이블 행 HTML"""
+    change = r.get("change_pct", 0)
+    change_class = "positive" if change >= 0 else "negative"
+    change_sign = "+" if change >= 0 else ""
+    rank_change_html = format_rank_change_html(r.get("rank_change"))
+    streak_html = format_streak_html(r.get("streak", 1))
+    return f"""
+    <tr>
+        <td style="text-align:center;">{i}</td>
+        <td style="text-align:center;">{r['code']}</td>
+        <td>{r['name']}</td>
+        <td style="text-align:center;">{rank_change_html}</td>
+        <td style="text-align:center;">{streak_html}</td>
+        <td style="text-align:center;">{r['market']}</td>
+        <td style="text-align:center;">{r['score']}</td>
+        <td style="text-align:right;">{r.get('close', 0):,.0f}</td>
+        <td style="text-align:right;" class="{change_class}">{change_sign}{change:.2f}%</td>
+    </tr>
+    """
+
+
 def create_detailed_html(results, stats=None, date_str=None):
     """상세 분석 결과를 HTML로 변환 (초기버전 형식)"""
     from config import get_signal_kr
@@ -538,181 +798,12 @@ def create_detailed_html(results, stats=None, date_str=None):
     </table>
     """
 
-    # 상위 20개 종목 상세 분석
-    detailed_html = ""
-    for i, r in enumerate(results[:20], 1):
-        code = r["code"]
-        name = r["name"]
-        market = r["market"]
-        score = r["score"]
-        close = r.get("close", 0)
-        change = r.get("change_pct", 0)
-        change_sign = "+" if change >= 0 else ""
-
-        # 연속 출현 및 순위 변동
-        streak = r.get("streak", 1)
-        rank_change = r.get("rank_change")
-        rank_change_html = format_rank_change_html(rank_change)
-        streak_html = format_streak_html(streak)
-
-        signals = r.get("signals", [])
-        indicators = r.get("indicators", {})
-
-        # === 점수 분석 ===
-        trend_score = r.get("trend_score", indicators.get("trend_score", 0)) or 0
-        momentum_score = r.get("momentum_score", indicators.get("momentum_score", 0)) or 0
-        volume_score = r.get("volume_score", indicators.get("volume_score", 0)) or 0
-        pattern_score = r.get("pattern_score", indicators.get("pattern_score", 0)) or 0
-        sma20_slope = r.get("sma20_slope", indicators.get("sma20_slope", 0))
-        trading_value = r.get("trading_value_억", indicators.get("trading_value_억", 0))
-        high_60d_pct = r.get("high_60d_pct", indicators.get("high_60d_pct", 0))
-        ma_status = r.get("ma_status", indicators.get("ma_status", ""))
-        selection_reasons = r.get("selection_reasons", [])
-
-        # 스크리닝 엔진 버전에 따른 점수 테이블
-        scoring_ver = stats.get('scoring_version', 'v2') if stats else 'v2'
-        if scoring_ver == 'v4':
-            # V4: 추세(30) + 수급(30) + 패턴(20) + 모멘텀(20)
-            score_breakdown = f"""
-            <table class="indicator-table">
-                <tr><th colspan="3" style="text-align:center; background:#2c5282; color:white;">점수 분석 (총 {score}점) - V4 Hybrid Sniper</th></tr>
-                <tr style="background:#e8f0fe;"><td><strong>추세 점수</strong></td><td style="text-align:right; font-weight:bold;">{trend_score}/30점</td><td>정배열, 20일선 기울기, 구름대, MACD</td></tr>
-                <tr><td><strong>수급 점수</strong></td><td style="text-align:right; font-weight:bold;">{volume_score}/30점</td><td>거래량, 거래대금, 기관/외국인</td></tr>
-                <tr style="background:#e8f0fe;"><td><strong>패턴 점수</strong></td><td style="text-align:right; font-weight:bold;">{pattern_score}/20점</td><td>VCP 패턴, OBV 다이버전스</td></tr>
-                <tr><td><strong>모멘텀 점수</strong></td><td style="text-align:right; font-weight:bold;">{momentum_score}/20점</td><td>RSI, StochRSI, 60일 신고가</td></tr>
-            </table>
-            """
-        else:
-            # V1-V3: 추세(30) + 모멘텀(35) + 거래량(35)
-            score_breakdown = f"""
-            <table class="indicator-table">
-                <tr><th colspan="3" style="text-align:center; background:#2c5282; color:white;">점수 분석 (총 {score}점)</th></tr>
-                <tr style="background:#e8f0fe;"><td><strong>추세 점수</strong></td><td style="text-align:right; font-weight:bold;">{trend_score}/30점</td><td>이평선 정배열, 20일선 기울기</td></tr>
-                <tr><td><strong>모멘텀 점수</strong></td><td style="text-align:right; font-weight:bold;">{momentum_score}/35점</td><td>RSI, 60일 신고가</td></tr>
-                <tr style="background:#e8f0fe;"><td><strong>거래량 점수</strong></td><td style="text-align:right; font-weight:bold;">{volume_score}/35점</td><td>거래량/거래대금</td></tr>
-            </table>
-            """
-
-        # 지표 테이블 생성
-        indicator_rows = ""
-
-        # 20일선 기울기 (변별력 강화 핵심)
-        if sma20_slope:
-            if sma20_slope > 3:
-                interp = "🔥 급등 추세"
-            elif sma20_slope > 1.5:
-                interp = "📈 상승 추세"
-            elif sma20_slope > 0.5:
-                interp = "완만한 상승"
-            else:
-                interp = "횡보"
-            highlight = " class='highlight'" if sma20_slope > 3 else ""
-            indicator_rows += f"<tr><td>20일선 기울기</td><td{highlight}>{sma20_slope:.1f}%</td><td>{interp}</td></tr>"
-
-        # RSI
-        rsi = r.get("rsi", indicators.get("rsi"))
-        if rsi:
-            if 60 <= rsi <= 75:
-                interp = "✅ 최적 구간 (Sweet Spot)"
-            elif rsi > 80:
-                interp = "⚡ 강세 지속"
-            elif 50 <= rsi < 60:
-                interp = "안정적 상승"
-            elif rsi < 30:
-                interp = "⚠️ 과매도"
-            else:
-                interp = "중립"
-            highlight = " class='highlight'" if 60 <= rsi <= 75 else ""
-            indicator_rows += f"<tr><td>RSI (14)</td><td{highlight}>{rsi:.1f}</td><td>{interp}</td></tr>"
-
-        # 거래량 배율
-        vol_ratio = r.get("volume_ratio", indicators.get("volume_ratio"))
-        if vol_ratio:
-            if vol_ratio >= 5:
-                interp = "🔥 폭발적 거래량"
-            elif vol_ratio >= 3:
-                interp = "📈 3배 이상 급증"
-            elif vol_ratio >= 2:
-                interp = "높은 거래량"
-            else:
-                interp = "보통"
-            highlight = " class='highlight'" if vol_ratio >= 3 else ""
-            indicator_rows += f"<tr><td>거래량 비율</td><td{highlight}>{vol_ratio:.1f}배</td><td>{interp}</td></tr>"
-
-        # 거래대금
-        if trading_value:
-            if trading_value >= 500:
-                interp = "🔥 초대형 거래"
-            elif trading_value >= 100:
-                interp = "✅ 대형 거래"
-            elif trading_value >= 30:
-                interp = "보통"
-            else:
-                interp = "⚠️ 소형"
-            highlight = " class='highlight'" if trading_value >= 100 else ""
-            indicator_rows += f"<tr><td>거래대금</td><td{highlight}>{trading_value:.0f}억원</td><td>{interp}</td></tr>"
-
-        # 60일 고가 대비
-        if high_60d_pct is not None:
-            if high_60d_pct >= 0:
-                interp = "🔥 60일 신고가 돌파"
-            elif high_60d_pct >= -3:
-                interp = "📈 고가 근접"
-            elif high_60d_pct >= -5:
-                interp = "고가 접근 중"
-            else:
-                interp = f"고가 대비 {high_60d_pct:.1f}%"
-            highlight = " class='highlight'" if high_60d_pct >= -3 else ""
-            indicator_rows += f"<tr><td>60일 고가 대비</td><td{highlight}>{high_60d_pct:+.1f}%</td><td>{interp}</td></tr>"
-
-        # 이평선 상태
-        if ma_status:
-            ma_text = {"aligned": "✅ 정배열", "partial": "일부 정배열", "reverse_aligned": "❌ 역배열"}.get(ma_status, ma_status)
-            indicator_rows += f"<tr><td>이평선 상태</td><td>{ma_text}</td><td>5일 > 20일 > 60일</td></tr>"
-
-        # 지표 테이블이 비어있으면 기본값
-        if not indicator_rows:
-            indicator_rows = f"""
-            <tr><td>RSI</td><td>-</td><td>-</td></tr>
-            <tr><td>거래량 배율</td><td>-</td><td>-</td></tr>
-            """
-
-        indicator_table = f"""
-        {score_breakdown}
-        <table class="indicator-table" style="margin-top:10px;">
-            <tr><th>핵심 지표</th><th>값</th><th>해석</th></tr>
-            {indicator_rows}
-        </table>
-        """
-
-        # 선정 이유 추가
-        if selection_reasons:
-            reasons_html = "<div style='margin-top:8px; padding:8px; background:#f8f9fa; border-radius:4px;'>"
-            reasons_html += "<strong>📌 선정 이유:</strong> " + ", ".join(selection_reasons[:5])
-            reasons_html += "</div>"
-            indicator_table += reasons_html
-
-        # 발생 신호 해석
-        signal_interpretations = generate_signal_interpretation(signals, indicators)
-        signals_html = ""
-        if signal_interpretations:
-            signals_html = "<div class='signals-section'><h4>발생 신호</h4><ul class='signals-list'>"
-            for interp in signal_interpretations:
-                signals_html += f"<li>{interp}</li>"
-            signals_html += "</ul></div>"
-
-        # 종목 섹션
-        detailed_html += f"""
-        <div class="stock-section">
-            <div class="stock-title">{i}위. {name} ({code}) - {market} | {rank_change_html} | 연속 {streak_html}</div>
-            <div class="stock-summary">
-                <span class="score">종합점수: {score}점</span> | 현재가: {close:,.0f}원 | 등락률: {change_sign}{change:.2f}%
-            </div>
-            <h4>선정 이유</h4>
-            {indicator_table}
-            {signals_html}
-        </div>
-        """
+    # 상위 20개 종목 상세 분석 (종목 데이터가 같으면 캐시된 조각 재사용)
+    scoring_ver = stats.get('scoring_version', 'v2') if stats else 'v2'
+    detailed_html = "".join(
+        _fragments.get(("section", i, scoring_ver), r, create_stock_section_html, i, r, scoring_ver)
+        for i, r in enumerate(results[:20], 1)
+    )
 
     # 나머지 종목 테이블 (21위~)
     remaining_html = ""
@@ -732,25 +823,10 @@ def create_detailed_html(results, stats=None, date_str=None):
                 <th>등락률</th>
             </tr>
         """
-        for i, r in enumerate(results[20:], 21):
-            change = r.get("change_pct", 0)
-            change_class = "positive" if change >= 0 else "negative"
-            change_sign = "+" if change >= 0 else ""
-            rank_change_html = format_rank_change_html(r.get("rank_change"))
-            streak_html = format_streak_html(r.get("streak", 1))
-            remaining_html += f"""
-            <tr>
-                <td style="text-align:center;">{i}</td>
-                <td style="text-align:center;">{r['code']}</td>
-                <td>{r['name']}</td>
-                <td style="text-align:center;">{rank_change_html}</td>
-                <td style="text-align:center;">{streak_html}</td>
-                <td style="text-align:center;">{r['market']}</td>
-                <td style="text-align:center;">{r['score']}</td>
-                <td style="text-align:right;">{r.get('close', 0):,.0f}</td>
-                <td style="text-align:right;" class="{change_class}">{change_sign}{change:.2f}%</td>
-            </tr>
-            """
+        remaining_html += "".join(
+            _fragments.get(("row", i), r, create_remaining_row_html, i, r)
+            for i, r in enumerate(results[20:], 21)
+        )
         remaining_html += "</table>"
 
     # 신호 해설 섹션
@@ -893,31 +969,11 @@ def create_detailed_html(results, stats=None, date_str=None):
     return html
 
 
-def generate_detailed_pdf(results, output_path, stats=None):
-    """상세 분석 결과를 PDF로 저장"""
-    import tempfile
-    import shutil
-    from weasyprint.text.fonts import FontConfiguration
-
-    date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    html_content = create_detailed_html(results, stats=stats, date_str=date_str)
-    css = CSS(string=get_base_css())
-
-    # 커스텀 fontconfig 설정으로 TTC 폰트 문제 우회
-    fontconfig_dir = None
-    original_fontconfig = os.environ.get('FONTCONFIG_PATH')
-
-    try:
-        # 임시 fontconfig 설정 생성 (TTF 폰트만 사용)
-        fontconfig_dir = tempfile.mkdtemp(prefix='fontconfig_')
-        fonts_conf = os.path.join(fontconfig_dir, 'fonts.conf')
-
-        with open(fonts_conf, 'w') as f:
-            f.write(f'''<?xml version="1.0"?>
+_FONTS_CONF = """<?xml version="1.0"?>
 <!DOCTYPE fontconfig SYSTEM "fonts.dtd">
 <fontconfig>
-    <dir>{FONT_DIR}</dir>
-    <cachedir>{fontconfig_dir}/cache</cachedir>
+    <dir>{font_dir}</dir>
+    <cachedir>{cache_dir}</cachedir>
     <match target="pattern">
         <edit name="family" mode="prepend" binding="strong">
             <string>NanumBarunpen</string>
@@ -929,33 +985,131 @@ def generate_detailed_pdf(results, output_path, stats=None):
             <glob>*.TTC</glob>
         </rejectfont>
     </selectfont>
-</fontconfig>''')
+</fontconfig>"""
+
+
+def setup_fontconfig(config_dir=None) -> Path:
+    """TTF 전용 fontconfig 설정 (프로세스당 1회, 캐시 디렉토리는 유지)
+
+    TTC 폰트 문제 우회. 환경변수는 fontconfig 초기화 전에 한 번만 설정한다.
+    """
+    config_dir = Path(config_dir or FONTCONFIG_DIR)
+    config_dir.mkdir(parents=True, exist_ok=True)
+    fonts_conf = config_dir / "fonts.conf"
+    content = _FONTS_CONF.format(font_dir=FONT_DIR.resolve(), cache_dir=config_dir / "cache")
+    if not fonts_conf.exists() or fonts_conf.read_text() != content:
+        tmp_path = fonts_conf.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(content)
+        tmp_path.replace(fonts_conf)
 
-        # 환경변수 설정
-        os.environ['FONTCONFIG_PATH'] = fontconfig_dir
-        os.environ['FONTCONFIG_FILE'] = fonts_conf
+    os.environ['FONTCONFIG_PATH'] = str(config_dir)
+    os.environ['FONTCONFIG_FILE'] = str(fonts_conf)
+    return fonts_conf
 
-        font_config = FontConfiguration()
 
-        HTML(string=html_content).write_pdf(
+class PDFRenderer:
+    """WeasyPrint 렌더러 (폰트 설정/스타일시트 재사용)"""
+
+    def __init__(self, base_css: str = None):
+        """
+        Args:
+            base_css: 기본 CSS (None이면 get_base_css())
+        """
+        from weasyprint.text.fonts import FontConfiguration
+
+        setup_fontconfig()
+        self.font_config = FontConfiguration()
+        self.base_css = base_css if base_css is not None else get_base_css()
+        self._stylesheets = {}
+        self._lock = threading.Lock()
+        self.renders = 0
+
+    def stylesheet(self, css: str = None):
+        """파싱된 스타일시트 (CSS 문자열별 1회 파싱)"""
+        from weasyprint import CSS
+
+        css = self.base_css if css is None else css
+        with self._lock:
+            sheet = self._stylesheets.get(css)
+            if sheet is None:
+                sheet = CSS(string=css, font_config=self.font_config)
+                self._stylesheets[css] = sheet
+        return sheet
+
+    def render(self, html: str, output_path=None, css: str = None):
+        """HTML → PDF
+
+        Args:
+            html: HTML 문자열
+            output_path: 저장 경로 (None이면 PDF bytes 반환)
+            css: 스타일시트 CSS 문자열 (None이면 기본 CSS)
+        """
+        from weasyprint import HTML
+
+        result = HTML(string=html).write_pdf(
             output_path,
-            stylesheets=[css],
-            font_config=font_config
+            stylesheets=[self.stylesheet(css)],
+            font_config=self.font_config
         )
-    finally:
-        # 환경변수 복원
-        if original_fontconfig:
-            os.environ['FONTCONFIG_PATH'] = original_fontconfig
-        elif 'FONTCONFIG_PATH' in os.environ:
-            del os.environ['FONTCONFIG_PATH']
-        if 'FONTCONFIG_FILE' in os.environ:
-            del os.environ['FONTCONFIG_FILE']
-
-        # 임시 디렉토리 삭제
-        if fontconfig_dir and os.path.exists(fontconfig_dir):
-            shutil.rmtree(fontconfig_dir, ignore_errors=True)
-
-    return output_path
+        self.renders += 1
+        return output_path if output_path is not None else result
+
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def get_pdf_renderer() -> PDFRenderer:
+    """프로세스 전역 렌더러 (최초 호출 시 폰트 설정)"""
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = PDFRenderer()
+    return _renderer
+
+
+def _render_job(job):
+    html, output_path, css = (tuple(job) + (None,))[:3]
+    return get_pdf_renderer().render(html, output_path, css=css)
+
+
+def render_many(jobs, workers: int = 4):
+    """여러 리포트 병렬 렌더링
+
+    Args:
+        jobs: (html, output_path) 또는 (html, output_path, css) 목록
+        workers: 프로세스 수 (1이면 현재 프로세스에서 순차)
+
+    Returns:
+        job 순서대로 output_path (실패한 job 은 예외 객체)
+    """
+    jobs = list(jobs)
+    if workers <= 1 or len(jobs) <= 1:
+        results = []
+        for job in jobs:
+            try:
+                results.append(_render_job(job))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = [pool.submit(_render_job, job) for job in jobs]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+    return results
+
+
+def generate_detailed_pdf(results, output_path, stats=None):
+    """상세 분석 결과를 PDF로 저장"""
+    date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    html_content = create_detailed_html(results, stats=stats, date_str=date_str)
+    return get_pdf_renderer().render(html_content, output_path)
 
 
 # 하위 호환성을 위한 별칭
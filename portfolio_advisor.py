@@ -93,6 +93,15 @@ class PortfolioAdvisor:
 
     def analyze_stock(self, code, buy_price=0):
         """단일 종목 분석"""
+        return self.apply_opinion(self.analyze_code(code), buy_price)
+
+    def analyze_code(self, code):
+        """
+        종목 기술적 분석 (매수가와 무관한 부분 — 여러 보유자가 공유)
+
+        Returns:
+            current_price, score, signals, patterns, indicators 또는 None
+        """
         try:
             # 주가 데이터 수집
             df = self.analyst.get_ohlcv(code, days=365)
@@ -100,37 +109,49 @@ class PortfolioAdvisor:
                 return None
 
             # 기술적 분석
-            result = self.analyst.analyze_full(df)
+            result = self.analyst.analyze_full(df, code=code)
             if result is None:
                 return None
 
-            # 현재가
-            current_price = df.iloc[-1]['Close']
-
-            # 수익률 계산
-            if buy_price > 0:
-                profit_rate = ((current_price - buy_price) / buy_price) * 100
-            else:
-                profit_rate = 0
-
-            # 의견 결정
-            opinion, reason = self._decide_opinion(result, profit_rate)
-
             return {
-                'current_price': current_price,
-                'profit_rate': profit_rate,
+                'current_price': df.iloc[-1]['Close'],
                 'score': result['score'],
                 'signals': result['signals'],
                 'patterns': result['patterns'],
                 'indicators': result['indicators'],
-                'opinion': opinion,
-                'reason': reason
             }
 
         except Exception as e:
             print(f"    [오류] {code}: {e}")
             return None
 
+    def apply_opinion(self, base, buy_price=0):
+        """종목 분석 결과 + 매수가 → 수익률/의견 포함 분석 결과"""
+        if base is None:
+            return None
+
+        current_price = base['current_price']
+
+        # 수익률 계산
+        if buy_price > 0:
+            profit_rate = ((current_price - buy_price) / buy_price) * 100
+        else:
+            profit_rate = 0
+
+        # 의견 결정
+        opinion, reason = self._decide_opinion(base, profit_rate)
+
+        return {
+            'current_price': current_price,
+            'profit_rate': profit_rate,
+            'score': base['score'],
+            'signals': base['signals'],
+            'patterns': base['patterns'],
+            'indicators': base['indicators'],
+            'opinion': opinion,
+            'reason': reason
+        }
+
     def _decide_opinion(self, analysis, profit_rate):
         """
         매도/보유/추가매수 의견 결정
@@ -348,9 +369,9 @@ class PortfolioAdvisor:
         html_content = self._create_html_report()
 
         try:
-            from weasyprint import HTML, CSS
+            from pdf_generator import get_pdf_renderer
 
-            css = CSS(string='''
+            css = '''
                 @page { size: A4; margin: 1.5cm; }
                 body { font-family: 'Malgun Gothic', sans-serif; font-size: 10pt; }
                 h1 { color: #1a365d; border-bottom: 2px solid #2c5282; padding-bottom: 10px; }
@@ -365,9 +386,9 @@ class PortfolioAdvisor:
                 .summary-box { background: #ebf8ff; padding: 12px; border-radius: 8px; margin: 15px 0; font-size: 9pt; }
                 .warning { background: #fff5f5; border-left: 4px solid #c53030; padding: 10px; margin: 10px 0; }
                 .positive { background: #f0fff4; border-left: 4px solid #2f855a; padding: 10px; margin: 10px 0; }
-            ''')
+            '''
 
-            HTML(string=html_content).write_pdf(output_path, stylesheets=[css])
+            get_pdf_renderer().render(html_content, output_path, css=css)
             print(f"[저장] PDF: {output_path}")
             return output_path
 
@@ -64,6 +64,16 @@ class PortfolioMonitor:
         """단일 종목 분석"""
         return self.advisor.analyze_stock(code, buy_price)
 
+    def analyze_codes(self, codes: list) -> dict:
+        """
+        종목별 기술적 분석 1회 (공용 풀에서 병렬)
+
+        Returns:
+            {종목코드: 매수가 무관 분석 결과 또는 None} — 사용자별 의견은 apply_opinion 으로
+        """
+        from api.services.price_snapshot import get_analysis_cache
+        return get_analysis_cache().get_many('portfolio_monitor', codes, self.advisor.analyze_code)
+
     def detect_alert_type(self, analysis: dict, profit_rate: float) -> tuple:
         """
         알림 유형 감지 - 의견 기반으로만 알림
@@ -86,10 +96,15 @@ class PortfolioMonitor:
 
         return None, False
 
-    def process_user_portfolio(self, user: dict) -> list:
+    def process_user_portfolio(self, user: dict, portfolio: list = None, analyses: dict = None) -> list:
         """
         사용자 포트폴리오 분석 및 알림 처리
 
+        Args:
+            user: 사용자 정보
+            portfolio: 보유 종목 (None이면 DB 조회)
+            analyses: 종목별 공유 분석 결과 (None이면 이 사용자 종목만 분석)
+
         Returns:
             list: 전송된 알림 목록
         """
@@ -100,13 +115,17 @@ class PortfolioMonitor:
         print(f"\n[사용자] {username} (ID: {user_id})")
 
         # 포트폴리오 조회
-        portfolio = self.db.get_portfolio(user_id)
+        if portfolio is None:
+            portfolio = self.db.get_portfolio(user_id)
         if not portfolio:
             print("    → 포트폴리오 없음")
             return []
 
         print(f"    → {len(portfolio)}개 종목 분석 중...")
 
+        if analyses is None:
+            analyses = self.analyze_codes([item['stock_code'] for item in portfolio])
+
         alerts = []
 
         for item in portfolio:
@@ -114,8 +133,8 @@ class PortfolioMonitor:
             name = item.get('stock_name', code)
             buy_price = item.get('buy_price', 0)
 
-            # 분석
-            analysis = self.analyze_stock(code, buy_price)
+            # 공유 분석 결과 + 매수가 → 의견
+            analysis = self.advisor.apply_opinion(analyses.get(code), buy_price)
             if analysis is None:
                 continue
 
@@ -190,13 +209,17 @@ class PortfolioMonitor:
             print("\n[알림] 텔레그램 알림이 활성화된 사용자가 없습니다.")
             return
 
-        print(f"\n[대상] {len(users)}명의 사용자 포트폴리오 분석")
+        # 전체 사용자 보유 종목 → 중복 없는 종목만 1회 분석
+        portfolios = self.db.get_portfolios([user['id'] for user in users])
+        codes = list(dict.fromkeys(item['stock_code'] for items in portfolios.values() for item in items))
+        print(f"\n[대상] {len(users)}명의 사용자 포트폴리오 분석 (보유 종목 {len(codes)}개)")
+        analyses = self.analyze_codes(codes)
 
-        # 각 사용자 포트폴리오 분석
+        # 각 사용자 포트폴리오 판정
         total_alerts = []
         for user in users:
             try:
-                alerts = self.process_user_portfolio(user)
+                alerts = self.process_user_portfolio(user, portfolios.get(user['id'], []), analyses)
                 total_alerts.extend(alerts)
             except Exception as e:
                 print(f"    [오류] 사용자 {user.get('username', 'unknown')} 처리 실패: {e}")
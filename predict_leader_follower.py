@@ -28,6 +28,7 @@ from scoring.score_v10_leader_follower import (
     get_reference_info,
     get_all_leaders,
     get_all_followers,
+    get_reference_index,
     load_reference,
 )
 
@@ -135,18 +136,13 @@ def main():
 
     # 대장주 움직임 확인
     print("\n[대장주 움직임]")
+    index = get_reference_index()
+    changes = index.vector(today_changes)
     active_leaders = []
-    for leader in all_leaders:
-        change = today_changes.get(leader, 0)
-        if change >= args.min:
-            # 대장주 이름 찾기
-            name = leader
-            for pair in ref.get('all_pairs', []):
-                if pair['leader_code'] == leader:
-                    name = pair['leader_name']
-                    break
-            active_leaders.append((leader, name, change))
-            print(f"  ★ {name}({leader}) +{change:.1f}%")
+    for i in index.active_leaders(changes, args.min):
+        leader, name, change = index.codes[i], index.names[i], changes[i]
+        active_leaders.append((leader, name, change))
+        print(f"  ★ {name}({leader}) +{change:.1f}%")
 
     if not active_leaders:
         print(f"  대장주 중 +{args.min}% 이상 상승한 종목이 없습니다.")
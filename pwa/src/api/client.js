@@ -97,6 +97,8 @@ export const realtimeAPI = {
   cacheStatus: () => api.get('/realtime/cached/status'),
   // 하이브리드: 캐시 우선 + 미스시 실시간 조회
   hybridPrices: (codes) => api.get(`/realtime/hybrid/prices?codes=${codes.join(',')}`),
+  // 실시간 스트림 (SSE): 메시지마다 종목별 변경 필드만 전달
+  stream: (codes) => new EventSource(`${API_BASE_URL}/realtime/stream?codes=${codes.join(',')}`),
 };
 
 // 가치주 API
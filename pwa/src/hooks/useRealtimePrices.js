@@ -0,0 +1,115 @@
+/**
+ * 실시간 시세 구독 훅 (SSE 스트림 우선, 실패 시 폴링)
+ *
+ * - /realtime/stream 으로 구독 종목의 변경 필드만 받아 onUpdate 로 전달
+ * - 스트림 연결 실패(EventSource 미지원/오류) 시 realtimeAPI.prices 폴링으로 전환
+ * - onUpdate(changes): { 종목코드: { current_price, change, change_rate, volume, ... } }
+ *   (스트림은 변경 필드만 오므로 기존 값에 덮어쓰기로 병합)
+ */
+
+import { useEffect, useRef, useState } from 'react';
+import { realtimeAPI } from '../api/client';
+
+const DEFAULT_FALLBACK_INTERVAL = 10000; // 폴링 전환 시 주기 (ms)
+const STREAM_RETRY_INTERVAL = 60000;     // 폴링 중 스트림 재연결 시도 주기 (ms)
+
+/**
+ * 종목별 변경 필드를 기존 시세에 병합
+ */
+export function mergePrices(prev, changes) {
+  const next = { ...prev };
+  Object.entries(changes).forEach(([code, fields]) => {
+    next[code] = { ...prev[code], ...fields };
+  });
+  return next;
+}
+
+export default function useRealtimePrices(codes, { enabled = true, fallbackInterval = DEFAULT_FALLBACK_INTERVAL, onUpdate } = {}) {
+  const [streaming, setStreaming] = useState(false);
+  const onUpdateRef = useRef(onUpdate);
+  onUpdateRef.current = onUpdate;
+
+  // 배열 참조가 바뀌어도 종목 구성이 같으면 재연결하지 않음
+  const codesKey = [...new Set((codes || []).filter(Boolean))].sort().join(',');
+
+  useEffect(() => {
+    if (!enabled || !codesKey) return undefined;
+    const codeList = codesKey.split(',');
+    let source = null;
+    let pollTimer = null;
+    let retryTimer = null;
+    let closed = false;
+
+    const emit = (changes) => {
+      if (!closed && Object.keys(changes).length > 0) {
+        onUpdateRef.current?.(changes);
+      }
+    };
+
+    const poll = async () => {
+      try {
+        const response = await realtimeAPI.prices(codeList);
+        const changes = {};
+        (response.data?.prices || []).forEach((p) => {
+          const { stock_code: code, ...fields } = p;
+          changes[code] = fields;
+        });
+        emit(changes);
+      } catch (error) {
+        console.error('실시간 시세 조회 실패:', error);
+      }
+    };
+
+    const stopPolling = () => {
+      clearInterval(pollTimer);
+      clearTimeout(retryTimer);
+      pollTimer = null;
+    };
+
+    const startPolling = () => {
+      if (closed || pollTimer) return;
+      poll();
+      pollTimer = setInterval(poll, fallbackInterval);
+      retryTimer = setTimeout(() => {
+        stopPolling();
+        connect();
+      }, STREAM_RETRY_INTERVAL);
+    };
+
+    function connect() {
+      if (closed) return;
+      if (typeof EventSource === 'undefined') {
+        startPolling();
+        return;
+      }
+      source = realtimeAPI.stream(codeList);
+      source.onopen = () => setStreaming(true);
+      source.onmessage = (event) => {
+        try {
+          const message = JSON.parse(event.data);
+          if (message.type === 'prices') emit(message.data || {});
+        } catch (error) {
+          console.error('실시간 스트림 메시지 오류:', error);
+        }
+      };
+      source.onerror = () => {
+        // 자동 재연결에 맡기지 않고 폴링으로 전환 (주기적으로 스트림 재시도)
+        source.close();
+        source = null;
+        setStreaming(false);
+        startPolling();
+      };
+    }
+
+    connect();
+
+    return () => {
+      closed = true;
+      stopPolling();
+      if (source) source.close();
+      setStreaming(false);
+    };
+  }, [codesKey, enabled, fallbackInterval]);
+
+  return { streaming };
+}
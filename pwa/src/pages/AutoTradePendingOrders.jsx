@@ -3,6 +3,7 @@ import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { useNavigate } from 'react-router-dom';
 import { autoTradeAPI, realtimeAPI } from '../api/client';
 import { useAuth } from '../contexts/AuthContext';
+import useRealtimePrices, { mergePrices } from '../hooks/useRealtimePrices';
 import Loading from '../components/Loading';
 import {
   Clock,
@@ -84,19 +85,15 @@ export default function AutoTradePendingOrders() {
     }
   }, [data?.orders, fetchRealtimePrices]);
 
-  // 자동 갱신 (10초 간격)
-  useEffect(() => {
-    if (!autoRefreshPrice) return;
-    const orders = data?.orders || [];
-    if (orders.length === 0) return;
-
-    const interval = setInterval(() => {
-      const codes = [...new Set(orders.map((o) => o.stock_code))];
-      fetchRealtimePrices(codes);
-    }, 10000); // 10초
-
-    return () => clearInterval(interval);
-  }, [autoRefreshPrice, data?.orders, fetchRealtimePrices]);
+  // 자동 갱신 (실시간 스트림, 스트림 오류 시 10초 폴링)
+  useRealtimePrices((data?.orders || []).map((o) => o.stock_code), {
+    enabled: autoRefreshPrice,
+    fallbackInterval: 10000,
+    onUpdate: (changes) => {
+      setRealtimePrices((prev) => mergePrices(prev, changes));
+      setLastPriceUpdate(new Date());
+    },
+  });
 
   // 주문 취소
   const cancelMutation = useMutation({
@@ -2,8 +2,9 @@ import { useState, useEffect, useCallback } from 'react';
 import { flushSync } from 'react-dom';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { useNavigate } from 'react-router-dom';
-import { autoTradeAPI, realtimeAPI } from '../api/client';
+import { autoTradeAPI } from '../api/client';
 import { useAuth } from '../contexts/AuthContext';
+import useRealtimePrices, { mergePrices } from '../hooks/useRealtimePrices';
 import Loading from '../components/Loading';
 import {
   FileText,
@@ -352,32 +353,13 @@ export default function AutoTradeSuggestions() {
     gcTime: 0,
   });
 
-  // 실시간 현재가 (10초마다 갱신)
+  // 실시간 현재가 (스트림, 스트림 오류 시 10초 폴링)
   const [livePrices, setLivePrices] = useState({});
 
-  useEffect(() => {
-    const fetchLivePrices = async () => {
-      const allSuggestions = [...(buySuggestions || []), ...(sellSuggestions || [])];
-      const codes = allSuggestions.map(s => s.stock_code).filter(Boolean);
-      if (codes.length === 0) return;
-
-      try {
-        const res = await realtimeAPI.prices(codes);
-        const priceMap = {};
-        (res.data?.prices || []).forEach(p => {
-          const code = p.stock_code || p.code;
-          priceMap[code] = { current_price: p.current_price, change_rate: p.change_rate };
-        });
-        setLivePrices(priceMap);
-      } catch (e) {
-        console.error('현재가 조회 실패:', e);
-      }
-    };
-
-    fetchLivePrices(); // 즉시 1회 실행
-    const interval = setInterval(fetchLivePrices, 10000); // 10초마다
-    return () => clearInterval(interval);
-  }, [buySuggestions, sellSuggestions]);
+  useRealtimePrices([...(buySuggestions || []), ...(sellSuggestions || [])].map(s => s.stock_code), {
+    fallbackInterval: 10000,
+    onUpdate: (changes) => setLivePrices(prev => mergePrices(prev, changes)),
+  });
 
   // 수량 조정 확인 상태
   const [adjustmentInfo, setAdjustmentInfo] = useState(null);
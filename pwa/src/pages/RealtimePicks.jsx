@@ -3,6 +3,7 @@ import { useQuery } from '@tanstack/react-query';
 import { useNavigate } from 'react-router-dom';
 import { top100API, realtimeAPI, portfolioAPI, watchlistAPI } from '../api/client';
 import { useAuth } from '../contexts/AuthContext';
+import useRealtimePrices, { mergePrices } from '../hooks/useRealtimePrices';
 import { Zap, TrendingUp, TrendingDown, RefreshCw, Brain, Activity } from 'lucide-react';
 
 // AI 분석 중 로딩 컴포넌트
@@ -134,17 +135,15 @@ export default function RealtimePicks() {
     }
   }, [data, fetchRealtimePrices, showAnalyzing]);
 
-  // 자동 갱신 (30초 간격)
-  useEffect(() => {
-    if (!autoRefresh || !data?.items || showAnalyzing) return;
-
-    const interval = setInterval(() => {
-      const codes = data.items.slice(0, 20).map((item) => item.code);
-      fetchRealtimePrices(codes);
-    }, 30000); // 30초
-
-    return () => clearInterval(interval);
-  }, [autoRefresh, data, fetchRealtimePrices, showAnalyzing]);
+  // 자동 갱신 (실시간 스트림, 스트림 오류 시 30초 폴링)
+  useRealtimePrices(data?.items?.slice(0, 20).map((item) => item.code), {
+    enabled: autoRefresh && !showAnalyzing,
+    fallbackInterval: 30000,
+    onUpdate: (changes) => {
+      setRealtimePrices((prev) => mergePrices(prev, changes));
+      setLastUpdate(new Date());
+    },
+  });
 
   // 수동 새로고침 (이전 데이터 즉시 삭제 후 새로 조회)
   const handleRefresh = () => {
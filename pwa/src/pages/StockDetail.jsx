@@ -3,6 +3,7 @@ import { useParams, useNavigate, useLocation } from 'react-router-dom';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { stockAPI, portfolioAPI, watchlistAPI, realtimeAPI } from '../api/client';
 import { useAuth } from '../contexts/AuthContext';
+import useRealtimePrices from '../hooks/useRealtimePrices';
 import Loading from '../components/Loading';
 import { ArrowLeft, Star, Plus, TrendingUp, TrendingDown, FileText, Check, RefreshCw, Share2 } from 'lucide-react';
 import { LineChart, Line, XAxis, YAxis, Tooltip, ResponsiveContainer } from 'recharts';
@@ -55,13 +56,23 @@ export default function StockDetail() {
     refetchOnWindowFocus: false,
   });
 
+  // 실시간 시세 스트림 (변경 필드만 수신, 스트림 오류 시 폴링)
+  const [streamPrice, setStreamPrice] = useState(null);
+  useEffect(() => setStreamPrice(null), [code]);
+  useRealtimePrices([code], {
+    onUpdate: (changes) => {
+      if (changes[code]) setStreamPrice((prev) => ({ ...prev, ...changes[code] }));
+    },
+  });
+  const livePrice = { ...realtimePrice, ...streamPrice };
+
   // 상세 정보 + 실시간 가격 병합
   const detail = detailBase ? {
     ...detailBase,
-    current_price: realtimePrice?.current_price ?? detailBase.current_price,
-    change: realtimePrice?.change ?? detailBase.change,
-    change_rate: realtimePrice?.change_rate ?? detailBase.change_rate,
-    volume: realtimePrice?.volume ?? detailBase.volume,
+    current_price: livePrice.current_price ?? detailBase.current_price,
+    change: livePrice.change ?? detailBase.change,
+    change_rate: livePrice.change_rate ?? detailBase.change_rate,
+    volume: livePrice.volume ?? detailBase.volume,
   } : null;
 
   const { data: analysis, isLoading: analysisLoading } = useQuery({
@@ -35,7 +35,8 @@ warnings.filterwarnings("ignore")
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from scoring import SCORING_FUNCTIONS
+from scoring import SCORING_FUNCTIONS, IndicatorContext, ScoringCycle
+from services.flow_cache import get_flow_cache
 
 # 설정
 OUTPUT_DIR = PROJECT_ROOT / "output" / "intraday_scores"
@@ -113,12 +114,14 @@ def get_kis_extra_data(code: str) -> dict:
         if ccnl:
             result['buy_strength'] = ccnl.get('buy_strength', 0.0)
 
-        # 외국인/기관 수급 조회 (당일)
-        investor = KIS_CLIENT.get_investor_trend(code, days=1)
+        # 외국인/기관 수급 (당일) - main 에서 일괄 갱신한 공용 캐시에서 읽음
+        # 캐시의 최신 행이 오늘이 아니면 (당일 수급 미조회) 전일 수급을 당일로 쓰지 않음
+        investor = get_flow_cache().get_investor(code, days=1, fetcher=KIS_CLIENT.get_investor_trend)
         if investor and investor.get('daily'):
-            today = investor['daily'][0]
-            result['foreign_net'] = today.get('foreign_net', 0)
-            result['inst_net'] = today.get('institution_net', 0)
+            latest = investor['daily'][0]
+            if latest.get('date') == datetime.now().strftime('%Y%m%d'):
+                result['foreign_net'] = latest.get('foreign_net', 0)
+                result['inst_net'] = latest.get('institution_net', 0)
 
     except Exception:
         pass
@@ -253,17 +256,18 @@ def get_stock_data(code: str, days: int = 120) -> pd.DataFrame:
         return None
 
 
-def calculate_scores(df: pd.DataFrame) -> dict:
-    """V1~V5 스코어 및 지표 계산"""
+def calculate_scores(df: pd.DataFrame, code: str = None, cycle: ScoringCycle = None) -> dict:
+    """V1~V5 스코어 및 지표 계산 (지표는 종목당 1회만 계산하여 버전 간 공유, 예상 거래량은 cycle 기준)"""
     scores = {}
     signals = {}
     indicators = {}
+    ctx = IndicatorContext(df, code, cycle=cycle)
 
     for version in VERSIONS:
         try:
             func = SCORING_FUNCTIONS.get(version)
             if func:
-                result = func(df)
+                result = func(df, ctx=ctx)
                 if result:
                     scores[version] = result.get('score', 0)
                     if version == 'v2':
@@ -298,10 +302,17 @@ def calculate_scores(df: pd.DataFrame) -> dict:
     return scores, signals, indicators
 
 
-def process_stock(stock_info: dict) -> dict:
-    """단일 종목 처리 - 데이터 1회 로드 후 V1~V5 모두 계산"""
+def process_stock(stock_info: dict, cycle: ScoringCycle = None) -> dict:
+    """단일 종목 처리 - 데이터 1회 로드 후 V1~V5 모두 계산
+
+    cycle: 실행 1회 공통 시장 지수. 예상 거래량 기준 시각은 이 종목 시세 조회 시각으로 맞춘다
+    (누적 거래량과 장 경과 시간이 같은 시점이어야 장 초반 VOL_RATIO 가 부풀지 않음).
+    """
     global USE_KIS_API, MARKET_INDEX, PREV_SCORES
 
+    if cycle is None:
+        cycle = ScoringCycle.now(market_index=MARKET_INDEX)
+
     code = stock_info['Code']
     name = stock_info.get('Name', '')
     market = stock_info.get('Market', '')
@@ -309,9 +320,11 @@ def process_stock(stock_info: dict) -> dict:
 
     try:
         # 데이터 1회만 로드 (V1~V5 공유)
+        fetched_at = datetime.now()
         df = get_stock_data(code)
         if df is None or len(df) < 60:
             return None
+        cycle = cycle.at(fetched_at)
 
         # 현재가 정보
         latest = df.iloc[-1]
@@ -335,7 +348,7 @@ def process_stock(stock_info: dict) -> dict:
         volume_ratio = round(current_volume / avg_volume_5d, 2) if avg_volume_5d > 0 else 1.0
 
         # V1~V5 스코어 계산 (같은 df 사용)
-        scores, signals, indicators = calculate_scores(df)
+        scores, signals, indicators = calculate_scores(df, code, cycle)
 
         # Delta 계산 (이전 스코어 대비 변화량)
         prev = PREV_SCORES.get(code, {})
@@ -391,7 +404,7 @@ def process_stock(stock_info: dict) -> dict:
             result['foreign_net'] = kis_data['foreign_net']
             result['inst_net'] = kis_data['inst_net']
             # 시장 대비 상대강도
-            market_chg = MARKET_INDEX.get('kosdaq' if 'KOSDAQ' in market else 'kospi', 0.0)
+            market_chg = cycle.index_change(market)
             result['rel_strength'] = round(change_rate - market_chg, 2)
         else:
             result['buy_strength'] = 0.0
@@ -759,10 +772,19 @@ def main():
     # 병렬 처리
     print(f"\n[2] 스코어 계산 (V1, V2, V4, V5 + Delta)...")
     stocks = stocks_df.to_dict('records')
+
+    # 수급 일괄 갱신 (당일 수급이 확정되지 않은 종목만 증분 조회)
+    if USE_KIS_API:
+        counts = get_flow_cache().prefetch([s['Code'] for s in stocks], days=1,
+                                           fetcher=KIS_CLIENT.get_investor_trend)
+        print(f"    수급 갱신: 전체 {counts['full']}개, 당일 증분 {counts['today']}개")
     records = []
 
+    # 시장 지수는 실행당 1번, 예상 거래량 기준 시각은 종목별 시세 조회 시각 (process_stock)
+    cycle = ScoringCycle.now(market_index=MARKET_INDEX)
+
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = {executor.submit(process_stock, s): s for s in stocks}
+        futures = {executor.submit(process_stock, s, cycle): s for s in stocks}
 
         done = 0
         for future in as_completed(futures):
@@ -16,27 +16,42 @@
 
 공통 모듈:
 - indicators: 기술적 지표 일괄 계산 (LRU 캐시)
+- series: 전 구간 점수 시계열 (백테스트용, 지표 1회 계산)
+- context: 종목별 지표 공유 컨텍스트 (여러 버전 동시 계산 시 지표 1회 계산)
+- cycle: 스코어링 실행 1회 공통 기준 시각 (장중 예상 거래량 배수, 시장 지수, 과거 시점 재현)
+- rule_scoring: YAML 규칙(config/) 컴파일 후 전 종목 일괄 채점 (V2, V4)
+- gap_features: V9 갭 예측 피처 일괄 계산 + 피처 스토어
+- correlation_engine: V10 대장주-종속주 증분 상관행렬 + 워크포워드 레퍼런스
 - base_scorer: 스코어러 추상 베이스 클래스
 """
 
-from .scoring_v1 import calculate_score_v1
-from .scoring_v2 import calculate_score_v2
-from .scoring_v3 import calculate_score_v3
-from .scoring_v3_5 import calculate_score_v3_5, calculate_score_v3_5_with_investor
-from .scoring_v4 import calculate_score_v4, calculate_score_v4_with_investor
-from .scoring_v5 import calculate_score_v5
-from .scoring_v6 import calculate_score_v6, calculate_score_v6_with_investor
-from .score_v7_trend_momentum import calculate_score_v7
-from .score_v8_contrarian_bounce import calculate_score_v8, calculate_score_v8_with_investor
+from .scoring_v1 import calculate_score_v1, calculate_score_v1_series
+from .scoring_v2 import calculate_score_v2, calculate_score_v2_series
+from .scoring_v3 import calculate_score_v3, calculate_score_v3_series
+from .scoring_v3_5 import calculate_score_v3_5, calculate_score_v3_5_with_investor, calculate_score_v3_5_series
+from .scoring_v4 import calculate_score_v4, calculate_score_v4_with_investor, calculate_score_v4_series
+from .scoring_v5 import calculate_score_v5, calculate_score_v5_series
+from .scoring_v6 import calculate_score_v6, calculate_score_v6_with_investor, calculate_score_v6_series
+from .score_v7_trend_momentum import calculate_score_v7, calculate_score_v7_series
+from .score_v8_contrarian_bounce import (
+    calculate_score_v8,
+    calculate_score_v8_with_investor,
+    calculate_score_v8_series,
+)
 from .score_v10_leader_follower import (
     calculate_score_v10,
     calculate_score_v10_with_market_data,
     get_follower_opportunities,
+    get_reference_index,
     get_reference_info,
     load_reference,
+    set_reference,
+    ReferenceIndex,
 )
 
 # 공통 모듈
+from .context import IndicatorContext, indicators_for
+from .cycle import ScoringCycle, current_cycle
 from .indicators import (
     calculate_base_indicators,
     IndicatorCache,
@@ -55,6 +70,23 @@ from .base_scorer import (
     PatternScorer,
     batch_score,
 )
+from .rule_scoring import build_rule_panel, score_universe
+from .gap_features import (
+    GAP_FEATURE_COLUMNS,
+    GapFeatureStore,
+    build_gap_panel,
+    compute_gap_features,
+    gap_training_samples,
+    latest_gap_features,
+)
+from .correlation_engine import (
+    RollingCorrelation,
+    build_reference_map,
+    correlation_matrix,
+    correlation_pairs,
+    estimate_caps_by_date,
+    walk_forward_references,
+)
 from .batch_scorer import (
     BatchScorer,
     BatchResult,
@@ -76,17 +108,31 @@ SCORING_FUNCTIONS = {
     'v10': calculate_score_v10,
 }
 
+# 버전별 전 구간 점수 시계열 함수 (V10 은 시장 전체 데이터가 필요하여 제외)
+SERIES_FUNCTIONS = {
+    'v1': calculate_score_v1_series,
+    'v2': calculate_score_v2_series,
+    'v3': calculate_score_v3_series,
+    'v3.5': calculate_score_v3_5_series,
+    'v4': calculate_score_v4_series,
+    'v5': calculate_score_v5_series,
+    'v6': calculate_score_v6_series,
+    'v7': calculate_score_v7_series,
+    'v8': calculate_score_v8_series,
+}
+
 # 기본 버전 (현재 운영 중)
 DEFAULT_VERSION = 'v2'
 
 
-def calculate_score(df, version: str = None):
+def calculate_score(df, version: str = None, ctx: IndicatorContext = None):
     """
     점수 계산 함수
 
     Args:
         df: OHLCV 데이터프레임
         version: 'v1', 'v2', 'v3', 'v3.5', 'v4' 중 하나 (기본값: v2)
+        ctx: 지표 공유 컨텍스트 (같은 종목 여러 버전 계산 시)
 
     Returns:
         점수 계산 결과 딕셔너리
@@ -104,23 +150,54 @@ def calculate_score(df, version: str = None):
     if version not in SCORING_FUNCTIONS:
         raise ValueError(f"Unknown version: {version}. Available: {list(SCORING_FUNCTIONS.keys())}")
 
-    return SCORING_FUNCTIONS[version](df)
+    return SCORING_FUNCTIONS[version](df, ctx=ctx)
+
+
+def calculate_score_series(df, version: str = None, start=None, end=None, **kwargs):
+    """
+    전 구간 점수 시계열 계산 (백테스트용)
+
+    날짜마다 df[df.index <= 날짜] 로 calculate_score 를 호출한 것과 같은 결과를
+    지표 1회 계산으로 얻는다.
+
+    Args:
+        df: 전체 기간 OHLCV 데이터프레임
+        version: SERIES_FUNCTIONS 의 버전 (기본값: v2)
+        start, end: 점수를 낼 날짜 범위 (None이면 전체)
+        **kwargs: 버전별 추가 인자 (investor_data 등)
+
+    Returns:
+        index=날짜, columns=['score', 'signals', 'result'] DataFrame
+
+    Example:
+        >>> series = calculate_score_series(df, 'v4', start='2025-01-01')
+        >>> series['score'].loc['2025-03-04']
+    """
+    version = (version or DEFAULT_VERSION).lower()
+
+    if version not in SERIES_FUNCTIONS:
+        raise ValueError(f"Unknown version: {version}. Available: {list(SERIES_FUNCTIONS.keys())}")
+
+    return SERIES_FUNCTIONS[version](df, start=start, end=end, **kwargs)
 
 
-def compare_scores(df):
+def compare_scores(df, ctx: IndicatorContext = None):
     """
-    모든 버전으로 점수 계산 비교
+    모든 버전으로 점수 계산 비교 (지표는 컨텍스트로 1회만 계산)
 
     Args:
         df: OHLCV 데이터프레임
+        ctx: 지표 공유 컨텍스트 (None이면 새로 생성)
 
     Returns:
         dict: 버전별 점수 결과
     """
     results = {}
+    if ctx is None and df is not None:
+        ctx = IndicatorContext(df)
 
     for version, func in SCORING_FUNCTIONS.items():
-        result = func(df)
+        result = func(df, ctx=ctx)
         if result:
             results[version] = {
                 'score': result['score'],
@@ -174,8 +251,23 @@ __all__ = [
     'calculate_score_v10',
     'calculate_score_v10_with_market_data',
     'get_follower_opportunities',
+    'get_reference_index',
     'get_reference_info',
     'load_reference',
+    'set_reference',
+    'ReferenceIndex',
+    # 전 구간 점수 시계열
+    'calculate_score_v1_series',
+    'calculate_score_v2_series',
+    'calculate_score_v3_series',
+    'calculate_score_v3_5_series',
+    'calculate_score_v4_series',
+    'calculate_score_v5_series',
+    'calculate_score_v6_series',
+    'calculate_score_v7_series',
+    'calculate_score_v8_series',
+    'calculate_score_series',
+    'SERIES_FUNCTIONS',
     # 통합 함수
     'calculate_score',
     'compare_scores',
@@ -183,6 +275,10 @@ __all__ = [
     'SCORING_FUNCTIONS',
     'DEFAULT_VERSION',
     # 공통 지표 모듈
+    'IndicatorContext',
+    'indicators_for',
+    'ScoringCycle',
+    'current_cycle',
     'calculate_base_indicators',
     'IndicatorCache',
     'check_ma_status',
@@ -191,6 +287,23 @@ __all__ = [
     'detect_obv_divergence',
     'detect_vcp_pattern',
     'get_global_cache',
+    # YAML 규칙 일괄 채점
+    'build_rule_panel',
+    'score_universe',
+    # 갭 상승 피처
+    'GAP_FEATURE_COLUMNS',
+    'GapFeatureStore',
+    'build_gap_panel',
+    'compute_gap_features',
+    'gap_training_samples',
+    'latest_gap_features',
+    # 종목 상관관계 (대장주-2등주 매핑)
+    'RollingCorrelation',
+    'build_reference_map',
+    'correlation_matrix',
+    'correlation_pairs',
+    'estimate_caps_by_date',
+    'walk_forward_references',
     # 베이스 클래스
     'BaseScorer',
     'ScoreResult',
@@ -1,7 +1,7 @@
 """
 스코어링 설정 모듈
 
-YAML 기반 스코어링 규칙 외부화
+YAML 기반 스코어링 규칙 외부화 (조건식은 컴파일 후 전 종목 패널에 벡터 평가)
 """
 
 from .scoring_loader import (
@@ -14,6 +14,7 @@ from .scoring_loader import (
     clear_config_cache,
     list_available_configs,
 )
+from .rule_compiler import CompiledCondition, CompiledRuleset, compile_condition
 
 __all__ = [
     'ScoringConfig',
@@ -24,4 +25,7 @@ __all__ = [
     'get_config',
     'clear_config_cache',
     'list_available_configs',
+    'CompiledCondition',
+    'CompiledRuleset',
+    'compile_condition',
 ]
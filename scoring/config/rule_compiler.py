@@ -0,0 +1,307 @@
+"""
+스코어링 규칙 컴파일러
+
+YAML 조건 문자열을 한 번만 파싱해서 식 트리(클로저)로 만들고,
+종목 1개 지표 딕셔너리 / 전 종목 지표 패널(DataFrame, 행=종목) 모두에 평가한다.
+
+지원 문법:
+    - 비교: >, >=, <, <=, ==, != (연쇄 비교 "SMA_5 > SMA_20 > SMA_60" 가능)
+    - 산술: + - * / 및 괄호 ("close >= high_60d * 0.97")
+    - 논리: AND, OR (AND 가 우선)
+    - 변수: 지표 이름, X_prev 는 없으면 X 로 대체, 없는 지표는 0
+
+사용법:
+    >>> from scoring.config import get_config
+    >>> ruleset = get_config('v2').compile()
+    >>> result = ruleset.evaluate(panel)   # index=종목코드, columns=[score, trend_score, ..., signals]
+"""
+
+import re
+from functools import lru_cache, reduce
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+
+_TOKEN_RE = re.compile(r"\s*(?:(\d+(?:\.\d+)?)|(>=|<=|==|!=|>|<|[-+*/()])|([A-Za-z_]\w*))")
+
+_COMPARE = {
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '!=': np.not_equal,
+}
+
+_ARITH = {
+    '+': np.add,
+    '-': np.subtract,
+    '*': np.multiply,
+    '/': np.divide,
+}
+
+
+def _tokenize(condition: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    text = condition.strip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"조건식 해석 실패: {condition!r} (위치 {pos})")
+        number, op, name = match.groups()
+        if number is not None:
+            tokens.append(('num', number))
+        elif op is not None:
+            tokens.append(('op', op))
+        elif name in ('AND', 'OR'):
+            tokens.append(('kw', name))
+        else:
+            tokens.append(('name', name))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """재귀 하강 파서 → lookup 을 받는 클로저"""
+
+    def __init__(self, condition: str):
+        self.condition = condition
+        self.tokens = _tokenize(condition)
+        self.pos = 0
+        self.variables = set()
+
+    def parse(self) -> Callable:
+        node = self._or()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"조건식 해석 실패: {self.condition!r} (남은 토큰 {self.tokens[self.pos:]})")
+        return node
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _take(self, kind: str, values=None):
+        tok_kind, value = self._peek()
+        if tok_kind == kind and (values is None or value in values):
+            self.pos += 1
+            return value
+        return None
+
+    def _or(self):
+        nodes = [self._and()]
+        while self._take('kw', ('OR',)):
+            nodes.append(self._and())
+        if len(nodes) == 1:
+            return nodes[0]
+        return lambda env: reduce(np.logical_or, [n(env) for n in nodes])
+
+    def _and(self):
+        nodes = [self._compare()]
+        while self._take('kw', ('AND',)):
+            nodes.append(self._compare())
+        if len(nodes) == 1:
+            return nodes[0]
+        return lambda env: reduce(np.logical_and, [n(env) for n in nodes])
+
+    def _compare(self):
+        operands = [self._sum()]
+        ops = []
+        while (op := self._take('op', _COMPARE)) is not None:
+            ops.append(_COMPARE[op])
+            operands.append(self._sum())
+        if not ops:
+            return operands[0]
+
+        def compare(env):
+            values = [o(env) for o in operands]
+            masks = [op(values[i], values[i + 1]) for i, op in enumerate(ops)]
+            return reduce(np.logical_and, masks)
+        return compare
+
+    def _binary(self, sub, symbols):
+        node = sub()
+        while (op := self._take('op', symbols)) is not None:
+            node = (lambda f, l, r: lambda env: f(l(env), r(env)))(_ARITH[op], node, sub())
+        return node
+
+    def _sum(self):
+        return self._binary(self._product, ('+', '-'))
+
+    def _product(self):
+        return self._binary(self._factor, ('*', '/'))
+
+    def _factor(self):
+        if self._take('op', ('-',)) is not None:
+            inner = self._factor()
+            return lambda env: np.negative(inner(env))
+        if self._take('op', ('(',)) is not None:
+            node = self._or()
+            if self._take('op', (')',)) is None:
+                raise ValueError(f"조건식 해석 실패: {self.condition!r} (괄호 불일치)")
+            return node
+        number = self._take('num')
+        if number is not None:
+            value = float(number)
+            return lambda env: value
+        name = self._take('name')
+        if name is not None:
+            self.variables.add(name)
+            return lambda env: env(name)
+        raise ValueError(f"조건식 해석 실패: {self.condition!r} (토큰 {self._peek()})")
+
+
+def _scalar(value: Any) -> float:
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _resolve(name: str, has: Callable[[str], bool]) -> str:
+    """X_prev 는 없으면 X 로 대체"""
+    if name.endswith('_prev') and not has(name):
+        return name[:-5]
+    return name
+
+
+class CompiledCondition:
+    """파싱 완료된 조건식"""
+
+    __slots__ = ('source', 'variables', '_fn')
+
+    def __init__(self, condition: str):
+        parser = _Parser(condition)
+        self._fn = parser.parse()
+        self.source = condition
+        self.variables = frozenset(parser.variables)
+
+    def evaluate(self, indicators: Mapping[str, Any]) -> bool:
+        """지표 딕셔너리 1개 평가"""
+        def lookup(name):
+            return _scalar(indicators.get(_resolve(name, indicators.__contains__), 0))
+
+        with np.errstate(all='ignore'):
+            return bool(self._fn(lookup))
+
+    def mask(self, panel: 'PanelView') -> np.ndarray:
+        """전 종목 패널 평가 → bool 배열"""
+        with np.errstate(all='ignore'):
+            result = self._fn(panel.lookup)
+        return np.broadcast_to(np.asarray(result, dtype=bool), (len(panel),))
+
+    def __repr__(self) -> str:
+        return f"CompiledCondition({self.source!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_condition(condition: str) -> CompiledCondition:
+    """조건 문자열 컴파일 (같은 문자열은 1번만 파싱)"""
+    return CompiledCondition(condition)
+
+
+class PanelView:
+    """지표 패널 (행=종목) 컬럼을 float 배열로 1번만 변환"""
+
+    def __init__(self, panel: pd.DataFrame):
+        self.panel = panel
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.panel)
+
+    def lookup(self, name: str):
+        name = _resolve(name, self.panel.columns.__contains__)
+        array = self._arrays.get(name)
+        if array is None:
+            if name in self.panel.columns:
+                array = pd.to_numeric(self.panel[name], errors='coerce').to_numpy(dtype=float)
+            else:
+                array = np.zeros(len(self.panel))
+            self._arrays[name] = array
+        return array
+
+
+class CompiledRuleset:
+    """ScoringConfig 를 컴파일한 규칙 집합 - 전 종목 패널을 한 번에 채점"""
+
+    def __init__(self, config):
+        self.config = config
+        self.disqualifiers = [(rule, compile_condition(rule.condition)) for rule in config.disqualifiers]
+        self.groups = [
+            (name, group, [(rule, compile_condition(rule.condition)) for rule in group.rules])
+            for name, group in config.scoring_groups.items()
+        ]
+        variables = set()
+        for _, cond in self.disqualifiers:
+            variables |= cond.variables
+        for _, _, rules in self.groups:
+            for _, cond in rules:
+                variables |= cond.variables
+        self.variables = sorted(variables)
+
+    def evaluate(self, panel: pd.DataFrame) -> pd.DataFrame:
+        """
+        전 종목 채점
+
+        Args:
+            panel: index=종목코드, columns=지표 (규칙이 참조하는 이름)
+
+        Returns:
+            index=종목코드, columns=['score', '<그룹>_score'..., 'signals',
+            'disqualified', 'disqualify_reason'] (ScoringConfig.calculate_all_scores 와 동일 규칙)
+        """
+        view = PanelView(panel)
+        n = len(panel)
+
+        # 과락: 순서상 첫 번째로 걸린 규칙
+        disq_index = np.full(n, -1)
+        for i, (_, cond) in enumerate(self.disqualifiers):
+            disq_index[cond.mask(view) & (disq_index < 0)] = i
+        passed = disq_index < 0
+
+        columns: Dict[str, Any] = {}
+        signal_names: List[str] = []
+        signal_masks: List[np.ndarray] = []
+        total = np.zeros(n, dtype=np.int64)
+
+        for name, group, rules in self.groups:
+            score = np.zeros(n, dtype=np.int64)
+            applied: Dict[str, np.ndarray] = {}  # 배타적 그룹별 적용 여부
+            for rule, cond in rules:
+                hit = cond.mask(view) & passed
+                if rule.exclusive_group:
+                    taken = applied.get(rule.exclusive_group)
+                    if taken is not None:
+                        hit = hit & ~taken
+                        applied[rule.exclusive_group] = taken | hit
+                    else:
+                        applied[rule.exclusive_group] = hit
+                score += np.where(hit, rule.score, 0)
+                signal_names.append(rule.signal)
+                signal_masks.append(hit)
+            score = np.where(passed, np.clip(score, group.min_score, group.max_score), 0)
+            columns[f"{name}_score"] = score
+            total += score
+
+        hits = np.column_stack(signal_masks) if signal_masks else np.zeros((n, 0), dtype=bool)
+        signals = []
+        for row in range(n):
+            if passed[row]:
+                signals.append([signal_names[j] for j in np.flatnonzero(hits[row])])
+            else:
+                rule = self.disqualifiers[disq_index[row]][0]
+                signals.append([rule.signal] if rule.signal else [])
+
+        result = pd.DataFrame(index=panel.index)
+        result['score'] = np.where(passed, np.clip(total, 0, self.config.max_score), 0)
+        for column, values in columns.items():
+            result[column] = values
+        result['signals'] = signals
+        result['disqualified'] = ~passed
+        result['disqualify_reason'] = [
+            None if i < 0 else self.disqualifiers[i][0].name for i in disq_index
+        ]
+        return result
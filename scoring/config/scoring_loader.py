@@ -13,15 +13,19 @@
             if rule.evaluate(indicators):
                 score += rule.score
                 signals.append(rule.signal)
+
+    # 전 종목 패널 한 번에 채점 (조건식은 1번만 컴파일)
+    result = config.compile().evaluate(panel)
 """
 
 import os
-import re
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any, Callable
 import yaml
 
+from .rule_compiler import CompiledRuleset, compile_condition
+
 # 설정 파일 디렉토리
 CONFIG_DIR = Path(__file__).parent
 
@@ -115,6 +119,13 @@ class ScoringConfig:
     disqualifiers: List[DisqualifierRule] = field(default_factory=list)
     scoring_groups: Dict[str, ScoringGroup] = field(default_factory=dict)
     signal_names_kr: Dict[str, str] = field(default_factory=dict)
+    _compiled: Optional[CompiledRuleset] = field(default=None, init=False, repr=False, compare=False)
+
+    def compile(self) -> CompiledRuleset:
+        """전 종목 패널 채점용 컴파일 규칙 (1회 생성 후 재사용)"""
+        if self._compiled is None:
+            self._compiled = CompiledRuleset(self)
+        return self._compiled
 
     def check_disqualifiers(self, indicators: Dict[str, Any]) -> Optional[str]:
         """과락 조건 검사
@@ -178,94 +189,14 @@ class ScoringConfig:
 def _evaluate_condition(condition: str, indicators: Dict[str, Any]) -> bool:
     """조건 문자열 평가
 
-    지원 형식:
+    지원 형식 (rule_compiler 참조, 문자열별로 1번만 파싱):
     - "SMA_5 > SMA_20"
     - "RSI >= 60 AND RSI <= 75"
     - "60 <= RSI <= 75"
+    - "close >= high_60d * 0.97"
     - "TRADING_VALUE >= 50000000000"
     """
-    # 특수 패턴: "A < B < C" 형식
-    triple_match = re.match(r'^(\w+)\s*(<|<=)\s*(\w+)\s*(<|<=)\s*(\w+)$', condition)
-    if triple_match:
-        left, op1, mid, op2, right = triple_match.groups()
-        left_val = _get_value(left, indicators)
-        mid_val = _get_value(mid, indicators)
-        right_val = _get_value(right, indicators)
-        return _compare(left_val, op1, mid_val) and _compare(mid_val, op2, right_val)
-
-    # 특수 패턴: "60 <= RSI <= 75" 형식
-    range_match = re.match(r'^(\d+(?:\.\d+)?)\s*(<=?)\s*(\w+)\s*(<=?)\s*(\d+(?:\.\d+)?)$', condition)
-    if range_match:
-        low, op1, var, op2, high = range_match.groups()
-        val = _get_value(var, indicators)
-        low_val = float(low)
-        high_val = float(high)
-        return _compare(low_val, op1, val) and _compare(val, op2, high_val)
-
-    # AND/OR 분리
-    if ' AND ' in condition:
-        parts = condition.split(' AND ')
-        return all(_evaluate_condition(p.strip(), indicators) for p in parts)
-
-    if ' OR ' in condition:
-        parts = condition.split(' OR ')
-        return any(_evaluate_condition(p.strip(), indicators) for p in parts)
-
-    # 단일 비교: "A >= B" 또는 "A >= 123"
-    compare_match = re.match(r'^(\w+)\s*(>=|<=|>|<|==|!=)\s*(.+)$', condition)
-    if compare_match:
-        left, op, right = compare_match.groups()
-        left_val = _get_value(left, indicators)
-        right_val = _get_value(right.strip(), indicators)
-        return _compare(left_val, op, right_val)
-
-    return False
-
-
-def _get_value(expr: str, indicators: Dict[str, Any]) -> Any:
-    """표현식에서 값 추출"""
-    expr = expr.strip()
-
-    # 숫자
-    if re.match(r'^-?\d+(?:\.\d+)?$', expr):
-        return float(expr)
-
-    # _prev 접미사 (이전 값)
-    if expr.endswith('_prev'):
-        base = expr[:-5]
-        # 이전 값이 있으면 사용, 없으면 현재값 사용
-        if f"{base}_prev" in indicators:
-            return indicators.get(f"{base}_prev", 0)
-        return indicators.get(base, 0)
-
-    # 일반 변수
-    return indicators.get(expr, 0)
-
-
-def _compare(left: Any, op: str, right: Any) -> bool:
-    """비교 연산"""
-    if left is None or right is None:
-        return False
-
-    try:
-        left = float(left) if not isinstance(left, (int, float)) else left
-        right = float(right) if not isinstance(right, (int, float)) else right
-    except (ValueError, TypeError):
-        return False
-
-    if op in ('>', '>'):
-        return left > right
-    elif op in ('<', '<'):
-        return left < right
-    elif op == '>=':
-        return left >= right
-    elif op == '<=':
-        return left <= right
-    elif op == '==':
-        return left == right
-    elif op == '!=':
-        return left != right
-    return False
+    return compile_condition(condition).evaluate(indicators)
 
 
 def load_scoring_config(version: str) -> Optional[ScoringConfig]:
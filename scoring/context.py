@@ -0,0 +1,180 @@
+"""
+종목별 지표 공유 컨텍스트
+
+같은 종목/같은 봉 수로 여러 버전 점수(V1~V10)를 연달아 계산할 때
+각 지표를 최대 1번만 계산하도록 결과를 공유한다.
+
+- pandas_ta 지표 (ta.sma / ta.obv / ta.bbands ...): 컨텍스트가 활성화된 동안
+  scoring.series 의 ta 프록시가 (지표, 입력 컬럼, 인자) 별로 결과를 재사용
+- 순수 pandas 지표 (V5~V8, V10 의 _calculate_indicators): indicators_for(df) 로
+  이동평균/표준편차/OBV/RSI/MACD/ATR 기본 계열을 지연 계산 + 재사용
+
+사용 예:
+    >>> ctx = IndicatorContext(df, code='005930')
+    >>> v1 = calculate_score_v1(df, ctx=ctx)
+    >>> v6 = calculate_score_v6(df, ctx=ctx)
+    >>> ctx.stats()['computed']   # 지표별 계산 횟수 (모두 1)
+
+cycle=ScoringCycle 을 주면 ctx 로 계산하는 동안 그 사이클(기준 시각, 예상 거래량
+배수)이 활성화된다 - 스레드풀 작업자에게 사이클을 넘기는 통로.
+
+컨텍스트는 한 스레드에서 한 종목을 계산하는 동안만 쓴다 (스레드 간 공유 X).
+"""
+
+import functools
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .cycle import ScoringCycle
+from .series import _FullHistory, ta
+
+BASE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+_local = threading.local()
+
+
+class IndicatorContext:
+    """(종목코드, 봉 수) 단위 지표 캐시 - 지표는 처음 요청될 때 계산"""
+
+    def __init__(self, df: pd.DataFrame, code: Optional[str] = None,
+                 cycle: Optional[ScoringCycle] = None):
+        self.df = df
+        self.code = code
+        self.cycle = cycle
+        self.bars = len(df)
+        self.columns = [c for c in BASE_COLUMNS if c in df.columns]
+        self._history = _FullHistory(df[self.columns], exact=True)
+        self._values: Dict[Tuple, object] = {}
+
+    @property
+    def key(self) -> Tuple[Optional[str], int]:
+        return (self.code, self.bars)
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """df 가 이 컨텍스트와 같은 봉 데이터인지 (점수 계산기 내부 복사본 포함)"""
+        if df is self.df:
+            return True
+        if len(df) != self.bars or not df.index.equals(self.df.index):
+            return False
+        return all(c in df.columns and df[c].equals(self.df[c]) for c in self.columns)
+
+    @contextmanager
+    def activate(self):
+        """이 블록 안의 ta 호출/indicators_for 가 컨텍스트 결과를 공유"""
+        prev = getattr(_local, 'ctx', None)
+        _local.ctx = self
+        try:
+            with self.activate_cycle(), ta.activated(self._history):
+                yield self
+        finally:
+            _local.ctx = prev
+
+    def activate_cycle(self):
+        """사이클만 활성화 (df 가 달라 지표를 공유하지 않을 때도 기준 시각은 유지)"""
+        return self.cycle.activate() if self.cycle is not None else nullcontext()
+
+    # ------------------------------------------------------------
+    # 공통 기본 지표 (pandas 3 Copy-on-Write 라 반환 Series 를 그대로 대입해도 안전)
+    # ------------------------------------------------------------
+    def _get(self, label: str, compute: Callable):
+        value = self._values.get(label)
+        if value is None:
+            value = compute()
+            self._values[label] = value
+            self._history.computed[label] += 1
+        else:
+            self._history.reused[label] += 1
+        return value
+
+    def series(self, column: str) -> pd.Series:
+        """기본 컬럼 또는 파생 계열 (obv / true_range / trading_value)"""
+        derived = {'obv': self.obv, 'true_range': self.true_range, 'trading_value': self.trading_value}
+        if column in derived:
+            return derived[column]()
+        return self.df[column]
+
+    def rolling(self, column: str, window: int, how: str = 'mean',
+                min_periods: Optional[int] = None) -> pd.Series:
+        """column.rolling(window, min_periods).<how>() (how: mean / std / min / max)"""
+        label = f"rolling_{how}({column}, {window}, min_periods={min_periods})"
+        return self._get(label, lambda: getattr(
+            self.series(column).rolling(window, min_periods=min_periods), how)())
+
+    def ewm(self, column: str, span: int) -> pd.Series:
+        """column.ewm(span, adjust=False).mean()"""
+        return self._get(f"ewm({column}, {span})",
+                         lambda: self.series(column).ewm(span=span, adjust=False).mean())
+
+    def obv(self) -> pd.Series:
+        return self._get("obv()", lambda: (
+            np.sign(self.df['Close'].diff()) * self.df['Volume']).fillna(0).cumsum())
+
+    def true_range(self) -> pd.Series:
+        def compute():
+            high_low = self.df['High'] - self.df['Low']
+            high_close = abs(self.df['High'] - self.df['Close'].shift(1))
+            low_close = abs(self.df['Low'] - self.df['Close'].shift(1))
+            return pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+        return self._get("true_range()", compute)
+
+    def trading_value(self) -> pd.Series:
+        return self._get("trading_value()", lambda: self.df['Close'] * self.df['Volume'])
+
+    def rsi_components(self, length: int = 14,
+                       min_periods: Optional[int] = None) -> Tuple[pd.Series, pd.Series]:
+        """RSI 평균 상승폭/하락폭 (단순 이동평균 방식)"""
+        def compute():
+            delta = self.df['Close'].diff()
+            gain = delta.where(delta > 0, 0).rolling(length, min_periods=min_periods).mean()
+            loss = (-delta.where(delta < 0, 0)).rolling(length, min_periods=min_periods).mean()
+            return gain, loss
+        return self._get(f"rsi_components({length}, min_periods={min_periods})", compute)
+
+    def macd(self, fast: int = 12, slow: int = 26,
+             signal: int = 9) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        """(macd, signal, hist) - EMA(adjust=False) 방식"""
+        def compute():
+            macd = self.ewm('Close', fast) - self.ewm('Close', slow)
+            macd_signal = macd.ewm(span=signal, adjust=False).mean()
+            return macd, macd_signal, macd - macd_signal
+        return self._get(f"macd({fast}, {slow}, {signal})", compute)
+
+    def stats(self) -> Dict:
+        """지표별 계산/재사용 횟수"""
+        return {
+            'code': self.code,
+            'bars': self.bars,
+            'computed': dict(self._history.computed),
+            'reused': dict(self._history.reused),
+        }
+
+
+def current_context() -> Optional[IndicatorContext]:
+    """현재 스레드에서 활성화된 컨텍스트"""
+    return getattr(_local, 'ctx', None)
+
+
+def indicators_for(df: pd.DataFrame) -> IndicatorContext:
+    """df 에 맞는 활성 컨텍스트, 없으면 1회용 컨텍스트 (결과는 동일)"""
+    ctx = current_context()
+    if ctx is not None and ctx.matches(df):
+        return ctx
+    return IndicatorContext(df)
+
+
+def accepts_context(func: Callable) -> Callable:
+    """점수 계산 함수에 ctx=IndicatorContext 인자 추가 (df 와 맞으면 활성화 후 실행)"""
+    @functools.wraps(func)
+    def wrapper(df, *args, ctx: Optional[IndicatorContext] = None, **kwargs):
+        if ctx is None or df is None:
+            return func(df, *args, **kwargs)
+        if not ctx.matches(df):
+            with ctx.activate_cycle():
+                return func(df, *args, **kwargs)
+        with ctx.activate():
+            return func(df, *args, **kwargs)
+    return wrapper
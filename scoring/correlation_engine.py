@@ -0,0 +1,277 @@
+"""
+대장주-종속주 상관관계 엔진 (증분 상관행렬 + 시점별 레퍼런스)
+
+목적:
+- train_leader_follower 의 returns_df.corr() + 종목 쌍 이중 루프를 배열 연산으로 대체
+- 하루씩 수익률을 추가(및 창 밖 날짜 제거)하며 상관행렬을 증분 갱신
+  → 워크포워드 백테스트용 시점별(look-ahead 없는) 레퍼런스, 라이브 레퍼런스 일일 갱신
+
+방식:
+- 종목 쌍 (i, j) 별로 둘 다 값이 있는 날만 사용 (DataFrame.corr() 의 pairwise 결측 처리와 동일)
+  n_ij, Σx_i, Σx_i², Σx_i·x_j 를 (N × N) 누적합으로 유지 → 날짜 1개 갱신은 외적 4번
+- 쌍 추출은 상삼각 마스크 (np.triu_indices) 로 한 번에
+- 레퍼런스 dict 형식은 train_leader_follower.build_reference 결과와 동일
+  (leader_to_followers, follower_to_leaders, all_pairs ...)
+- 워크포워드의 대장주 판정/대상 종목은 시점별 시가총액 (caps_by_date) 기준
+  한계: 시점 시총은 종가 × 현재 발행주식수 추정 (증자/분할 미반영), 현재 상장 종목만 대상 (상장폐지 종목 없음)
+
+사용법:
+    from scoring.correlation_engine import RollingCorrelation, walk_forward_references
+
+    for date, reference in walk_forward_references(returns_df, market_caps, window=120):
+        set_reference(reference)   # 다음 거래일 채점에 사용 (date 종가까지의 데이터만 반영)
+"""
+
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# 대장주당 최대 종속주 수
+MAX_FOLLOWERS = 10
+
+
+# ============================================================================
+# 상관행렬
+# ============================================================================
+def _pairwise_corr(n: np.ndarray, sx: np.ndarray, sxx: np.ndarray, sxy: np.ndarray,
+                   min_periods: int = 1) -> np.ndarray:
+    """쌍별 누적합 → 피어슨 상관계수 (관측 부족/분산 0 은 NaN)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = n * sxy - sx * sx.T
+        var = n * sxx - sx * sx
+        den = np.sqrt(np.clip(var, 0, None) * np.clip(var.T, 0, None))
+        corr = np.where((den > 0) & (n >= max(min_periods, 2)), cov / den, np.nan)
+    return np.clip(corr, -1.0, 1.0)
+
+
+def correlation_matrix(returns: np.ndarray, min_periods: int = 1) -> np.ndarray:
+    """
+    (날짜 × 종목) 수익률 → 종목 상관행렬 (NaN 은 해당 쌍에서만 제외)
+
+    DataFrame.corr() 와 같은 결과를 행렬곱 4번으로 계산한다.
+    """
+    returns = np.asarray(returns, dtype=float)
+    mask = (~np.isnan(returns)).astype(float)
+    x = np.where(mask > 0, returns, 0.0)
+    return _pairwise_corr(mask.T @ mask, x.T @ mask, (x * x).T @ mask, x.T @ x, min_periods)
+
+
+class RollingCorrelation:
+    """일별 수익률을 하나씩 추가하며 상관행렬을 증분 갱신 (window=None 이면 누적)"""
+
+    def __init__(self, n_assets: int, window: Optional[int] = None, min_periods: int = 1):
+        self.n_assets = n_assets
+        self.window = window
+        self.min_periods = min_periods
+        self._rows = []   # 창 안의 수익률 행 (제거용)
+        self._n = np.zeros((n_assets, n_assets))
+        self._sx = np.zeros((n_assets, n_assets))
+        self._sxx = np.zeros((n_assets, n_assets))
+        self._sxy = np.zeros((n_assets, n_assets))
+
+    def _apply(self, row: np.ndarray, sign: float):
+        mask = (~np.isnan(row)).astype(float)
+        x = np.where(mask > 0, row, 0.0)
+        self._n += sign * np.outer(mask, mask)
+        self._sx += sign * np.outer(x, mask)
+        self._sxx += sign * np.outer(x * x, mask)
+        self._sxy += sign * np.outer(x, x)
+
+    def update(self, row: Sequence[float]):
+        """하루치 수익률 추가 (결측은 NaN). 창을 넘는 가장 오래된 날은 제거"""
+        row = np.asarray(row, dtype=float)
+        self._apply(row, 1.0)
+        if self.window is not None:
+            self._rows.append(row)
+            if len(self._rows) > self.window:
+                self._apply(self._rows.pop(0), -1.0)
+
+    def corr(self) -> np.ndarray:
+        return _pairwise_corr(self._n, self._sx, self._sxx, self._sxy, self.min_periods)
+
+    @property
+    def n_obs(self) -> np.ndarray:
+        """쌍별 관측 수"""
+        return self._n.copy()
+
+
+# ============================================================================
+# 쌍 추출 / 대장주-종속주 분류 / 레퍼런스
+# ============================================================================
+def correlation_pairs(corr: np.ndarray, tickers: Sequence[str], min_corr: float = 0.4) -> pd.DataFrame:
+    """
+    상삼각 (i < j) 에서 상관계수 min_corr 이상 쌍 추출
+
+    Returns:
+        ticker1, ticker2, correlation(소수 4자리) — 상관계수 내림차순
+    """
+    tickers = np.asarray(tickers, dtype=object)
+    i, j = np.triu_indices(len(tickers), k=1)
+    values = corr[i, j]
+    keep = ~np.isnan(values) & (values >= min_corr)
+
+    pairs_df = pd.DataFrame({
+        'ticker1': tickers[i[keep]],
+        'ticker2': tickers[j[keep]],
+        'correlation': np.round(values[keep], 4),
+    })
+    return pairs_df.sort_values('correlation', ascending=False)
+
+
+def classify_pairs(pairs_df: pd.DataFrame, market_caps: pd.DataFrame) -> pd.DataFrame:
+    """시가총액이 큰 쪽을 대장주로 분류 (market_caps: ticker, name, 시가총액, 중복 종목은 첫 행)"""
+    caps = market_caps.drop_duplicates('ticker', keep='first').set_index('ticker')
+    cap_dict = caps['시가총액']
+    name_dict = caps['name']
+
+    t1, t2 = pairs_df['ticker1'].to_numpy(dtype=object), pairs_df['ticker2'].to_numpy(dtype=object)
+    cap1 = pairs_df['ticker1'].map(cap_dict).fillna(0).to_numpy()
+    cap2 = pairs_df['ticker2'].map(cap_dict).fillna(0).to_numpy()
+
+    first_leads = cap1 >= cap2
+    leader = np.where(first_leads, t1, t2)
+    follower = np.where(first_leads, t2, t1)
+    leader_cap = np.where(first_leads, cap1, cap2)
+    follower_cap = np.where(first_leads, cap2, cap1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cap_ratio = np.where(leader_cap > 0, follower_cap / leader_cap, 0)
+
+    leader = pd.Series(leader)
+    follower = pd.Series(follower)
+    return pd.DataFrame({
+        'leader_code': leader,
+        'leader_name': leader.map(name_dict).fillna(leader),
+        'leader_cap': leader_cap,
+        'follower_code': follower,
+        'follower_name': follower.map(name_dict).fillna(follower),
+        'follower_cap': follower_cap,
+        'correlation': pairs_df['correlation'].to_numpy(),
+        'cap_ratio': np.round(cap_ratio, 4),
+    })
+
+
+def build_reference_map(classified_df: pd.DataFrame, min_corr: float = 0.5, created_at: str = None) -> Dict:
+    """
+    대장주 → 종속주 (상관계수 높은 순 최대 10개), 종속주 → 대장주 레퍼런스 dict
+
+    형식은 train_leader_follower.build_reference 와 동일.
+    """
+    filtered = classified_df[classified_df['correlation'] >= min_corr]
+
+    leader_map = {}
+    leader_names = {}
+    for leader, group in filtered.groupby('leader_code', sort=False):
+        top = group.sort_values('correlation', ascending=False, kind='stable').head(MAX_FOLLOWERS)
+        leader_map[leader] = [
+            {'code': code, 'name': name, 'correlation': corr, 'cap_ratio': ratio}
+            for code, name, corr, ratio in zip(top['follower_code'], top['follower_name'],
+                                               top['correlation'].tolist(), top['cap_ratio'].tolist())
+        ]
+        leader_names[leader] = group['leader_name'].iloc[0]
+
+    follower_to_leader = {}
+    for leader, followers in leader_map.items():
+        for f in followers:
+            follower_to_leader.setdefault(f['code'], []).append({
+                'leader_code': leader,
+                'leader_name': leader_names[leader],
+                'correlation': f['correlation'],
+            })
+
+    return {
+        'version': '1.0',
+        'created_at': created_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'min_correlation': min_corr,
+        'total_leaders': len(leader_map),
+        'total_followers': len(follower_to_leader),
+        'total_pairs': len(filtered),
+        'leader_to_followers': leader_map,
+        'follower_to_leaders': follower_to_leader,
+        'all_pairs': filtered.to_dict('records'),
+    }
+
+
+# ============================================================================
+# 워크포워드
+# ============================================================================
+def estimate_caps_by_date(close_df: pd.DataFrame, market_caps: pd.DataFrame) -> pd.DataFrame:
+    """
+    시점별 시가총액 추정 (날짜 × 종목) = 그날 종가 × 현재 발행주식수
+
+    현재 발행주식수는 현재 시총 / 마지막 종가로 역산 (증자/분할은 반영하지 못함).
+    """
+    caps = market_caps.drop_duplicates('ticker', keep='first').set_index('ticker')['시가총액']
+    last_close = close_df.ffill().iloc[-1]
+    shares = caps.reindex(close_df.columns) / last_close.replace(0, np.nan)
+    return close_df * shares
+
+
+def _caps_as_of(caps_by_date: pd.DataFrame, date, names: pd.Series) -> pd.DataFrame:
+    """date 시점 시가총액 (caps_by_date 는 ffill 된 상태) → classify_pairs 형식"""
+    past = caps_by_date.loc[:date]
+    caps = past.iloc[-1].dropna() if len(past) else pd.Series(dtype=float)
+    return pd.DataFrame({'ticker': caps.index, 'name': [names.get(t, t) for t in caps.index],
+                         '시가총액': caps.to_numpy()})
+
+
+def walk_forward_references(
+    returns_df: pd.DataFrame,
+    market_caps: pd.DataFrame,
+    window: Optional[int] = 120,
+    calc_corr: float = 0.4,
+    min_corr: float = 0.5,
+    min_periods: int = 60,
+    start=None,
+    step: int = 1,
+    caps_by_date: Optional[pd.DataFrame] = None,
+    universe_size: Optional[int] = None,
+) -> Iterator[Tuple[pd.Timestamp, Dict]]:
+    """
+    날짜별 시점 레퍼런스 생성 (look-ahead 없음)
+
+    Args:
+        returns_df: index=날짜, columns=종목코드 일별 수익률 (결측 NaN)
+        market_caps: ticker, name, 시가총액 (종목명, caps_by_date 가 없으면 대장주 판정도 이 시총 -
+            현재 시총이라 과거 시점 판정에 미래 정보가 섞임)
+        window: 상관계수 창 (거래일, None이면 누적)
+        calc_corr / min_corr: 쌍 추출 / 레퍼런스 최소 상관계수
+        min_periods: 쌍별 최소 관측 수
+        start: 이 날짜부터 레퍼런스 생성 (이전 날짜는 창 채우기만)
+        step: 레퍼런스 생성 간격 (거래일)
+        caps_by_date: index=날짜, columns=종목코드 시점별 시가총액 (estimate_caps_by_date)
+            → 대장주 판정을 그 날짜 시총으로
+        universe_size: 그 날짜 시총 상위 N 종목 쌍만 사용 (caps_by_date 필요)
+
+    Yields:
+        (날짜, 레퍼런스) — 날짜 종가까지의 수익률만 반영, 다음 거래일 채점에 사용
+    """
+    if universe_size is not None and caps_by_date is None:
+        raise ValueError("universe_size 는 caps_by_date 와 함께 사용")
+    returns_df = returns_df.sort_index()
+    tickers = list(returns_df.columns)
+    engine = RollingCorrelation(len(tickers), window=window, min_periods=min_periods)
+    start = pd.Timestamp(start) if start is not None else None
+    if caps_by_date is not None:
+        caps_by_date = caps_by_date.sort_index().ffill()
+        names = market_caps.drop_duplicates('ticker', keep='first').set_index('ticker')['name']
+
+    emitted = 0
+    for date, row in zip(returns_df.index, returns_df.to_numpy(dtype=float)):
+        engine.update(row)
+        if start is not None and date < start:
+            continue
+        if emitted % step == 0:
+            pairs_df = correlation_pairs(engine.corr(), tickers, min_corr=calc_corr)
+            caps = market_caps
+            if caps_by_date is not None:
+                caps = _caps_as_of(caps_by_date, date, names)
+                if universe_size is not None:
+                    universe = set(caps.nlargest(universe_size, '시가총액')['ticker'])
+                    pairs_df = pairs_df[pairs_df['ticker1'].isin(universe) & pairs_df['ticker2'].isin(universe)]
+            classified = classify_pairs(pairs_df, caps)
+            yield date, build_reference_map(classified, min_corr=min_corr,
+                                            created_at=pd.Timestamp(date).strftime('%Y-%m-%d'))
+        emitted += 1
@@ -0,0 +1,110 @@
+"""
+스코어링 사이클 (장중 시각 컨텍스트)
+
+한 번의 스코어링 실행(예: record_intraday_scores 10분 주기)에서 모든 종목이
+같은 기준 시각 / 장 경과 비율 / 예상 거래량 배수 / 시장 지수 등락을 쓰도록
+실행 시작 시 1번 만들어 전달한다. 기준 시각을 지정하면 과거 장중 시점의
+점수를 그대로 재현할 수 있다.
+
+사용법:
+    >>> cycle = ScoringCycle.now(market_index={'kospi': 0.4, 'kosdaq': -0.2})
+    >>> ctx = IndicatorContext(df, code, cycle=cycle.at(fetched_at))  # 종목별 시세 조회 시각 기준
+    >>> calculate_score_v2(df, ctx=ctx)
+
+    # 과거 장중 재현
+    >>> replay = ScoringCycle(datetime(2026, 1, 20, 10, 30))
+    >>> with replay.activate():
+    ...     calculate_score_v2(df_at_1030)
+"""
+
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from datetime import datetime, time
+from typing import Dict, Mapping, Optional
+
+MARKET_OPEN = time(9, 0)
+MARKET_CLOSE = time(15, 30)
+SESSION_MINUTES = 390          # 6시간 30분
+EARLY_SESSION_MINUTES = 60     # 장 초반 (거래량 쏠림 구간)
+EARLY_SESSION_DISCOUNT = 0.7   # 장 초반 예상 거래량 보정 계수
+
+_local = threading.local()
+
+
+@dataclass(frozen=True)
+class ScoringCycle:
+    """스코어링 1회 실행의 기준 시각 + 장중 파생값"""
+    as_of: datetime
+    market_index: Mapping[str, float] = field(default_factory=dict)  # {'kospi': 등락률%, 'kosdaq': 등락률%}
+    in_session: bool = field(init=False)
+    elapsed_minutes: float = field(init=False)
+    session_fraction: float = field(init=False)
+    projection_factor: float = field(init=False)
+
+    def __post_init__(self):
+        market_open = self.as_of.replace(hour=MARKET_OPEN.hour, minute=MARKET_OPEN.minute,
+                                         second=0, microsecond=0)
+        market_close = self.as_of.replace(hour=MARKET_CLOSE.hour, minute=MARKET_CLOSE.minute,
+                                          second=0, microsecond=0)
+        in_session = market_open <= self.as_of < market_close
+
+        if in_session:
+            elapsed = max(1, (self.as_of - market_open).total_seconds() / 60)
+            factor = SESSION_MINUTES / elapsed
+            if elapsed < EARLY_SESSION_MINUTES:
+                factor *= EARLY_SESSION_DISCOUNT
+        else:
+            elapsed = SESSION_MINUTES if self.as_of >= market_close else 0
+            factor = 1.0
+
+        object.__setattr__(self, 'market_index', dict(self.market_index))
+        object.__setattr__(self, 'in_session', in_session)
+        object.__setattr__(self, 'elapsed_minutes', elapsed)
+        object.__setattr__(self, 'session_fraction', min(1.0, elapsed / SESSION_MINUTES))
+        object.__setattr__(self, 'projection_factor', factor)
+
+    @classmethod
+    def now(cls, market_index: Optional[Mapping[str, float]] = None) -> 'ScoringCycle':
+        return cls(datetime.now(), market_index or {})
+
+    def at(self, as_of: datetime) -> 'ScoringCycle':
+        """같은 시장 지수, 다른 기준 시각 (예: 종목별 시세 조회 시각)"""
+        return replace(self, as_of=as_of)
+
+    def project_volume(self, curr_vol: int) -> int:
+        """장중 예상 거래량 (장외 시간은 현재 거래량 그대로)"""
+        if not self.in_session:
+            return curr_vol
+        return int(curr_vol * self.projection_factor)
+
+    def index_change(self, market: str) -> float:
+        """종목 시장(KOSPI/KOSDAQ)의 지수 등락률"""
+        key = 'kosdaq' if 'KOSDAQ' in str(market).upper() else 'kospi'
+        return self.market_index.get(key, 0.0)
+
+    @contextmanager
+    def activate(self):
+        """이 블록 안의 current_cycle() 이 이 사이클을 반환 (현재 스레드)"""
+        prev = getattr(_local, 'cycle', None)
+        _local.cycle = self
+        try:
+            yield self
+        finally:
+            _local.cycle = prev
+
+    def to_dict(self) -> Dict:
+        return {
+            'as_of': self.as_of.isoformat(),
+            'in_session': self.in_session,
+            'elapsed_minutes': round(self.elapsed_minutes, 2),
+            'session_fraction': round(self.session_fraction, 4),
+            'projection_factor': round(self.projection_factor, 4),
+            'market_index': dict(self.market_index),
+        }
+
+
+def current_cycle() -> ScoringCycle:
+    """활성화된 사이클, 없으면 지금 시각 기준 사이클"""
+    cycle = getattr(_local, 'cycle', None)
+    return cycle if cycle is not None else ScoringCycle.now()
@@ -0,0 +1,300 @@
+"""
+V9 갭상승 예측 피처 (컬럼형 일괄 계산 + 피처 스토어)
+
+train_gap_model_v2.calculate_features(df, idx) / auto_trade_v9.calc_features(df) 와 같은 피처를
+전 종목 × 전 날짜에 대해 한 번에 계산한다.
+
+구조:
+- 종목별 일봉을 종목·날짜순 긴 패널 1개로 이어 붙이고 (bar: 종목 안 위치)
+  이동 구간 평균/합/최대/최소/표준편차는 배열 슬라이딩 윈도우로 일괄 계산
+- 윈도우는 최대 20봉 전까지만 보므로 bar >= 20 인 행은 다른 종목 구간과 섞이지 않음
+- 학습: 전체 피처 행렬을 연도별 파티션으로 저장 (Parquet, 엔진 없으면 pickle)
+- 15:20 실행: 최근 구간 패널로 계산 후 종목별 마지막 행만 사용
+
+사용법:
+    from scoring.gap_features import build_gap_panel, compute_gap_features, GapFeatureStore
+
+    features = compute_gap_features(build_gap_panel(all_data))   # {종목코드: pykrx 일봉}
+    GapFeatureStore().write(features)
+    train = gap_training_samples(features)
+"""
+
+import importlib.util
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+DEFAULT_STORE_DIR = Path(__file__).resolve().parent.parent / "output" / "feature_store" / "gap_v9"
+
+_HAS_PARQUET = any(importlib.util.find_spec(m) is not None for m in ('pyarrow', 'fastparquet'))
+PARTITION_SUFFIX = '.parquet' if _HAS_PARQUET else '.pkl'
+
+OHLCV_COLUMNS = ['시가', '고가', '저가', '종가', '거래량']
+
+# 모델 학습 피처 순서 (calculate_features 반환 dict 순서)
+GAP_FEATURE_COLUMNS = [
+    'close_pos', 'close_high', 'is_bull', 'body_ratio', 'upper_wick', 'lower_wick',
+    'day_change', 'dist_ma5', 'dist_ma20', 'vol_ratio', 'vol_declining',
+    'rsi', 'rsi_overbought', 'consec_bull', 'aligned', 'near_high_20d', 'from_low_20d',
+    'volatility', 'trade_value', 'is_surge', 'two_day_surge',
+]
+
+LOOKBACK = 20
+
+# 학습/매수 대상 필터 (거래대금 50억 이상, 당일 등락률 -15% ~ +25%)
+MIN_TRADE_VALUE = 50
+DAY_CHANGE_RANGE = (-15, 25)
+
+
+# ============================================================================
+# 패널 구성
+# ============================================================================
+def build_gap_panel(data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    종목별 일봉 → 긴 패널 (code, date, 시가, 고가, 저가, 종가, 거래량, bar)
+
+    Args:
+        data: {종목코드: 날짜 인덱스 OHLCV (pykrx 컬럼명)}
+    """
+    frames = []
+    for code, df in data.items():
+        if df is None or df.empty:
+            continue
+        frame = df[OHLCV_COLUMNS].copy()
+        frame.insert(0, 'date', df.index)
+        frame.insert(0, 'code', code)
+        frame['bar'] = np.arange(len(frame))
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=['code', 'date'] + OHLCV_COLUMNS + ['bar'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def _window(values: np.ndarray, size: int, lag: int, func) -> np.ndarray:
+    """out[i] = func(values[i-lag-size+1 : i-lag+1]) (구간 부족 시 NaN)"""
+    out = np.full(len(values), np.nan)
+    count = len(values) - size + 1 - lag
+    if count > 0:
+        out[lag + size - 1:] = func(sliding_window_view(values, size)[:count], axis=1)
+    return out
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if 0 < periods < len(values):
+        out[periods:] = values[:-periods]
+    elif periods < 0 and -periods < len(values):
+        out[:periods] = values[-periods:]
+    return out
+
+
+def _ratio(num: np.ndarray, den: np.ndarray, valid: np.ndarray, default: float) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(valid, num / den, default)
+
+
+# ============================================================================
+# 피처 계산
+# ============================================================================
+def compute_gap_features(panel: pd.DataFrame) -> pd.DataFrame:
+    """
+    전 종목 × 전 날짜 갭 피처 (calculate_features(df, idx) 가 None 이 아닌 행만)
+
+    Returns:
+        code, date, bar, close, next_open(다음 봉 시가, 없으면 NaN) + GAP_FEATURE_COLUMNS
+    """
+    if panel.empty:
+        return pd.DataFrame(columns=['code', 'date', 'bar', 'close', 'next_open'] + GAP_FEATURE_COLUMNS)
+
+    o = panel['시가'].to_numpy(dtype=float)
+    h = panel['고가'].to_numpy(dtype=float)
+    l = panel['저가'].to_numpy(dtype=float)
+    c = panel['종가'].to_numpy(dtype=float)
+    v = panel['거래량'].to_numpy(dtype=float)
+    bar = panel['bar'].to_numpy()
+
+    f = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 캔들 피처 (고가 <= 저가면 범위 1로 계산)
+        total_range = np.where(h > l, h - l, 1.0)
+        f['close_pos'] = (c - l) / total_range
+        f['close_high'] = np.where(h > l, (c - l) / (h - l), 0.5)
+        f['is_bull'] = (c > o).astype(int)
+        f['body_ratio'] = np.abs(c - o) / total_range
+        f['upper_wick'] = (h - np.maximum(o, c)) / total_range
+        f['lower_wick'] = (np.minimum(o, c) - l) / total_range
+
+        # 등락률
+        prev_close = _shift(c, 1)
+        f['day_change'] = _ratio((c - prev_close) * 100, prev_close, prev_close > 0, 0)
+
+        # 이동평균 거리 (직전 5/20봉)
+        ma5 = _window(c, 5, 1, np.mean)
+        ma20 = _window(c, LOOKBACK, 1, np.mean)
+        f['dist_ma5'] = _ratio((c - ma5) * 100, ma5, ma5 > 0, 0)
+        f['dist_ma20'] = _ratio((c - ma20) * 100, ma20, ma20 > 0, 0)
+
+        # 거래량 비율 / 감소 여부 (직전 5봉 vs 그 앞 15봉)
+        avg_vol = _window(v, LOOKBACK, 1, np.mean)
+        f['vol_ratio'] = _ratio(v, avg_vol, avg_vol > 0, 1)
+        recent_vol = _window(v, 5, 1, np.mean)
+        older_vol = _window(v, 15, 6, np.mean)
+        f['vol_declining'] = (recent_vol < older_vol * 0.7).astype(int)
+
+        # RSI (직전 20봉 안의 19개 종가 변화)
+        changes = c - prev_close
+        gains = _window(np.where(changes > 0, changes, 0), LOOKBACK - 1, 1, np.sum)
+        losses = _window(np.where(changes < 0, -changes, 0), LOOKBACK - 1, 1, np.sum)
+        f['rsi'] = _ratio(gains * 100, gains + losses, gains + losses > 0, 50)
+        f['rsi_overbought'] = (f['rsi'] > 70).astype(int)
+
+        # 연속 양봉 (당일 포함 5봉)
+        f['consec_bull'] = _window((c > o).astype(float), 5, 0, np.sum)
+
+        # 이동평균 정배열 (당일 포함)
+        ma5_val = _window(c, 5, 0, np.mean)
+        ma10_val = _window(c, 10, 0, np.mean)
+        ma20_val = _window(c, LOOKBACK, 0, np.mean)
+        f['aligned'] = ((c > ma5_val) & (ma5_val > ma10_val) & (ma10_val > ma20_val)).astype(int)
+
+        # 20일 고점/저점 대비
+        high_20d = _window(h, LOOKBACK, 1, np.max)
+        low_20d = _window(l, LOOKBACK, 1, np.min)
+        f['near_high_20d'] = _ratio(c, high_20d, high_20d > 0, 0)
+        f['from_low_20d'] = _ratio((c - low_20d) * 100, low_20d, low_20d > 0, 0)
+
+        # 변동성 (직전 20봉 일간 수익률 표준편차)
+        pct = c / prev_close - 1
+        f['volatility'] = _window(pct, LOOKBACK - 1, 1, lambda w, axis: np.std(w, axis=axis, ddof=1)) * 100
+
+        # 거래대금 (억 단위) / 급등
+        f['trade_value'] = v * c / 100000000
+        f['is_surge'] = (f['day_change'] >= 15).astype(int)
+        prev_prev_close = _shift(c, 2)
+        f['two_day_surge'] = ((c - prev_prev_close) / prev_prev_close * 100 >= 20).astype(int)
+
+    # 다음 봉 시가 (같은 종목일 때만)
+    next_bar = _shift(bar.astype(float), -1)
+    next_open = np.where(next_bar == bar + 1, _shift(o, -1), np.nan)
+
+    valid = (bar >= LOOKBACK) & (o != 0) & (c != 0) & (v != 0)
+
+    features = pd.DataFrame({
+        'code': panel['code'].to_numpy(),
+        'date': panel['date'].to_numpy(),
+        'bar': bar,
+        'close': c,
+        'next_open': next_open,
+    })
+    for name in GAP_FEATURE_COLUMNS:
+        features[name] = f[name]
+    features = features[valid].reset_index(drop=True)
+    features['consec_bull'] = features['consec_bull'].astype(int)
+    return features
+
+
+def apply_gap_filters(features: pd.DataFrame) -> pd.DataFrame:
+    """거래대금/등락률 대상 필터"""
+    low, high = DAY_CHANGE_RANGE
+    mask = (features['trade_value'] >= MIN_TRADE_VALUE) & features['day_change'].between(low, high)
+    return features[mask]
+
+
+def gap_training_samples(features: pd.DataFrame) -> pd.DataFrame:
+    """
+    학습 샘플 (train_gap_model_v2 와 동일: bar 21 이상, 다음 봉 있음, 대상 필터 통과)
+
+    Returns:
+        GAP_FEATURE_COLUMNS + gap_up (다음날 시가 > 당일 종가)
+    """
+    samples = apply_gap_filters(features[(features['bar'] > LOOKBACK) & features['next_open'].notna()])
+    gap_pct = (samples['next_open'] - samples['close']) / samples['close'] * 100
+    return samples[GAP_FEATURE_COLUMNS].assign(gap_up=(gap_pct > 0).astype(int)).reset_index(drop=True)
+
+
+def latest_gap_features(features: pd.DataFrame, date=None) -> pd.DataFrame:
+    """
+    종목별 마지막 행 (15:20 실시간 예측용)
+
+    Args:
+        date: 마지막 행이 이 날짜인 종목만 (None이면 전체)
+    """
+    latest = features.drop_duplicates('code', keep='last')
+    if date is not None:
+        latest = latest[pd.to_datetime(latest['date']) == pd.Timestamp(date)]
+    return latest.reset_index(drop=True)
+
+
+# ============================================================================
+# 피처 스토어
+# ============================================================================
+class GapFeatureStore:
+    """연도별 파티션 갭 피처 저장소 ({root}/{연도}.parquet)"""
+
+    def __init__(self, root: Path = None):
+        self.root = Path(root) if root else DEFAULT_STORE_DIR
+
+    def _path(self, year: int) -> Path:
+        return self.root / f"{year}{PARTITION_SUFFIX}"
+
+    def _read(self, path: Path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        if _HAS_PARQUET:
+            return pd.read_parquet(path, columns=list(columns) if columns else None)
+        frame = pd.read_pickle(path)
+        return frame[list(columns)] if columns else frame
+
+    def _write(self, frame: pd.DataFrame, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + '.tmp')
+        if _HAS_PARQUET:
+            frame.to_parquet(tmp, index=False)
+        else:
+            frame.to_pickle(tmp)
+        tmp.replace(path)
+
+    def years(self) -> List[int]:
+        if not self.root.exists():
+            return []
+        return sorted(int(p.stem) for p in self.root.glob(f"*{PARTITION_SUFFIX}") if p.stem.isdigit())
+
+    def write(self, features: pd.DataFrame) -> List[Path]:
+        """피처 행렬을 연도별로 저장 (같은 연도 파티션은 교체). 저장한 경로 반환"""
+        years = pd.to_datetime(features['date']).dt.year
+        paths = []
+        for year, part in features.groupby(years.to_numpy(), sort=True):
+            path = self._path(int(year))
+            self._write(part.reset_index(drop=True), path)
+            paths.append(path)
+        return paths
+
+    def read(self, start=None, end=None, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """기간 피처 로드 (columns 지정 시 해당 컬럼만, code/date 는 항상 포함)"""
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        if columns is not None:
+            columns = ['code', 'date'] + [c for c in columns if c not in ('code', 'date')]
+
+        frames = []
+        for year in self.years():
+            if (start is not None and year < start.year) or (end is not None and year > end.year):
+                continue
+            frames.append(self._read(self._path(year), columns))
+        if not frames:
+            return pd.DataFrame(columns=columns or [])
+
+        features = pd.concat(frames, ignore_index=True)
+        dates = pd.to_datetime(features['date'])
+        mask = pd.Series(True, index=features.index)
+        if start is not None:
+            mask &= dates >= start
+        if end is not None:
+            mask &= dates <= end
+        # 연도 파티션을 이어 붙였으므로 종목(처음 등장 순)·날짜순으로 복원
+        features = features[mask]
+        order = np.lexsort((dates[mask].to_numpy(), pd.factorize(features['code'])[0]))
+        return features.iloc[order].reset_index(drop=True)
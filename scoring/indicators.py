@@ -26,6 +26,8 @@ from datetime import datetime
 from collections import OrderedDict
 from dataclasses import dataclass, field
 
+from .cycle import ScoringCycle, current_cycle
+
 
 @dataclass
 class IndicatorResult:
@@ -296,38 +298,18 @@ def calculate_base_indicators(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def calculate_projected_volume(df: pd.DataFrame) -> Tuple[int, float]:
+def calculate_projected_volume(df: pd.DataFrame, cycle: Optional[ScoringCycle] = None) -> Tuple[int, float]:
     """장중 예상 거래량 계산
 
     Args:
         df: OHLCV DataFrame
+        cycle: 스코어링 사이클 (None이면 활성 사이클/현재 시각)
 
     Returns:
-        (예상 거래량, 거래량 비율)
+        (예상 거래량, 거래량 비율) - 장외 시간은 현재 거래량 그대로
     """
-    now = datetime.now()
-    market_open = now.replace(hour=9, minute=0, second=0, microsecond=0)
-    market_close = now.replace(hour=15, minute=30, second=0, microsecond=0)
-
     curr_vol = int(df.iloc[-1]['Volume'])
-
-    if now < market_open or now >= market_close:
-        # 장외 시간: 현재 거래량 그대로
-        vol_ma = df['VOL_MA20'].iloc[-1] if 'VOL_MA20' in df.columns else df['Volume'].tail(20).mean()
-        ratio = curr_vol / vol_ma if vol_ma > 0 else 1.0
-        return curr_vol, ratio
-
-    # 장중: 예상 거래량 계산
-    total_minutes = 390  # 6시간 30분
-    elapsed_minutes = max(1, (now - market_open).total_seconds() / 60)
-
-    # 장 초반 보정 (거래량 편중)
-    if elapsed_minutes < 60:
-        projection_factor = (total_minutes / elapsed_minutes) * 0.7
-    else:
-        projection_factor = total_minutes / elapsed_minutes
-
-    projected_vol = int(curr_vol * projection_factor)
+    projected_vol = (cycle or current_cycle()).project_volume(curr_vol)
 
     vol_ma = df['VOL_MA20'].iloc[-1] if 'VOL_MA20' in df.columns else df['Volume'].tail(20).mean()
     ratio = projected_vol / vol_ma if vol_ma > 0 else 1.0
@@ -0,0 +1,99 @@
+"""
+YAML 규칙 기반 전 종목 일괄 채점
+
+config/<버전>_config.yaml 규칙을 한 번 컴파일해 두고,
+종목별 지표(마지막 봉)를 모은 패널(행=종목)에 벡터 연산으로 점수/신호를 낸다.
+결과는 calculate_score_v2 / calculate_score_v4 와 동일하다.
+
+사용법:
+    >>> from scoring.rule_scoring import build_rule_panel, score_universe
+    >>> result = score_universe(frames, 'v2')            # frames: {종목코드: OHLCV df}
+    >>> result.sort_values('score', ascending=False).head(20)
+
+    # 규칙 A/B: 지표 패널은 1번만 만들고 설정만 바꿔 재채점
+    >>> panel = build_rule_panel(frames, 'v2')
+    >>> base = get_config('v2').compile().evaluate(panel)
+    >>> trial = load_scoring_config('v2_trial').compile().evaluate(panel)
+"""
+
+from typing import Dict, Mapping, Optional
+
+import pandas as pd
+
+from .config import ScoringConfig, get_config
+from .context import IndicatorContext
+from .scoring_v2 import rule_features_v2
+from .scoring_v4 import rule_features_v4
+
+# 버전별 패널 1행(지표) 계산 함수
+RULE_FEATURES = {
+    'v2': rule_features_v2,
+    'v4': rule_features_v4,
+}
+
+# 투자자 수급(investor_data)을 받는 버전
+INVESTOR_VERSIONS = frozenset({'v4'})
+
+
+def build_rule_panel(
+    frames: Mapping[str, pd.DataFrame],
+    version: str = 'v2',
+    investor_data: Optional[Mapping[str, Dict]] = None,
+    contexts: Optional[Mapping[str, IndicatorContext]] = None,
+) -> pd.DataFrame:
+    """
+    전 종목 지표 패널
+
+    Args:
+        frames: {종목코드: OHLCV 데이터프레임}
+        version: RULE_FEATURES 의 버전
+        investor_data: {종목코드: 투자자별 매매동향} (V4)
+        contexts: {종목코드: IndicatorContext} - 다른 버전 점수와 지표 공유
+
+    Returns:
+        index=종목코드, columns=규칙이 참조하는 지표 (데이터 부족/오류 종목은 제외)
+    """
+    version = version.lower()
+    if version not in RULE_FEATURES:
+        raise ValueError(f"Unknown version: {version}. Available: {list(RULE_FEATURES.keys())}")
+
+    features = RULE_FEATURES[version]
+    rows = {}
+    for code, df in frames.items():
+        kwargs = {}
+        if contexts is not None:
+            kwargs['ctx'] = contexts.get(code)
+        if investor_data is not None and version in INVESTOR_VERSIONS:
+            kwargs['investor_data'] = investor_data.get(code)
+        try:
+            row = features(df, **kwargs)
+        except Exception:
+            row = None  # calculate_score_vX 도 오류 시 None
+        if row is not None:
+            rows[code] = row
+
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def score_universe(
+    frames: Mapping[str, pd.DataFrame],
+    version: str = 'v2',
+    investor_data: Optional[Mapping[str, Dict]] = None,
+    contexts: Optional[Mapping[str, IndicatorContext]] = None,
+    config: Optional[ScoringConfig] = None,
+) -> pd.DataFrame:
+    """
+    전 종목 일괄 채점
+
+    Args:
+        frames, version, investor_data, contexts: build_rule_panel 참조
+        config: 채점 규칙 (None이면 config/<version>_config.yaml)
+
+    Returns:
+        index=종목코드, columns=['score', '<그룹>_score'..., 'signals', 'disqualified', 'disqualify_reason']
+    """
+    config = config or get_config(version.lower())
+    if config is None:
+        raise ValueError(f"스코어링 설정 없음: {version}")
+    panel = build_rule_panel(frames, version, investor_data=investor_data, contexts=contexts)
+    return config.compile().evaluate(panel)
@@ -31,6 +31,8 @@ import numpy as np
 from typing import Optional, Dict, List, Tuple
 from datetime import datetime, timedelta
 
+from .context import accepts_context, indicators_for
+
 
 # ============================================================
 # 레퍼런스 로드
@@ -41,6 +43,7 @@ REFERENCE_JSON = os.path.join(PROJECT_ROOT, "models", "v10_leader_follower_refer
 
 # 글로벌 레퍼런스 캐시
 _REFERENCE_CACHE = None
+_INDEX_CACHE = None
 
 
 def load_reference() -> Optional[dict]:
@@ -72,6 +75,96 @@ def load_reference() -> Optional[dict]:
     return None
 
 
+def set_reference(reference: Optional[dict]):
+    """
+    레퍼런스 교체 (워크포워드 백테스트에서 날짜별 레퍼런스 사용)
+
+    None이면 캐시를 비워 다음 조회 때 파일에서 다시 로드.
+    """
+    global _REFERENCE_CACHE, _INDEX_CACHE
+    _REFERENCE_CACHE = reference
+    _INDEX_CACHE = None
+
+
+class ReferenceIndex:
+    """
+    레퍼런스 컴파일 결과 (종목코드 → 정수 인덱스, 대장주 → 종속주 CSR 인접 배열)
+
+    - codes / index / names: 대장주·종속주 전체 코드 ↔ 정수 인덱스, 대장주 이름
+    - leader_rows: CSR 행 순서의 대장주 인덱스 (레퍼런스 leader_to_followers 순서)
+    - indptr / followers / weights: 행 r 의 종속주 = followers[indptr[r]:indptr[r+1]], 상관계수 = weights[...]
+    - edge_leaders / follower_names: 간선별 대장주 인덱스 (행 전개), 종속주 이름
+
+    시장 스냅샷 등락률을 코드 순서 벡터로 만들면
+    "오늘 X% 이상 움직인 대장주의 모든 종속주" 가 배열 인덱싱 한 번으로 구해진다.
+    """
+
+    def __init__(self, reference: dict):
+        self.reference = reference
+        leader_map = reference.get('leader_to_followers', {})
+
+        leader_names = {}
+        for pair in reference.get('all_pairs', []):
+            leader_names.setdefault(pair['leader_code'], pair['leader_name'])
+
+        codes = list(dict.fromkeys(
+            list(leader_map) + [f['code'] for followers in leader_map.values() for f in followers]
+        ))
+        self.codes = np.array(codes, dtype=object)
+        self.index = {code: i for i, code in enumerate(codes)}
+        self.names = np.array([leader_names.get(code, code) for code in codes], dtype=object)
+
+        self.leader_rows = np.array([self.index[leader] for leader in leader_map], dtype=np.int64)
+        counts = [len(followers) for followers in leader_map.values()]
+        self.indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self.followers = np.array(
+            [self.index[f['code']] for followers in leader_map.values() for f in followers], dtype=np.int64
+        )
+        self.weights = np.array(
+            [f['correlation'] for followers in leader_map.values() for f in followers], dtype=float
+        )
+        self.follower_names = np.array(
+            [f['name'] for followers in leader_map.values() for f in followers], dtype=object
+        )
+        self.edge_leaders = np.repeat(self.leader_rows, counts)
+
+        self._pair_corr = {
+            (int(leader), int(follower)): corr
+            for leader, follower, corr in zip(self.edge_leaders, self.followers, self.weights.tolist())
+        }
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def vector(self, values) -> np.ndarray:
+        """{code: 값} (dict 또는 Series) → 코드 순서 벡터 (없는 종목 0)"""
+        if isinstance(values, pd.Series):
+            return values.reindex(self.codes).fillna(0).to_numpy(dtype=float)
+        return np.array([values.get(code, 0) for code in self.codes], dtype=float)
+
+    def correlation(self, leader_code: str, follower_code: str) -> float:
+        leader, follower = self.index.get(leader_code), self.index.get(follower_code)
+        if leader is None or follower is None:
+            return 0.0
+        return self._pair_corr.get((leader, follower), 0.0)
+
+    def active_leaders(self, changes: np.ndarray, min_change: float) -> np.ndarray:
+        """등락률 min_change 이상 대장주 인덱스 (레퍼런스 순서)"""
+        return self.leader_rows[changes[self.leader_rows] >= min_change]
+
+
+def get_reference_index() -> Optional[ReferenceIndex]:
+    """컴파일된 레퍼런스 (레퍼런스 로드/교체 시 1회 컴파일)"""
+    global _INDEX_CACHE
+
+    ref = load_reference()
+    if ref is None:
+        return None
+    if _INDEX_CACHE is None or _INDEX_CACHE.reference is not ref:
+        _INDEX_CACHE = ReferenceIndex(ref)
+    return _INDEX_CACHE
+
+
 def get_leaders_for_follower(follower_code: str) -> List[dict]:
     """종속주의 대장주 목록 조회"""
     ref = load_reference()
@@ -92,17 +185,11 @@ def get_followers_for_leader(leader_code: str) -> List[dict]:
 
 def get_correlation(leader_code: str, follower_code: str) -> float:
     """대장주-종속주 상관계수 조회"""
-    ref = load_reference()
-    if ref is None:
+    index = get_reference_index()
+    if index is None:
         return 0.0
 
-    # follower_to_leaders에서 검색
-    leaders = ref.get('follower_to_leaders', {}).get(follower_code, [])
-    for leader in leaders:
-        if leader['leader_code'] == leader_code:
-            return leader['correlation']
-
-    return 0.0
+    return index.correlation(leader_code, follower_code)
 
 
 def get_all_leaders() -> List[str]:
@@ -129,22 +216,21 @@ def get_all_followers() -> List[str]:
 def _calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """기술적 지표 계산"""
     df = df.copy()
+    ind = indicators_for(df)  # 같은 종목 다른 버전과 기본 지표 공유
 
     # 이동평균
-    df['MA5'] = df['Close'].rolling(5).mean()
-    df['MA20'] = df['Close'].rolling(20).mean()
-    df['MA60'] = df['Close'].rolling(60).mean()
+    df['MA5'] = ind.rolling('Close', 5)
+    df['MA20'] = ind.rolling('Close', 20)
+    df['MA60'] = ind.rolling('Close', 60)
 
     # RSI
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    gain, loss = ind.rsi_components(14)
     rs = gain / loss.replace(0, 1e-10)
     df['RSI'] = 100 - (100 / (1 + rs))
 
     # 볼린저밴드
-    df['BB_mid'] = df['Close'].rolling(20).mean()
-    df['BB_std'] = df['Close'].rolling(20).std()
+    df['BB_mid'] = ind.rolling('Close', 20)
+    df['BB_std'] = ind.rolling('Close', 20, 'std')
     df['BB_upper'] = df['BB_mid'] + 2 * df['BB_std']
     df['BB_lower'] = df['BB_mid'] - 2 * df['BB_std']
     df['BB_pct'] = (df['Close'] - df['BB_lower']) / (df['BB_upper'] - df['BB_lower'] + 1e-10)
@@ -155,6 +241,7 @@ def _calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
 # ============================================================
 # V10 점수 계산
 # ============================================================
+@accepts_context
 def calculate_score_v10(
     df: pd.DataFrame,
     ticker: str = None,
@@ -337,88 +424,54 @@ def get_follower_opportunities(
     Returns:
         캐치업 기회 목록 (점수 높은 순)
     """
-    ref = load_reference()
-    if ref is None:
+    index = get_reference_index()
+    if index is None:
+        return []
+
+    # 간선(대장주-종속주 쌍) 단위 일괄 계산
+    changes = index.vector(today_changes)
+    leader_change = changes[index.edge_leaders]
+    follower_change = changes[index.followers]
+    keep = (leader_change >= min_leader_change) & (follower_change <= max_follower_change)
+    if not keep.any():
         return []
 
-    opportunities = []
-
-    # 모든 대장주 확인
-    for leader_code, followers in ref.get('leader_to_followers', {}).items():
-        leader_change = today_changes.get(leader_code, 0)
-
-        if leader_change < min_leader_change:
-            continue
-
-        # 대장주 이름 찾기
-        leader_name = leader_code
-        for pair in ref.get('all_pairs', []):
-            if pair['leader_code'] == leader_code:
-                leader_name = pair['leader_name']
-                break
-
-        # 종속주 확인
-        for follower in followers:
-            follower_code = follower['code']
-            follower_change = today_changes.get(follower_code, 0)
-
-            if follower_change > max_follower_change:
-                continue
-
-            gap = leader_change - follower_change
-            correlation = follower['correlation']
-
-            # V10 점수 계산 (상관계수 기반 차등)
-            score = 40  # 기본 점수
-
-            # 1. 대장주 움직임 (최대 20점)
-            if leader_change >= 10:
-                score += 20
-            elif leader_change >= 7:
-                score += 16
-            elif leader_change >= 5:
-                score += 12
-            elif leader_change >= 3:
-                score += 8
-
-            # 2. 실측 상관계수 (최대 25점) - 핵심 요소
-            if correlation >= 0.8:
-                score += 25
-            elif correlation >= 0.7:
-                score += 20
-            elif correlation >= 0.6:
-                score += 14
-            elif correlation >= 0.5:
-                score += 8
-
-            # 3. 캐치업 갭 (최대 15점)
-            if gap >= 8:
-                score += 15
-            elif gap >= 6:
-                score += 12
-            elif gap >= 4:
-                score += 8
-            elif gap >= 2:
-                score += 4
-
-            score = min(100, score)
-
-            opportunities.append({
-                'follower_code': follower_code,
-                'follower_name': follower['name'],
-                'follower_change': follower_change,
-                'leader_code': leader_code,
-                'leader_name': leader_name,
-                'leader_change': leader_change,
-                'correlation': correlation,
-                'catchup_gap': gap,
-                'score': int(score)
-            })
-
-    # 점수 높은 순 정렬
-    opportunities.sort(key=lambda x: (-x['score'], -x['catchup_gap']))
-
-    return opportunities
+    edges = np.flatnonzero(keep)
+    leader_change, follower_change = leader_change[edges], follower_change[edges]
+    correlation = index.weights[edges]
+    gap = leader_change - follower_change
+
+    # V10 점수 계산 (상관계수 기반 차등, 기본 40점)
+    # 1. 대장주 움직임 (최대 20점) 2. 실측 상관계수 (최대 25점) - 핵심 요소 3. 캐치업 갭 (최대 15점)
+    score = (
+        40
+        + np.select([leader_change >= 10, leader_change >= 7, leader_change >= 5, leader_change >= 3],
+                    [20, 16, 12, 8], 0)
+        + np.select([correlation >= 0.8, correlation >= 0.7, correlation >= 0.6, correlation >= 0.5],
+                    [25, 20, 14, 8], 0)
+        + np.select([gap >= 8, gap >= 6, gap >= 4, gap >= 2], [15, 12, 8, 4], 0)
+    )
+    score = np.minimum(100, score)
+
+    # 점수 높은 순 정렬 (동점은 캐치업 갭, 레퍼런스 순서)
+    order = np.lexsort((edges, -gap, -score))
+    leaders = index.edge_leaders[edges]
+    followers = index.followers[edges]
+
+    return [
+        {
+            'follower_code': index.codes[followers[i]],
+            'follower_name': index.follower_names[edges[i]],
+            'follower_change': follower_change[i].item(),
+            'leader_code': index.codes[leaders[i]],
+            'leader_name': index.names[leaders[i]],
+            'leader_change': leader_change[i].item(),
+            'correlation': correlation[i].item(),
+            'catchup_gap': gap[i].item(),
+            'score': int(score[i]),
+        }
+        for i in order
+    ]
 
 
 def get_reference_info() -> dict:
@@ -34,7 +34,11 @@ import pandas as pd
 import numpy as np
 from typing import Optional, Dict, List
 
+from .series import score_series
+from .context import accepts_context, indicators_for
 
+
+@accepts_context
 def calculate_score_v8(
     df: pd.DataFrame,
     investor_data: Optional[Dict] = None
@@ -53,9 +57,17 @@ def calculate_score_v8(
         return None
 
     try:
-        df = df.copy()
         df = _calculate_indicators(df)
+    except Exception as e:
+        print(f"V8 점수 계산 오류: {e}")
+        return None
+
+    return _score_v8(df, investor_data)
 
+
+def _score_v8(df: pd.DataFrame, investor_data: Optional[Dict] = None) -> Optional[Dict]:
+    """지표가 계산된 df 의 마지막 날짜 기준 V8 점수 (calculate_score_v8 / 전 구간 시계열 공용)"""
+    try:
         result = {
             'score': 0,
             'bounce_score': 0,      # 반등 신호 (40점)
@@ -158,38 +170,66 @@ def calculate_score_v8(
         return None
 
 
+@accepts_context
 def calculate_score_v8_with_investor(
     df: pd.DataFrame,
-    investor_data: Optional[Dict] = None
+    investor_data: Optional[Dict] = None,
+    stock_code: Optional[str] = None,
+    flow_cache=None,
 ) -> Optional[Dict]:
-    """투자자 데이터 포함 버전"""
+    """투자자 데이터 포함 버전
+
+    investor_data 없이 stock_code + flow_cache(services.flow_cache)를 주면 캐시의 최근 5일 수급을 사용
+    """
+    if investor_data is None and stock_code and flow_cache is not None:
+        investor_data = flow_cache.get_investor(stock_code, days=5)
     return calculate_score_v8(df, investor_data)
 
 
+def calculate_score_v8_series(df: pd.DataFrame, investor_data: Optional[Dict] = None, start=None, end=None) -> pd.DataFrame:
+    """
+    V8 전 구간 점수 시계열 (백테스트용)
+
+    지표는 전체 기간으로 1번만 계산하며, 날짜별 결과는
+    calculate_score_v8(df[df.index <= 날짜]) 와 동일하다.
+
+    Args:
+        df: 전체 기간 OHLCV 데이터프레임
+        investor_data: 투자자별 매매동향 (선택, 모든 날짜에 동일하게 적용)
+        start, end: 점수를 낼 날짜 범위 (None이면 전체)
+
+    Returns:
+        index=날짜, columns=['score', 'signals', 'result'] (scoring.series.score_series 참조)
+    """
+    return score_series(df, _score_v8, prepare=_calculate_indicators,
+                        start=start, end=end, investor_data=investor_data)
+
+
 def _calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """기술적 지표 계산"""
     df = df.copy()
+    ind = indicators_for(df)  # 같은 종목 다른 버전과 기본 지표 공유
 
     # === 이동평균선 ===
     for p in [5, 10, 20, 60, 120]:
-        df[f'ma{p}'] = df['Close'].rolling(p, min_periods=1).mean()
+        df[f'ma{p}'] = ind.rolling('Close', p, min_periods=1)
 
     # 이평선 상태
     df['ma_aligned'] = (df['ma5'] > df['ma10']) & (df['ma10'] > df['ma20']) & (df['ma20'] > df['ma60'])
     df['ma_reverse'] = (df['ma5'] < df['ma10']) & (df['ma10'] < df['ma20'])  # 역배열
 
     # === 거래량 ===
-    df['vol_ma5'] = df['Volume'].rolling(5, min_periods=1).mean()
-    df['vol_ma20'] = df['Volume'].rolling(20, min_periods=1).mean()
+    df['vol_ma5'] = ind.rolling('Volume', 5, min_periods=1)
+    df['vol_ma20'] = ind.rolling('Volume', 20, min_periods=1)
     df['vol_ratio'] = df['Volume'] / df['vol_ma20']
 
     # === 거래대금 ===
-    df['trading_value'] = df['Close'] * df['Volume']
-    df['trading_value_ma20'] = df['trading_value'].rolling(20, min_periods=1).mean()
+    df['trading_value'] = ind.trading_value()
+    df['trading_value_ma20'] = ind.rolling('trading_value', 20, min_periods=1)
 
     # === 볼린저 밴드 ===
-    df['bb_middle'] = df['Close'].rolling(20, min_periods=1).mean()
-    df['bb_std'] = df['Close'].rolling(20, min_periods=1).std()
+    df['bb_middle'] = ind.rolling('Close', 20, min_periods=1)
+    df['bb_std'] = ind.rolling('Close', 20, 'std', min_periods=1)
     df['bb_upper'] = df['bb_middle'] + df['bb_std'] * 2
     df['bb_lower'] = df['bb_middle'] - df['bb_std'] * 2
     df['bb_width'] = (df['bb_upper'] - df['bb_lower']) / df['bb_middle'] * 100
@@ -197,41 +237,31 @@ def _calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['bb_position'] = (df['Close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
 
     # === ATR ===
-    high_low = df['High'] - df['Low']
-    high_close = abs(df['High'] - df['Close'].shift(1))
-    low_close = abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    df['atr'] = tr.rolling(14, min_periods=1).mean()
+    df['atr'] = ind.rolling('true_range', 14, min_periods=1)
     df['atr_ma'] = df['atr'].rolling(20, min_periods=1).mean()
 
     # === OBV ===
-    df['obv'] = (np.sign(df['Close'].diff()) * df['Volume']).fillna(0).cumsum()
-    df['obv_ma20'] = df['obv'].rolling(20, min_periods=1).mean()
+    df['obv'] = ind.obv()
+    df['obv_ma20'] = ind.rolling('obv', 20, min_periods=1)
 
     # === RSI ===
-    delta = df['Close'].diff()
-    gain = delta.where(delta > 0, 0).rolling(14, min_periods=1).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(14, min_periods=1).mean()
+    gain, loss = ind.rsi_components(14, min_periods=1)
     rs = gain / loss
     df['rsi'] = 100 - (100 / (1 + rs))
     df['rsi'] = df['rsi'].fillna(50)
 
     # === MACD ===
-    exp12 = df['Close'].ewm(span=12, adjust=False).mean()
-    exp26 = df['Close'].ewm(span=26, adjust=False).mean()
-    df['macd'] = exp12 - exp26
-    df['macd_signal'] = df['macd'].ewm(span=9, adjust=False).mean()
-    df['macd_hist'] = df['macd'] - df['macd_signal']
+    df['macd'], df['macd_signal'], df['macd_hist'] = ind.macd(12, 26, 9)
 
     # === 스토캐스틱 ===
-    low14 = df['Low'].rolling(14, min_periods=1).min()
-    high14 = df['High'].rolling(14, min_periods=1).max()
+    low14 = ind.rolling('Low', 14, 'min', min_periods=1)
+    high14 = ind.rolling('High', 14, 'max', min_periods=1)
     df['stoch_k'] = 100 * (df['Close'] - low14) / (high14 - low14 + 0.0001)
     df['stoch_d'] = df['stoch_k'].rolling(3, min_periods=1).mean()
 
     # === 20일 최저가 대비 위치 ===
-    df['low_20d'] = df['Low'].rolling(20, min_periods=1).min()
-    df['high_20d'] = df['High'].rolling(20, min_periods=1).max()
+    df['low_20d'] = ind.rolling('Low', 20, 'min', min_periods=1)
+    df['high_20d'] = ind.rolling('High', 20, 'max', min_periods=1)
     df['pos_in_range'] = (df['Close'] - df['low_20d']) / (df['high_20d'] - df['low_20d'] + 0.0001)
 
     return df
@@ -52,10 +52,12 @@ V1 점수 계산 로직 - 종합 기술적 분석
 """
 
 import pandas as pd
-import pandas_ta as ta
+from .series import ta, score_series  # ta: pandas_ta (전 구간 시계열 모드 지원)
+from .context import accepts_context
 from typing import Dict, Optional
 
 
+@accepts_context
 def calculate_score_v1(df: pd.DataFrame) -> Optional[Dict]:
     """
     V1 점수 계산 (종합 기술적 분석)
@@ -465,6 +467,23 @@ def calculate_score_v1(df: pd.DataFrame) -> Optional[Dict]:
         return None
 
 
+def calculate_score_v1_series(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """
+    V1 전 구간 점수 시계열 (백테스트용)
+
+    지표는 전체 기간으로 1번만 계산하며, 날짜별 결과는
+    calculate_score_v1(df[df.index <= 날짜]) 와 동일하다.
+
+    Args:
+        df: 전체 기간 OHLCV 데이터프레임
+        start, end: 점수를 낼 날짜 범위 (None이면 전체)
+
+    Returns:
+        index=날짜, columns=['score', 'signals', 'result'] (scoring.series.score_series 참조)
+    """
+    return score_series(df, calculate_score_v1, start=start, end=end)
+
+
 # 테스트
 if __name__ == "__main__":
     import FinanceDataReader as fdr
@@ -47,32 +47,20 @@ V2 점수 계산 로직 - 추세 추종 강화판
 └──────────────────────────────────┴──────┘
 """
 
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
-from datetime import datetime
+from .series import ta, score_series  # ta: pandas_ta (전 구간 시계열 모드 지원)
+from .context import accepts_context
+from .cycle import ScoringCycle, current_cycle
 from typing import Dict, Optional
 
 
-def calculate_projected_volume(curr_vol: int) -> int:
-    """장중 예상 거래량 계산 (시간 가중치 적용)"""
-    now = datetime.now()
-    market_open = now.replace(hour=9, minute=0, second=0, microsecond=0)
-    market_close = now.replace(hour=15, minute=30, second=0, microsecond=0)
-
-    if now < market_open or now >= market_close:
-        return curr_vol
-
-    total_minutes = 390  # 6시간 30분
-    elapsed_minutes = max(1, (now - market_open).total_seconds() / 60)
-
-    if elapsed_minutes < 60:
-        projection_factor = (total_minutes / elapsed_minutes) * 0.7
-    else:
-        projection_factor = total_minutes / elapsed_minutes
-
-    return int(curr_vol * projection_factor)
+def calculate_projected_volume(curr_vol: int, cycle: Optional[ScoringCycle] = None) -> int:
+    """장중 예상 거래량 계산 (시간 가중치 적용, cycle 없으면 활성 사이클/현재 시각)"""
+    return (cycle or current_cycle()).project_volume(curr_vol)
 
 
+@accepts_context
 def calculate_score_v2(df: pd.DataFrame) -> Optional[Dict]:
     """
     V2 점수 계산 (추세 추종 강화판)
@@ -290,6 +278,78 @@ def calculate_score_v2(df: pd.DataFrame) -> Optional[Dict]:
         return None
 
 
+@accepts_context
+def rule_features_v2(df: pd.DataFrame) -> Optional[Dict]:
+    """
+    config/v2_config.yaml 규칙이 참조하는 지표 (마지막 봉 기준)
+
+    전 종목 패널 1행으로 쓰이며 (scoring.rule_scoring.score_universe),
+    지표 계산은 calculate_score_v2 와 동일하다. df 는 수정하지 않는다.
+    """
+    if df is None or len(df) < 60:
+        return None
+
+    curr = df.iloc[-1]
+    sma5 = ta.sma(df['Close'], length=5)
+    sma20 = ta.sma(df['Close'], length=20)
+    sma60 = ta.sma(df['Close'], length=60)
+
+    features = {
+        'close': curr['Close'],
+        'SMA_5': sma5.iloc[-1],
+        'SMA_20': sma20.iloc[-1],
+        'SMA_60': sma60.iloc[-1],
+        'SMA20_SLOPE': np.nan,
+        'MACD': np.nan,
+        'SUPERTRENDd': np.nan,
+        'SUPERTRENDd_prev': np.nan,
+        'TRADING_VALUE': curr['Close'] * curr['Volume'],
+        'high_60d': df['High'].tail(60).max(),
+    }
+
+    sma20_5d_ago = sma20.iloc[-6]
+    if pd.notna(sma20_5d_ago) and sma20_5d_ago > 0:
+        features['SMA20_SLOPE'] = (sma20.iloc[-1] - sma20_5d_ago) / sma20_5d_ago * 100
+
+    macd = ta.macd(df['Close'], fast=12, slow=26, signal=9)
+    if macd is not None:
+        macd_col = [c for c in macd.columns if 'MACD_' in c and 'MACDh' not in c and 'MACDs' not in c][0]
+        features['MACD'] = macd.iloc[-1][macd_col]
+
+    supertrend = ta.supertrend(df['High'], df['Low'], df['Close'], length=10, multiplier=3)
+    if supertrend is not None:
+        st_col = [c for c in supertrend.columns if 'SUPERTd' in c][0]
+        features['SUPERTRENDd'] = supertrend.iloc[-1][st_col]
+        features['SUPERTRENDd_prev'] = supertrend.iloc[-2][st_col]
+
+    rsi = ta.rsi(df['Close'], length=14)
+    features['RSI'] = rsi.iloc[-1]
+    features['RSI_prev'] = rsi.iloc[-2]
+
+    vol_ma = ta.sma(df['Volume'], length=20).iloc[-1]
+    projected_vol = calculate_projected_volume(int(curr['Volume']))
+    features['VOL_RATIO'] = 1.0 if pd.isna(vol_ma) or vol_ma == 0 else projected_vol / vol_ma
+
+    return features
+
+
+def calculate_score_v2_series(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """
+    V2 전 구간 점수 시계열 (백테스트용)
+
+    지표는 전체 기간으로 1번만 계산하며, 날짜별 결과는
+    calculate_score_v2(df[df.index <= 날짜]) 와 동일하다.
+
+    Args:
+        df: 전체 기간 OHLCV 데이터프레임
+        start, end: 점수를 낼 날짜 범위 (None이면 전체)
+
+    Returns:
+        index=날짜, columns=['score', 'signals', 'result'] (scoring.series.score_series 참조)
+    """
+    return score_series(df, calculate_score_v2, start=start, end=end)
+
+
 # 테스트
 if __name__ == "__main__":
     import FinanceDataReader as fdr
@@ -46,7 +46,8 @@ V3 점수 계산 로직 - 사일런트 바이어 (Silent Buyer)
 """
 
 import pandas as pd
-import pandas_ta as ta
+from .series import ta, score_series  # ta: pandas_ta (전 구간 시계열 모드 지원)
+from .context import accepts_context
 import numpy as np
 from typing import Dict, Optional, List
 
@@ -362,6 +363,7 @@ def detect_pullback_volume_dryup(df: pd.DataFrame) -> Dict:
     return result
 
 
+@accepts_context
 def calculate_score_v3(df: pd.DataFrame) -> Optional[Dict]:
     """
     V3 점수 계산 (사일런트 바이어 - Silent Buyer)
@@ -579,6 +581,23 @@ def calculate_score_v3(df: pd.DataFrame) -> Optional[Dict]:
         return None
 
 
+def calculate_score_v3_series(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """
+    V3 전 구간 점수 시계열 (백테스트용)
+
+    지표는 전체 기간으로 1번만 계산하며, 날짜별 결과는
+    calculate_score_v3(df[df.index <= 날짜]) 와 동일하다.
+
+    Args:
+        df: 전체 기간 OHLCV 데이터프레임
+        start, end: 점수를 낼 날짜 범위 (None이면 전체)
+
+    Returns:
+        index=날짜, columns=['score', 'signals', 'result'] (scoring.series.score_series 참조)
+    """
+    return score_series(df, calculate_score_v3, start=start, end=end)
+
+
 # 테스트
 if __name__ == "__main__":
     import FinanceDataReader as fdr
@@ -33,12 +33,47 @@ V3 대비 개선사항:
 """
 
 import pandas as pd
-import pandas_ta as ta
+from .series import ta, score_series  # ta: pandas_ta (전 구간 시계열 모드 지원)
+from .context import accepts_context
 import numpy as np
 from typing import Dict, Optional, List, Any
 from datetime import datetime, timedelta
 
 
+# ============================================================
+# 공통 헬퍼 (NumPy 배열 기반 - 행 단위 iloc 루프 대체)
+# ============================================================
+
+def _rolling_peak_indices(values: np.ndarray, half_window: int) -> np.ndarray:
+    """앞뒤 half_window 일 창의 최댓값과 같은 날의 위치 (창이 잘리는 양 끝 제외)"""
+    size = 2 * half_window + 1
+    if len(values) < size:
+        return np.array([], dtype=int)
+    # fmax: 창 안의 NaN 은 건너뜀 (pandas max 와 동일)
+    window_max = np.fmax.reduce(np.lib.stride_tricks.sliding_window_view(values, size), axis=1)
+    return np.flatnonzero(values[half_window:len(values) - half_window] == window_max) + half_window
+
+
+def _swing_low_indices(values: np.ndarray, half_window: int) -> np.ndarray:
+    """앞뒤 half_window 일 값 이하인 날의 위치 (창이 잘리는 양 끝 제외)"""
+    n = len(values)
+    if n < 2 * half_window + 1:
+        return np.array([], dtype=int)
+    center = values[half_window:n - half_window]
+    is_low = np.ones(len(center), dtype=bool)
+    for offset in range(1, half_window + 1):
+        is_low &= center <= values[half_window - offset:n - half_window - offset]
+        is_low &= center <= values[half_window + offset:n - half_window + offset]
+    return np.flatnonzero(is_low) + half_window
+
+
+def _get_obv(df: pd.DataFrame) -> Optional[pd.Series]:
+    """OBV (calculate_score_v3_5 가 미리 계산한 'OBV' 열이 있으면 재사용)"""
+    if 'OBV' in df.columns:
+        return df['OBV']
+    return ta.obv(df['Close'], df['Volume'])
+
+
 # ============================================================
 # Phase 1: 위치 필터 + 분산 패턴 감지
 # ============================================================
@@ -249,52 +284,42 @@ def detect_double_top_pattern(df: pd.DataFrame) -> Dict:
 
         recent = df.tail(60)
         curr_close = df.iloc[-1]['Close']
+        high = recent['High'].to_numpy()
+        low = recent['Low'].to_numpy()
 
-        # 로컬 고점 찾기 (5일 기준)
-        local_highs = []
-        for i in range(5, len(recent) - 5):
-            window = recent.iloc[i-5:i+6]
-            if recent.iloc[i]['High'] == window['High'].max():
-                local_highs.append({
-                    'idx': i,
-                    'price': recent.iloc[i]['High'],
-                    'date': recent.index[i] if hasattr(recent.index, '__iter__') else i
-                })
+        # 로컬 고점 찾기 (5일 기준): 앞뒤 5일 (11일 창) 최고가와 같은 날
+        local_highs = _rolling_peak_indices(high, 5)
 
         if len(local_highs) < 2:
             return result
 
-        # 최근 2개의 유효한 고점 선택 (가격 비슷한 것)
-        sorted_highs = sorted(local_highs, key=lambda x: x['price'], reverse=True)
-
-        first_peak = sorted_highs[0]
-        second_peak = None
+        # 최근 2개의 유효한 고점 선택 (가격 비슷한 것) - 가격 내림차순, 같으면 먼저 온 고점
+        sorted_highs = local_highs[np.argsort(-high[local_highs], kind='stable')]
 
-        for peak in sorted_highs[1:]:
-            # 첫 번째 고점과 ±5% 범위 내이고, 최소 10일 간격
-            price_diff = abs(peak['price'] / first_peak['price'] - 1) * 100
-            idx_diff = abs(peak['idx'] - first_peak['idx'])
+        first_idx = sorted_highs[0]
+        first_price = high[first_idx]
 
-            if price_diff <= 5 and idx_diff >= 10:
-                second_peak = peak
-                break
+        # 첫 번째 고점과 ±5% 범위 내이고, 최소 10일 간격
+        candidates = sorted_highs[1:]
+        price_diff = np.abs(high[candidates] / first_price - 1) * 100
+        matched = np.flatnonzero((price_diff <= 5) & (np.abs(candidates - first_idx) >= 10))
 
-        if second_peak is None:
+        if len(matched) == 0:
             return result
+        second_idx = candidates[matched[0]]
 
         # 시간 순서 정리 (먼저 온 게 first)
-        if first_peak['idx'] > second_peak['idx']:
-            first_peak, second_peak = second_peak, first_peak
+        start_idx, end_idx = sorted((first_idx, second_idx))
+        first_peak = {'idx': start_idx, 'price': high[start_idx]}
+        second_peak = {'idx': end_idx, 'price': high[end_idx]}
 
         # 두 고점 사이의 저점 (Neckline) 찾기
-        start_idx = first_peak['idx']
-        end_idx = second_peak['idx']
-        between = recent.iloc[start_idx:end_idx+1]
+        between = low[start_idx:end_idx+1]
 
         if len(between) < 3:
             return result
 
-        neckline = between['Low'].min()
+        neckline = np.fmin.reduce(between)
 
         # 결과 저장
         result['first_peak'] = first_peak['price']
@@ -408,41 +433,37 @@ def detect_wyckoff_phase(df: pd.DataFrame) -> Dict:
 
         # Phase A 이벤트 감지
 
+        n = len(recent)
+        close = recent['Close'].to_numpy()
+        low = recent['Low'].to_numpy()
+        volume = recent['Volume'].to_numpy()
+
         # SC (Selling Climax): 급락 + 거래량 폭발
+        # 5일간 10% 이상 하락 + 거래량이 평균의 2배 이상인 첫 날 (i = 10 ~ n-6)
         sc_detected = False
         sc_idx = None
-        for i in range(10, len(recent) - 5):
-            # 5일간 10% 이상 하락
-            if (recent.iloc[i]['Close'] / recent.iloc[i-5]['Close'] - 1) * 100 < -10:
-                # 거래량이 평균의 2배 이상
-                if recent.iloc[i]['Volume'] > vol_ma * 2:
-                    sc_detected = True
-                    sc_idx = i
-                    result['events'].append('SC')
-                    break
-
-        # AR (Automatic Rally): SC 후 반등
+        idx = np.arange(10, n - 5)
+        sc_hits = idx[((close[idx] / close[idx - 5] - 1) * 100 < -10) & (volume[idx] > vol_ma * 2)]
+        if len(sc_hits):
+            sc_detected = True
+            sc_idx = int(sc_hits[0])
+            result['events'].append('SC')
+
+        # AR (Automatic Rally): SC 후 9일 내 SC 저점 대비 5% 이상 반등
         ar_detected = False
         if sc_detected and sc_idx is not None:
-            for i in range(sc_idx + 1, min(sc_idx + 10, len(recent))):
-                # SC 저점 대비 5% 이상 반등
-                if (recent.iloc[i]['Close'] / recent.iloc[sc_idx]['Low'] - 1) * 100 > 5:
-                    ar_detected = True
-                    result['events'].append('AR')
-                    break
+            if np.any((close[sc_idx + 1:min(sc_idx + 10, n)] / low[sc_idx] - 1) * 100 > 5):
+                ar_detected = True
+                result['events'].append('AR')
 
-        # ST (Secondary Test): SC 저점 재테스트
+        # ST (Secondary Test): SC 저점 근처 (±3%) 재테스트 + 거래량은 SC 때보다 적음
         st_detected = False
         if sc_detected and ar_detected and sc_idx is not None:
-            sc_low = recent.iloc[sc_idx]['Low']
-            for i in range(sc_idx + 5, len(recent)):
-                # SC 저점 근처 (±3%)까지 다시 내려옴
-                if abs(recent.iloc[i]['Low'] / sc_low - 1) * 100 < 3:
-                    # 거래량은 SC 때보다 적음
-                    if recent.iloc[i]['Volume'] < recent.iloc[sc_idx]['Volume'] * 0.7:
-                        st_detected = True
-                        result['events'].append('ST')
-                        break
+            sc_low = low[sc_idx]
+            near_low = np.abs(low[sc_idx + 5:] / sc_low - 1) * 100 < 3
+            if np.any(near_low & (volume[sc_idx + 5:] < volume[sc_idx] * 0.7)):
+                st_detected = True
+                result['events'].append('ST')
 
         # Phase B 이벤트 감지
 
@@ -467,24 +488,17 @@ def detect_wyckoff_phase(df: pd.DataFrame) -> Dict:
         spring_detected = False
         support = recent['Low'].quantile(0.1)  # 하위 10%
 
-        for i in range(len(recent) - 10, len(recent)):
-            # 지지선 이탈
-            if recent.iloc[i]['Low'] < support:
-                # 이후 회복
-                if curr_close > support:
-                    spring_detected = True
-                    result['events'].append('SPRING')
-                    break
+        # 최근 10일 내 지지선 이탈 + 현재가 회복
+        if np.any(low[-10:] < support) and curr_close > support:
+            spring_detected = True
+            result['events'].append('SPRING')
 
         # LPS (Last Point of Support): Spring 후 재테스트 시 지지 확인
         lps_detected = False
         if spring_detected:
-            for i in range(len(recent) - 5, len(recent)):
-                if abs(recent.iloc[i]['Low'] / support - 1) * 100 < 2:
-                    if recent.iloc[i]['Close'] > support:
-                        lps_detected = True
-                        result['events'].append('LPS')
-                        break
+            if np.any((np.abs(low[-5:] / support - 1) * 100 < 2) & (close[-5:] > support)):
+                lps_detected = True
+                result['events'].append('LPS')
 
         # Phase 판정
         if spring_detected or lps_detected:
@@ -520,23 +534,19 @@ def detect_wyckoff_phase(df: pd.DataFrame) -> Dict:
         bu_detected = False
 
         # 최근 20일 내 SOS 패턴이 있었는지 확인 (현재 SOS가 아니더라도)
-        for i in range(len(recent) - 20, len(recent) - 3):
-            if i < 0:
-                continue
-            # 과거 돌파 시점 찾기: 저항선 돌파 + 고거래량
-            past_close = recent.iloc[i]['Close']
-            past_volume = recent.iloc[i]['Volume']
-            if past_close > high_60d * 0.95 and past_volume > vol_ma * 1.5:
-                sos_detected = True
-                sos_idx = i
-                if 'SOS' not in result['events']:
-                    result['events'].append('SOS')
-                break
+        # 과거 돌파 시점 찾기: 저항선 돌파 + 고거래량
+        idx = np.arange(max(n - 20, 0), n - 3)
+        sos_hits = idx[(close[idx] > high_60d * 0.95) & (volume[idx] > vol_ma * 1.5)]
+        if len(sos_hits):
+            sos_detected = True
+            sos_idx = int(sos_hits[0])
+            if 'SOS' not in result['events']:
+                result['events'].append('SOS')
 
         if sos_detected and sos_idx is not None:
             # SOS 이후 눌림목 확인
             # 조건: SOS 고점에서 하락 → 저항선(=지지선) 근처 도달 → 거래량 감소
-            sos_high = recent.iloc[sos_idx]['High']
+            sos_high = recent['High'].iloc[sos_idx]
             resistance_turned_support = high_60d * 0.95  # 돌파했던 저항선
 
             # 현재가가 저항선 전환 지지선 근처 (±3%)
@@ -544,7 +554,7 @@ def detect_wyckoff_phase(df: pd.DataFrame) -> Dict:
 
             # 최근 3일 거래량이 SOS 때보다 50% 이상 감소
             recent_vol = recent['Volume'].tail(3).mean()
-            sos_volume = recent.iloc[sos_idx]['Volume']
+            sos_volume = volume[sos_idx]
             vol_decreased = recent_vol < sos_volume * 0.5
 
             # 현재가가 SOS 고점보다 낮음 (눌림)
@@ -617,7 +627,7 @@ def detect_short_covering_risk(
             return result
 
         # OBV 추세 분석
-        obv = ta.obv(df['Close'], df['Volume'])
+        obv = _get_obv(df)
         if obv is not None:
             obv_recent = obv.tail(10)
             obv_trend_up = obv_recent.iloc[-1] > obv_recent.iloc[0]
@@ -798,7 +808,7 @@ def analyze_supply_demand(
             obv_weight = 1.5  # 하락장/중소형주: OBV 비중 증가
 
         if len(df) >= 20:
-            obv = ta.obv(df['Close'], df['Volume'])
+            obv = _get_obv(df)
             if obv is not None:
                 obv_ma = ta.sma(obv, length=20)
                 if obv_ma is not None and pd.notna(obv_ma.iloc[-1]):
@@ -1013,25 +1023,25 @@ def analyze_volume_profile(df: pd.DataFrame, bins: int = 20) -> Dict:
 
         bin_size = price_range / bins
 
-        # 각 가격대별 거래량 누적
-        volume_by_price = []
-        total_volume = 0
-
-        for i in range(bins):
-            price_low = price_min + (i * bin_size)
-            price_high = price_min + ((i + 1) * bin_size)
-
-            # 해당 가격대에서 거래된 거래량
-            mask = (recent['Low'] <= price_high) & (recent['High'] >= price_low)
-            bin_volume = recent.loc[mask, 'Volume'].sum()
-
-            volume_by_price.append({
+        # 각 가격대별 거래량 누적: 봉의 저가~고가가 가격대와 겹치면 그 봉 거래량 전체를 더함
+        # (종가 히스토그램이 아니라 구간 겹침이므로 (bins x 일수) 겹침 행렬로 한 번에 계산)
+        steps = np.arange(bins)
+        price_lows = price_min + (steps * bin_size)
+        price_highs = price_min + ((steps + 1) * bin_size)
+        overlap = ((recent['Low'].to_numpy() <= price_highs[:, None])
+                   & (recent['High'].to_numpy() >= price_lows[:, None]))
+        bin_volumes = np.where(overlap, recent['Volume'].to_numpy(), 0).sum(axis=1)
+
+        volume_by_price = [
+            {
                 'price_low': price_low,
                 'price_high': price_high,
                 'volume': bin_volume,
                 'mid_price': (price_low + price_high) / 2,
-            })
-            total_volume += bin_volume
+            }
+            for price_low, price_high, bin_volume in zip(price_lows, price_highs, bin_volumes)
+        ]
+        total_volume = sum(bin_volumes)
 
         # 비율 계산
         for vp in volume_by_price:
@@ -1375,9 +1385,9 @@ def detect_exit_signals(
                 warning_score += 15
                 result['signals'].append('VOLUME_COLLAPSE_AFTER_PEAK')
 
-        # 5. 이평선 역배열 전환 조짐
-        sma5 = ta.sma(df['Close'], length=5)
-        sma20 = ta.sma(df['Close'], length=20)
+        # 5. 이평선 역배열 전환 조짐 (calculate_score_v3_5 가 계산한 열 재사용)
+        sma5 = df['SMA_5'] if 'SMA_5' in df.columns else ta.sma(df['Close'], length=5)
+        sma20 = df['SMA_20'] if 'SMA_20' in df.columns else ta.sma(df['Close'], length=20)
         if sma5 is not None and sma20 is not None:
             if sma5.iloc[-1] < sma20.iloc[-1] and sma5.iloc[-5] > sma20.iloc[-5]:
                 warning_score += 20
@@ -1426,33 +1436,26 @@ def detect_obv_divergence(df: pd.DataFrame, lookback: int = 30) -> Dict:
         if len(df) < lookback:
             return result
 
-        obv = ta.obv(df['Close'], df['Volume'])
+        obv = _get_obv(df)
         if obv is None:
             return result
 
-        df_temp = df.tail(lookback).copy()
-        df_temp['OBV'] = obv.tail(lookback).values
-
-        price_lows = []
-        obv_at_lows = []
+        low = df['Low'].to_numpy()[-lookback:]
+        obv_values = obv.to_numpy()[-lookback:]
 
-        for i in range(2, len(df_temp) - 2):
-            if (df_temp['Low'].iloc[i] <= df_temp['Low'].iloc[i-1] and
-                df_temp['Low'].iloc[i] <= df_temp['Low'].iloc[i-2] and
-                df_temp['Low'].iloc[i] <= df_temp['Low'].iloc[i+1] and
-                df_temp['Low'].iloc[i] <= df_temp['Low'].iloc[i+2]):
-                price_lows.append((i, df_temp['Low'].iloc[i]))
-                obv_at_lows.append((i, df_temp['OBV'].iloc[i]))
+        # 스윙 저점: 앞뒤 2일 저가 이하인 날
+        swing_lows = _swing_low_indices(low, 2)
 
-        if len(price_lows) >= 2:
-            prev_price_low = price_lows[-2][1]
-            curr_price_low = price_lows[-1][1]
-            prev_obv = obv_at_lows[-2][1]
-            curr_obv = obv_at_lows[-1][1]
+        if len(swing_lows) >= 2:
+            prev_idx, curr_idx = swing_lows[-2], swing_lows[-1]
+            prev_price_low = low[prev_idx]
+            curr_price_low = low[curr_idx]
+            prev_obv = obv_values[prev_idx]
+            curr_obv = obv_values[curr_idx]
 
             if curr_price_low < prev_price_low and curr_obv > prev_obv:
                 result['detected'] = True
-                result['days'] = price_lows[-1][0] - price_lows[-2][0]
+                result['days'] = int(curr_idx - prev_idx)
                 price_decline = (prev_price_low - curr_price_low) / prev_price_low * 100
                 obv_rise = (curr_obv - prev_obv) / abs(prev_obv) * 100 if prev_obv != 0 else 0
                 result['strength'] = min(100, price_decline + obv_rise)
@@ -1660,6 +1663,7 @@ def detect_pullback_volume_dryup(df: pd.DataFrame) -> Dict:
 # 메인 점수 계산 함수
 # ============================================================
 
+@accepts_context
 def calculate_score_v3_5(
     df: pd.DataFrame,
     investor_data: Optional[Dict] = None,
@@ -1742,6 +1746,11 @@ def calculate_score_v3_5(
         df['SMA_20'] = ta.sma(df['Close'], length=20)
         df['SMA_60'] = ta.sma(df['Close'], length=60)
 
+        # OBV 는 수급/패턴/숏커버링 분석이 공유
+        obv = ta.obv(df['Close'], df['Volume'])
+        if obv is not None:
+            df['OBV'] = obv
+
         curr = df.iloc[-1]
         curr_sma5 = curr['SMA_5']
         curr_sma20 = curr['SMA_20']
@@ -1954,13 +1963,33 @@ def calculate_score_v3_5(
         return None
 
 
+def calculate_score_v3_5_series(df: pd.DataFrame, start=None, end=None, **kwargs) -> pd.DataFrame:
+    """
+    V3.5 전 구간 점수 시계열 (백테스트용)
+
+    지표는 전체 기간으로 1번만 계산하며, 날짜별 결과는
+    calculate_score_v3_5(df[df.index <= 날짜]) 와 동일하다.
+
+    Args:
+        df: 전체 기간 OHLCV 데이터프레임
+        **kwargs: calculate_score_v3_5 추가 인자 (investor_data, market_regime 등)
+        start, end: 점수를 낼 날짜 범위 (None이면 전체)
+
+    Returns:
+        index=날짜, columns=['score', 'signals', 'result'] (scoring.series.score_series 참조)
+    """
+    return score_series(df, calculate_score_v3_5, start=start, end=end, **kwargs)
+
+
 # 편의 함수: 투자자 데이터 포함 계산
+@accepts_context
 def calculate_score_v3_5_with_investor(
     df: pd.DataFrame,
     stock_code: str,
     investor_fetcher=None,
     short_fetcher=None,
     disclosure_fetcher=None,
+    flow_cache=None,
 ) -> Optional[Dict]:
     """
     V3.5 점수 계산 + 외부 데이터 자동 조회
@@ -1968,9 +1997,11 @@ def calculate_score_v3_5_with_investor(
     Args:
         df: OHLCV 데이터프레임
         stock_code: 종목코드
-        investor_fetcher: 투자자 동향 조회 함수 (기본: naver_investor.get_investor_trend)
+        investor_fetcher: 투자자 동향 조회 함수 (code, days=10)
         short_fetcher: 공매도 데이터 조회 함수
         disclosure_fetcher: 공시 데이터 조회 함수
+        flow_cache: services.flow_cache.InvestorFlowCache
+            (fetcher 를 주지 않은 수급/공매도는 캐시에서 읽음)
 
     Returns:
         V3.5 점수 계산 결과
@@ -1979,6 +2010,10 @@ def calculate_score_v3_5_with_investor(
     short_data = None
     disclosure_data = None
 
+    if flow_cache is not None:
+        investor_fetcher = investor_fetcher or flow_cache.get_investor
+        short_fetcher = short_fetcher or flow_cache.get_short
+
     # 투자자 동향 조회
     if investor_fetcher:
         try:
@@ -63,7 +63,8 @@ V4 점수 계산 로직 - Hybrid Sniper (하이브리드 스나이퍼)
 """
 
 import pandas as pd
-import pandas_ta as ta
+from .series import ta, score_series  # ta: pandas_ta (전 구간 시계열 모드 지원)
+from .context import accepts_context
 import numpy as np
 from typing import Dict, Optional
 
@@ -189,6 +190,7 @@ def calculate_stoch_rsi(df: pd.DataFrame) -> Optional[Dict]:
         return None
 
 
+@accepts_context
 def calculate_score_v4(df: pd.DataFrame, investor_data: Optional[Dict] = None) -> Optional[Dict]:
     """
     V4 점수 계산 (Hybrid Sniper)
@@ -501,18 +503,140 @@ def calculate_score_v4(df: pd.DataFrame, investor_data: Optional[Dict] = None) -
         return None
 
 
+@accepts_context
+def rule_features_v4(df: pd.DataFrame, investor_data: Optional[Dict] = None) -> Optional[Dict]:
+    """
+    config/v4_config.yaml 규칙이 참조하는 지표 (마지막 봉 기준)
+
+    전 종목 패널 1행으로 쓰이며 (scoring.rule_scoring.score_universe),
+    지표 계산은 calculate_score_v4 와 동일하다. df 는 수정하지 않는다.
+    """
+    if df is None or len(df) < 60:
+        return None
+
+    curr = df.iloc[-1]
+    prev = df.iloc[-2]
+    sma20 = ta.sma(df['Close'], length=20)
+
+    features = {
+        'close': curr['Close'],
+        'close_prev': prev['Close'],
+        'SMA_5': ta.sma(df['Close'], length=5).iloc[-1],
+        'SMA_20': sma20.iloc[-1],
+        'SMA_60': ta.sma(df['Close'], length=60).iloc[-1],
+        'SMA20_SLOPE': np.nan,
+        'ICHIMOKU_CLOUD_TOP': np.nan,
+        'MACD': np.nan,
+        'MACD_prev': np.nan,
+        'MACD_HIST': np.nan,
+        'MACD_HIST_prev': np.nan,
+        'STOCHRSI_K': np.nan,
+        'STOCHRSI_D': np.nan,
+        'STOCHRSI_GOLDEN': np.nan,
+        'VOL_RATIO': np.nan,
+        'TRADING_VALUE': curr['Close'] * curr['Volume'],
+        'INST_FOREIGN_NET': np.nan,
+        'FOREIGN_CONSEC_BUY': np.nan,
+    }
+
+    sma20_5d_ago = sma20.iloc[-6]
+    if pd.notna(sma20_5d_ago) and sma20_5d_ago > 0:
+        features['SMA20_SLOPE'] = (sma20.iloc[-1] - sma20_5d_ago) / sma20_5d_ago * 100
+
+    ichimoku = ta.ichimoku(df['High'], df['Low'], df['Close'])
+    if ichimoku is not None and len(ichimoku) == 2:
+        ich_df = ichimoku[0]
+        span_a_col = [c for c in ich_df.columns if 'ISA' in c]
+        span_b_col = [c for c in ich_df.columns if 'ISB' in c]
+        if span_a_col and span_b_col:
+            span_a = ich_df.iloc[-1][span_a_col[0]]
+            span_b = ich_df.iloc[-1][span_b_col[0]]
+            if pd.notna(span_a) and pd.notna(span_b):
+                features['ICHIMOKU_CLOUD_TOP'] = max(span_a, span_b)
+
+    macd = ta.macd(df['Close'], fast=12, slow=26, signal=9)
+    if macd is not None:
+        macd_col = [c for c in macd.columns if 'MACD_' in c and 'MACDh' not in c and 'MACDs' not in c]
+        macdh_col = [c for c in macd.columns if 'MACDh' in c]
+        if macd_col and macdh_col:
+            features['MACD'] = macd.iloc[-1][macd_col[0]]
+            features['MACD_prev'] = macd.iloc[-2][macd_col[0]]
+            features['MACD_HIST'] = macd.iloc[-1][macdh_col[0]]
+            features['MACD_HIST_prev'] = macd.iloc[-2][macdh_col[0]]
+
+    features['VCP_DETECTED'] = int(detect_vcp_pattern(df)['detected'])
+    features['OBV_BULLISH_DIVERGENCE'] = int(detect_obv_divergence(df)['bullish_divergence'])
+    features['RSI'] = ta.rsi(df['Close'], length=14).iloc[-1]
+
+    stoch_rsi = calculate_stoch_rsi(df)
+    if stoch_rsi is not None:
+        features['STOCHRSI_K'] = stoch_rsi['k']
+        features['STOCHRSI_D'] = stoch_rsi['d']
+        features['STOCHRSI_GOLDEN'] = int(stoch_rsi['golden_cross'])
+
+    high_60d = df['High'].tail(60).max()
+    features['high_60d'] = high_60d
+
+    body = abs(curr['Close'] - curr['Open'])
+    upper_shadow = curr['High'] - max(curr['Close'], curr['Open'])
+    lower_shadow = min(curr['Close'], curr['Open']) - curr['Low']
+    features['SHOOTING_STAR'] = int(
+        curr['High'] - curr['Low'] > 0 and
+        upper_shadow >= body * 2 and
+        lower_shadow < body and
+        curr['Close'] < curr['Open'] and
+        curr['Close'] >= high_60d * 0.95
+    )
+
+    vol_ma = ta.sma(df['Volume'], length=20).iloc[-1]
+    if pd.notna(vol_ma) and vol_ma > 0:
+        features['VOL_RATIO'] = curr['Volume'] / vol_ma
+
+    if investor_data is not None:
+        daily = investor_data.get('daily', [])
+        features['INST_FOREIGN_NET'] = investor_data.get('foreign_net', 0) + investor_data.get('institution_net', 0)
+        features['FOREIGN_CONSEC_BUY'] = int(
+            len(daily) >= 3 and all(d.get('foreign_net', 0) > 0 for d in daily[:3])
+        )
+
+    return features
+
+
+def calculate_score_v4_series(df: pd.DataFrame, investor_data: Optional[Dict] = None, start=None, end=None) -> pd.DataFrame:
+    """
+    V4 전 구간 점수 시계열 (백테스트용)
+
+    지표는 전체 기간으로 1번만 계산하며, 날짜별 결과는
+    calculate_score_v4(df[df.index <= 날짜]) 와 동일하다.
+
+    Args:
+        df: 전체 기간 OHLCV 데이터프레임
+        investor_data: 투자자별 매매동향 (선택, 모든 날짜에 동일하게 적용)
+        start, end: 점수를 낼 날짜 범위 (None이면 전체)
+
+    Returns:
+        index=날짜, columns=['score', 'signals', 'result'] (scoring.series.score_series 참조)
+    """
+    return score_series(df, calculate_score_v4, start=start, end=end, investor_data=investor_data)
+
+
+@accepts_context
 def calculate_score_v4_with_investor(
     df: pd.DataFrame,
     stock_code: str,
-    kis_client=None
+    kis_client=None,
+    flow_cache=None,
 ) -> Optional[Dict]:
     """
     투자자 데이터 포함 V4 점수 계산 (편의 함수)
 
+    수급은 공용 수급 캐시(services.flow_cache)를 거쳐 당일 이미 조회한 종목은 다시 조회하지 않는다.
+
     Args:
         df: OHLCV 데이터프레임
         stock_code: 종목코드 (6자리)
-        kis_client: KISClient 인스턴스 (없으면 투자자 데이터 제외)
+        kis_client: KISClient 인스턴스 (캐시 미스 시 조회에 사용)
+        flow_cache: InvestorFlowCache (None이면 기본 캐시, kis_client 도 없으면 투자자 데이터 제외)
 
     Returns:
         V4 점수 결과 (투자자 데이터 포함)
@@ -524,9 +648,13 @@ def calculate_score_v4_with_investor(
     """
     investor_data = None
 
-    if kis_client is not None:
+    if kis_client is not None or flow_cache is not None:
         try:
-            investor_data = kis_client.get_investor_trend(stock_code, days=5)
+            if flow_cache is None:
+                from services.flow_cache import get_flow_cache
+                flow_cache = get_flow_cache()
+            fetcher = kis_client.get_investor_trend if kis_client is not None else None
+            investor_data = flow_cache.get_investor(stock_code, days=5, fetcher=fetcher)
         except Exception as e:
             print(f"투자자 데이터 조회 실패 [{stock_code}]: {e}")
 
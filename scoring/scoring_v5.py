@@ -15,10 +15,13 @@ V5 스코어링 엔진 - 장대양봉 (Long Bullish Candle)
 """
 
 import pandas as pd
-import numpy as np
 from typing import Optional, Dict, List
 
+from .series import score_series
+from .context import accepts_context, indicators_for
 
+
+@accepts_context
 def calculate_score_v5(df: pd.DataFrame) -> Optional[Dict]:
     """
     V5 스코어 계산 - 장대양봉 가능성 분석
@@ -33,11 +36,16 @@ def calculate_score_v5(df: pd.DataFrame) -> Optional[Dict]:
         return None
 
     try:
-        df = df.copy()
-
-        # 기본 지표 계산
         df = _calculate_indicators(df)
+    except Exception:
+        return None
+
+    return _score_v5(df)
 
+
+def _score_v5(df: pd.DataFrame) -> Optional[Dict]:
+    """지표가 계산된 df 의 마지막 날짜 기준 V5 점수 (calculate_score_v5 / 전 구간 시계열 공용)"""
+    try:
         result = {
             'score': 0,
             'raw_score': 0,
@@ -139,9 +147,27 @@ def calculate_score_v5(df: pd.DataFrame) -> Optional[Dict]:
         return None
 
 
+def calculate_score_v5_series(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """
+    V5 전 구간 점수 시계열 (백테스트용)
+
+    지표는 전체 기간으로 1번만 계산하며, 날짜별 결과는
+    calculate_score_v5(df[df.index <= 날짜]) 와 동일하다.
+
+    Args:
+        df: 전체 기간 OHLCV 데이터프레임
+        start, end: 점수를 낼 날짜 범위 (None이면 전체)
+
+    Returns:
+        index=날짜, columns=['score', 'signals', 'result'] (scoring.series.score_series 참조)
+    """
+    return score_series(df, _score_v5, prepare=_calculate_indicators, start=start, end=end)
+
+
 def _calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """기술적 지표 계산"""
     df = df.copy()
+    ind = indicators_for(df)  # 같은 종목 다른 버전과 기본 지표 공유
 
     # === 캔들 정보 ===
     df['candle_body'] = df['Close'] - df['Open']
@@ -155,15 +181,15 @@ def _calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['is_doji'] = abs(df['candle_body_pct']) < 0.5
 
     # === 거래량 지표 ===
-    df['vol_ma5'] = df['Volume'].rolling(5).mean()
-    df['vol_ma20'] = df['Volume'].rolling(20).mean()
+    df['vol_ma5'] = ind.rolling('Volume', 5)
+    df['vol_ma20'] = ind.rolling('Volume', 20)
     df['vol_ratio'] = df['Volume'] / df['vol_ma20']
     df['vol_surge'] = df['Volume'] > df['Volume'].shift(1) * 2.0  # 2배 이상 폭증
     df['vol_shrink'] = df['Volume'] < df['Volume'].shift(1) * 0.5  # 50% 이하 급감
 
     # === 이동평균선 ===
     for p in [5, 10, 20, 60, 120]:
-        df[f'ma{p}'] = df['Close'].rolling(p).mean()
+        df[f'ma{p}'] = ind.rolling('Close', p)
 
     df['ma_aligned'] = (df['ma5'] > df['ma10']) & (df['ma10'] > df['ma20'])
     df['ma_convergence'] = df[['ma5', 'ma10', 'ma20']].std(axis=1) / df['Close'] * 100
@@ -172,8 +198,8 @@ def _calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['golden_cross_20_60'] = (df['ma20'] > df['ma60']) & (df['ma20'].shift(1) <= df['ma60'].shift(1))
 
     # === 볼린저 밴드 ===
-    df['bb_middle'] = df['Close'].rolling(20).mean()
-    df['bb_std'] = df['Close'].rolling(20).std()
+    df['bb_middle'] = ind.rolling('Close', 20)
+    df['bb_std'] = ind.rolling('Close', 20, 'std')
     df['bb_upper'] = df['bb_middle'] + df['bb_std'] * 2
     df['bb_lower'] = df['bb_middle'] - df['bb_std'] * 2
     df['bb_width'] = (df['bb_upper'] - df['bb_lower']) / df['bb_middle'] * 100
@@ -182,29 +208,23 @@ def _calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['bb_squeeze'] = df['bb_width'] < df['bb_width_ma']
 
     # === OBV ===
-    df['obv'] = (np.sign(df['Close'].diff()) * df['Volume']).fillna(0).cumsum()
-    df['obv_ma20'] = df['obv'].rolling(20).mean()
+    df['obv'] = ind.obv()
+    df['obv_ma20'] = ind.rolling('obv', 20)
     df['obv_trend'] = df['obv'] > df['obv_ma20']
 
     # === RSI ===
-    delta = df['Close'].diff()
-    gain = delta.where(delta > 0, 0).rolling(14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    gain, loss = ind.rsi_components(14)
     df['rsi'] = 100 - (100 / (1 + gain / loss))
     df['rsi_oversold_exit'] = (df['rsi'] > 30) & (df['rsi'].shift(1) <= 30)
 
     # === MACD ===
-    exp12 = df['Close'].ewm(span=12, adjust=False).mean()
-    exp26 = df['Close'].ewm(span=26, adjust=False).mean()
-    df['macd'] = exp12 - exp26
-    df['macd_signal'] = df['macd'].ewm(span=9, adjust=False).mean()
-    df['macd_hist'] = df['macd'] - df['macd_signal']
+    df['macd'], df['macd_signal'], df['macd_hist'] = ind.macd(12, 26, 9)
     df['macd_golden_cross'] = (df['macd'] > df['macd_signal']) & (df['macd'].shift(1) <= df['macd_signal'].shift(1))
     df['macd_hist_positive'] = (df['macd_hist'] > 0) & (df['macd_hist'].shift(1) <= 0)
 
     # === 스토캐스틱 ===
-    low14 = df['Low'].rolling(14).min()
-    high14 = df['High'].rolling(14).max()
+    low14 = ind.rolling('Low', 14, 'min')
+    high14 = ind.rolling('High', 14, 'max')
     df['stoch_k'] = 100 * (df['Close'] - low14) / (high14 - low14)
     df['stoch_d'] = df['stoch_k'].rolling(3).mean()
     df['stoch_golden_cross'] = (df['stoch_k'] > df['stoch_d']) & (df['stoch_k'].shift(1) <= df['stoch_d'].shift(1))
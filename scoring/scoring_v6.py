@@ -22,7 +22,11 @@ import pandas as pd
 import numpy as np
 from typing import Optional, Dict, List
 
+from .series import score_series
+from .context import accepts_context, indicators_for
 
+
+@accepts_context
 def calculate_score_v6(
     df: pd.DataFrame,
     investor_data: Optional[Dict] = None
@@ -59,9 +63,17 @@ def calculate_score_v6(
         return None
 
     try:
-        df = df.copy()
         df = _calculate_indicators(df)
+    except Exception as e:
+        print(f"V6 점수 계산 오류: {e}")
+        return None
 
+    return _score_v6(df, investor_data)
+
+
+def _score_v6(df: pd.DataFrame, investor_data: Optional[Dict] = None) -> Optional[Dict]:
+    """지표가 계산된 df 의 마지막 날짜 기준 V6 점수 (calculate_score_v6 / 전 구간 시계열 공용)"""
+    try:
         result = {
             'score': 0,
             'energy_score': 0,
@@ -152,34 +164,71 @@ def calculate_score_v6(
         return None
 
 
+@accepts_context
 def calculate_score_v6_with_investor(
     df: pd.DataFrame,
-    investor_data: Optional[Dict] = None
+    investor_data: Optional[Dict] = None,
+    stock_code: Optional[str] = None,
+    flow_cache=None,
 ) -> Optional[Dict]:
-    """V6 점수 계산 (투자자 데이터 포함) - 별칭"""
+    """V6 점수 계산 (투자자 데이터 포함) - 별칭
+
+    investor_data 없이 stock_code + flow_cache(services.flow_cache)를 주면 캐시의 최근 5일 수급을 사용
+    """
+    if investor_data is None and stock_code and flow_cache is not None:
+        investor_data = flow_cache.get_investor(stock_code, days=5)
     return calculate_score_v6(df, investor_data)
 
 
+def calculate_score_v6_series(df: pd.DataFrame, investor_data: Optional[Dict] = None, start=None, end=None) -> pd.DataFrame:
+    """
+    V6 전 구간 점수 시계열 (백테스트용)
+
+    지표는 전체 기간으로 1번만 계산하며, 날짜별 결과는
+    calculate_score_v6(df[df.index <= 날짜]) 와 동일하다.
+
+    Args:
+        df: 전체 기간 OHLCV 데이터프레임
+        investor_data: 투자자별 매매동향 (선택, 모든 날짜에 동일하게 적용)
+        start, end: 점수를 낼 날짜 범위 (None이면 전체)
+
+    Returns:
+        index=날짜, columns=['score', 'signals', 'result'] (scoring.series.score_series 참조)
+    """
+    def score_bar(panel: pd.DataFrame, investor_data: Optional[Dict] = None) -> Optional[Dict]:
+        # 피보나치 기준점은 마지막 날짜 기준 최근 60일이라 구간마다 다시 계산
+        return _score_v6(_add_fibonacci_levels(panel.copy()), investor_data)
+
+    return score_series(df, score_bar, prepare=_calculate_causal_indicators,
+                        start=start, end=end, investor_data=investor_data)
+
+
 def _calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """기술적 지표 계산"""
+    return _add_fibonacci_levels(_calculate_causal_indicators(df))
+
+
+def _calculate_causal_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """각 날짜까지의 데이터만 쓰는 지표 (전 구간 1회 계산 후 날짜별로 잘라 써도 동일)"""
     df = df.copy()
+    ind = indicators_for(df)  # 같은 종목 다른 버전과 기본 지표 공유
 
     # === 이동평균선 ===
     for p in [5, 10, 20, 60, 120]:
-        df[f'ma{p}'] = df['Close'].rolling(p, min_periods=1).mean()
+        df[f'ma{p}'] = ind.rolling('Close', p, min_periods=1)
 
     # 이평선 상태
     df['ma_aligned'] = (df['ma5'] > df['ma10']) & (df['ma10'] > df['ma20'])
     df['ma_reverse'] = (df['ma5'] < df['ma10']) & (df['ma10'] < df['ma20'])
 
     # === 거래량 ===
-    df['vol_ma5'] = df['Volume'].rolling(5, min_periods=1).mean()
-    df['vol_ma20'] = df['Volume'].rolling(20, min_periods=1).mean()
+    df['vol_ma5'] = ind.rolling('Volume', 5, min_periods=1)
+    df['vol_ma20'] = ind.rolling('Volume', 20, min_periods=1)
     df['vol_ratio'] = df['Volume'] / df['vol_ma20']
 
     # === 볼린저 밴드 ===
-    df['bb_middle'] = df['Close'].rolling(20, min_periods=1).mean()
-    df['bb_std'] = df['Close'].rolling(20, min_periods=1).std()
+    df['bb_middle'] = ind.rolling('Close', 20, min_periods=1)
+    df['bb_std'] = ind.rolling('Close', 20, 'std', min_periods=1)
     df['bb_upper'] = df['bb_middle'] + df['bb_std'] * 2
     df['bb_lower'] = df['bb_middle'] - df['bb_std'] * 2
     df['bb_width'] = (df['bb_upper'] - df['bb_lower']) / df['bb_middle'] * 100
@@ -187,38 +236,33 @@ def _calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['bb_position'] = (df['Close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
 
     # === ATR ===
-    high_low = df['High'] - df['Low']
-    high_close = abs(df['High'] - df['Close'].shift(1))
-    low_close = abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    df['atr'] = tr.rolling(14, min_periods=1).mean()
+    df['atr'] = ind.rolling('true_range', 14, min_periods=1)
     df['atr_ma'] = df['atr'].rolling(20, min_periods=1).mean()
 
     # === OBV ===
-    df['obv'] = (np.sign(df['Close'].diff()) * df['Volume']).fillna(0).cumsum()
-    df['obv_ma20'] = df['obv'].rolling(20, min_periods=1).mean()
+    df['obv'] = ind.obv()
+    df['obv_ma20'] = ind.rolling('obv', 20, min_periods=1)
 
     # === RSI ===
-    delta = df['Close'].diff()
-    gain = delta.where(delta > 0, 0).rolling(14, min_periods=1).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(14, min_periods=1).mean()
+    gain, loss = ind.rsi_components(14, min_periods=1)
     rs = gain / loss
     df['rsi'] = 100 - (100 / (1 + rs))
     df['rsi'] = df['rsi'].fillna(50)
 
     # === MACD ===
-    exp12 = df['Close'].ewm(span=12, adjust=False).mean()
-    exp26 = df['Close'].ewm(span=26, adjust=False).mean()
-    df['macd'] = exp12 - exp26
-    df['macd_signal'] = df['macd'].ewm(span=9, adjust=False).mean()
-    df['macd_hist'] = df['macd'] - df['macd_signal']
+    df['macd'], df['macd_signal'], df['macd_hist'] = ind.macd(12, 26, 9)
 
     # === 스토캐스틱 ===
-    low14 = df['Low'].rolling(14, min_periods=1).min()
-    high14 = df['High'].rolling(14, min_periods=1).max()
+    low14 = ind.rolling('Low', 14, 'min', min_periods=1)
+    high14 = ind.rolling('High', 14, 'max', min_periods=1)
     df['stoch_k'] = 100 * (df['Close'] - low14) / (high14 - low14 + 0.0001)
     df['stoch_d'] = df['stoch_k'].rolling(3, min_periods=1).mean()
 
+    return df
+
+
+def _add_fibonacci_levels(df: pd.DataFrame) -> pd.DataFrame:
+    """피보나치 되돌림 기준점 (마지막 날짜 기준 최근 60일 → 구간마다 다시 계산)"""
     # === 피보나치 되돌림 기준점 (최근 60일) ===
     recent_60 = df.tail(60)
     swing_high = recent_60['High'].max()
@@ -576,19 +620,14 @@ def _detect_vcp_pattern(df: pd.DataFrame) -> Dict:
     try:
         recent = df.tail(40)
 
-        # 4개의 10일 구간
-        ranges = []
-        for i in range(4):
-            period = recent.iloc[i*10:(i+1)*10]
-            high = period['High'].max()
-            low = period['Low'].min()
-            vol = period['Volume'].mean()
-            ranges.append({
-                'high': high,
-                'low': low,
-                'range': high - low,
-                'vol': vol
-            })
+        # 4개의 10일 구간 (행 = 구간)
+        highs = recent['High'].to_numpy().reshape(4, 10).max(axis=1)
+        lows = recent['Low'].to_numpy().reshape(4, 10).min(axis=1)
+        vols = recent['Volume'].to_numpy().reshape(4, 10).mean(axis=1)
+        ranges = [
+            {'high': high, 'low': low, 'range': high - low, 'vol': vol}
+            for high, low, vol in zip(highs, lows, vols)
+        ]
 
         # VCP 조건
         # 1. 변동폭 수축 (마지막 구간이 첫 구간의 70% 이하)
@@ -650,13 +689,14 @@ def _analyze_obv_divergence(df: pd.DataFrame) -> Dict:
     if len(df) < 20:
         return result
 
-    recent = df.tail(20)
+    close = df['Close'].to_numpy()[-20:]
+    obv = df['obv'].to_numpy()[-20:]
 
     # 가격 변화
-    price_change = (recent.iloc[-1]['Close'] - recent.iloc[0]['Close']) / recent.iloc[0]['Close'] * 100
+    price_change = (close[-1] - close[0]) / close[0] * 100
 
     # OBV 변화
-    obv_change = recent.iloc[-1]['obv'] - recent.iloc[0]['obv']
+    obv_change = obv[-1] - obv[0]
 
     # OBV 상승 중
     if obv_change > 0:
@@ -831,9 +871,9 @@ def _calculate_obv_slope(df: pd.DataFrame, days: int = 10) -> float:
     if len(df) < days:
         return 0
 
-    recent = df.tail(days)
-    obv_start = recent.iloc[0]['obv']
-    obv_end = recent.iloc[-1]['obv']
+    obv = df['obv'].to_numpy()[-days:]
+    obv_start = obv[0]
+    obv_end = obv[-1]
 
     if obv_start == 0:
         return 0
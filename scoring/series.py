@@ -0,0 +1,318 @@
+"""
+전 구간 점수 시계열 모듈 (score every bar)
+
+목적:
+- 백테스트에서 df[df.index <= date] 로 매일 잘라 점수를 다시 계산하던 O(일수²) 제거
+- 지표는 전체 기간으로 1번만 계산하고, 각 날짜의 점수는 해당 날짜까지의 구간으로 평가
+- 결과는 날짜별로 잘라서 호출한 calculate_score_vX 와 동일
+
+방식:
+- pandas_ta 기반 엔진 (V1~V4): 스코어러 모듈의 `ta` 를 PrefixTA 프록시로 사용
+  full_history(df) 컨텍스트 안에서는 지표를 전체 기간으로 1번 계산해 두고
+  접두 구간 호출에는 잘라서 반환 (첫 호출 시 직접 계산 결과와 비교 검증)
+- 지표 함수가 분리된 엔진 (V5~V8): 지표 패널을 1번 계산 후 날짜별로 슬라이스만 평가
+
+사용법:
+    from scoring import calculate_score_series
+
+    series = calculate_score_series(df, 'v2', start='2025-01-01')
+    series.loc['2025-03-04', 'score']
+"""
+
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pandas_ta as _pandas_ta
+
+
+# 접두 구간 = 전체 결과의 앞부분이 성립하는 (인과적) 지표만 캐시
+# - ichimoku: 선행스팬(미래 구간) 을 별도로 반환하므로 제외
+PREFIX_SAFE_INDICATORS = frozenset({
+    'sma', 'ema', 'wma', 'rsi', 'macd', 'bbands', 'stoch', 'stochrsi', 'adx', 'atr',
+    'cci', 'willr', 'obv', 'mfi', 'cmf', 'supertrend', 'psar', 'roc', 'cdl_pattern',
+})
+
+# 같은 봉 수(전체 길이) 호출만 공유하는 지표 컨텍스트(scoring.context)에서는 비인과 지표도 재사용 가능
+SHARED_INDICATORS = PREFIX_SAFE_INDICATORS | frozenset({'ichimoku'})
+
+
+class _CachedIndicator:
+    """전체 기간 지표 결과 + 접두 구간 검증 상태"""
+
+    __slots__ = ("full", "verified_from", "unsafe")
+
+    def __init__(self, full):
+        self.full = full
+        self.verified_from: Optional[int] = None  # 이 길이 이상은 잘라서 반환
+        self.unsafe = False                       # 검증 실패 → 항상 직접 계산
+
+
+class _FullHistory:
+    """full_history / 지표 컨텍스트 상태 (스레드별)
+
+    exact=True 이면 전체 길이 호출만 공유하는 지표 컨텍스트 (scoring.context.IndicatorContext)
+    """
+
+    def __init__(self, df: pd.DataFrame, exact: bool = False):
+        self.index = df.index
+        self.index_values = df.index.to_numpy()
+        self.series: Dict[str, pd.Series] = {c: df[c] for c in df.columns}
+        self.cache: Dict[Tuple, _CachedIndicator] = {}
+        self.exact = exact
+        self.stats = {"sliced": 0, "direct": 0}
+        self.computed: Counter = Counter()  # 지표(+인자)별 계산 횟수
+        self.reused: Counter = Counter()    # 지표(+인자)별 재사용 횟수
+
+    def resolve(self, s: pd.Series) -> Optional[str]:
+        """인자 Series 가 전체 기간 Series 의 접두 구간이면 그 이름 반환"""
+        name = s.name
+        if not isinstance(name, str) or name not in self.series:
+            return None
+        n = len(s)
+        full = self.series[name]
+        if n == 0 or n > len(full) or s.dtype != full.dtype:
+            return None
+        # 인덱스는 정렬된 날짜이므로 양 끝만 비교, 값은 numpy 로 전체 비교
+        index = s.index.to_numpy()
+        if index[0] != self.index_values[0] or index[-1] != self.index_values[n - 1]:
+            return None
+        values, full_values = s.to_numpy(), full.to_numpy()[:n]
+        equal_nan = values.dtype.kind == 'f'
+        return name if np.array_equal(values, full_values, equal_nan=equal_nan) else None
+
+    def register(self, result):
+        """지표 결과도 다음 지표의 입력이 될 수 있도록 등록 (예: sma(obv))"""
+        if isinstance(result, pd.Series):
+            if isinstance(result.name, str):
+                self.series.setdefault(result.name, result)
+        elif isinstance(result, pd.DataFrame):
+            for col in result.columns:
+                if isinstance(col, str):
+                    self.series.setdefault(col, result[col])
+
+
+def _slice(result, n: int, length: int):
+    if isinstance(result, (pd.Series, pd.DataFrame)) and len(result) == length:
+        return result.iloc[:n].copy()
+    return None
+
+
+def _copy(result):
+    if isinstance(result, (pd.Series, pd.DataFrame)):
+        return result.copy()
+    if isinstance(result, tuple):
+        return tuple(_copy(r) for r in result)
+    return result
+
+
+def _label(name: str, key_args: tuple, kwargs: tuple) -> str:
+    """계측용 지표 이름 (예: sma(Close, length=20))"""
+    parts = [value for _, value in key_args] + [f"{k}={v}" for k, v in kwargs]
+    return f"{name}({', '.join(str(p) for p in parts)})"
+
+
+def _same(a, b) -> bool:
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, pd.DataFrame) and list(a.columns) != list(b.columns):
+        return False
+    return a.equals(b)
+
+
+class PrefixTA:
+    """pandas_ta 프록시
+
+    full_history 컨텍스트 밖에서는 pandas_ta 그대로 동작한다.
+    컨텍스트 안에서는 입력이 전체 기간 Series 의 접두 구간인 호출에 대해
+    전체 기간 결과를 잘라서 반환한다. 지표(+인자)별 첫 호출은 직접 계산한 결과와
+    비교하여 같을 때만 이후 호출에 재사용한다.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def _active(self) -> Optional[_FullHistory]:
+        return getattr(self._local, "state", None)
+
+    def __getattr__(self, name: str):
+        func = getattr(_pandas_ta, name)
+        if not callable(func):
+            return func
+        state = self._active
+        if state is None or name not in (SHARED_INDICATORS if state.exact else PREFIX_SAFE_INDICATORS):
+            return func
+        return lambda *args, **kwargs: self._call(state, name, func, args, kwargs)
+
+    def _direct(self, state: _FullHistory, name: str, func: Callable, args: tuple, kwargs: dict):
+        state.stats["direct"] += 1
+        state.computed[name] += 1
+        return func(*args, **kwargs)
+
+    def _call(self, state: _FullHistory, name: str, func: Callable, args: tuple, kwargs: dict):
+        n = None
+        key_args = []
+        full_args = []
+        for arg in args:
+            if isinstance(arg, pd.Series):
+                col = state.resolve(arg)
+                if col is None or (n is not None and len(arg) != n):
+                    return self._direct(state, name, func, args, kwargs)
+                n = len(arg)
+                key_args.append(("series", col))
+                full_args.append(state.series[col])
+            else:
+                key_args.append(("value", arg))
+                full_args.append(arg)
+
+        if n is None or any(isinstance(v, (pd.Series, pd.DataFrame)) for v in kwargs.values()):
+            return self._direct(state, name, func, args, kwargs)
+
+        full_length = len(state.index)
+        if n != full_length and name not in PREFIX_SAFE_INDICATORS:
+            return self._direct(state, name, func, args, kwargs)
+
+        key = (name, tuple(key_args), tuple(sorted(kwargs.items())))
+        try:
+            entry = state.cache.get(key)
+        except TypeError:  # 해시 불가 인자
+            return self._direct(state, name, func, args, kwargs)
+        label = _label(name, key[1], key[2])
+        if entry is None:
+            entry = _CachedIndicator(func(*full_args, **kwargs))
+            state.cache[key] = entry
+            state.register(entry.full)
+            state.computed[label] += 1
+            if n == full_length:
+                return _copy(entry.full)
+        elif n == full_length:
+            # 전체 길이 호출 = 같은 입력으로 직접 계산한 것과 동일 (검증 불필요)
+            state.reused[label] += 1
+            return _copy(entry.full)
+
+        if entry.unsafe or entry.verified_from is None or n < entry.verified_from:
+            state.stats["direct"] += 1
+            direct = func(*args, **kwargs)
+            if entry.unsafe or direct is None:
+                return direct  # 데이터 부족 시 pandas_ta 는 None 반환 (그대로 유지)
+            if _same(direct, _slice(entry.full, n, full_length)):
+                entry.verified_from = n if entry.verified_from is None else min(n, entry.verified_from)
+            else:
+                entry.unsafe = True
+            return direct
+
+        state.stats["sliced"] += 1
+        state.reused[label] += 1
+        return _slice(entry.full, n, full_length)
+
+    @contextmanager
+    def activated(self, state: _FullHistory):
+        """state 를 현재 스레드의 지표 캐시로 사용"""
+        prev = self._active
+        self._local.state = state
+        try:
+            yield state
+        finally:
+            self._local.state = prev
+
+    @contextmanager
+    def full_history(self, df: pd.DataFrame):
+        """이 컨텍스트 안의 지표 호출은 df 전체 기간 결과를 재사용"""
+        with self.activated(_FullHistory(df)) as state:
+            yield state
+
+
+# 스코어러 모듈에서 `from .series import ta` 로 사용
+ta = PrefixTA()
+
+
+def _bar_range(index: pd.Index, start, end) -> range:
+    first = 0 if start is None else index.searchsorted(pd.Timestamp(start), side='left')
+    last = len(index) if end is None else index.searchsorted(pd.Timestamp(end), side='right')
+    return range(int(first), int(last))
+
+
+def iter_score_series(
+    df: pd.DataFrame,
+    score_fn: Callable[..., Optional[Dict]],
+    prepare: Callable[[pd.DataFrame], pd.DataFrame] = None,
+    start=None,
+    end=None,
+    min_bars: int = 60,
+    **kwargs,
+) -> Iterator[Tuple[Any, Optional[Dict]]]:
+    """
+    날짜별 점수 계산 (각 날짜까지의 데이터만 사용한 것과 동일한 결과)
+
+    Args:
+        df: 전체 기간 OHLCV (DatetimeIndex 오름차순)
+        score_fn: 점수 함수
+            - prepare 가 None 이면 calculate_score_vX (접두 구간 복사본으로 호출)
+            - prepare 가 있으면 지표가 계산된 패널의 접두 구간(읽기 전용)으로 호출
+        prepare: 전체 기간 지표 패널 계산 함수 (인과적 지표만)
+        start, end: 점수를 낼 날짜 범위 (None이면 전체)
+        min_bars: 이보다 짧은 구간은 None (calculate_score_vX 의 최소 일수)
+        **kwargs: score_fn 추가 인자 (investor_data 등)
+
+    Yields:
+        (날짜, 점수 결과 dict 또는 None)
+    """
+    if df is None or df.empty:
+        return
+
+    bars = _bar_range(df.index, start, end)
+
+    if prepare is not None:
+        try:
+            panel = prepare(df)
+        except Exception as e:
+            # calculate_score_vX 도 지표 계산 실패 시 None 반환
+            print(f"지표 패널 계산 오류: {e}")
+            for i in bars:
+                yield df.index[i], None
+            return
+        for i in bars:
+            if i + 1 < min_bars:
+                yield df.index[i], None
+            else:
+                yield df.index[i], score_fn(panel.iloc[:i + 1], **kwargs)
+        return
+
+    with ta.full_history(df):
+        for i in bars:
+            if i + 1 < min_bars:
+                yield df.index[i], None
+            else:
+                yield df.index[i], score_fn(df.iloc[:i + 1].copy(), **kwargs)
+
+
+def score_series(
+    df: pd.DataFrame,
+    score_fn: Callable[..., Optional[Dict]],
+    prepare: Callable[[pd.DataFrame], pd.DataFrame] = None,
+    start=None,
+    end=None,
+    min_bars: int = 60,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    날짜별 점수 시계열 DataFrame (iter_score_series 참조)
+
+    Returns:
+        index=날짜, columns=['score', 'signals', 'result']
+        - 점수를 낼 수 없는 날짜는 score=NaN, signals/result=None
+    """
+    rows = []
+    dates = []
+    for date, result in iter_score_series(df, score_fn, prepare, start, end, min_bars, **kwargs):
+        dates.append(date)
+        if result:
+            rows.append((result.get('score'), result.get('signals'), result))
+        else:
+            rows.append((float('nan'), None, None))
+    return pd.DataFrame(rows, index=pd.Index(dates, name=df.index.name),
+                        columns=['score', 'signals', 'result'])
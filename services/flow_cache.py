@@ -0,0 +1,423 @@
+"""
+투자자 수급 / 공매도 공용 캐시 (종목 x 일자)
+
+목적:
+- 스크리너, 장중 스코어 기록기, V3.5/V4/V6/V8 *_with_investor 점수 계산이
+  같은 종목의 수급을 각자 조회하지 않도록 SQLite 에 (code, date) 단위로 공유
+- 하루 1번 일괄 조회 (스레드 병렬 + 토큰 버킷 속도 제한, 종목마다 sleep 없음)
+- 장중에는 당일 행만 바뀌므로 당일 데이터가 확정되지 않은 종목만 days=1 로 증분 갱신
+- 장 마감(15:40) 이후/주말에 받은 데이터는 확정 → 다시 조회하지 않음
+- 공매도는 하루 1번 공시되므로 종목별 당일 1회만 조회
+- 보관 기간(30일)이 지난 일별 행은 하루 1번 (그날 첫 일괄 조회 시) 삭제
+
+사용법:
+    from services.flow_cache import get_flow_cache
+
+    cache = get_flow_cache()
+    flows = cache.get_investor_many(codes, days=5)      # 미조회/만료 종목만 일괄 조회
+    inv = cache.get_investor('005930', days=10)         # 캐시 읽기 (없으면 조회)
+    short = cache.get_short('005930')
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from database.connection_pool import pooled_connection
+from services.rate_limit import TokenBucket
+
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "database" / "stock_data.db"
+
+DEFAULT_RATE = 15.0            # 초당 조회 건수 (KIS 실전 20건/초 제한 이내)
+DEFAULT_INTRADAY_TTL = 300.0   # 초 - 장중 당일 수급 재조회 간격
+MIN_FETCH_DAYS = 10            # 일괄 조회 시 최소 일수 (V3.5 10일 / V4 5일 / 장중 1일 모두 충족)
+KEEP_DAYS = 30                 # 일별 행 보관 일수
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS investor_flow_daily (
+        code TEXT NOT NULL,
+        date TEXT NOT NULL,
+        foreign_net INTEGER NOT NULL DEFAULT 0,
+        institution_net INTEGER NOT NULL DEFAULT 0,
+        individual_net INTEGER NOT NULL DEFAULT 0,
+        foreign_total INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (code, date)
+    );
+    CREATE TABLE IF NOT EXISTS short_flow_daily (
+        code TEXT NOT NULL,
+        date TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        PRIMARY KEY (code, date)
+    );
+    CREATE TABLE IF NOT EXISTS flow_fetch_log (
+        kind TEXT NOT NULL,
+        code TEXT NOT NULL,
+        fetched_at REAL NOT NULL,
+        days INTEGER NOT NULL,
+        final INTEGER NOT NULL DEFAULT 0,
+        foreign_ratio REAL,
+        PRIMARY KEY (kind, code)
+    );
+"""
+
+_CHUNK = 500  # IN (...) 절 최대 변수 수
+
+
+def _chunks(items: List[str]):
+    for i in range(0, len(items), _CHUNK):
+        yield items[i:i + _CHUNK]
+
+
+def flows_settled(now: datetime = None) -> bool:
+    """당일 수급이 확정됐는지 (장 마감 이후 또는 주말)"""
+    now = now or datetime.now()
+    return now.weekday() >= 5 or (now.hour, now.minute) >= (15, 40)
+
+
+def _default_investor_fetcher():
+    from api.services.kis_client import KISClient
+    return KISClient(is_virtual=False).get_investor_trend
+
+
+def _default_short_fetcher():
+    from krx_short_data import get_short_data
+    return get_short_data
+
+
+def summarize_flows(code: str, daily: List[Dict], foreign_ratio: float = 0.0) -> Dict:
+    """일별 수급 → 점수 계산기 입력 형식
+
+    KISClient.get_investor_trend 반환 키에 스크리너/V3.5/V6 가 쓰는 연속 매수 일수 키를 더한다.
+
+    Args:
+        daily: 최신순 일별 수급 [{date, foreign_net, institution_net, individual_net, foreign_total}]
+    """
+    def consecutive(key):
+        count = 0
+        for row in daily:
+            if row[key] <= 0:
+                break
+            count += 1
+        return count
+
+    foreign_days = consecutive('foreign_net')
+    inst_days = consecutive('institution_net')
+    return {
+        'stock_code': code,
+        'foreign_net': sum(row['foreign_net'] for row in daily),
+        'institution_net': sum(row['institution_net'] for row in daily),
+        'individual_net': sum(row['individual_net'] for row in daily),
+        'foreign_ratio': foreign_ratio,
+        'foreign_hold_ratio': foreign_ratio,
+        'consecutive_foreign_buy': foreign_days,
+        'consecutive_institution_buy': inst_days,
+        'foreign_consecutive_days': foreign_days,
+        'institution_consecutive_days': inst_days,
+        'days': len(daily),
+        'daily': daily,
+    }
+
+
+class InvestorFlowCache:
+    """종목 x 일자 수급/공매도 캐시 (프로세스 간 공유)"""
+
+    def __init__(
+        self,
+        db_path=None,
+        investor_fetcher: Optional[Callable] = None,
+        short_fetcher: Optional[Callable] = None,
+        rate: float = DEFAULT_RATE,
+        max_workers: int = 8,
+        intraday_ttl: float = DEFAULT_INTRADAY_TTL,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        """
+        Args:
+            db_path: 캐시 DB (None이면 stock_data.db)
+            investor_fetcher: (code, days) -> KISClient.get_investor_trend 형식 (None이면 KIS 실전 클라이언트)
+            short_fetcher: (code, days) -> krx_short_data.get_short_data 형식
+            rate: 초당 최대 조회 건수
+            max_workers: 일괄 조회 동시 실행 수
+            intraday_ttl: 장중 당일 수급 재조회 간격 (초)
+            clock: 현재 시각 함수 (테스트용)
+        """
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self._investor_fetcher = investor_fetcher
+        self._short_fetcher = short_fetcher
+        self.max_workers = max_workers
+        self.intraday_ttl = intraday_ttl
+        self.clock = clock
+        self._bucket = TokenBucket(rate)
+        self._fetch_lock = threading.Lock()  # 같은 프로세스 내 중복 일괄 조회 방지
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "full": 0, "incremental": 0, "short": 0, "errors": 0, "purged": 0}
+        self._purged_on: Optional[str] = None
+        with pooled_connection(self.db_path) as conn:
+            conn.executescript(_SCHEMA)
+
+    # ==================== 조회 필요 여부 ====================
+
+    def _fetch_logs(self, kind: str, codes: List[str]) -> Dict[str, dict]:
+        logs = {}
+        with pooled_connection(self.db_path) as conn:
+            for chunk in _chunks(codes):
+                rows = conn.execute(
+                    f"SELECT code, fetched_at, days, final, foreign_ratio FROM flow_fetch_log "
+                    f"WHERE kind = ? AND code IN ({','.join('?' * len(chunk))})",
+                    [kind, *chunk]
+                ).fetchall()
+                logs.update({row['code']: dict(row) for row in rows})
+        return logs
+
+    def _plan(self, codes: List[str], days: int) -> Dict[str, str]:
+        """종목별 조회 방식: 'full' (전체 기간) / 'today' (당일 행만) - 최신이면 제외"""
+        now = self.clock()
+        logs = self._fetch_logs('investor', codes)
+        plan = {}
+        for code in codes:
+            log = logs.get(code)
+            if log is None or log['days'] < days:
+                plan[code] = 'full'
+                continue
+            fetched = datetime.fromtimestamp(log['fetched_at'])
+            if fetched.date() != now.date():
+                plan[code] = 'full'
+            elif not log['final'] and now.timestamp() - log['fetched_at'] >= self.intraday_ttl:
+                plan[code] = 'today'
+        return plan
+
+    # ==================== 일괄 조회 ====================
+
+    def _call(self, fetcher: Callable, code: str, days: int):
+        self._bucket.acquire()
+        try:
+            return fetcher(code, days)
+        except Exception:
+            with self._stats_lock:
+                self._stats["errors"] += 1
+            return None
+
+    def _run(self, jobs: List[tuple], fetcher: Callable, max_workers: int) -> List:
+        if not jobs:
+            return []
+        workers = max(1, min(max_workers or self.max_workers, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="flow-cache") as executor:
+            return list(executor.map(lambda job: self._call(fetcher, *job), jobs))
+
+    def prefetch(self, codes: Iterable[str], days: int = MIN_FETCH_DAYS,
+                 fetcher: Optional[Callable] = None, max_workers: int = None) -> Dict[str, int]:
+        """미조회/만료 종목 수급만 일괄 조회해 저장
+
+        Args:
+            codes: 종목코드 목록
+            days: 필요한 일수 (전체 조회 시 최소 MIN_FETCH_DAYS 일)
+            fetcher: 이번 조회에만 쓸 조회 함수 (예: 이미 만든 KISClient.get_investor_trend)
+            max_workers: 동시 조회 수
+
+        Returns:
+            {'full': 전체 조회 종목 수, 'today': 당일 증분 조회 종목 수}
+        """
+        codes = list(dict.fromkeys(codes))
+        with self._fetch_lock:
+            self._purge_daily()
+            plan = self._plan(codes, days)
+            if not plan:
+                return {'full': 0, 'today': 0}
+
+            if fetcher is None:
+                if self._investor_fetcher is None:
+                    self._investor_fetcher = _default_investor_fetcher()
+                fetcher = self._investor_fetcher
+
+            full_days = max(days, MIN_FETCH_DAYS)
+            jobs = [(code, full_days if mode == 'full' else 1) for code, mode in plan.items()]
+            results = self._run(jobs, fetcher, max_workers)
+
+            now = self.clock()
+            final = int(flows_settled(now))
+            rows, logs = [], []
+            for (code, fetch_days), data in zip(jobs, results):
+                if not data:
+                    continue
+                for day in data.get('daily', []):
+                    if not day.get('date'):
+                        continue
+                    rows.append((code, day['date'], day.get('foreign_net', 0), day.get('institution_net', 0),
+                                 day.get('individual_net', 0), day.get('foreign_total', 0)))
+                logs.append((code, now.timestamp(), fetch_days, final, data.get('foreign_ratio', 0.0)))
+
+            with pooled_connection(self.db_path) as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO investor_flow_daily "
+                    "(code, date, foreign_net, institution_net, individual_net, foreign_total) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                # 증분(당일) 조회는 기존 보유 일수를 유지
+                conn.executemany(
+                    "INSERT INTO flow_fetch_log (kind, code, fetched_at, days, final, foreign_ratio) "
+                    "VALUES ('investor', ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(kind, code) DO UPDATE SET fetched_at = excluded.fetched_at, "
+                    "days = CASE WHEN excluded.days > 1 THEN excluded.days ELSE days END, "
+                    "final = excluded.final, foreign_ratio = excluded.foreign_ratio",
+                    logs
+                )
+
+        counts = {'full': sum(1 for mode in plan.values() if mode == 'full')}
+        counts['today'] = len(plan) - counts['full']
+        with self._stats_lock:
+            self._stats["full"] += counts['full']
+            self._stats["incremental"] += counts['today']
+        return counts
+
+    # ==================== 수급 ====================
+
+    def _read_investor(self, codes: List[str], days: int) -> Dict[str, Optional[Dict]]:
+        logs = self._fetch_logs('investor', codes)
+        daily: Dict[str, List[Dict]] = {code: [] for code in codes}
+        with pooled_connection(self.db_path) as conn:
+            for chunk in _chunks(codes):
+                rows = conn.execute(
+                    f"SELECT code, date, foreign_net, institution_net, individual_net, foreign_total "
+                    f"FROM investor_flow_daily WHERE code IN ({','.join('?' * len(chunk))}) "
+                    f"ORDER BY code, date DESC",
+                    chunk
+                ).fetchall()
+                for row in rows:
+                    rows_for_code = daily[row['code']]
+                    if len(rows_for_code) < days:
+                        rows_for_code.append({
+                            'date': row['date'],
+                            'foreign_net': row['foreign_net'],
+                            'institution_net': row['institution_net'],
+                            'individual_net': row['individual_net'],
+                            'foreign_total': row['foreign_total'],
+                        })
+
+        result = {}
+        for code in codes:
+            if code not in logs or not daily[code]:
+                result[code] = None
+            else:
+                result[code] = summarize_flows(code, daily[code], logs[code]['foreign_ratio'] or 0.0)
+        return result
+
+    def get_investor_many(self, codes: Iterable[str], days: int = 5, fetch: bool = True,
+                          fetcher: Optional[Callable] = None,
+                          max_workers: int = None) -> Dict[str, Optional[Dict]]:
+        """여러 종목 최근 N일 수급 (필요한 종목만 일괄 조회 후 캐시에서 읽음)
+
+        Args:
+            codes: 종목코드 목록
+            days: 합산 일수
+            fetch: False면 캐시만 읽음
+            fetcher: 이번 조회에만 쓸 조회 함수
+            max_workers: 동시 조회 수
+
+        Returns:
+            {stock_code: summarize_flows 결과 (데이터 없으면 None)}
+        """
+        codes = list(dict.fromkeys(codes))
+        fetched = 0
+        if fetch:
+            counts = self.prefetch(codes, days=days, fetcher=fetcher, max_workers=max_workers)
+            fetched = counts['full'] + counts['today']
+        with self._stats_lock:
+            self._stats["hits"] += len(codes) - fetched
+        return self._read_investor(codes, days)
+
+    def get_investor(self, code: str, days: int = 5, fetch: bool = True,
+                     fetcher: Optional[Callable] = None) -> Optional[Dict]:
+        """단일 종목 수급 (V3.5 investor_fetcher 호환 시그니처)"""
+        return self.get_investor_many([code], days=days, fetch=fetch, fetcher=fetcher)[code]
+
+    # ==================== 공매도 ====================
+
+    def get_short_many(self, codes: Iterable[str], days: int = 10, fetch: bool = True,
+                       max_workers: int = None) -> Dict[str, Optional[Dict]]:
+        """여러 종목 공매도 정보 (종목별 하루 1회 조회)
+
+        Returns:
+            {stock_code: krx_short_data.get_short_data 결과 (없으면 None)}
+        """
+        codes = list(dict.fromkeys(codes))
+        today = self.clock().strftime('%Y%m%d')
+
+        def read():
+            found = {}
+            with pooled_connection(self.db_path) as conn:
+                for chunk in _chunks(codes):
+                    rows = conn.execute(
+                        f"SELECT code, payload FROM short_flow_daily "
+                        f"WHERE date = ? AND code IN ({','.join('?' * len(chunk))})",
+                        [today, *chunk]
+                    ).fetchall()
+                    found.update({row['code']: json.loads(row['payload']) for row in rows})
+            return found
+
+        found = read()
+        missing = [code for code in codes if code not in found]
+        if fetch and missing:
+            with self._fetch_lock:
+                if self._short_fetcher is None:
+                    self._short_fetcher = _default_short_fetcher()
+                results = self._run([(code, days) for code in missing], self._short_fetcher, max_workers)
+                rows = [(code, today, json.dumps(data, ensure_ascii=False, default=str))
+                        for code, data in zip(missing, results) if data]
+                with pooled_connection(self.db_path) as conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO short_flow_daily (code, date, payload) VALUES (?, ?, ?)",
+                        rows
+                    )
+            with self._stats_lock:
+                self._stats["short"] += len(missing)
+            found = read()
+
+        return {code: found.get(code) for code in codes}
+
+    def get_short(self, code: str, days: int = 10, fetch: bool = True) -> Optional[Dict]:
+        """단일 종목 공매도 정보 (V3.5 short_fetcher 호환 시그니처)"""
+        return self.get_short_many([code], days=days, fetch=fetch)[code]
+
+    # ==================== 관리 ====================
+
+    def _purge_daily(self):
+        """하루 1번 보관 기간 지난 행 삭제 (일괄 조회 경로에서 호출)"""
+        today = self.clock().strftime('%Y%m%d')
+        if self._purged_on == today:
+            return
+        self._purged_on = today
+        removed = self.purge()
+        with self._stats_lock:
+            self._stats["purged"] += removed
+
+    def purge(self, keep_days: int = KEEP_DAYS) -> int:
+        """오래된 일별 행 삭제"""
+        cutoff = datetime.fromtimestamp(self.clock().timestamp() - keep_days * 86400).strftime('%Y%m%d')
+        with pooled_connection(self.db_path) as conn:
+            removed = conn.execute("DELETE FROM investor_flow_daily WHERE date < ?", (cutoff,)).rowcount
+            removed += conn.execute("DELETE FROM short_flow_daily WHERE date < ?", (cutoff,)).rowcount
+        return removed
+
+    def stats(self) -> Dict:
+        """캐시 적중 / 전체 조회 / 당일 증분 조회 / 공매도 조회 / 오류 / 삭제 행 건수"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+
+_flow_cache: Optional[InvestorFlowCache] = None
+_init_lock = threading.Lock()
+
+
+def get_flow_cache() -> InvestorFlowCache:
+    """기본 수급 캐시"""
+    global _flow_cache
+    if _flow_cache is None:
+        with _init_lock:
+            if _flow_cache is None:
+                _flow_cache = InvestorFlowCache()
+    return _flow_cache
@@ -0,0 +1,33 @@
+"""
+호출 속도 제한 (스레드 공용)
+
+알림 디스패처(채널별 전송 속도)와 수급 캐시(KIS 일괄 조회)가 같이 쓴다.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """초당 rate 건, 최대 burst 건 연속 (토큰 부족 시 acquire 가 대기)"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개 획득 (부족하면 대기)"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,289 @@
+"""
+스테이지 DAG 실행기 (중간 산출물 캐시 + 병렬 렌더링)
+
+- 스테이지마다 결과를 피클로 저장 → 재실행 시 완료된 스테이지는 캐시에서 로드
+  (예: PDF 렌더링 실패 후 재실행해도 스크리닝은 다시 하지 않음)
+- 의존 스테이지가 모두 끝난 스테이지끼리 동시에 실행, parallel=True 는 별도 프로세스
+- 실패한 스테이지의 하위 스테이지만 건너뛰고 나머지는 계속 진행
+- 스테이지별 소요 시간/상태를 manifest.json 에 기록
+- purge_runs 로 오래된 실행 디렉토리 정리 (실행마다 run_dir 이 새로 생기므로)
+
+사용법:
+    from stage_pipeline import Stage, StagePipeline
+
+    pipeline = StagePipeline(run_dir, [
+        Stage("screening", run_screening),
+        Stage("pdf", render_pdf, deps=("screening",), parallel=True, output=pdf_path),
+    ])
+    results = pipeline.run()
+"""
+
+import json
+import pickle
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class Stage:
+    """파이프라인 스테이지
+
+    func 는 deps 순서대로 의존 스테이지 결과를 위치 인자로 받는다.
+    parallel=True 면 별도 프로세스에서 실행하므로 func 는 모듈 최상위 함수여야 한다.
+    """
+    name: str
+    func: Callable
+    deps: Tuple[str, ...] = ()
+    parallel: bool = False
+    cache: bool = True               # 결과 저장 (False면 매번 실행)
+    output: Optional[str] = None     # 산출 파일 - 없어지면 캐시 무효
+
+
+class StagePipeline:
+    """스테이지 DAG 실행 + 산출물 캐시"""
+
+    def __init__(self, run_dir, stages: List[Stage], workers: int = 4, log: Callable = print):
+        """
+        Args:
+            run_dir: 산출물/manifest 저장 디렉토리 (실행 단위)
+            stages: 스테이지 목록 (의존 스테이지가 먼저 오도록)
+            workers: parallel 스테이지 동시 실행 프로세스 수
+            log: 진행 로그 함수
+        """
+        self.run_dir = Path(run_dir)
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise ValueError(f"{stage.name}: 알 수 없는 의존 스테이지 {missing}")
+            self.stages[stage.name] = stage
+        self.workers = workers
+        self.log = log
+        self.manifest = self._load_manifest()
+        self.failed: List[str] = []
+        self.skipped: List[str] = []
+
+    # ==================== 캐시 ====================
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.run_dir / "manifest.json"
+
+    def _artifact_path(self, name: str) -> Path:
+        return self.run_dir / f"{name}.pkl"
+
+    def _load_manifest(self) -> dict:
+        if self.manifest_path.exists():
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        return {}
+
+    def _save_manifest(self):
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+
+    def is_cached(self, name: str) -> bool:
+        """완료 기록 + 산출물이 남아 있는지"""
+        stage = self.stages[name]
+        if not stage.cache or self.manifest.get(name, {}).get("status") != "done":
+            return False
+        if not self._artifact_path(name).exists():
+            return False
+        return stage.output is None or Path(stage.output).exists()
+
+    def _load(self, name: str):
+        with open(self._artifact_path(name), "rb") as f:
+            return pickle.load(f)
+
+    def _store(self, name: str, result):
+        if not self.stages[name].cache:
+            return
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._artifact_path(name).with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(self._artifact_path(name))
+
+    def invalidate(self, names: Iterable[str]):
+        """스테이지 + 하위 스테이지 캐시 무효화"""
+        for name in self.descendants(names):
+            self.manifest.pop(name, None)
+            self._artifact_path(name).unlink(missing_ok=True)
+        self._save_manifest()
+
+    def clear(self):
+        """실행 디렉토리 전체 삭제"""
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+        self.manifest = {}
+
+    # ==================== DAG ====================
+
+    def ancestors(self, targets: Iterable[str]) -> List[str]:
+        """targets 실행에 필요한 스테이지 (등록 순서)"""
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            needed.add(name)
+            stack.extend(self.stages[name].deps)
+        return [name for name in self.stages if name in needed]
+
+    def descendants(self, names: Iterable[str]) -> List[str]:
+        """names 와 그 하위 스테이지 (등록 순서)"""
+        affected = set(names)
+        for name, stage in self.stages.items():
+            if any(dep in affected for dep in stage.deps):
+                affected.add(name)
+        return [name for name in self.stages if name in affected]
+
+    # ==================== 실행 ====================
+
+    def _record(self, name: str, status: str, seconds: float, error: str = None):
+        entry = {
+            "status": status,
+            "seconds": round(seconds, 3),
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        if error:
+            entry["error"] = error
+        self.manifest[name] = entry
+        self._save_manifest()
+
+    def _finish(self, name: str, result, started: float, results: dict):
+        seconds = time.perf_counter() - started
+        self._store(name, result)
+        results[name] = result
+        self._record(name, "done", seconds)
+        self.log(f"[스테이지] {name}: {seconds:.1f}초")
+
+    def _fail(self, name: str, error: Exception, started: float):
+        seconds = time.perf_counter() - started
+        self.failed.append(name)
+        self._record(name, "failed", seconds, error=f"{type(error).__name__}: {error}")
+        self.log(f"[스테이지] {name}: 실패 ({seconds:.1f}초) - {error}")
+
+    def run(self, targets: Optional[Iterable[str]] = None, force: Iterable[str] = ()) -> dict:
+        """스테이지 실행
+
+        Args:
+            targets: 최종 스테이지 (None이면 전체)
+            force: 캐시를 무시하고 다시 실행할 스테이지 (하위 스테이지 포함)
+
+        Returns:
+            {스테이지: 결과} - 성공(또는 캐시)한 스테이지만
+        """
+        if force:
+            self.invalidate(force)
+        order = self.ancestors(targets if targets is not None else self.stages)
+        self.failed, self.skipped = [], []
+
+        results = {}
+        done = set()
+        pending = []
+        for name in order:
+            if self.is_cached(name):
+                done.add(name)
+                self.log(f"[스테이지] {name}: 캐시 사용 ({self.manifest[name].get('seconds', 0):.1f}초 절약)")
+            else:
+                pending.append(name)
+
+        def inputs(name):
+            values = []
+            for dep in self.stages[name].deps:
+                if dep not in results:
+                    results[dep] = self._load(dep)
+                values.append(results[dep])
+            return values
+
+        pool = None
+        try:
+            while pending:
+                blocked = [name for name in pending
+                           if any(dep in self.failed or dep in self.skipped for dep in self.stages[name].deps)]
+                for name in blocked:
+                    self.skipped.append(name)
+                    pending.remove(name)
+                    self.log(f"[스테이지] {name}: 건너뜀 (의존 스테이지 실패)")
+
+                ready = [name for name in pending if all(dep in done for dep in self.stages[name].deps)]
+                if not ready:
+                    break
+                for name in ready:
+                    pending.remove(name)
+
+                # 프로세스 스테이지 먼저 제출 → 메인 스테이지와 동시에 진행
+                parallel = [name for name in ready if self.stages[name].parallel]
+                futures = {}
+                if len(parallel) > 1 and self.workers > 1:
+                    if pool is None:
+                        pool = ProcessPoolExecutor(max_workers=self.workers)
+                    for name in parallel:
+                        futures[name] = (pool.submit(self.stages[name].func, *inputs(name)), time.perf_counter())
+                inline = [name for name in ready if name not in futures]
+
+                for name in inline:
+                    started = time.perf_counter()
+                    try:
+                        result = self.stages[name].func(*inputs(name))
+                    except Exception as e:
+                        self._fail(name, e, started)
+                        continue
+                    self._finish(name, result, started, results)
+                    done.add(name)
+
+                for name, (future, started) in futures.items():
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self._fail(name, e, started)
+                        continue
+                    self._finish(name, result, started, results)
+                    done.add(name)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        for name in order:
+            if name in done and name not in results:
+                results[name] = self._load(name)
+        return results
+
+    def timings(self) -> Dict[str, float]:
+        """스테이지별 소요 시간 (초, 마지막 실행 기준)"""
+        return {name: entry.get("seconds", 0.0) for name, entry in self.manifest.items()}
+
+
+def purge_runs(root, max_age_days: float, keep: Iterable[str] = (), now: Optional[float] = None) -> List[str]:
+    """마지막 기록 후 max_age_days 가 지난 실행 디렉토리 삭제
+
+    Args:
+        root: 실행 디렉토리들의 상위 디렉토리
+        keep: 삭제하지 않을 실행 이름 (이어서 실행 중인 run_id 등)
+        now: 기준 시각 (epoch 초, None이면 현재)
+
+    Returns:
+        삭제한 실행 이름 목록
+    """
+    root = Path(root)
+    if not root.is_dir():
+        return []
+    cutoff = (now if now is not None else time.time()) - max_age_days * 86400
+    keep = set(keep)
+    removed = []
+    for run_dir in sorted(root.iterdir()):
+        if not run_dir.is_dir() or run_dir.name in keep:
+            continue
+        # 디렉토리 mtime 은 기존 파일 덮어쓰기에 갱신되지 않으므로 파일 mtime 까지 확인
+        last_modified = max([run_dir.stat().st_mtime] + [f.stat().st_mtime for f in run_dir.iterdir()])
+        if last_modified < cutoff:
+            shutil.rmtree(run_dir, ignore_errors=True)
+            removed.append(run_dir.name)
+    return removed
@@ -1,8 +1,17 @@
+import contextlib
+import copy
+import functools
+import threading
+from collections import OrderedDict
+
 import FinanceDataReader as fdr
-import pandas_ta as ta
 import pandas as pd
 from datetime import datetime, timedelta
 
+from scoring.context import IndicatorContext
+from scoring.cycle import current_cycle
+from scoring.series import ta  # pandas_ta 프록시 (IndicatorContext 활성 시 지표 공유)
+
 
 def apply_signal_reliability_weights(signals: list, base_score: int) -> tuple:
     """
@@ -64,6 +73,167 @@ def apply_signal_reliability_weights(signals: list, base_score: int) -> tuple:
     return adjusted_score, reliability_info
 
 
+class AnalysisCache:
+    """TechnicalAnalyst 분석 결과 + 종목별 지표 컨텍스트 LRU 캐시
+
+    키 = (종목코드, 마지막 봉 날짜, 봉 수, 마지막 봉 OHLCV) - 장중 현재가가 바뀌면 새 키.
+    예상 거래량을 쓰는 분석은 사이클의 예상 거래량 배수도 키에 포함한다.
+    같은 종목의 다른 분석(퀵 스크리닝 → 전체 분석 → API 요청)은 최근 컨텍스트를
+    공유해서 지표를 다시 계산하지 않는다. IndicatorContext 는 스레드 안전하지 않으므로
+    공유 컨텍스트는 컨텍스트별 락을 잡은 동안만 활성화한다 (activated).
+
+    사용 예:
+        cache = get_analysis_cache()
+        analyst = TechnicalAnalyst()
+        analyst.get_quick_score(df, code='005930')          # 계산 + 저장
+        analyst.analyze_trend_following_strict(df, code='005930')  # 지표 재사용
+        print(cache.stats)
+    """
+
+    def __init__(self, maxsize: int = 5000, context_size: int = 64):
+        """
+        Args:
+            maxsize: 최대 분석 결과 수 (결과 딕셔너리만 저장하므로 전 종목 가능)
+            context_size: 최대 지표 컨텍스트 수 (종목별 지표 시계열 보관)
+        """
+        self.maxsize = maxsize
+        self.context_size = context_size
+        self._results: OrderedDict = OrderedDict()
+        self._contexts: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def bar_key(code: str, df: pd.DataFrame) -> tuple:
+        """(종목코드, 마지막 봉 날짜, 봉 수, 마지막 봉 OHLCV)"""
+        last = df.iloc[-1]
+        values = tuple(float(last[c]) for c in ('Open', 'High', 'Low', 'Close', 'Volume') if c in df.columns)
+        return (code, df.index[-1], len(df), values)
+
+    def get(self, key: tuple):
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._results.move_to_end(key)
+        return copy.deepcopy(result)
+
+    def put(self, key: tuple, result: dict) -> None:
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def _context_entry(self, code: str, df: pd.DataFrame) -> tuple:
+        """(컨텍스트, 컨텍스트 락) - 같은 봉 데이터의 최근 항목 (없으면 생성)"""
+        key = self.bar_key(code, df)
+        with self._lock:
+            entry = self._contexts.get(key)
+            if entry is not None and entry[0].matches(df):
+                self._contexts.move_to_end(key)
+                return entry
+            entry = (IndicatorContext(df, code), threading.RLock())
+            self._contexts[key] = entry
+            while len(self._contexts) > self.context_size:
+                self._contexts.popitem(last=False)
+        return entry
+
+    def context(self, code: str, df: pd.DataFrame) -> IndicatorContext:
+        """같은 봉 데이터의 최근 지표 컨텍스트 (없으면 생성, 직접 쓸 때는 activated 사용)"""
+        return self._context_entry(code, df)[0]
+
+    @contextlib.contextmanager
+    def activated(self, code: str, df: pd.DataFrame):
+        """공유 컨텍스트를 락을 잡고 활성화 (같은 컨텍스트는 한 번에 한 스레드만)"""
+        ctx, lock = self._context_entry(code, df)
+        with lock, ctx.activate():
+            yield ctx
+
+    def clear(self) -> None:
+        """전체 캐시 초기화"""
+        with self._lock:
+            self._results.clear()
+            self._contexts.clear()
+            self._hits = 0
+            self._misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """캐시 히트율"""
+        total = self._hits + self._misses
+        return self._hits / total if total > 0 else 0.0
+
+    @property
+    def stats(self) -> dict:
+        """캐시 통계"""
+        return {
+            "size": len(self._results),
+            "contexts": len(self._contexts),
+            "maxsize": self.maxsize,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self.hit_rate,
+        }
+
+
+_analysis_cache = None
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """전역 분석 캐시 (싱글톤) - TechnicalAnalyst 인스턴스 간 공유"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = AnalysisCache()
+    return _analysis_cache
+
+
+def cached_analysis(uses_projection: bool = False):
+    """
+    분석 메서드에 code= / ctx= 인자 추가
+
+    - code 가 있으면 (종목코드, 마지막 봉) 단위로 결과 캐시 + 종목 지표 컨텍스트 공유
+    - ctx(IndicatorContext) 를 직접 주면 그 컨텍스트의 지표 사용 (V1~V10 점수와 공유)
+    - uses_projection: 장중 예상 거래량을 쓰는 분석 → 사이클 배수를 캐시 키에 포함
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, df, code=None, ctx=None):
+            if df is None or len(df) < 60 or (code is None and ctx is None):
+                return method(self, df)
+
+            cache = self.cache
+            key = None
+            if cache is not None and code is not None:
+                key = (method.__name__,) + cache.bar_key(code, df)
+                if uses_projection:
+                    cycle = ctx.cycle if ctx is not None and ctx.cycle is not None else current_cycle()
+                    key += (cycle.projection_factor,)
+                result = cache.get(key)
+                if result is not None:
+                    return result
+
+            if ctx is None and key is not None:
+                with cache.activated(code, df):
+                    result = method(self, df)
+            elif ctx is not None and ctx.matches(df):
+                with ctx.activate():
+                    result = method(self, df)
+            else:
+                with ctx.activate_cycle() if ctx is not None else contextlib.nullcontext():
+                    result = method(self, df)
+
+            if key is not None and result is not None:
+                cache.put(key, result)
+            return result
+        return wrapper
+    return decorator
+
+
 class TechnicalAnalyst:
     """
     확장된 기술적 분석기
@@ -74,8 +244,12 @@ class TechnicalAnalyst:
     - 캔들 패턴: Hammer, Engulfing, Doji, Morning/Evening Star
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, cache: AnalysisCache = None):
+        """
+        Args:
+            cache: 분석 결과 캐시 (None 이면 전역 캐시, 분석 메서드는 code= 를 줄 때만 사용)
+        """
+        self.cache = cache if cache is not None else get_analysis_cache()
 
     def get_ohlcv(self, stock_code, days=365):
         """주가 데이터 수집"""
@@ -83,31 +257,14 @@ class TechnicalAnalyst:
         df = fdr.DataReader(stock_code, start_date)
         return df
 
-    def calculate_projected_volume(self, curr_vol):
+    def calculate_projected_volume(self, curr_vol, cycle=None):
         """
         장중 예상 거래량 계산 (시간 가중치 적용)
         - 장 초반(9~10시) 거래량 쏠림 보정 (0.7 계수)
         - 장 마감 후에는 실제 거래량 그대로 반환
+        - cycle(ScoringCycle) 없으면 활성 사이클/현재 시각 기준
         """
-        now = datetime.now()
-        market_open = now.replace(hour=9, minute=0, second=0, microsecond=0)
-        market_close = now.replace(hour=15, minute=30, second=0, microsecond=0)
-
-        if now < market_open:
-            return curr_vol  # 장 시작 전
-        if now >= market_close:
-            return curr_vol  # 장 마감 후
-
-        total_minutes = 390  # 6시간 30분
-        elapsed_minutes = max(1, (now - market_open).total_seconds() / 60)
-
-        # 장 초반 거래량 쏠림 보정
-        if elapsed_minutes < 60:
-            projection_factor = (total_minutes / elapsed_minutes) * 0.7
-        else:
-            projection_factor = total_minutes / elapsed_minutes
-
-        return int(curr_vol * projection_factor)
+        return (cycle or current_cycle()).project_volume(curr_vol)
 
     def analyze(self, df):
         """기본 분석 (기존 호환성 유지)"""
@@ -171,6 +328,7 @@ class TechnicalAnalyst:
 
         return score, reasons, details
 
+    @cached_analysis()
     def analyze_full(self, df):
         """
         전체 기술적 분석 (스크리닝용)
@@ -829,6 +987,7 @@ class TechnicalAnalyst:
             print(f"추천 매수가 계산 오류: {e}")
             return None
 
+    @cached_analysis()
     def analyze_trend_following(self, df):
         """
         추세 추종형(Trend Following) 분석 로직
@@ -1118,6 +1277,7 @@ class TechnicalAnalyst:
             print(f"추세 추종 분석 오류: {e}")
             return None
 
+    @cached_analysis(uses_projection=True)
     def analyze_trend_following_strict(self, df):
         """
         [변별력 강화판] 추세 추종 분석 로직
@@ -1339,6 +1499,7 @@ class TechnicalAnalyst:
             print(f"변별력 강화 분석 오류: {e}")
             return None
 
+    @cached_analysis()
     def get_quick_score(self, df):
         """빠른 스크리닝용 간소화된 점수 (속도 우선)
         Returns: dict with score, signals, indicators, close, volume, change_pct
@@ -0,0 +1,76 @@
+"""
+포트폴리오 알림 스윕 테스트
+
+테스트 항목:
+1. 여러 사용자가 보유한 같은 종목은 스윕당 1회만 분석
+2. 사용자별 매수가로 손실률 알림 판정 (수량 0 종목 제외)
+3. 포트폴리오 일괄 조회 (get_portfolios)
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+
+from database.db_manager import DatabaseManager
+from api.services import portfolio_alert, price_snapshot
+from api.services.price_snapshot import SharedAnalysisCache
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(tmp_path / "alert_test.db")
+    for i in range(3):
+        db.create_user(f"u{i}@example.com", f"user{i}", "hash", f"사용자{i}")
+    with db.get_connection() as conn:
+        conn.execute("UPDATE users SET push_alerts_enabled = 1")
+        conn.commit()
+    return db
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(price_snapshot, '_analysis_cache', SharedAnalysisCache(ttl=60))
+    monkeypatch.setattr(portfolio_alert, '_last_status', {})
+
+
+def test_sweep_analyzes_each_code_once(db, monkeypatch):
+    with db.get_connection() as conn:
+        users = [row['id'] for row in conn.execute("SELECT id FROM users ORDER BY id").fetchall()]
+    db.add_portfolio_item(users[0], '005930', '삼성전자', 10000, 1)
+    db.add_portfolio_item(users[0], '000660', 'SK하이닉스', 10000, 1)
+    db.add_portfolio_item(users[1], '005930', '삼성전자', 9000, 3)
+    db.add_portfolio_item(users[2], '005930', '삼성전자', 12000, 2)
+    db.add_portfolio_item(users[2], '035420', 'NAVER', 10000, 0)   # 수량 0 → 제외
+
+    calls = []
+
+    def analyze(code):
+        calls.append(code)
+        return {'current_price': 10500, 'opinion': '관망', 'score': 55}
+
+    sent = []
+    monkeypatch.setattr(portfolio_alert, 'DatabaseManager', lambda: db)
+    monkeypatch.setattr(portfolio_alert, 'analyze_stock_for_alert', analyze)
+    monkeypatch.setattr(portfolio_alert, 'send_push_to_user',
+                        lambda db, user_id, title, body, url=None, history=None: sent.append((user_id, title)) or 1)
+
+    portfolio_alert.check_portfolio_alerts()
+
+    assert sorted(calls) == ['000660', '005930']
+    # 매수가 12000 → 10500 (-12.5%) 인 사용자만 손실률 알림
+    assert sent == [(users[2], '삼성전자 - 손실률 -5% 돌파')]
+    assert set(portfolio_alert._last_status) == set(users)
+    assert '035420' not in portfolio_alert._last_status[users[2]]
+
+
+def test_get_portfolios(db):
+    db.add_portfolio_item(1, '005930', '삼성전자', 10000, 1)
+    db.add_portfolio_item(1, '000660', 'SK하이닉스', 10000, 1)
+    db.add_portfolio_item(2, '005930', '삼성전자', 9000, 3)
+
+    portfolios = db.get_portfolios([1, 2, 3])
+    assert [item['stock_code'] for item in portfolios[1]] == ['005930', '000660']
+    assert portfolios[1] == db.get_portfolio(1)
+    assert portfolios[3] == []
@@ -0,0 +1,135 @@
+"""
+PriceSnapshotService / SharedAnalysisCache 테스트
+
+테스트 항목:
+1. 조회 우선순위 (실시간 캐시 → price_cache → KIS → 종가)
+2. price_cache 나이 제한, price_cache 값은 실시간 캐시/스트림에 넣지 않음
+3. 같은 종목 분석은 1회만 계산 (캐시/동시 요청 공유)
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+
+realtime = pytest.importorskip("api.routers.realtime")
+
+from database.db_manager import DatabaseManager
+from api.services import price_snapshot
+from api.services.price_snapshot import PriceSnapshotService, SharedAnalysisCache
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseManager(tmp_path / "snapshot_test.db")
+
+
+@pytest.fixture(autouse=True)
+def clear_realtime_cache():
+    realtime._realtime_cache.clear()
+    yield
+    realtime._realtime_cache.clear()
+
+
+class FakeKIS:
+    def __init__(self, prices):
+        self.prices = prices
+        self.calls = []
+
+    def get_multiple_prices(self, codes, max_workers=10):
+        self.calls.append(list(codes))
+        return [{'stock_code': c, 'current_price': self.prices[c]} for c in codes if c in self.prices]
+
+
+def test_lookup_order(db, monkeypatch):
+    realtime.set_realtime_cache('000001', {'stock_code': '000001', 'current_price': 100})
+    db.bulk_upsert_price_cache([{'stock_code': '000002', 'current_price': 200}])
+    kis = FakeKIS({'000003': 300})
+    monkeypatch.setattr(realtime, 'get_kis', lambda: kis)
+    monkeypatch.setattr(price_snapshot, '_ohlcv_close', lambda code: 400 if code == '000004' else None)
+
+    prices = PriceSnapshotService(db).get_price_map(['000001', '000002', '000003', '000004', '000005', '000001'])
+
+    assert prices == {'000001': 100, '000002': 200, '000003': 300, '000004': 400, '000005': None}
+    # KIS 는 캐시 미스 종목만 한 번에 조회
+    assert kis.calls == [['000003', '000004', '000005']]
+    # 조회 결과는 실시간 캐시에 채워짐
+    assert realtime.get_cached_realtime('000003')['current_price'] == 300
+    db.flush_price_cache()
+
+
+def test_stale_price_cache_skipped(db, monkeypatch):
+    db.bulk_upsert_price_cache([{'stock_code': '000002', 'current_price': 200}])
+    with db.get_connection() as conn:
+        conn.execute("UPDATE price_cache SET updated_at = datetime('now', '-1 day')")
+        conn.commit()
+
+    assert db.get_cached_prices(['000002'], max_age_seconds=600) == []
+    assert len(db.get_cached_prices(['000002'], max_age_seconds=2 * 86400)) == 1
+
+    monkeypatch.setattr(price_snapshot, '_is_market_hours', lambda: True)
+    monkeypatch.setattr(price_snapshot, '_ohlcv_close', lambda code: 250)
+    assert PriceSnapshotService(db, use_kis=False).get_price_map(['000002']) == {'000002': 250}
+
+
+def test_price_cache_not_published_as_realtime(db, monkeypatch):
+    from api.services import price_stream
+
+    published = []
+
+    class RecordingHub:
+        def publish(self, code, data):
+            published.append(code)
+
+    monkeypatch.setattr(price_stream, '_price_stream', RecordingHub())
+    db.bulk_upsert_price_cache([{'stock_code': '000002', 'current_price': 200}])
+    with db.get_connection() as conn:
+        conn.execute("UPDATE price_cache SET updated_at = datetime('now', '-10 minutes')")
+        conn.commit()
+    monkeypatch.setattr(price_snapshot, '_is_market_hours', lambda: True)
+
+    assert PriceSnapshotService(db, use_kis=False).get_price_map(['000002']) == {'000002': 200}
+    assert realtime.get_cached_realtime('000002') is None
+    assert published == []
+
+
+def test_analysis_shared_across_requests():
+    cache = SharedAnalysisCache(ttl=60)
+    calls = []
+    gate = threading.Event()
+
+    def analyze(code):
+        calls.append(code)
+        gate.wait(1)
+        return {'score': len(code)}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_many('t', ['A', 'BB'], analyze)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert sorted(calls) == ['A', 'BB']
+    assert all(r == {'A': {'score': 1}, 'BB': {'score': 2}} for r in results)
+
+    # 완료 후에는 캐시 적중
+    assert cache.get_many('t', ['A'], analyze) == {'A': {'score': 1}}
+    assert sorted(calls) == ['A', 'BB']
+    assert cache.stats()['hits'] >= 1
+
+
+def test_analysis_failure_not_cached():
+    cache = SharedAnalysisCache()
+    outcomes = iter([None, {'ok': True}])
+
+    assert cache.get_many('t', ['A'], lambda c: next(outcomes)) == {'A': None}
+    assert cache.get_many('t', ['A'], lambda c: next(outcomes)) == {'A': {'ok': True}}
@@ -0,0 +1,108 @@
+"""
+PriceStreamHub 테스트
+
+테스트 항목:
+1. 변경 필드만 diff 로 전송 + 종목별 병합
+2. 구독 종목만 전달 / 최초 구독 시 전체 필드
+3. 여러 연결이 하나의 업스트림 조회를 공유
+"""
+
+import asyncio
+
+import pytest
+
+from api.services import price_stream
+from api.services.price_stream import PriceStreamHub
+
+
+@pytest.fixture(autouse=True)
+def regular_hours(monkeypatch):
+    """장 시작 전 등락률 0 처리 비활성화 (시간대 무관하게 테스트)"""
+    monkeypatch.setattr(price_stream, '_normalize',
+                        lambda data: {k: data[k] for k in price_stream.PRICE_FIELDS if data.get(k) is not None})
+
+
+def price(code, current, volume=100):
+    return {'stock_code': code, 'current_price': current, 'volume': volume, 'change': 0}
+
+
+def test_diff_and_coalesce():
+    async def scenario():
+        hub = PriceStreamHub(fetch=lambda codes: None, min_interval=60)
+        client = hub.open()
+        hub.subscribe(client, ['000001'])
+
+        hub.publish('000001', price('000001', 100))
+        hub.publish('000001', price('000001', 101))
+        hub.publish('000001', price('000001', 102, volume=200))
+        hub.flush()
+        first = await hub.next_message(client, timeout=1)
+
+        hub.publish('000001', price('000001', 102, volume=300))
+        hub.publish('000001', price('000001', 102, volume=300))  # 변화 없음
+        hub.flush()
+        second = await hub.next_message(client, timeout=1)
+
+        hub.close(client)
+        return hub, first, second
+
+    hub, first, second = asyncio.run(scenario())
+    assert first['data'] == {'000001': {'current_price': 102, 'volume': 200, 'change': 0}}
+    assert second['data'] == {'000001': {'volume': 300}}
+    assert hub.stats()['coalesced'] == 2
+
+
+def test_subscription_filter_and_snapshot():
+    async def scenario():
+        hub = PriceStreamHub(fetch=lambda codes: None, min_interval=60)
+        hub.publish('000001', price('000001', 100))
+        hub.publish('000002', price('000002', 200))
+
+        a, b = hub.open(), hub.open()
+        hub.subscribe(a, ['000001'])
+        hub.subscribe(b, ['000002'])
+        snapshot_a = await hub.next_message(a, timeout=1)
+        await hub.next_message(b, timeout=1)
+
+        hub.publish('000002', price('000002', 201))
+        hub.flush()
+        nothing_for_a = await hub.next_message(a, timeout=0.05)
+        update_b = await hub.next_message(b, timeout=1)
+
+        hub.unsubscribe(b, ['000002'])
+        codes_after = hub.subscribed_codes
+        hub.close(a)
+        hub.close(b)
+        return snapshot_a, nothing_for_a, update_b, codes_after
+
+    snapshot_a, nothing_for_a, update_b, codes_after = asyncio.run(scenario())
+    assert snapshot_a['data'] == {'000001': {'current_price': 100, 'volume': 100, 'change': 0}}
+    assert nothing_for_a is None
+    assert update_b['data'] == {'000002': {'current_price': 201}}
+    assert codes_after == ['000001']
+
+
+def test_single_upstream_for_many_clients():
+    calls = []
+
+    async def scenario():
+        def fetch(codes):
+            calls.append(sorted(codes))
+            hub.publish_many(price(c, 1000) for c in codes)
+
+        hub = PriceStreamHub(fetch=fetch, poll_interval=60, min_interval=0.01)
+        clients = [hub.open() for _ in range(5)]
+        for i, client in enumerate(clients):
+            hub.subscribe(client, ['000001', f'00000{i + 2}'])
+
+        messages = [await hub.next_message(c, timeout=2) for c in clients]
+        for client in clients:
+            hub.close(client)
+        await asyncio.sleep(0.05)
+        return hub, messages
+
+    hub, messages = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert calls[0] == ['000001', '000002', '000003', '000004', '000005', '000006']
+    assert all(set(m['data']) == {'000001', f'00000{i + 2}'} for i, m in enumerate(messages))
+    assert hub.stats()['clients'] == 0
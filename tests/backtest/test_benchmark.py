@@ -0,0 +1,82 @@
+"""
+성능 벤치마크 (benchmark_backtest) 테스트
+
+테스트 항목:
+1. 합성 유니버스는 시드가 같으면 동일
+2. 로컬 fdr 스텁은 "오늘" 기준 조회 구간을 마지막 거래일 기준으로 자름
+3. 항목 실행 결과 / 리포트 비교 (회귀 판정)
+4. 기준에 있는데 빠졌거나 실패한 항목은 회귀
+"""
+
+import pandas as pd
+
+from benchmark_backtest import (
+    BenchContext,
+    LocalDataReader,
+    benchmark_cases,
+    compare_reports,
+    make_universe,
+    run_benchmarks,
+    select_cases,
+)
+
+
+def test_universe_is_deterministic():
+    frames_a, listing_a = make_universe(n_tickers=5, years=1, seed=7)
+    frames_b, listing_b = make_universe(n_tickers=5, years=1, seed=7)
+    for code in frames_a:
+        pd.testing.assert_frame_equal(frames_a[code], frames_b[code])
+    pd.testing.assert_frame_equal(listing_a, listing_b)
+
+    df = frames_a[listing_a['Code'].iloc[0]]
+    assert len(df) == 250
+    assert (df['High'] >= df[['Open', 'Close']].max(axis=1)).all()
+    assert (df['Low'] <= df[['Open', 'Close']].min(axis=1)).all()
+
+
+def test_local_reader_anchors_to_last_day():
+    frames, listing = make_universe(n_tickers=2, years=1, seed=1)
+    reader = LocalDataReader(frames, listing)
+    code = listing['Code'].iloc[0]
+
+    start = pd.Timestamp.now().normalize() - pd.Timedelta(days=30)
+    df = reader.DataReader(code, start.strftime('%Y-%m-%d'))
+    last = frames[code].index[-1]
+    assert df.index[-1] == last
+    assert df.index[0] >= last - pd.Timedelta(days=30)
+    assert reader.DataReader('999999').empty
+    assert len(reader.StockListing('KRX')) == 2
+
+
+def test_run_and_compare():
+    frames, listing = make_universe(n_tickers=4, years=1, seed=3)
+    ctx = BenchContext(frames, listing, sample=4, workers=2)
+    cases = select_cases(benchmark_cases(), ['indicators', 'score_v2'])
+    assert list(cases) == ['indicators', 'score_v2']
+
+    results = run_benchmarks(ctx, cases, verbose=False)
+    assert results['indicators']['items'] == 4
+    assert results['score_v2']['over_budget'] is False
+
+    base = {'cases': {'indicators': {'per_item_ms': 10.0}, 'score_v2': {'per_item_ms': 10.0}}}
+    current = {'cases': {'indicators': {'per_item_ms': 11.0}, 'score_v2': {'per_item_ms': 15.0},
+                         'screen_full': {'per_item_ms': 1.0}}}
+    rows = {row['case']: row for row in compare_reports(base, current, tolerance=0.2)}
+    assert set(rows) == {'indicators', 'score_v2'}
+    assert not rows['indicators']['regression']
+    assert rows['score_v2']['regression'] and rows['score_v2']['ratio'] == 1.5
+
+
+def test_missing_or_failed_cases_are_regressions():
+    base = {'cases': {'indicators': {'per_item_ms': 10.0}, 'score_v2': {'per_item_ms': 10.0},
+                      'screen_full': {'per_item_ms': 10.0}}}
+    current = {'cases': {'indicators': {'per_item_ms': 10.0}, 'score_v2': {'error': 'KeyError: x'}}}
+
+    rows = {row['case']: row for row in compare_reports(base, current)}
+    assert not rows['indicators']['regression']
+    assert rows['score_v2']['regression'] and rows['score_v2']['error'] == 'KeyError: x'
+    assert rows['screen_full']['regression'] and rows['screen_full']['current'] is None
+
+    # --cases 로 일부만 실행한 경우 선택 항목만 비교
+    rows = compare_reports(base, current, cases=['indicators'])
+    assert [row['case'] for row in rows] == ['indicators']
@@ -0,0 +1,164 @@
+"""
+통합 백테스트 엔진 테스트
+
+테스트 항목:
+1. 일괄 청산 판정 = 스윙 백테스트 일별 루프 (목표/손절/트레일링/조기/시간)
+2. 다음날 시가 진입, 갭상승 생략, TOP N/금액 필터
+3. 전략 설정 → 청산 규칙 변환
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import (
+    ExitRules,
+    PanelBacktest,
+    PricePanel,
+    StrategyAdapter,
+    evaluate_exit,
+    evaluate_exits,
+)
+
+
+def _reference_exit(entry, target, stop, high, low, close, trigger=None, early_exit_day=None):
+    """backtest_swing_v7 의 일별 청산 루프"""
+    trailing_active = False
+    for offset in range(1, len(high) + 1):
+        i = offset - 1
+        if trigger is not None and high[i] >= trigger and not trailing_active:
+            trailing_active = True
+            stop = max(stop, entry)
+        if high[i] >= target:
+            return offset, target, 'TARGET_HIT'
+        if low[i] <= stop:
+            return offset, stop, 'TRAILING_STOP' if trailing_active else 'STOP_HIT'
+        if early_exit_day is not None and offset >= early_exit_day and close[i] < entry:
+            return offset, close[i], 'EARLY_EXIT'
+        if offset == len(high):
+            return offset, close[i], 'TIME_EXIT'
+    return 0, None, None
+
+
+def _frame(prices, start='2025-01-01'):
+    prices = np.asarray(prices, dtype=float)
+    idx = pd.bdate_range(start, periods=len(prices))
+    return pd.DataFrame({
+        'Open': prices, 'High': prices * 1.01, 'Low': prices * 0.99,
+        'Close': prices, 'Volume': np.full(len(prices), 1000.0),
+    }, index=idx)
+
+
+class _FixedAdapter:
+    """고정 신호 어댑터"""
+
+    def __init__(self, signals, exit_rules=None):
+        self._signals = pd.DataFrame(signals)
+        self.exit_rules = exit_rules or ExitRules()
+        self.name = 'fixed'
+
+    def signals(self, panel, start=None, end=None):
+        return self._signals
+
+
+class TestEvaluateExits:
+    """일괄 청산 판정"""
+
+    @pytest.mark.parametrize("trailing,early", [(None, None), (0.5, 2)])
+    def test_matches_daily_loop(self, trailing, early):
+        rng = np.random.default_rng(7)
+        n, h = 300, 3
+        entry = rng.uniform(9000, 11000, n)
+        atr = entry * rng.uniform(0.01, 0.05, n)
+        close = entry[:, None] * np.cumprod(1 + rng.normal(0, 0.03, (n, h)), axis=1)
+        high = close * rng.uniform(1.0, 1.04, (n, h))
+        low = close * rng.uniform(0.96, 1.0, (n, h))
+        rules = ExitRules(trailing_start_atr=trailing, early_exit_day=early)
+        target, stop, trigger = rules.levels(entry, atr)
+
+        # 일부 거래는 보유일 데이터가 부족 (상장폐지/기간 끝)
+        length = rng.integers(1, h + 1, n)
+        valid = np.arange(h)[None, :] < length[:, None]
+
+        out = evaluate_exits(entry, target, stop, high, low, close, valid, trigger, early)
+        for i in range(n):
+            L = length[i]
+            exp = _reference_exit(entry[i], target[i], stop[i], high[i, :L], low[i, :L], close[i, :L],
+                                  None if trigger is None else trigger[i], early)
+            assert out['hold_days'][i] == exp[0]
+            assert out['exit_price'][i] == pytest.approx(exp[1])
+            assert out['exit_reason'][i] == exp[2]
+
+    def test_single_trade(self):
+        hold_days, price, reason = evaluate_exit(100, 110, 95, [105, 112], [99, 104], [104, 111])
+        assert (hold_days, price, reason) == (2, 110, 'TARGET_HIT')
+
+    def test_no_holding_data(self):
+        assert evaluate_exit(100, 110, 95, [], [], []) == (0, None, None)
+
+
+class TestPanelBacktest:
+    """신호 → 진입 → 청산"""
+
+    def test_next_day_open_entry(self):
+        panel = PricePanel({'000010': _frame([100, 102, 104, 106, 108, 110])})
+        signal_date = panel.frames['000010'].index[1]
+        adapter = _FixedAdapter([{'date': signal_date, 'code': '000010', 'score': 80, 'atr': 1.0, 'priority': 80}],
+                                ExitRules(target_atr_mult=3.0, stop_atr_mult=1.0, time_stop_days=3))
+
+        result = PanelBacktest(panel, top_n=5, allocation=1000).run(adapter)
+        trade = result.trades.iloc[0]
+        assert trade['entry_date'] == panel.frames['000010'].index[2]
+        assert trade['entry_price'] == 104
+        assert trade['prev_close'] == 102
+        assert trade['shares'] == 1000 // 104
+        assert trade['exit_reason'] == 'TARGET_HIT'  # 다음날 고가 106*1.01 >= 107
+        assert trade['hold_days'] == 1
+
+    def test_gap_skip_and_selection(self):
+        frames = {
+            '000010': _frame([100, 100, 120, 121, 122]),   # 20% 갭상승 → 생략
+            '000020': _frame([100, 100, 101, 102, 103]),
+            '000030': _frame([5000, 5000, 5000, 5000, 5000]),  # 1주도 못 삼
+            '000040': _frame([100, 100, 100, 100, 100]),
+        }
+        panel = PricePanel(frames)
+        date = frames['000010'].index[1]
+        adapter = _FixedAdapter(
+            [{'date': date, 'code': c, 'score': s, 'atr': 1.0, 'priority': s}
+             for c, s in [('000010', 90), ('000020', 80), ('000030', 95), ('000040', 70)]],
+            ExitRules(max_gap_pct=10.0),
+        )
+
+        result = PanelBacktest(panel, top_n=2, allocation=1000).run(adapter)
+        assert list(result.skipped['code']) == ['000010']
+        assert list(result.trades['code']) == ['000020']
+        assert result.trades.iloc[0]['rank'] == 2
+        assert result.summary()['skipped'] == 1
+
+    def test_result_serialization(self, tmp_path):
+        panel = PricePanel({'000010': _frame(np.linspace(100, 120, 10))})
+        dates = panel.frames['000010'].index
+        adapter = _FixedAdapter([{'date': d, 'code': '000010', 'score': 70, 'atr': 2.0, 'priority': 70}
+                                 for d in dates[:5]])
+        result = PanelBacktest(panel, allocation=10_000).run(adapter)
+        path = result.save(tmp_path / 'result.json')
+
+        import json
+        data = json.loads(path.read_text(encoding='utf-8'))
+        assert data['summary']['total_trades'] == len(result.trades) == 5
+        assert data['trades'][0]['signal_date'] == dates[0].strftime('%Y-%m-%d')
+
+
+class TestStrategyAdapter:
+    """전략 설정 → 청산 규칙"""
+
+    def test_exit_rules_from_strategy(self):
+        from trading.strategies.strategy_v2_trend import StrategyV2Trend
+        from trading.strategies.strategy_v8_bounce import StrategyV8Bounce
+
+        v2 = StrategyAdapter(StrategyV2Trend()).exit_rules
+        assert (v2.target_atr_mult, v2.stop_atr_mult, v2.time_stop_days, v2.trailing_start_atr) == (1.5, 0.8, 3, 0.5)
+
+        # V8 은 트레일링 미사용
+        assert StrategyAdapter(StrategyV8Bounce()).exit_rules.trailing_start_atr is None
@@ -0,0 +1,143 @@
+"""
+장중 스냅샷 리플레이 패널 테스트
+
+테스트 항목:
+1. pairs() = 연속 CSV 쌍 inner merge (analyze_all_pairs vs compare_two_csvs)
+2. detect_surge_candidates = Tier 1/2/3 행 판정 루프 (체결강도 포함)
+3. 미래 수익률 = 시점 오프셋 위치의 종가 (없는 종목/범위 밖은 NaN)
+4. load_replays 병렬 로드 = from_files
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import analyze_score_changes as asc
+from backtest.intraday_replay import SnapshotReplay, load_replays, load_snapshot
+
+
+def _write_day(directory, date_str='20260101', n_times=6, n_codes=30, seed=0, kis=False):
+    rng = np.random.default_rng(seed)
+    codes = [f"{i:06d}" for i in range(n_codes)]
+    signals = np.array(['VOLUME_EXPLOSION', 'BB_SQUEEZE', 'VOLUME_SURGE_3X,VCP_PATTERN', np.nan, 'RSI'], dtype=object)
+    files = []
+    for k in range(n_times):
+        t = 9 * 60 + 10 * k
+        picked = list(rng.choice(codes, n_codes - 4, replace=False))
+        n = len(picked)
+        df = pd.DataFrame({
+            'code': picked,
+            'name': 'n',
+            'v2': rng.integers(50, 95, n).astype(float),
+            'v4': rng.integers(30, 80, n),
+            'v5': rng.integers(30, 80, n),
+            'v3.5': rng.integers(20, 60, n),
+            'v8': rng.integers(0, 80, n),
+            'v9_prob': rng.integers(30, 80, n),
+            'close': rng.uniform(1000, 200000, n),
+            'volume': rng.integers(0, 2_000_000, n),
+            'change_pct': rng.normal(0, 2, n),
+            'signals': rng.choice(signals, n),
+        })
+        if kis:
+            df['buy_strength'] = rng.choice([0, 90, 105, 130], n)
+            df['foreign_net'] = rng.integers(-1000, 1000, n)
+        df.loc[rng.random(n) < 0.05, 'v2'] = np.nan
+        path = directory / f"{date_str}_{t // 60:02d}{t % 60:02d}.csv"
+        df.to_csv(path, index=False)
+        files.append(path)
+    return files
+
+
+def test_pairs_match_consecutive_merge(tmp_path, monkeypatch):
+    files = _write_day(tmp_path, kis=True)
+    monkeypatch.setattr(asc, 'SCORES_DIR', tmp_path)
+
+    results = asc.analyze_all_pairs('20260101')
+
+    assert len(results) == len(files) - 1
+    for r, prev_file, curr_file in zip(results, files[:-1], files[1:]):
+        expected = asc.compare_two_csvs(asc.load_csv(prev_file), asc.load_csv(curr_file))
+        assert (r['prev_time'], r['curr_time']) == (prev_file.stem[-4:], curr_file.stem[-4:])
+        pd.testing.assert_frame_equal(r['data'][expected.columns], expected, check_dtype=False)
+
+
+def _has_signal(signals, names):
+    return not pd.isna(signals) and any(name in signals for name in names)
+
+
+def _strength_below(row, cfg):
+    if not asc.HAS_KIS_DATA or 'buy_strength' not in row:
+        return False
+    strength = row.get('buy_strength', 0)
+    return 0 < strength < cfg.get('buy_strength_min', 0)
+
+
+def _row_tier(row):
+    """행 단위 기준 판정 (벡터 판정과 비교용)"""
+    cfg = asc.TIER_CONFIG['tier1']['conditions']
+    if not (row['v2'] < cfg['v2_min'] or row['v2_delta'] < cfg['v2_delta_min']
+            or not _has_signal(row.get('signals', ''), ('VOLUME_EXPLOSION', 'VOLUME_SURGE_3X'))
+            or row['v4'] < cfg['v4_min'] or row['close'] * row['volume'] < cfg['amount_min']
+            or _strength_below(row, cfg)):
+        return 'tier1'
+    cfg = asc.TIER_CONFIG['tier2']['conditions']
+    if not (row['v2'] < cfg['v2_min'] or row['v2_delta'] < cfg['v2_delta_min']
+            or row['volume_ratio'] < cfg['volume_ratio_min']
+            or (row['v3.5'] < cfg['v35_min'] and row['v5'] < cfg['v5_min'])
+            or _strength_below(row, cfg)):
+        return 'tier2'
+    cfg = asc.TIER_CONFIG['tier3']['conditions']
+    if not (row['v2'] < cfg['v2_min']
+            or (not _has_signal(row.get('signals', ''), ('BB_SQUEEZE', 'VCP_PATTERN'))
+                and row['v9_prob'] < cfg['v9_min'])):
+        return 'tier3'
+    return None
+
+
+@pytest.mark.parametrize('kis', [False, True])
+def test_surge_candidates_match_row_checks(tmp_path, monkeypatch, kis):
+    files = _write_day(tmp_path, n_codes=200, kis=kis)
+    monkeypatch.setattr(asc, 'SCORES_DIR', tmp_path)
+    monkeypatch.setattr(asc, 'HAS_KIS_DATA', False)
+    # 후보가 나오도록 거래대금 조건 완화
+    monkeypatch.setitem(asc.TIER_CONFIG['tier1']['conditions'], 'amount_min', 1_000_000)
+
+    for r in asc.analyze_all_pairs('20260101'):
+        merged = r['data']
+        expected = {'tier1': [], 'tier2': [], 'tier3': []}
+        for i, row in merged.iterrows():
+            tier = _row_tier(row)
+            if tier:
+                expected[tier].append(i)
+
+        candidates = asc.detect_surge_candidates(merged)
+        for tier_key, index in expected.items():
+            assert list(candidates[tier_key].index) == index
+
+
+def test_forward_returns(tmp_path):
+    files = _write_day(tmp_path, n_times=8)
+    frames = [load_snapshot(f) for f in files]
+    prepared = SnapshotReplay.from_files(files).candidates('20260101')
+
+    assert set(prepared['time']) == {f.stem[-4:] for f in files[1:-1]}
+    for _, row in prepared.sample(20, random_state=0).iterrows():
+        t = int(row['_t'])
+        for label, offset in [('10min', 1), ('30min', 3), ('60min', 6)]:
+            future = frames[t + offset] if t + offset < len(frames) else pd.DataFrame(columns=['code', 'close'])
+            price = future.loc[future['code'] == row['code'], 'close']
+            expected = (price.iloc[0] - row['close']) / row['close'] * 100 if len(price) else np.nan
+            np.testing.assert_allclose(row[f'return_{label}'], expected)
+
+
+def test_load_replays_matches_from_files(tmp_path):
+    by_date = {
+        '20260101': _write_day(tmp_path, '20260101', seed=1),
+        '20260102': _write_day(tmp_path, '20260102', seed=2),
+    }
+    replays = load_replays(by_date, max_workers=4)
+
+    for date_str, files in by_date.items():
+        expected = SnapshotReplay.from_files(files).candidates(date_str)
+        pd.testing.assert_frame_equal(replays[date_str].candidates(date_str), expected)
@@ -0,0 +1,103 @@
+"""
+장중 급등 감지 백테스트 벡터화 테스트
+
+테스트 항목:
+1. detect_signals = 종목별 Tier 1/2/3 행 판정 루프 (NaN, 시그널 문자열 포함)
+2. 10분/30분/장마감 수익률 (중복 종목은 첫 행 가격)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import backtest_intraday_signals as bis
+
+
+def _write_snapshots(tmp_path, n_times=8, n_codes=40, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = [f"{i:06d}" for i in range(n_codes)]
+    signals = np.array(['VOLUME_EXPLOSION', 'BB_SQUEEZE', 'VOLUME_SURGE_3X,VCP_PATTERN', np.nan, 'RSI'], dtype=object)
+    files = []
+    for k in range(n_times):
+        t = 9 * 60 + 10 * k
+        picked = list(rng.choice(codes, n_codes - 3, replace=False)) + [codes[0]]  # 중복 종목 포함
+        n = len(picked)
+        df = pd.DataFrame({
+            'code': picked,
+            'name': 'n',
+            'v2': rng.integers(50, 95, n).astype(float),
+            'v4': rng.integers(30, 80, n),
+            'v5': rng.integers(30, 80, n),
+            'v3': rng.integers(20, 60, n),
+            'v9_prob': rng.integers(30, 80, n),
+            'close': rng.uniform(1000, 200000, n),
+            'volume': rng.integers(0, 2_000_000, n),
+            'signals': rng.choice(signals, n),
+        })
+        df.loc[rng.random(n) < 0.05, 'v2'] = np.nan
+        path = tmp_path / f"20260101_{t // 60:02d}{t % 60:02d}.csv"
+        df.to_csv(path, index=False)
+        files.append(path)
+    return files
+
+
+def _has_signal(signals, names):
+    return not pd.isna(signals) and any(name in signals for name in names)
+
+
+def _row_tier(row, config):
+    """행 단위 기준 판정 (벡터 판정과 비교용)"""
+    cfg = config['tier1']
+    if not (row['v2'] < cfg['v2_min'] or row['v2_delta'] < cfg['v2_delta_min']
+            or not _has_signal(row.get('signals', ''), ('VOLUME_EXPLOSION', 'VOLUME_SURGE_3X'))
+            or row['v4'] < cfg['v4_min'] or row['close'] * row['volume'] < cfg['amount_min']):
+        return 'tier1'
+    cfg = config['tier2']
+    if not (row['v2'] < cfg['v2_min'] or row['v2_delta'] < cfg['v2_delta_min']
+            or row['volume_ratio'] < cfg['volume_ratio_min']
+            or (row['v3.5'] < cfg['v35_min'] and row['v5'] < cfg['v5_min'])):
+        return 'tier2'
+    cfg = config['tier3']
+    if not (row['v2'] < cfg['v2_min']
+            or (not _has_signal(row.get('signals', ''), ('BB_SQUEEZE', 'VCP_PATTERN'))
+                and row['v9_prob'] < cfg['v9_min'])):
+        return 'tier3'
+    return None
+
+
+def _reference_tiers(prepared, config):
+    return [_row_tier(row, config) for _, row in prepared.iterrows()]
+
+
+@pytest.mark.parametrize('v2_min,v2_delta_min', [(60, 5), (70, 8), (75, 12)])
+def test_detect_signals_matches_row_checks(tmp_path, v2_min, v2_delta_min):
+    files = _write_snapshots(tmp_path)
+    config = bis.build_tier_config(v2_min, v2_delta_min, 50)
+    prepared = bis.prepare_date('20260101', files)
+
+    expected = _reference_tiers(prepared, config)
+    detected = bis.detect_signals(prepared, config)
+
+    assert [r['tier'] for r in detected] == [t for t in expected if t is not None]
+    assert len(detected) > 0
+
+
+def test_future_returns(tmp_path):
+    files = _write_snapshots(tmp_path, n_times=5)
+    prepared = bis.prepare_date('20260101', files)
+    frames = [bis.load_csv(f) for f in files]
+
+    row = prepared[prepared['time'] == '0910'].iloc[0]
+    future = frames[2][frames[2]['code'] == row['code']]
+    eod = frames[-1][frames[-1]['code'] == row['code']]
+
+    expected_10 = (future.iloc[0]['close'] - row['close']) / row['close'] * 100 if not future.empty else np.nan
+    expected_eod = (eod.iloc[0]['close'] - row['close']) / row['close'] * 100 if not eod.empty else np.nan
+    np.testing.assert_allclose(row['return_10min'], expected_10)
+    np.testing.assert_allclose(row['return_eod'], expected_eod)
+    assert prepared['return_60min'].isna().all()  # 미래 6개 시점 없음
+
+
+def test_too_few_snapshots(tmp_path):
+    files = _write_snapshots(tmp_path, n_times=2)
+    assert bis.run_backtest_for_date('20260101', files, bis.build_tier_config(70, 8, 50)) == []
@@ -0,0 +1,186 @@
+"""
+점수 디스크 캐시 테스트
+
+테스트 항목:
+1. 저장 → 새 인스턴스에서 적중 (결과 동일, 재계산 없음), 미적중도 적중과 같은 타입 반환
+2. 스코어러 None 결과도 캐시
+3. 스코어러 소스 변경 시 해시 변경 (간접 의존 모듈/YAML 포함, 자동 무효화), prune
+4. 실제 스코어러 결과 = 캐시 결과
+5. 기준일이 같아도 조회 기간이 다르면 다른 키, 장 마감 전 오늘 봉은 저장 안 함
+"""
+
+import importlib
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import ScoreCache, scorer_hash
+from backtest import score_cache as score_cache_module
+
+
+def _make_ohlcv(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 10000 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.005, n)),
+        'High': close * 1.02,
+        'Low': close * 0.98,
+        'Close': close,
+        'Volume': rng.integers(100_000, 1_000_000, n).astype(float),
+    }, index=pd.bdate_range('2025-01-01', periods=n))
+
+
+class _Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, df):
+        self.calls += 1
+        return {'score': float(round(df['Close'].iloc[-1] % 100)), 'signals': ['A', 'B'],
+                'indicators': {'close': np.float64(df['Close'].iloc[-1])}}
+
+
+def _fake_scorer(df):
+    return {'score': 1}
+
+
+def _fake_scorer_none(df):
+    return None
+
+
+def test_roundtrip_across_instances(tmp_path):
+    df = _make_ohlcv()
+    scorer = _Counter()
+
+    cache = ScoreCache(tmp_path)
+    first = cache.get_or_compute('vx', _fake_scorer, '000001', df, compute=lambda: scorer(df))
+    assert cache.flush() == 1
+    assert scorer.calls == 1
+
+    reloaded = ScoreCache(tmp_path)
+    second = reloaded.get_or_compute('vx', _fake_scorer, '000001', df, compute=lambda: scorer(df))
+    assert scorer.calls == 1
+    assert second['score'] == first['score']
+    assert second['signals'] == ['A', 'B']
+    assert second['indicators']['close'] == pytest.approx(float(df['Close'].iloc[-1]))
+    assert reloaded.stats()['hits'] == 1
+    # 미적중(계산 직후)도 적중과 같은 JSON 왕복 결과
+    assert first == second
+    assert type(first['indicators']['close']) is float
+
+    # 다른 날짜/종목은 미적중
+    assert reloaded.lookup(ScoreCache.namespace('vx', _fake_scorer), '000001', df.iloc[:-1]) == (False, None)
+    assert reloaded.lookup(ScoreCache.namespace('vx', _fake_scorer), '000002', df) == (False, None)
+
+
+def test_none_result_cached(tmp_path):
+    df = _make_ohlcv()
+    cache = ScoreCache(tmp_path)
+    assert cache.get_or_compute('vn', _fake_scorer_none, '000001', df) is None
+    cache.flush()
+
+    reloaded = ScoreCache(tmp_path)
+    hit, result = reloaded.lookup(ScoreCache.namespace('vn', _fake_scorer_none), '000001', df)
+    assert hit and result is None
+
+
+def test_partition_merge(tmp_path):
+    df = _make_ohlcv()
+    cache = ScoreCache(tmp_path)
+    cache.get_or_compute('vm', _fake_scorer, '000001', df)
+    cache.release()
+    cache.get_or_compute('vm', _fake_scorer, '000002', df)
+    cache.release()
+
+    reloaded = ScoreCache(tmp_path)
+    namespace = ScoreCache.namespace('vm', _fake_scorer)
+    assert reloaded.lookup(namespace, '000001', df)[0]
+    assert reloaded.lookup(namespace, '000002', df)[0]
+
+
+def test_source_change_invalidates(tmp_path, monkeypatch):
+    package = tmp_path / 'fake_scoring_pkg'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'helpers.py').write_text('from .base import BASE\nWEIGHT = BASE\n')
+    (package / 'base.py').write_text('BASE = 1\n')
+    (package / 'rules.yaml').write_text('weight: 1\n')
+    (package / 'scorer.py').write_text(
+        'from .helpers import WEIGHT\n\ndef score(df):\n    return {"score": WEIGHT}\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(score_cache_module, '_hash_cache', {})
+
+    module = importlib.import_module('fake_scoring_pkg.scorer')
+    before = scorer_hash(module.score)
+
+    # 간접 의존 모듈(helpers → base), YAML 설정 변경도 반영
+    hashes = {before}
+    for path, text in [('base.py', 'BASE = 2\n'), ('rules.yaml', 'weight: 2\n')]:
+        (package / path).write_text(text)
+        score_cache_module._hash_cache.clear()
+        hashes.add(scorer_hash(module.score))
+    assert len(hashes) == 3
+    after = scorer_hash(module.score)
+
+    cache = ScoreCache(tmp_path / 'cache')
+    (tmp_path / 'cache' / f'vz-{before}').mkdir(parents=True)
+    (tmp_path / 'cache' / f'vz-{after}').mkdir(parents=True)
+    assert cache.prune('vz', module.score) == 1
+    assert (tmp_path / 'cache' / f'vz-{after}').exists()
+
+    for name in ['fake_scoring_pkg.scorer', 'fake_scoring_pkg.helpers', 'fake_scoring_pkg.base', 'fake_scoring_pkg']:
+        sys.modules.pop(name, None)
+
+
+def test_cached_scorer_matches_direct(tmp_path):
+    from scoring import calculate_score_v2
+
+    df = _make_ohlcv(200, seed=3)
+    cache = ScoreCache(tmp_path)
+    cached = cache.cached_scorer('v2', calculate_score_v2)
+
+    direct = calculate_score_v2(df)
+    first = cached(df, '000001')
+    cache.release()
+    second = cached(df, '000001')
+
+    assert first['score'] == direct['score'] == second['score']
+    assert second['signals'] == list(direct['signals'])
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 50.0}
+
+
+def test_window_in_key(tmp_path):
+    full = _make_ohlcv(200, seed=4)
+    short = full.iloc[-150:]
+    scorer = _Counter()
+
+    cache = ScoreCache(tmp_path)
+    cache.get_or_compute('vw', _fake_scorer, '000001', full, compute=lambda: scorer(full))
+    cache.get_or_compute('vw', _fake_scorer, '000001', short, compute=lambda: scorer(short))
+    assert scorer.calls == 2  # 기준일은 같지만 조회 기간이 다름
+    cache.get_or_compute('vw', _fake_scorer, '000001', short.copy(), compute=lambda: scorer(short))
+    assert scorer.calls == 2
+
+    revised = short.copy()
+    revised.iloc[0, revised.columns.get_loc('Close')] += 1
+    assert ScoreCache.window_key(revised) != ScoreCache.window_key(short)
+
+
+def test_forming_bar_not_stored(tmp_path, monkeypatch):
+    now = datetime.now()
+    df = _make_ohlcv()
+    df.index = pd.bdate_range(end=now.date(), periods=len(df))
+    scorer = _Counter()
+    cache = ScoreCache(tmp_path)
+
+    monkeypatch.setattr(ScoreCache, 'is_forming', staticmethod(lambda date: True))
+    cache.get_or_compute('vf', _fake_scorer, '000001', df, compute=lambda: scorer(df))
+    cache.get_or_compute('vf', _fake_scorer, '000001', df, compute=lambda: scorer(df))
+    assert scorer.calls == 2 and cache.flush() == 0
+
+    monkeypatch.undo()
+    assert ScoreCache.is_forming(df.index[-1]) == (now.time() < datetime.strptime('15:30', '%H:%M').time())
+    assert not ScoreCache.is_forming(df.index[-2])
@@ -0,0 +1,127 @@
+"""
+파라미터 스윕 실행기 테스트
+
+테스트 항목:
+1. 그리드 전개, 순차/병렬 결과 일치 (그리드 순서 유지)
+2. 체크포인트 이어하기 (완료 포인트 재실행 없음, 실패 포인트 재시도)
+   입력 지문이 바뀌면 체크포인트 폐기
+3. 워커 캐시(memoize) 재사용 + group_by 묶음
+"""
+
+import pandas as pd
+import pytest
+
+from backtest import SweepRunner, expand_grid, file_fingerprint, memoize
+
+
+def _evaluate(params, shared):
+    """a*b + 오프셋 (모듈 최상위 함수: 프로세스 풀 전달용)"""
+    base = memoize(('base', params['a']), lambda: shared['offset'] + params['a'] * 10)
+    return {'value': base + params['b']}
+
+
+def _evaluate_counting(params, shared):
+    """memoize 계산 횟수를 결과에 기록"""
+    calls = memoize('calls', lambda: {'n': 0})
+    memoize(('signals', params['a']), lambda: calls.__setitem__('n', calls['n'] + 1))
+    return {'computed': calls['n']}
+
+
+def _evaluate_failing(params, shared):
+    if params['a'] == shared['fail_on']:
+        raise ValueError('bad point')
+    return {'value': params['a']}
+
+
+GRID = {'a': [1, 2, 3], 'b': [0, 1]}
+
+
+def test_expand_grid():
+    points = expand_grid(GRID)
+    assert len(points) == 6
+    assert points[0] == {'a': 1, 'b': 0}
+    assert points[-1] == {'a': 3, 'b': 1}
+
+
+def test_serial_and_parallel_match():
+    serial = SweepRunner(_evaluate, GRID, shared={'offset': 100}, max_workers=1).run()
+    parallel = SweepRunner(_evaluate, GRID, shared={'offset': 100}, max_workers=3).run()
+
+    assert list(serial['value']) == [110, 111, 120, 121, 130, 131]
+    pd.testing.assert_frame_equal(serial[['a', 'b', 'value']], parallel[['a', 'b', 'value']])
+    assert serial['_error'].isna().all()
+
+
+def test_best():
+    table = SweepRunner(_evaluate, GRID, shared={'offset': 0}, max_workers=1).run()
+    assert SweepRunner.best(table, 'value') == {'a': 3, 'b': 1, 'value': 31}
+    assert SweepRunner.best(table, 'value', maximize=False)['value'] == 10
+    assert SweepRunner.best(table, 'missing') is None
+
+
+def test_checkpoint_resume(tmp_path):
+    checkpoint = tmp_path / 'sweep.jsonl'
+    first = SweepRunner(_evaluate, {'a': [1, 2], 'b': [0]}, shared={'offset': 0}, checkpoint=checkpoint)
+    first.run()
+    assert checkpoint.read_text().count('\n') == 2
+
+    # 그리드 확장 → 새 포인트만 실행, 결과표는 전체
+    second = SweepRunner(_evaluate, {'a': [1, 2, 3], 'b': [0]}, shared={'offset': 0}, checkpoint=checkpoint)
+    table = second.run()
+    assert checkpoint.read_text().count('\n') == 3
+    assert list(table['value']) == [10, 20, 30]
+    assert checkpoint.with_suffix('.csv').exists()
+
+    # resume=False → 체크포인트 새로 작성
+    second.run(resume=False)
+    assert checkpoint.read_text().count('\n') == 3
+
+
+def test_failed_points_recorded_and_retried(tmp_path):
+    checkpoint = tmp_path / 'sweep.jsonl'
+    grid = {'a': [1, 2, 3]}
+    table = SweepRunner(_evaluate_failing, grid, shared={'fail_on': 2}, checkpoint=checkpoint,
+                        max_workers=1).run()
+    assert table.loc[table['a'] == 2, '_error'].iloc[0].startswith('ValueError')
+    assert SweepRunner.best(table, 'value')['value'] == 3
+
+    # 실패 포인트만 재실행
+    table = SweepRunner(_evaluate_failing, grid, shared={'fail_on': None}, checkpoint=checkpoint,
+                        max_workers=1).run()
+    assert table['_error'].isna().all()
+    assert checkpoint.read_text().count('\n') == 4
+
+
+def test_fingerprint_mismatch_discards_checkpoint(tmp_path):
+    data = tmp_path / 'model.pkl'
+    data.write_bytes(b'v1')
+    checkpoint = tmp_path / 'sweep.jsonl'
+    grid = {'a': [1, 2], 'b': [0]}
+
+    SweepRunner(_evaluate, grid, shared={'offset': 0}, checkpoint=checkpoint,
+                fingerprint=file_fingerprint([data])).run()
+    assert checkpoint.read_text().count('\n') == 3   # 지문 + 포인트 2개
+
+    # 입력 그대로 → 이어하기 (결과 재사용)
+    table = SweepRunner(_evaluate, grid, shared={'offset': 100}, checkpoint=checkpoint,
+                        fingerprint=file_fingerprint([data])).run()
+    assert list(table['value']) == [10, 20]
+
+    # 입력 변경 → 폐기 후 재계산
+    data.write_bytes(b'version 2')
+    table = SweepRunner(_evaluate, grid, shared={'offset': 100}, checkpoint=checkpoint,
+                        fingerprint=file_fingerprint([data])).run()
+    assert list(table['value']) == [110, 120]
+    assert checkpoint.read_text().count('\n') == 3
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_group_by_reuses_worker_cache(max_workers):
+    grid = {'a': [1, 2], 'b': [0, 1, 2]}
+    table = SweepRunner(_evaluate_counting, grid, max_workers=max_workers, group_by=['a']).run()
+
+    # 같은 a 의 포인트는 같은 작업 → 신호 계산은 a 값마다 1번
+    for _, group in table.groupby('a'):
+        assert group['computed'].nunique() == 1
+    if max_workers == 1:
+        assert list(table['computed']) == [1, 1, 1, 2, 2, 2]
@@ -0,0 +1,3 @@
+"""
+데이터베이스 테스트 모듈
+"""
@@ -0,0 +1,142 @@
+"""
+SQLitePool 테스트
+
+테스트 항목:
+1. 스레드별 커넥션 재사용
+2. WAL / PRAGMA 적용
+3. commit / rollback 동작 (TradeLogger / DatabaseManager 방식)
+4. 중첩 컨텍스트 처리
+"""
+
+import threading
+
+import pytest
+
+from database.connection_pool import SQLitePool
+
+
+@pytest.fixture
+def pool():
+    """테스트용 커넥션 풀"""
+    p = SQLitePool()
+    yield p
+    p.close_all()
+
+
+@pytest.fixture
+def db_path(tmp_path, pool):
+    """테이블 1개가 있는 임시 DB"""
+    path = tmp_path / "pool_test.db"
+    with pool.connection(path) as conn:
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+    return path
+
+
+def _count(pool, path):
+    with pool.connection(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+
+
+class TestConnectionReuse:
+    """커넥션 재사용 테스트"""
+
+    def test_same_thread_reuses_connection(self, pool, db_path):
+        """같은 스레드는 같은 커넥션"""
+        with pool.connection(db_path) as c1:
+            pass
+        with pool.connection(db_path) as c2:
+            pass
+        assert c1 is c2
+        assert pool.stats()["created"] == 1
+
+    def test_threads_get_own_connection(self, pool, db_path):
+        """스레드마다 별도 커넥션"""
+        with pool.connection(db_path) as main_conn:
+            pass
+
+        result = {}
+
+        def worker():
+            with pool.connection(db_path) as conn:
+                result["conn"] = conn
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+
+        assert result["conn"] is not main_conn
+        assert pool.stats()["created"] == 2
+
+    def test_pragmas_applied(self, pool, db_path):
+        """WAL + busy_timeout + foreign_keys"""
+        with pool.connection(db_path, foreign_keys=True) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == pool.busy_timeout_ms
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+
+class TestTransactions:
+    """commit / rollback 테스트"""
+
+    def test_autocommit_on_exit(self, pool, db_path):
+        """commit=True: 정상 종료 시 커밋"""
+        with pool.connection(db_path) as conn:
+            conn.execute("INSERT INTO t (v) VALUES ('a')")
+        assert _count(pool, db_path) == 1
+
+    def test_rollback_on_exception(self, pool, db_path):
+        """예외 발생 시 롤백"""
+        with pytest.raises(RuntimeError):
+            with pool.connection(db_path) as conn:
+                conn.execute("INSERT INTO t (v) VALUES ('a')")
+                raise RuntimeError("boom")
+        assert _count(pool, db_path) == 0
+
+    def test_uncommitted_discarded_without_autocommit(self, pool, db_path):
+        """commit=False: 명시적 commit 없으면 폐기 (기존 close() 동작)"""
+        with pool.connection(db_path, commit=False) as conn:
+            conn.execute("INSERT INTO t (v) VALUES ('a')")
+        assert _count(pool, db_path) == 0
+
+        with pool.connection(db_path, commit=False) as conn:
+            conn.execute("INSERT INTO t (v) VALUES ('b')")
+            conn.commit()
+        assert _count(pool, db_path) == 1
+
+    def test_nested_commits_only_at_outermost(self, pool, db_path):
+        """중첩 컨텍스트는 바깥에서만 커밋"""
+        with pytest.raises(RuntimeError):
+            with pool.connection(db_path) as outer:
+                outer.execute("INSERT INTO t (v) VALUES ('a')")
+                with pool.connection(db_path) as inner:
+                    inner.execute("INSERT INTO t (v) VALUES ('b')")
+                assert outer.in_transaction
+                raise RuntimeError("boom")
+        assert _count(pool, db_path) == 0
+
+
+class TestRepositoryIntegration:
+    """TradeLogger / DatabaseManager 연동"""
+
+    def test_trade_logger_roundtrip(self, tmp_path):
+        """TradeLogger 주문 기록 후 조회"""
+        from trading.trade_logger import TradeLogger
+
+        logger = TradeLogger(db_path=str(tmp_path / "auto_trade.db"))
+        logger.log_order("005930", "삼성전자", "buy", 10, 70000, user_id=1)
+        history = logger.get_trade_history(user_id=1)
+
+        assert len(history) == 1
+        assert history[0]["amount"] == 700000
+
+    def test_db_manager_integrity_error_rolled_back(self, tmp_path):
+        """중복 관심종목 추가 실패 후에도 커넥션 정상"""
+        from database.db_manager import DatabaseManager
+
+        db = DatabaseManager(db_path=tmp_path / "stock_data.db")
+        user_id = db.create_user("a@test.com", "tester", "hash", "테스터")
+
+        assert db.add_to_watchlist(user_id, "기본", "005930", "삼성전자") is True
+        assert db.add_to_watchlist(user_id, "기본", "005930", "삼성전자") is False
+        assert len(db.get_watchlists(user_id)) == 1
@@ -0,0 +1,190 @@
+"""
+WriteBatcher 테스트
+
+테스트 항목:
+1. 건수 임계치 flush / 수동 flush
+2. 같은 key 병합 (마지막 값만 반영)
+3. 실패 시 트랜잭션 롤백
+4. TradeLogger / PositionManager 지연 쓰기 일관성
+5. 미반영 값은 같은 DB 의 다른 인스턴스에서도 조회 (대기열은 DB 파일별 공용 배치)
+"""
+
+import sqlite3
+
+import pytest
+
+from database.connection_pool import pooled_connection
+from database.write_batcher import WriteBatcher
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """테이블 1개가 있는 임시 DB"""
+    path = tmp_path / "batch_test.db"
+    with pooled_connection(path) as conn:
+        conn.execute("CREATE TABLE kv (k TEXT PRIMARY KEY, v INTEGER)")
+    return path
+
+
+UPSERT = "INSERT INTO kv (k, v) VALUES (?, ?) ON CONFLICT(k) DO UPDATE SET v = excluded.v"
+
+
+def _rows(path):
+    with pooled_connection(path) as conn:
+        return {r["k"]: r["v"] for r in conn.execute("SELECT k, v FROM kv")}
+
+
+class TestWriteBatcher:
+    """WriteBatcher 기본 동작"""
+
+    def test_pending_until_flush(self, db_path):
+        """flush 전에는 DB 미반영"""
+        batcher = WriteBatcher(db_path, max_rows=100, max_delay=0)
+        batcher.add(UPSERT, ("a", 1))
+        batcher.add(UPSERT, ("b", 2))
+
+        assert batcher.pending_count == 2
+        assert _rows(db_path) == {}
+
+        assert batcher.flush() == 2
+        assert _rows(db_path) == {"a": 1, "b": 2}
+        assert batcher.pending_count == 0
+
+    def test_flush_on_max_rows(self, db_path):
+        """건수 임계치 도달 시 자동 flush"""
+        batcher = WriteBatcher(db_path, max_rows=3, max_delay=0)
+        for i in range(3):
+            batcher.add(UPSERT, (f"k{i}", i))
+
+        assert batcher.pending_count == 0
+        assert len(_rows(db_path)) == 3
+
+    def test_coalesce_same_key(self, db_path):
+        """같은 key는 마지막 값만 반영"""
+        batcher = WriteBatcher(db_path, max_rows=100, max_delay=0)
+        for v in (1, 2, 3):
+            batcher.add(UPSERT, ("a", v), key="a")
+
+        assert batcher.pending_count == 1
+        batcher.flush()
+        assert _rows(db_path) == {"a": 3}
+        assert batcher.stats()["coalesced"] == 2
+
+    def test_pending_params_until_flush(self, db_path):
+        """flush 전까지 key 별 대기 파라미터 조회"""
+        batcher = WriteBatcher(db_path, max_rows=100, max_delay=0)
+        batcher.add(UPSERT, ("a", 1), key="a")
+        batcher.add(UPSERT, ("a", 2), key="a")
+
+        assert batcher.pending_params(UPSERT, "a") == ("a", 2)
+        assert batcher.pending_rows(UPSERT) == {"a": ("a", 2)}
+        assert batcher.pending_params(UPSERT, "b") is None
+
+        batcher.flush()
+        assert batcher.pending_params(UPSERT, "a") is None
+        assert batcher.pending_rows(UPSERT) == {}
+
+    def test_failed_flush_rolls_back(self, db_path):
+        """한 SQL이 실패하면 배치 전체 롤백"""
+        batcher = WriteBatcher(db_path, max_rows=100, max_delay=0)
+        batcher.add(UPSERT, ("a", 1))
+        batcher.add("INSERT INTO missing_table (x) VALUES (?)", (1,))
+
+        with pytest.raises(sqlite3.OperationalError):
+            batcher.flush()
+
+        assert _rows(db_path) == {}
+        assert batcher.pending_count == 0
+        assert batcher.stats()["dropped"] == 2
+
+
+class TestTradeLoggerBatching:
+    """TradeLogger 지연 쓰기"""
+
+    @pytest.fixture
+    def trade_logger(self, tmp_path):
+        from trading.trade_logger import TradeLogger
+        return TradeLogger(db_path=str(tmp_path / "auto_trade.db"))
+
+    def test_deferred_log_visible_in_history(self, trade_logger):
+        """defer=True 기록도 거래 내역 조회 시 반영"""
+        assert trade_logger.log_order("005930", "삼성전자", "buy", 1, 70000, user_id=1, defer=True) is None
+        assert len(trade_logger.get_trade_history(user_id=1)) == 1
+
+    def test_peak_profit_rate_read_your_writes(self, trade_logger):
+        """고점 수익률은 flush 전에도 조회 가능"""
+        with trade_logger._get_connection() as conn:
+            conn.execute(
+                "INSERT INTO holdings (user_id, stock_code, quantity, avg_price, buy_date) "
+                "VALUES (1, '005930', 1, 70000, '2026-01-02')"
+            )
+
+        trade_logger.update_peak_profit_rate(1, "005930", 5.5)
+        assert trade_logger.get_peak_profit_rate(1, "005930") == 5.5
+
+        trade_logger.flush_writes()
+        with trade_logger._get_connection() as conn:
+            row = conn.execute("SELECT peak_profit_rate FROM holdings WHERE user_id = 1").fetchone()
+        assert row["peak_profit_rate"] == 5.5
+
+    def test_peak_profit_rate_visible_to_other_instance(self, trade_logger):
+        """다른 인스턴스가 올린 미반영 고점도 조회"""
+        from trading.trade_logger import TradeLogger
+
+        with trade_logger._get_connection() as conn:
+            conn.execute(
+                "INSERT INTO holdings (user_id, stock_code, quantity, avg_price, buy_date) "
+                "VALUES (1, '005930', 1, 70000, '2026-01-02')"
+            )
+        other = TradeLogger(db_path=str(trade_logger.db_path))
+
+        trade_logger.update_peak_profit_rate(1, "005930", 7.0)
+        assert other.get_peak_profit_rate(1, "005930") == 7.0
+        trade_logger.flush_writes()
+
+
+class TestPositionManagerBatching:
+    """PositionManager 트레일링 스탑 지연 쓰기"""
+
+    def test_trailing_stop_pending_then_flushed_on_close(self, tmp_path):
+        from trading.intraday.position_manager import PositionManager
+
+        pm = PositionManager(db_path=str(tmp_path / "auto_trade.db"))
+        pos_id = pm.open_position(1, "005930", "삼성전자", "test", 10000, 10, atr=200)
+
+        assert pm.update_trailing_stop(pos_id, 11000) == 10780
+        # 더 낮은 가격은 트레일링을 내리지 않음
+        assert pm.update_trailing_stop(pos_id, 10500) == 10780
+
+        pos = pm.get_position_by_code(1, "005930")
+        assert pos["trailing_high_price"] == 11000
+        assert pos["trailing_stop_price"] == 10780
+
+        assert pm.close_position(pos_id, 10780, "TRAILING") is True
+        with pm._get_connection() as conn:
+            row = conn.execute("SELECT * FROM intraday_positions WHERE id = ?", (pos_id,)).fetchone()
+        assert row["status"] == "closed"
+        assert row["trailing_stop_price"] == 10780
+
+    def test_trailing_stop_visible_to_other_instance(self, tmp_path):
+        """다른 PositionManager 가 올린 미반영 트레일링 값도 조회/갱신 기준으로 사용"""
+        from trading.intraday.position_manager import PositionManager
+
+        db_path = str(tmp_path / "auto_trade.db")
+        pm = PositionManager(db_path=db_path)
+        other = PositionManager(db_path=db_path)
+        pos_id = pm.open_position(1, "005930", "삼성전자", "test", 10000, 10, atr=200)
+
+        assert pm.update_trailing_stop(pos_id, 11000) == 10780
+        pos = other.get_position_by_code(1, "005930")
+        assert pos["trailing_high_price"] == 11000
+        assert pos["trailing_stop_price"] == 10780
+        assert other.get_open_positions(1)[0]["trailing_stop_price"] == 10780
+
+        # 다른 인스턴스도 미반영 고점 기준으로 판단 (낮은 가격으로 트레일링을 내리지 않음)
+        assert other.update_trailing_stop(pos_id, 10900) == 10780
+
+        pm.flush_writes()
+        with pm._get_connection() as conn:
+            row = conn.execute("SELECT * FROM intraday_positions WHERE id = ?", (pos_id,)).fetchone()
+        assert row["trailing_stop_price"] == 10780
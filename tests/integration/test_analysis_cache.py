@@ -0,0 +1,119 @@
+"""
+TechnicalAnalyst 분석 결과 캐시 + 지표 공유 테스트
+
+테스트 항목:
+1. code/ctx 유무와 관계없이 4개 분석 결과 동일
+2. 같은 (종목, 마지막 봉) 재요청은 캐시 히트, 반환값 수정은 캐시에 영향 없음
+3. 마지막 봉(장중 현재가)이 바뀌면 재계산
+4. 같은 종목의 다른 분석은 지표 컨텍스트를 공유 (지표별 계산 1회)
+5. 예상 거래량을 쓰는 분석은 사이클별로 따로 캐시
+6. 여러 스레드가 같은 종목을 동시에 분석해도 공유 컨텍스트 결과 동일
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scoring import IndicatorContext, ScoringCycle
+from technical_analyst import AnalysisCache, TechnicalAnalyst
+
+METHODS = ['analyze_full', 'analyze_trend_following', 'analyze_trend_following_strict', 'get_quick_score']
+CLOSED = ScoringCycle(datetime(2026, 1, 20, 18, 0))
+
+
+@pytest.fixture
+def ohlcv():
+    rng = np.random.default_rng(5)
+    n = 200
+    close = 15000 * np.exp(np.cumsum(rng.normal(0.002, 0.02, n)))
+    open_ = close * (1 + rng.normal(0, 0.01, n))
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + abs(rng.normal(0, 0.01, n))),
+        'Low': np.minimum(open_, close) * (1 - abs(rng.normal(0, 0.01, n))),
+        'Close': close,
+        'Volume': rng.integers(100000, 2000000, n).astype(float),
+    }, index=pd.bdate_range('2025-03-03', periods=n))
+
+
+@pytest.fixture
+def analyst():
+    return TechnicalAnalyst(cache=AnalysisCache())
+
+
+@pytest.fixture(autouse=True)
+def closed_market():
+    """장중 예상 거래량은 기준 시각에 따라 달라지므로 장 마감 후로 고정"""
+    with CLOSED.activate():
+        yield
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_results_identical(ohlcv, analyst, method):
+    expected = getattr(TechnicalAnalyst(cache=AnalysisCache()), method)(ohlcv.copy())
+    assert expected is not None
+    assert repr(getattr(analyst, method)(ohlcv.copy(), code='000001')) == repr(expected)
+    assert repr(getattr(analyst, method)(ohlcv.copy(), code='000001')) == repr(expected)  # 캐시 히트
+    ctx = IndicatorContext(ohlcv, '000001')
+    assert repr(getattr(TechnicalAnalyst(cache=AnalysisCache()), method)(ohlcv.copy(), ctx=ctx)) == repr(expected)
+
+
+def test_cache_hits_and_isolation(ohlcv, analyst):
+    first = analyst.analyze_full(ohlcv.copy(), code='000001')
+    first['signals'].append('MUTATED')
+    second = analyst.analyze_full(ohlcv.copy(), code='000001')
+    assert 'MUTATED' not in second['signals']
+    assert analyst.cache.stats['hits'] == 1 and analyst.cache.stats['misses'] == 1
+
+    # 코드 없이 호출하면 캐시 미사용 (기존 동작)
+    analyst.analyze_full(ohlcv.copy())
+    assert analyst.cache.stats['hits'] == 1
+
+    # 장중 현재가 변경 → 새 키
+    changed = ohlcv.copy()
+    changed.iloc[-1, changed.columns.get_loc('Close')] *= 1.01
+    analyst.analyze_full(changed, code='000001')
+    assert analyst.cache.stats['misses'] == 2
+
+
+def test_analyses_share_indicators(ohlcv, analyst):
+    for method in METHODS:
+        getattr(analyst, method)(ohlcv.copy(), code='000001')
+
+    ctx = analyst.cache.context('000001', ohlcv)
+    stats = ctx.stats()
+    assert set(stats['computed'].values()) == {1}
+    assert stats['reused']['sma(Close, length=20)'] >= 3
+    assert stats['reused']['macd(Close, fast=12, signal=9, slow=26)'] >= 3
+
+
+def test_projection_keyed_by_cycle(ohlcv, analyst):
+    intraday = ScoringCycle(datetime(2026, 1, 20, 10, 0))
+    closed = analyst.analyze_trend_following_strict(ohlcv.copy(), code='000001')
+    with intraday.activate():
+        projected = analyst.analyze_trend_following_strict(ohlcv.copy(), code='000001')
+        expected = TechnicalAnalyst(cache=AnalysisCache()).analyze_trend_following_strict(ohlcv.copy())
+    assert repr(projected) == repr(expected)
+    assert projected['indicators']['volume_ratio'] > closed['indicators']['volume_ratio']
+
+
+def test_shared_context_across_threads(ohlcv, analyst):
+    expected = {method: repr(getattr(TechnicalAnalyst(cache=AnalysisCache()), method)(ohlcv.copy()))
+                for method in METHODS}
+    barrier = threading.Barrier(len(METHODS))
+
+    def run(method):
+        with CLOSED.activate():
+            barrier.wait()
+            return method, repr(getattr(analyst, method)(ohlcv.copy(), code='000001'))
+
+    with ThreadPoolExecutor(max_workers=len(METHODS)) as executor:
+        results = dict(executor.map(run, METHODS))
+
+    assert results == expected
+    assert set(analyst.cache.context('000001', ohlcv).stats()['computed'].values()) == {1}
+
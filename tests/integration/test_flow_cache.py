@@ -0,0 +1,163 @@
+"""
+투자자 수급 / 공매도 공용 캐시 테스트
+
+테스트 항목:
+1. 일괄 조회 1회 후 같은 날 재요청은 캐시에서 읽음 + 연속 매수 일수 요약
+2. 장중에는 TTL 지난 종목만 당일 행 증분 조회, 마감 후 확정되면 재조회 없음, 다음 날 전체 조회
+3. 공매도는 종목별 하루 1회 조회 (get_short_data_batch 도 캐시 경유)
+4. *_with_investor 점수 계산기가 캐시 수급을 사용
+5. 보관 기간 지난 일별 행은 그날 첫 일괄 조회에서 1번 삭제
+"""
+
+import threading
+from datetime import datetime
+
+import pytest
+
+import krx_short_data
+from services import flow_cache as flow_cache_module
+from services.flow_cache import InvestorFlowCache
+
+
+class FakeKIS:
+    """KISClient.get_investor_trend 형식 응답 (최신순)"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_investor_trend(self, code, days=5):
+        with self._lock:
+            self.calls.append((code, days))
+        today = self.clock.now.strftime('%Y%m%d')
+        daily = [{"date": today, "foreign_net": 100, "institution_net": -50,
+                  "individual_net": -50, "foreign_total": 0}]
+        for i in range(1, days):
+            daily.append({"date": f"202601{20 - i:02d}", "foreign_net": 10 if i < 3 else -10,
+                          "institution_net": 5, "individual_net": -15, "foreign_total": 0})
+        return {"stock_code": code, "foreign_ratio": 12.5, "daily": daily[:days]}
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock(datetime(2026, 1, 20, 10, 0))  # 화요일 장중
+
+
+@pytest.fixture
+def kis(clock):
+    return FakeKIS(clock)
+
+
+@pytest.fixture
+def cache(tmp_path, kis, clock):
+    return InvestorFlowCache(tmp_path / "flows.db", investor_fetcher=kis.get_investor_trend,
+                             short_fetcher=lambda code, days: {"short_ratio": 3.0, "balance_change_pct": -25.0},
+                             rate=1000.0, intraday_ttl=300, clock=clock)
+
+
+def test_bulk_fill_once_per_day(cache, kis):
+    flows = cache.get_investor_many(["000001", "000002", "000003"], days=5)
+    assert sorted(kis.calls) == [("000001", 10), ("000002", 10), ("000003", 10)]
+
+    inv = flows["000001"]
+    assert inv["days"] == 5 and inv["daily"][0]["date"] == "20260120"
+    assert inv["foreign_net"] == 100 + 10 + 10 - 10 - 10
+    assert inv["consecutive_foreign_buy"] == 3 and inv["foreign_consecutive_days"] == 3
+    assert inv["consecutive_institution_buy"] == 0
+    assert inv["foreign_hold_ratio"] == 12.5
+
+    kis.calls.clear()
+    assert cache.get_investor("000002", days=10)["days"] == 10
+    assert cache.get_investor_many(["000001", "000003"], days=1)["000003"]["foreign_net"] == 100
+    assert kis.calls == []
+    assert cache.get_investor("999999", fetch=False) is None
+
+
+def test_intraday_incremental_refresh(cache, kis, clock):
+    cache.prefetch(["000001", "000002"])
+    kis.calls.clear()
+
+    clock.now = datetime(2026, 1, 20, 10, 3)
+    assert cache.prefetch(["000001", "000002"]) == {'full': 0, 'today': 0}
+
+    # TTL 경과 → 당일 행만, 새로 요청된 종목은 전체 조회
+    clock.now = datetime(2026, 1, 20, 10, 10)
+    assert cache.prefetch(["000001", "000003"]) == {'full': 1, 'today': 1}
+    assert sorted(kis.calls) == [("000001", 1), ("000003", 10)]
+    assert cache.get_investor("000001", days=10, fetch=False)["days"] == 10
+
+    # 마감 후 1번 갱신하면 확정
+    kis.calls.clear()
+    clock.now = datetime(2026, 1, 20, 15, 45)
+    cache.prefetch(["000001", "000002", "000003"])
+    assert len(kis.calls) == 3
+    kis.calls.clear()
+    clock.now = datetime(2026, 1, 20, 18, 0)
+    cache.prefetch(["000001", "000002", "000003"])
+    assert kis.calls == []
+
+    # 다음 날은 전체 조회
+    clock.now = datetime(2026, 1, 21, 8, 30)
+    cache.prefetch(["000001"])
+    assert kis.calls == [("000001", 10)]
+    assert cache.stats()["incremental"] == 4
+
+
+def test_old_rows_purged_once_per_day(cache, kis, clock):
+    cache.prefetch(["000001"])
+    assert cache.stats()["purged"] == 0
+    assert cache.get_investor("000001", days=10, fetch=False)["days"] == 10
+
+    clock.now = datetime(2026, 2, 25, 10, 0)   # 30일 경과 → 1월 행 전부 만료
+    cache.prefetch(["000002"])
+    assert cache.stats()["purged"] == 10
+    assert cache.get_investor("000001", days=10, fetch=False) is None
+
+    clock.now = datetime(2026, 2, 25, 10, 10)
+    cache.prefetch(["000001"])
+    assert cache.stats()["purged"] == 10   # 같은 날 다시 삭제하지 않음
+
+
+def test_short_data_once_per_day(cache, clock, monkeypatch):
+    calls = []
+
+    def short_fetcher(code, days):
+        calls.append(code)
+        return None if code == "000009" else {"short_ratio": 5.5, "balance_change_pct": -21.0}
+
+    cache._short_fetcher = short_fetcher
+    monkeypatch.setattr(flow_cache_module, "_flow_cache", cache)
+
+    batch = krx_short_data.get_short_data_batch(["000001", "000002", "000009"])
+    assert set(batch) == {"000001", "000002"}
+    assert cache.get_short("000001")["short_ratio"] == 5.5
+    assert sorted(calls) == ["000001", "000002", "000009"]
+
+    calls.clear()
+    clock.now = datetime(2026, 1, 21, 10, 0)
+    cache.get_short_many(["000001"])
+    assert calls == ["000001"]
+
+
+def test_scorers_read_from_cache(cache, kis, monkeypatch):
+    from scoring import scoring_v4, scoring_v6
+
+    captured = {}
+    monkeypatch.setattr(scoring_v4, "calculate_score_v4", lambda df, inv: captured.setdefault("v4", inv))
+    monkeypatch.setattr(scoring_v6, "calculate_score_v6", lambda df, inv: captured.setdefault("v6", inv))
+
+    scoring_v4.calculate_score_v4_with_investor(None, "005930", flow_cache=cache)
+    scoring_v6.calculate_score_v6_with_investor(None, stock_code="005930", flow_cache=cache)
+
+    assert captured["v4"]["stock_code"] == "005930" and captured["v4"]["days"] == 5
+    assert captured["v6"] == captured["v4"]
+    assert kis.calls == [("005930", 10)]
@@ -0,0 +1,91 @@
+"""
+PDF 렌더러 / HTML 조각 캐시 테스트
+
+테스트 항목:
+1. 종목 섹션 조각 캐시: 같은 데이터는 재사용, 데이터가 바뀌면 다시 생성
+2. fontconfig 설정은 한 번만 기록하고 재호출 시 파일을 다시 쓰지 않음
+3. render_many: job 순서 유지, 실패 job 은 예외로 반환
+4. (weasyprint 설치 시) 렌더러 재사용으로 여러 PDF 생성
+"""
+
+import pytest
+
+import pdf_generator as pg
+
+
+@pytest.fixture
+def results():
+    return [
+        {
+            "code": f"{i:06d}", "name": f"종목{i}", "market": "KOSPI", "score": 90 - i,
+            "close": 10000 + i * 10, "change_pct": 1.5 - i * 0.2, "signals": ["MA_ALIGNED", "VOLUME_SURGE"],
+            "streak": i % 4 + 1, "rank_change": None if i % 3 else 2,
+            "indicators": {"rsi": 55 + i, "volume_ratio": 2.5, "sma20_slope": 1.2},
+        }
+        for i in range(25)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def fresh_fragments(monkeypatch):
+    monkeypatch.setattr(pg, "_fragments", pg.FragmentCache())
+
+
+def test_fragment_cache_reuses_sections(results):
+    stats = {"scoring_version": "v2"}
+    first = pg.create_detailed_html(results, stats=stats, date_str="2026-01-02")
+    assert pg._fragments.misses == 25 and pg._fragments.hits == 0
+
+    second = pg.create_detailed_html(results, stats=stats, date_str="2026-01-02")
+    assert second == first
+    assert pg._fragments.hits == 25
+
+    results[3]["close"] = 99999
+    third = pg.create_detailed_html(results, stats=stats, date_str="2026-01-02")
+    assert "99,999" in third and "99,999" not in first
+    assert pg._fragments.misses == 26
+
+    # 버전이 다르면 점수 테이블이 달라지므로 별도 조각
+    pg.create_detailed_html(results, stats={"scoring_version": "v4"}, date_str="2026-01-02")
+    assert pg._fragments.misses == 26 + 20
+
+
+def test_fontconfig_written_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("FONTCONFIG_PATH", "")
+    monkeypatch.setenv("FONTCONFIG_FILE", "")
+
+    conf = pg.setup_fontconfig(tmp_path / "fc")
+    mtime = conf.stat().st_mtime_ns
+    assert str(pg.FONT_DIR.resolve()) in conf.read_text()
+
+    assert pg.setup_fontconfig(tmp_path / "fc") == conf
+    assert conf.stat().st_mtime_ns == mtime
+    assert pg.os.environ["FONTCONFIG_FILE"] == str(conf)
+
+
+def test_render_many_keeps_order(monkeypatch):
+    class FakeRenderer:
+        def render(self, html, output_path=None, css=None):
+            if html == "bad":
+                raise ValueError("렌더링 실패")
+            return (output_path, css)
+
+    monkeypatch.setattr(pg, "_renderer", FakeRenderer())
+    results = pg.render_many([("a", "a.pdf"), ("bad", "b.pdf"), ("c", "c.pdf", "body{}")], workers=1)
+
+    assert results[0] == ("a.pdf", None)
+    assert isinstance(results[1], ValueError)
+    assert results[2] == ("c.pdf", "body{}")
+
+
+def test_renderer_reuses_font_config(results, tmp_path, monkeypatch):
+    pytest.importorskip("weasyprint")
+    monkeypatch.setattr(pg, "FONTCONFIG_DIR", tmp_path / "fc")
+    renderer = pg.PDFRenderer()
+
+    html = pg.create_detailed_html(results[:3], date_str="2026-01-02")
+    for name in ("a.pdf", "b.pdf"):
+        renderer.render(html, tmp_path / name)
+        assert (tmp_path / name).read_bytes().startswith(b"%PDF")
+    assert renderer.stylesheet() is renderer.stylesheet()
+    assert renderer.renders == 2
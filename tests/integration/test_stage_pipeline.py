@@ -0,0 +1,160 @@
+"""
+스테이지 파이프라인 (daily_top100 DAG) 테스트
+
+테스트 항목:
+1. 의존 순서대로 결과 전달, parallel 스테이지는 별도 프로세스에서 동시 실행
+2. 렌더링 실패 시 하위만 건너뛰고, 재실행하면 스크리닝 없이 실패 스테이지부터 이어서 진행
+3. force 스테이지 + 하위만 재실행, 산출 파일 삭제 시 캐시 무효
+4. purge_runs: 보관 기간이 지난 실행 디렉토리만 삭제 (이어서 실행 중인 run_id 제외)
+"""
+
+import os
+import time
+from functools import partial
+
+import pytest
+
+from stage_pipeline import Stage, StagePipeline, purge_runs
+
+
+def render_pid(prepared):
+    return os.getpid(), sum(prepared)
+
+
+def render_file(path, prepared):
+    with open(path, "w") as f:
+        f.write(str(prepared))
+    return path
+
+
+def render_flaky(flag_path, prepared):
+    if os.path.exists(flag_path):
+        raise RuntimeError("PDF 렌더링 실패")
+    return len(prepared)
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+def _pipeline(run_dir, calls, tmp_path, flag_path=None, workers=3):
+    def screening():
+        calls.append("screening")
+        return [3, 1, 2]
+
+    def prepare(results):
+        calls.append("prepare")
+        return sorted(results)
+
+    def email(pdf, body):
+        calls.append("email")
+        return (pdf, body)
+
+    flag_path = flag_path or str(tmp_path / "no-flag")
+    return StagePipeline(run_dir, [
+        Stage("screening", screening),
+        Stage("prepare", prepare, deps=("screening",)),
+        Stage("excel", render_pid, deps=("prepare",), parallel=True),
+        Stage("csv", partial(render_file, str(tmp_path / "top.csv")), deps=("prepare",), parallel=True,
+              output=str(tmp_path / "top.csv")),
+        Stage("pdf", partial(render_flaky, flag_path), deps=("prepare",), parallel=True),
+        Stage("email", email, deps=("pdf", "csv")),
+    ], workers=workers, log=lambda msg: None)
+
+
+def test_runs_in_dependency_order(tmp_path, calls):
+    pipeline = _pipeline(tmp_path / "run", calls, tmp_path)
+    results = pipeline.run()
+
+    assert calls == ["screening", "prepare", "email"]
+    assert results["prepare"] == [1, 2, 3]
+    pid, total = results["excel"]
+    assert pid != os.getpid() and total == 6
+    assert results["email"] == (3, str(tmp_path / "top.csv"))
+    assert set(pipeline.timings()) == {"screening", "prepare", "excel", "csv", "pdf", "email"}
+
+    # 일부 스테이지만 요청하면 필요한 상위 스테이지만 실행
+    assert pipeline.ancestors(["csv"]) == ["screening", "prepare", "csv"]
+
+
+def test_failure_resumes_without_rescreening(tmp_path, calls):
+    flag = tmp_path / "fail-pdf"
+    flag.touch()
+
+    pipeline = _pipeline(tmp_path / "run", calls, tmp_path, flag_path=str(flag))
+    results = pipeline.run()
+    assert pipeline.failed == ["pdf"] and pipeline.skipped == ["email"]
+    assert "csv" in results and "email" not in results
+    assert pipeline.manifest["pdf"]["status"] == "failed"
+
+    flag.unlink()
+    calls.clear()
+    pipeline = _pipeline(tmp_path / "run", calls, tmp_path, flag_path=str(flag))
+    results = pipeline.run()
+
+    assert calls == ["email"]
+    assert pipeline.failed == []
+    assert results["pdf"] == 3 and results["prepare"] == [1, 2, 3]
+
+
+def test_force_and_missing_output(tmp_path, calls):
+    _pipeline(tmp_path / "run", calls, tmp_path).run()
+
+    calls.clear()
+    _pipeline(tmp_path / "run", calls, tmp_path).run(force=["prepare"])
+    assert calls == ["prepare", "email"]
+
+    calls.clear()
+    os.remove(tmp_path / "top.csv")
+    pipeline = _pipeline(tmp_path / "run", calls, tmp_path, workers=1)
+    pipeline.run()
+    assert calls == []  # csv 만 다시 렌더링 (email 은 캐시)
+    assert (tmp_path / "top.csv").exists()
+
+
+def test_purge_runs_removes_only_expired(tmp_path, calls):
+    root = tmp_path / "pipeline"
+    for name in ("old", "old_resumed", "recent"):
+        _pipeline(root / name, calls, tmp_path).run()
+    (root / "notes.txt").write_text("실행 디렉토리 아님")
+
+    week_ago = time.time() - 7 * 86400
+    for name in ("old", "old_resumed"):
+        for path in [root / name, *(root / name).iterdir()]:
+            os.utime(path, (week_ago, week_ago))
+    # 최근에 기록한 파일이 있으면 디렉토리 mtime 이 오래돼도 유지
+    os.utime(root / "recent", (week_ago, week_ago))
+
+    assert purge_runs(root, max_age_days=3, keep=["old_resumed"]) == ["old"]
+    assert sorted(p.name for p in root.iterdir()) == ["notes.txt", "old_resumed", "recent"]
+    assert purge_runs(tmp_path / "missing", max_age_days=3) == []
+
+
+def test_daily_top100_runs_do_not_share_screening(tmp_path, monkeypatch):
+    pytest.importorskip("openpyxl")
+    import daily_top100
+
+    screened = []
+
+    def run_screening(**kwargs):
+        screened.append(kwargs)
+        return [{"code": "000001", "score": len(screened)}], {}
+
+    monkeypatch.setattr(daily_top100, "PIPELINE_DIR", tmp_path)
+    monkeypatch.setattr(daily_top100, "run_screening", run_screening)
+    monkeypatch.setattr(daily_top100, "load_yesterday_results", lambda: (None, None))
+    monkeypatch.setattr(daily_top100, "prepare_results", lambda results, **kwargs: {"results": results})
+
+    first, pipeline = daily_top100.run_pipeline(save=False)
+    second, _ = daily_top100.run_pipeline(save=False)
+    assert len(screened) == 2
+    assert first["results"][0]["score"] == 1 and second["results"][0]["score"] == 2
+
+    # --resume 일 때만 캐시 재사용
+    resumed, _ = daily_top100.run_pipeline(save=False, resume=pipeline.run_dir.name)
+    assert len(screened) == 2 and resumed == first
+
+    # --no-save 면 이메일은 PDF 를 기다리지 않음
+    pipeline, _ = daily_top100.build_pipeline(save=False, send_email=True, run_id="no-save")
+    assert pipeline.stages["email"].deps == ("email_body",)
@@ -0,0 +1,71 @@
+"""
+ML 장중 백테스트 시뮬레이션 테스트
+
+테스트 항목:
+1. simulate() (배열 순회) = simulate_loop() (iterrows 루프)
+   - 거래 내역/자산 곡선/신호 수 동일 (손절/익절/ML 매도/추가 매수/일말 청산/이월 포지션)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_intraday.backtest import simulate, simulate_loop
+
+
+def _predictions(n_days=3, n_codes=10, seed=0):
+    rng = np.random.default_rng(seed)
+    times = [f"{h:02d}{m:02d}00" for h in range(9, 16) for m in range(0, 60, 10) if (h, m) <= (15, 20)]
+    rows = []
+    for d in range(n_days):
+        date = f"2026010{d + 1}"
+        price = rng.uniform(5000, 50000, n_codes)
+        for t in times:
+            price = price * (1 + rng.normal(0, 0.006, n_codes))
+            for c in range(n_codes):
+                # 일부 종목은 장마감 구간 데이터 없음 → 포지션 이월
+                if c % 5 == 0 and t >= '150000':
+                    continue
+                rows.append({
+                    'date': date,
+                    'time': t,
+                    'code': f"{c:06d}",
+                    'close': round(price[c]),
+                    'buy_prob': rng.uniform(0.2, 0.9),
+                    'sell_prob': rng.uniform(0.0, 0.7),
+                    'v2_score': rng.integers(50, 90),
+                    'v4_score': rng.integers(30, 70),
+                })
+    return pd.DataFrame(rows).sort_values(['date', 'time']).reset_index(drop=True)
+
+
+@pytest.mark.parametrize('params', [
+    dict(min_probability=0.6, max_positions=5, position_size=0.1, use_scores=True),
+    dict(min_probability=0.7, max_positions=3, position_size=0.2, use_scores=False),
+    dict(min_probability=0.5, max_positions=10, position_size=0.05, use_scores=True),
+])
+def test_simulate_matches_loop(params):
+    df = _predictions()
+
+    expected_engine, expected_signals, expected_filtered = simulate_loop(df, **params)
+    engine, signals, filtered = simulate(df, **params)
+
+    assert (signals, filtered) == (expected_signals, expected_filtered)
+    assert len(expected_engine.trades) > 0
+
+    expected_trades = pd.DataFrame(expected_engine.trades)
+    pd.testing.assert_frame_equal(pd.DataFrame(engine.trades), expected_trades, check_dtype=False)
+    pd.testing.assert_frame_equal(pd.DataFrame(engine.equity_curve), pd.DataFrame(expected_engine.equity_curve),
+                                  check_dtype=False)
+    assert engine.capital == pytest.approx(expected_engine.capital)
+    assert set(engine.positions) == set(expected_engine.positions)
+
+
+def test_simulate_without_score_columns():
+    df = _predictions(n_days=2).drop(columns=['v2_score', 'v4_score'])
+
+    expected_engine, expected_signals, expected_filtered = simulate_loop(df)
+    engine, signals, filtered = simulate(df)
+
+    assert (signals, filtered) == (expected_signals, expected_filtered)
+    assert engine.trades == expected_engine.trades == []
@@ -0,0 +1,169 @@
+"""
+대장주-종속주 상관관계 엔진 테스트
+
+테스트 항목:
+1. correlation_matrix = DataFrame.corr() (결측 포함)
+2. RollingCorrelation 증분 갱신 = 창 구간 DataFrame.corr()
+3. 쌍 추출/분류/레퍼런스 = train_leader_follower 기존 루프 구현
+4. 워크포워드 레퍼런스는 해당 날짜 이후 데이터에 영향받지 않음
+5. 워크포워드 대장주/대상 종목은 시점별 시가총액 기준, 중복 종목 시총 처리
+"""
+
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scoring.correlation_engine import (
+    RollingCorrelation,
+    build_reference_map,
+    classify_pairs,
+    correlation_matrix,
+    correlation_pairs,
+    estimate_caps_by_date,
+    walk_forward_references,
+)
+
+
+@pytest.fixture
+def returns_df():
+    rng = np.random.default_rng(3)
+    n_days, n_assets = 150, 12
+    market = rng.normal(0, 0.01, n_days)
+    beta = rng.uniform(0, 1.5, n_assets)
+    values = market[:, None] * beta + rng.normal(0, 0.01, (n_days, n_assets))
+    values[rng.random(values.shape) < 0.05] = np.nan
+    values[:40, 3] = np.nan  # 중간 상장 종목
+    dates = pd.bdate_range('2024-01-02', periods=n_days)
+    return pd.DataFrame(values, index=dates, columns=[f"{i:06d}" for i in range(n_assets)])
+
+
+@pytest.fixture
+def market_caps(returns_df):
+    tickers = list(returns_df.columns)
+    return pd.DataFrame({
+        'ticker': tickers,
+        'name': [f"종목{t[-2:]}" for t in tickers],
+        '시가총액': [(i % 5 + 1) * 1000 for i in range(len(tickers))],
+    })
+
+
+def _loop_pairs(returns_df, min_corr):
+    """train_leader_follower.calculate_all_correlations (기존)"""
+    corr_matrix = returns_df.corr()
+    tickers = list(returns_df.columns)
+    pairs = []
+    for i, t1 in enumerate(tickers):
+        for j, t2 in enumerate(tickers):
+            if i >= j:
+                continue
+            corr = corr_matrix.loc[t1, t2]
+            if pd.notna(corr) and corr >= min_corr:
+                pairs.append({'ticker1': t1, 'ticker2': t2, 'correlation': round(corr, 4)})
+    return pd.DataFrame(pairs).sort_values('correlation', ascending=False)
+
+
+def _loop_reference(classified_df, min_corr):
+    """train_leader_follower.build_reference (기존, 메타데이터 제외)"""
+    filtered = classified_df[classified_df['correlation'] >= min_corr]
+    leader_map = defaultdict(list)
+    for _, row in filtered.iterrows():
+        leader_map[row['leader_code']].append({
+            'code': row['follower_code'], 'name': row['follower_name'],
+            'correlation': row['correlation'], 'cap_ratio': row['cap_ratio'],
+        })
+    for leader in leader_map:
+        leader_map[leader] = sorted(leader_map[leader], key=lambda x: x['correlation'], reverse=True)[:10]
+    follower_to_leader = {}
+    for leader, followers in leader_map.items():
+        leader_name = filtered[filtered['leader_code'] == leader]['leader_name'].iloc[0]
+        for f in followers:
+            follower_to_leader.setdefault(f['code'], []).append({
+                'leader_code': leader, 'leader_name': leader_name, 'correlation': f['correlation'],
+            })
+    return dict(leader_map), follower_to_leader
+
+
+def test_correlation_matrix_matches_pandas(returns_df):
+    corr = correlation_matrix(returns_df.to_numpy())
+    np.testing.assert_allclose(corr, returns_df.corr().to_numpy(), atol=1e-10)
+
+
+def test_rolling_matches_window_corr(returns_df):
+    window = 30
+    engine = RollingCorrelation(returns_df.shape[1], window=window)
+    for t, row in enumerate(returns_df.to_numpy()):
+        engine.update(row)
+        if t in (10, 29, 75, 149):
+            expected = returns_df.iloc[max(0, t - window + 1):t + 1].corr().to_numpy()
+            np.testing.assert_allclose(engine.corr(), expected, atol=1e-9)
+
+
+def test_pairs_and_reference_match_loop(returns_df, market_caps):
+    pairs_df = correlation_pairs(correlation_matrix(returns_df.to_numpy()), returns_df.columns, min_corr=0.2)
+    expected = _loop_pairs(returns_df, 0.2)
+    pd.testing.assert_frame_equal(pairs_df.reset_index(drop=True), expected.reset_index(drop=True),
+                                  check_dtype=False)
+
+    classified = classify_pairs(pairs_df, market_caps)
+    leaders_bigger = classified['leader_cap'] >= classified['follower_cap']
+    assert leaders_bigger.all()
+
+    reference = build_reference_map(classified, min_corr=0.3)
+    leader_map, follower_map = _loop_reference(classified, 0.3)
+    assert reference['leader_to_followers'] == leader_map
+    assert list(reference['leader_to_followers']) == list(leader_map)
+    assert reference['follower_to_leaders'] == follower_map
+    assert reference['total_pairs'] == int((classified['correlation'] >= 0.3).sum())
+
+
+def test_walk_forward_has_no_look_ahead(returns_df, market_caps):
+    cutoff = returns_df.index[100]
+    kwargs = dict(window=60, calc_corr=0.2, min_corr=0.3, min_periods=20, start=returns_df.index[80], step=5)
+
+    full = dict(walk_forward_references(returns_df, market_caps, **kwargs))
+    shocked = returns_df.copy()
+    shocked.loc[shocked.index > cutoff] *= -3
+    altered = dict(walk_forward_references(shocked, market_caps, **kwargs))
+
+    assert list(full) == list(altered)
+    for date in full:
+        if date <= cutoff:
+            assert full[date]['all_pairs'] == altered[date]['all_pairs']
+    assert returns_df.index[80] in full and returns_df.index[85] in full and returns_df.index[81] not in full
+
+
+def test_classify_pairs_with_duplicate_tickers(market_caps):
+    pairs_df = pd.DataFrame({'ticker1': ['000000'], 'ticker2': ['000001'], 'correlation': [0.8]})
+    duplicated = pd.concat([market_caps, market_caps.iloc[[0]].assign(시가총액=1)], ignore_index=True)
+    classified = classify_pairs(pairs_df, duplicated)
+    assert classified['leader_code'].tolist() == ['000001']
+    assert classified['follower_cap'].tolist() == [1000]
+
+
+def test_walk_forward_uses_caps_as_of_date(returns_df, market_caps):
+    close_df = (1 + returns_df.fillna(0)).cumprod() * 1000
+    caps_by_date = estimate_caps_by_date(close_df, market_caps)
+    np.testing.assert_allclose(caps_by_date.iloc[-1].to_numpy(), market_caps['시가총액'].to_numpy())
+
+    # 000004 (현재 시총 최대) 는 cutoff 전까지 시총이 가장 작았던 종목
+    cutoff = returns_df.index[100]
+    caps_by_date.loc[:cutoff, '000004'] = 1.0
+    kwargs = dict(window=60, calc_corr=0.0, min_corr=0.0, min_periods=20, start=returns_df.index[80], step=5)
+    references = dict(walk_forward_references(returns_df, market_caps, caps_by_date=caps_by_date, **kwargs))
+
+    before = [p for p in references[returns_df.index[95]]['all_pairs'] if '000004' in (p['leader_code'], p['follower_code'])]
+    after = [p for p in references[returns_df.index[145]]['all_pairs'] if '000004' in (p['leader_code'], p['follower_code'])]
+    assert before and all(p['follower_code'] == '000004' for p in before)
+    assert after and any(p['leader_code'] == '000004' for p in after)
+
+    # 그 날짜 시총 상위 N 종목 쌍만
+    limited = dict(walk_forward_references(returns_df, market_caps, caps_by_date=caps_by_date,
+                                           universe_size=4, **kwargs))
+    codes = {c for p in limited[returns_df.index[95]]['all_pairs'] for c in (p['leader_code'], p['follower_code'])}
+    assert codes and '000004' not in codes
+
+    with pytest.raises(ValueError):
+        next(walk_forward_references(returns_df, market_caps, universe_size=4, **kwargs))
+
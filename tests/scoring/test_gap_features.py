@@ -0,0 +1,160 @@
+"""
+V9 갭 피처 일괄 계산 테스트
+
+테스트 항목:
+1. compute_gap_features = train_gap_model_v2.calculate_features(df, idx) 행별 계산
+2. 학습 샘플 (bar 21 이상, 필터, gap_up 라벨) = 학습 스크립트 루프
+3. latest_gap_features = auto_trade_v9.calc_features(df) (마지막 행)
+4. 피처 스토어 연도 파티션 저장/기간 조회
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scoring.gap_features import (
+    GAP_FEATURE_COLUMNS,
+    GapFeatureStore,
+    build_gap_panel,
+    compute_gap_features,
+    gap_training_samples,
+    latest_gap_features,
+)
+
+
+def _reference_features(df, idx):
+    """train_gap_model_v2.calculate_features"""
+    if idx < 20:
+        return None
+    row = df.iloc[idx]
+    prev_rows = df.iloc[idx-20:idx]
+    o, h, l, c, v = row['시가'], row['고가'], row['저가'], row['종가'], row['거래량']
+    if o == 0 or c == 0 or v == 0:
+        return None
+
+    f = {}
+    body = abs(c - o)
+    total_range = h - l if h > l else 1
+    f['close_pos'] = (c - l) / total_range if total_range > 0 else 0.5
+    f['close_high'] = (c - l) / (h - l) if h > l else 0.5
+    f['is_bull'] = 1 if c > o else 0
+    f['body_ratio'] = body / total_range if total_range > 0 else 0
+    f['upper_wick'] = (h - max(o, c)) / total_range if total_range > 0 else 0
+    f['lower_wick'] = (min(o, c) - l) / total_range if total_range > 0 else 0
+    prev_close = df.iloc[idx-1]['종가']
+    f['day_change'] = (c - prev_close) / prev_close * 100 if prev_close > 0 else 0
+    ma5 = prev_rows['종가'].tail(5).mean()
+    ma20 = prev_rows['종가'].mean()
+    f['dist_ma5'] = (c - ma5) / ma5 * 100 if ma5 > 0 else 0
+    f['dist_ma20'] = (c - ma20) / ma20 * 100 if ma20 > 0 else 0
+    avg_vol = prev_rows['거래량'].mean()
+    f['vol_ratio'] = v / avg_vol if avg_vol > 0 else 1
+    recent_vol = prev_rows['거래량'].tail(5).mean()
+    older_vol = prev_rows['거래량'].head(15).mean()
+    f['vol_declining'] = 1 if recent_vol < older_vol * 0.7 else 0
+    changes = prev_rows['종가'].diff()
+    gains = changes.where(changes > 0, 0).mean()
+    losses = (-changes.where(changes < 0, 0)).mean()
+    f['rsi'] = gains / (gains + losses) * 100 if gains + losses > 0 else 50
+    f['rsi_overbought'] = 1 if f['rsi'] > 70 else 0
+    recent_5 = df.iloc[idx-4:idx+1]
+    f['consec_bull'] = sum(1 for i in range(len(recent_5)) if recent_5.iloc[i]['종가'] > recent_5.iloc[i]['시가'])
+    ma5_val = df.iloc[idx-4:idx+1]['종가'].mean()
+    ma10_val = df.iloc[idx-9:idx+1]['종가'].mean()
+    ma20_val = df.iloc[idx-19:idx+1]['종가'].mean()
+    f['aligned'] = 1 if c > ma5_val > ma10_val > ma20_val else 0
+    high_20d = prev_rows['고가'].max()
+    low_20d = prev_rows['저가'].min()
+    f['near_high_20d'] = c / high_20d if high_20d > 0 else 0
+    f['from_low_20d'] = (c - low_20d) / low_20d * 100 if low_20d > 0 else 0
+    f['volatility'] = prev_rows['종가'].pct_change().std() * 100
+    f['trade_value'] = row['거래량'] * c / 100000000
+    f['is_surge'] = 1 if f['day_change'] >= 15 else 0
+    prev_prev_close = df.iloc[idx-2]['종가']
+    f['two_day_surge'] = 1 if (c - prev_prev_close) / prev_prev_close * 100 >= 20 else 0
+    return f
+
+
+def _ohlcv(n, seed):
+    rng = np.random.default_rng(seed)
+    close = np.maximum(100, 20000 * np.cumprod(1 + rng.normal(0.002, 0.05, n))).round()
+    open_ = (close * (1 + rng.normal(0, 0.02, n))).round()
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.03, n))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.03, n))
+    volume = rng.integers(100_000, 5_000_000, n)
+    volume[rng.random(n) < 0.03] = 0          # 거래 없는 날
+    high[rng.random(n) < 0.03] = low[0]       # 고가 <= 저가 (비정상 봉)
+    index = pd.bdate_range('2024-11-01', periods=n, name='날짜')
+    return pd.DataFrame({'시가': open_, '고가': high.round(), '저가': low.round(), '종가': close, '거래량': volume},
+                        index=index)
+
+
+@pytest.fixture
+def all_data():
+    return {f"{i:06d}": _ohlcv(n, seed=i) for i, n in enumerate([80, 25, 21, 120, 10, 300])}
+
+
+def test_features_match_per_index(all_data):
+    features = compute_gap_features(build_gap_panel(all_data))
+
+    expected = []
+    for code, df in all_data.items():
+        for idx in range(len(df)):
+            f = _reference_features(df, idx)
+            if f is not None:
+                expected.append({'code': code, 'date': df.index[idx], **f})
+    expected = pd.DataFrame(expected)
+
+    assert list(features[['code', 'date']].itertuples(index=False)) == \
+        list(expected[['code', 'date']].itertuples(index=False))
+    pd.testing.assert_frame_equal(features[GAP_FEATURE_COLUMNS], expected[GAP_FEATURE_COLUMNS],
+                                  check_dtype=False, rtol=1e-9)
+
+
+def test_training_samples_match_script_loop(all_data):
+    samples = gap_training_samples(compute_gap_features(build_gap_panel(all_data)))
+
+    expected = []
+    for df in all_data.values():
+        for i in range(21, len(df) - 1):
+            f = _reference_features(df, i)
+            if f is None or f['trade_value'] < 50 or not (-15 <= f['day_change'] <= 25):
+                continue
+            gap_pct = (df.iloc[i + 1]['시가'] - df.iloc[i]['종가']) / df.iloc[i]['종가'] * 100
+            expected.append({**f, 'gap_up': 1 if gap_pct > 0 else 0})
+    expected = pd.DataFrame(expected)
+
+    assert len(samples) > 0
+    assert list(samples.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(samples, expected, check_dtype=False, rtol=1e-9)
+
+
+def test_latest_matches_live_calc(all_data):
+    target = all_data['000003'].index[-1]
+    latest = latest_gap_features(compute_gap_features(build_gap_panel(all_data)), target)
+
+    # 마지막 날짜가 target 인 종목 중 calc_features 가 None 이 아닌 종목
+    expected_codes = [code for code, df in all_data.items()
+                      if len(df) >= 21 and df.index[-1] == target
+                      and _reference_features(df, len(df) - 1) is not None]
+    assert list(latest['code']) == expected_codes
+    for _, row in latest.iterrows():
+        df = all_data[row['code']]
+        ref = _reference_features(df, len(df) - 1)
+        np.testing.assert_allclose(row[GAP_FEATURE_COLUMNS].to_numpy(dtype=float),
+                                   [ref[c] for c in GAP_FEATURE_COLUMNS], rtol=1e-9)
+
+
+def test_feature_store_roundtrip(tmp_path, all_data):
+    features = compute_gap_features(build_gap_panel(all_data))
+    store = GapFeatureStore(tmp_path)
+
+    paths = store.write(features)
+    assert len(paths) == pd.to_datetime(features['date']).dt.year.nunique() > 1
+
+    pd.testing.assert_frame_equal(store.read(), features)
+
+    part = store.read(start='2025-02-01', end='2025-03-31', columns=['close', 'rsi'])
+    assert list(part.columns) == ['code', 'date', 'close', 'rsi']
+    dates = pd.to_datetime(part['date'])
+    assert dates.min() >= pd.Timestamp('2025-02-01') and dates.max() <= pd.Timestamp('2025-03-31')
@@ -0,0 +1,99 @@
+"""
+지표 공유 컨텍스트 (IndicatorContext) 테스트
+
+테스트 항목:
+1. 컨텍스트 유무와 관계없이 모든 버전 점수 동일
+2. V1~V8 을 한 컨텍스트로 계산하면 지표별 계산 횟수는 1, 나머지는 재사용
+3. 다른 데이터(봉 수/값)의 df 에는 컨텍스트를 적용하지 않음
+4. compare_scores 는 내부적으로 컨텍스트 1개를 공유
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import scoring
+from scoring import SCORING_FUNCTIONS, IndicatorContext, indicators_for
+from scoring.series import ta
+
+VERSIONS = [v for v in SCORING_FUNCTIONS if v != 'v10']  # V10 은 레퍼런스 파일 필요
+
+
+@pytest.fixture
+def ohlcv():
+    rng = np.random.default_rng(7)
+    n = 160
+    close = 10000 * np.exp(np.cumsum(rng.normal(0.001, 0.02, n)))
+    open_ = close * (1 + rng.normal(0, 0.01, n))
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + abs(rng.normal(0, 0.01, n))),
+        'Low': np.minimum(open_, close) * (1 - abs(rng.normal(0, 0.01, n))),
+        'Close': close,
+        'Volume': rng.integers(100000, 1000000, n).astype(float),
+    }, index=pd.bdate_range('2025-01-02', periods=n))
+
+
+def test_scores_identical_with_context(ohlcv):
+    ctx = IndicatorContext(ohlcv, code='000001')
+    for version in VERSIONS:
+        func = SCORING_FUNCTIONS[version]
+        expected = func(ohlcv.copy())
+        assert repr(func(ohlcv.copy(), ctx=ctx)) == repr(expected), version
+
+
+def test_each_indicator_computed_once(ohlcv):
+    ctx = IndicatorContext(ohlcv, code='000001')
+    for version in VERSIONS:
+        SCORING_FUNCTIONS[version](ohlcv.copy(), ctx=ctx)
+
+    stats = ctx.stats()
+    assert stats['code'] == '000001' and stats['bars'] == len(ohlcv)
+    assert set(stats['computed'].values()) == {1}
+    # pandas_ta (V1~V4) 와 순수 pandas (V5~V8) 지표 모두 공유
+    assert stats['reused']['sma(Close, length=20)'] >= 2
+    assert stats['reused']['obv()'] >= 3
+    assert stats['reused']['rolling_mean(Close, 20, min_periods=1)'] >= 3
+    assert stats['reused']['macd(12, 26, 9)'] >= 2
+
+    # 같은 컨텍스트로 다시 돌리면 새로 계산하는 지표 없음
+    before = dict(stats['computed'])
+    SCORING_FUNCTIONS['v6'](ohlcv.copy(), ctx=ctx)
+    assert ctx.stats()['computed'] == before
+
+
+def test_context_ignored_for_other_data(ohlcv):
+    ctx = IndicatorContext(ohlcv)
+    shorter = ohlcv.iloc[1:]
+    changed = ohlcv.copy()
+    changed.iloc[-1, changed.columns.get_loc('Close')] += 1
+
+    assert ctx.matches(ohlcv.copy())
+    assert not ctx.matches(shorter) and not ctx.matches(changed)
+
+    assert repr(SCORING_FUNCTIONS['v7'](changed, ctx=ctx)) == repr(SCORING_FUNCTIONS['v7'](changed))
+    assert ctx.stats()['computed'] == {}
+
+    with ctx.activate():
+        assert indicators_for(ohlcv.copy()) is ctx
+        assert indicators_for(shorter) is not ctx
+        # 다른 데이터의 ta 호출은 캐시하지 않고 직접 계산
+        pd.testing.assert_series_equal(ta.sma(shorter['Close'], length=5),
+                                       shorter['Close'].rolling(5).mean(), check_names=False)
+    assert list(ctx.stats()['computed']) == ['sma']
+
+
+def test_compare_scores_shares_context(ohlcv, monkeypatch):
+    created = []
+    original = scoring.IndicatorContext.__init__
+
+    def tracking_init(self, df, code=None):
+        created.append(self)
+        original(self, df, code)
+
+    monkeypatch.setattr(scoring.IndicatorContext, '__init__', tracking_init)
+    results = scoring.compare_scores(ohlcv)
+
+    assert set(results) == set(SCORING_FUNCTIONS)
+    assert len(created) == 1
+    assert set(created[0].stats()['computed'].values()) == {1}
@@ -0,0 +1,305 @@
+"""
+V3.5 / V6 패턴 감지 NumPy 구현 테스트
+
+테스트 항목:
+1. 쌍봉 / 와이코프 / 매물대 / OBV 다이버전스 = 기존 행 단위 루프 구현 (V3.5)
+2. VCP / OBV 다이버전스 / OBV 기울기 = 기존 구현 (V6)
+3. 헬퍼: 창 최댓값 고점, 스윙 저점 위치
+4. calculate_score_v3_5 가 미리 계산한 OBV / SMA 열을 재사용
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scoring import scoring_v3_5 as v35
+from scoring import scoring_v6 as v6
+from scoring.series import ta
+
+
+def _make_df(seed, n=120):
+    """추세 전환/급락/박스권이 섞인 합성 OHLCV"""
+    rng = np.random.default_rng(seed)
+    style = seed % 3
+    if style == 0:
+        ret = rng.normal(0, 0.03, n)
+    elif style == 1:
+        third = n // 3
+        ret = np.concatenate([rng.normal(0.01, 0.02, third), rng.normal(-0.02, 0.03, third),
+                              rng.normal(0.005, 0.02, n - 2 * third)])
+    else:
+        ret = np.sin(np.arange(n) / 6) * 0.04 + rng.normal(0, 0.01, n)
+    close = np.round(10000 * np.exp(np.cumsum(ret)))
+    high = np.round(close * (1 + rng.uniform(0, 0.03, n)))
+    low = np.round(close * (1 - rng.uniform(0, 0.03, n)))
+    volume = rng.integers(10_000, 1_000_000, n) * (1 + (rng.random(n) < 0.1) * rng.integers(1, 5, n))
+    return pd.DataFrame(
+        {'Open': close, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+        index=pd.bdate_range('2025-01-01', periods=n),
+    )
+
+
+CASES = [_make_df(seed, n=60 + seed * 7 % 80) for seed in range(60)]
+
+
+# ============================================================
+# 기존 구현 (행 단위 iloc 루프)
+# ============================================================
+
+def _reference_double_top(df):
+    result = {'detected': False, 'pattern_type': None, 'severity': None, 'first_peak': 0,
+              'second_peak': 0, 'neckline': 0, 'neckline_broken': False, 'target_price': 0}
+    if len(df) < 60:
+        return result
+    recent = df.tail(60)
+    curr_close = df.iloc[-1]['Close']
+    local_highs = []
+    for i in range(5, len(recent) - 5):
+        window = recent.iloc[i-5:i+6]
+        if recent.iloc[i]['High'] == window['High'].max():
+            local_highs.append({'idx': i, 'price': recent.iloc[i]['High']})
+    if len(local_highs) < 2:
+        return result
+    sorted_highs = sorted(local_highs, key=lambda x: x['price'], reverse=True)
+    first_peak = sorted_highs[0]
+    second_peak = None
+    for peak in sorted_highs[1:]:
+        price_diff = abs(peak['price'] / first_peak['price'] - 1) * 100
+        if price_diff <= 5 and abs(peak['idx'] - first_peak['idx']) >= 10:
+            second_peak = peak
+            break
+    if second_peak is None:
+        return result
+    if first_peak['idx'] > second_peak['idx']:
+        first_peak, second_peak = second_peak, first_peak
+    between = recent.iloc[first_peak['idx']:second_peak['idx']+1]
+    if len(between) < 3:
+        return result
+    neckline = between['Low'].min()
+    result.update(first_peak=first_peak['price'], second_peak=second_peak['price'], neckline=neckline)
+    peak_height = (first_peak['price'] + second_peak['price']) / 2
+    if (peak_height - neckline) / peak_height * 100 < 5:
+        return result
+    result.update(detected=True, pattern_type='double_top', target_price=neckline - (peak_height - neckline))
+    if curr_close < neckline * 0.98:
+        result.update(neckline_broken=True, severity='critical')
+    elif curr_close < neckline * 1.02:
+        result['severity'] = 'high'
+    elif curr_close < second_peak['price'] * 0.95:
+        result['severity'] = 'medium'
+    else:
+        result['severity'] = 'low'
+    return result
+
+
+def _reference_wyckoff_events(df):
+    """detect_wyckoff_phase 의 루프 이벤트 (SC/AR/ST/SPRING/LPS/과거 SOS 위치)"""
+    recent = df.tail(60)
+    vol_ma = recent['Volume'].mean()
+    curr_close = df.iloc[-1]['Close']
+    high_60d = recent['High'].max()
+    events = {}
+
+    sc_idx = None
+    for i in range(10, len(recent) - 5):
+        if (recent.iloc[i]['Close'] / recent.iloc[i-5]['Close'] - 1) * 100 < -10:
+            if recent.iloc[i]['Volume'] > vol_ma * 2:
+                sc_idx = i
+                break
+    events['SC'] = sc_idx
+
+    ar = False
+    if sc_idx is not None:
+        for i in range(sc_idx + 1, min(sc_idx + 10, len(recent))):
+            if (recent.iloc[i]['Close'] / recent.iloc[sc_idx]['Low'] - 1) * 100 > 5:
+                ar = True
+                break
+    events['AR'] = ar
+
+    st = False
+    if ar:
+        sc_low = recent.iloc[sc_idx]['Low']
+        for i in range(sc_idx + 5, len(recent)):
+            if abs(recent.iloc[i]['Low'] / sc_low - 1) * 100 < 3:
+                if recent.iloc[i]['Volume'] < recent.iloc[sc_idx]['Volume'] * 0.7:
+                    st = True
+                    break
+    events['ST'] = st
+
+    support = recent['Low'].quantile(0.1)
+    spring = False
+    for i in range(len(recent) - 10, len(recent)):
+        if recent.iloc[i]['Low'] < support and curr_close > support:
+            spring = True
+            break
+    events['SPRING'] = spring
+
+    lps = False
+    if spring:
+        for i in range(len(recent) - 5, len(recent)):
+            if abs(recent.iloc[i]['Low'] / support - 1) * 100 < 2 and recent.iloc[i]['Close'] > support:
+                lps = True
+                break
+    events['LPS'] = lps
+
+    sos_idx = None
+    for i in range(len(recent) - 20, len(recent) - 3):
+        if recent.iloc[i]['Close'] > high_60d * 0.95 and recent.iloc[i]['Volume'] > vol_ma * 1.5:
+            sos_idx = i
+            break
+    events['SOS'] = sos_idx
+    return events
+
+
+def _reference_volume_by_price(df, bins=20):
+    recent = df.tail(60)
+    price_min, price_max = recent['Low'].min(), recent['High'].max()
+    bin_size = (price_max - price_min) / bins
+    levels = []
+    for i in range(bins):
+        price_low = price_min + (i * bin_size)
+        price_high = price_min + ((i + 1) * bin_size)
+        mask = (recent['Low'] <= price_high) & (recent['High'] >= price_low)
+        levels.append((price_low, price_high, recent.loc[mask, 'Volume'].sum()))
+    return levels
+
+
+def _reference_obv_divergence(df, lookback=30):
+    result = {'detected': False, 'strength': 0, 'days': 0}
+    if len(df) < lookback:
+        return result
+    obv = ta.obv(df['Close'], df['Volume'])
+    df_temp = df.tail(lookback).copy()
+    df_temp['OBV'] = obv.tail(lookback).values
+    price_lows = []
+    for i in range(2, len(df_temp) - 2):
+        low = df_temp['Low']
+        if (low.iloc[i] <= low.iloc[i-1] and low.iloc[i] <= low.iloc[i-2] and
+                low.iloc[i] <= low.iloc[i+1] and low.iloc[i] <= low.iloc[i+2]):
+            price_lows.append((i, low.iloc[i], df_temp['OBV'].iloc[i]))
+    if len(price_lows) >= 2:
+        (prev_i, prev_low, prev_obv), (curr_i, curr_low, curr_obv) = price_lows[-2:]
+        if curr_low < prev_low and curr_obv > prev_obv:
+            result['detected'] = True
+            result['days'] = curr_i - prev_i
+            price_decline = (prev_low - curr_low) / prev_low * 100
+            obv_rise = (curr_obv - prev_obv) / abs(prev_obv) * 100 if prev_obv != 0 else 0
+            result['strength'] = min(100, price_decline + obv_rise)
+    return result
+
+
+def _reference_vcp(df):
+    result = {'detected': False, 'tight': False, 'contraction_pct': 0}
+    if len(df) < 40:
+        return result
+    recent = df.tail(40)
+    ranges = []
+    for i in range(4):
+        period = recent.iloc[i*10:(i+1)*10]
+        ranges.append({'low': period['Low'].min(), 'range': period['High'].max() - period['Low'].min(),
+                       'vol': period['Volume'].mean()})
+    if (ranges[3]['range'] < ranges[0]['range'] * 0.7 and ranges[3]['low'] > ranges[0]['low']
+            and ranges[2]['vol'] < ranges[0]['vol'] * 0.7):
+        result['detected'] = True
+        result['contraction_pct'] = (1 - ranges[3]['range'] / ranges[0]['range']) * 100
+        if ranges[3]['range'] < ranges[0]['range'] * 0.5:
+            result['tight'] = True
+    return result
+
+
+# ============================================================
+# 테스트
+# ============================================================
+
+class TestV35Equivalence:
+    """V3.5 감지기 = 기존 구현"""
+
+    @pytest.mark.parametrize("df", CASES)
+    def test_double_top(self, df):
+        assert v35.detect_double_top_pattern(df) == _reference_double_top(df)
+
+    @pytest.mark.parametrize("df", CASES)
+    def test_wyckoff_events(self, df):
+        events = _reference_wyckoff_events(df)
+        result = v35.detect_wyckoff_phase(df)
+
+        assert ('SC' in result['events']) == (events['SC'] is not None)
+        assert ('AR' in result['events']) == events['AR']
+        assert ('ST' in result['events']) == events['ST']
+        assert ('SPRING' in result['events']) == events['SPRING']
+        assert ('LPS' in result['events']) == events['LPS']
+        if events['SOS'] is not None:
+            assert 'SOS' in result['events']
+
+    @pytest.mark.parametrize("df", CASES)
+    def test_volume_profile(self, df):
+        result = v35.analyze_volume_profile(df)
+        expected = _reference_volume_by_price(df)
+
+        levels = [(lv['price_low'], lv['price_high'], lv['volume']) for lv in result['price_levels']]
+        assert levels == expected
+        total = sum(volume for _, _, volume in expected)
+        assert [lv['volume_pct'] for lv in result['price_levels']] == [v / total * 100 for _, _, v in expected]
+
+    @pytest.mark.parametrize("df", CASES)
+    def test_obv_divergence(self, df):
+        assert v35.detect_obv_divergence(df) == _reference_obv_divergence(df)
+
+    def test_cases_cover_detections(self):
+        """합성 데이터가 감지/미감지 양쪽을 모두 포함하는지"""
+        assert 0 < sum(_reference_double_top(df)['detected'] for df in CASES) < len(CASES)
+        assert 0 < sum(_reference_obv_divergence(df)['detected'] for df in CASES) < len(CASES)
+        assert any(_reference_wyckoff_events(df)['SC'] is not None for df in CASES)
+
+
+class TestV6Equivalence:
+    """V6 감지기 = 기존 구현"""
+
+    @pytest.mark.parametrize("df", CASES)
+    def test_vcp(self, df):
+        assert v6._detect_vcp_pattern(df) == _reference_vcp(df)
+
+    @pytest.mark.parametrize("df", CASES)
+    def test_obv_divergence_and_slope(self, df):
+        ind = v6._calculate_indicators(df)
+        recent = ind.tail(20)
+        price_change = (recent.iloc[-1]['Close'] - recent.iloc[0]['Close']) / recent.iloc[0]['Close'] * 100
+        obv_change = recent.iloc[-1]['obv'] - recent.iloc[0]['obv']
+
+        result = v6._analyze_obv_divergence(ind)
+        assert result['obv_rising'] == (obv_change > 0)
+        assert result['strong_bullish_div'] == (price_change < -5 and obv_change > 0)
+        assert result['bullish_div'] == (-5 <= price_change < 0 and obv_change > 0)
+
+        start, end = ind['obv'].iloc[-10], ind['obv'].iloc[-1]
+        expected = 0 if start == 0 else (end - start) / abs(start) * 100
+        assert v6._calculate_obv_slope(ind) == expected
+
+
+class TestHelpers:
+    def test_rolling_peak_indices(self):
+        values = np.array([1, 3, 2, 5, 4, 4, 1, 2, 6, 0, 1], dtype=float)
+        assert list(v35._rolling_peak_indices(values, 1)) == [1, 3, 5, 8]  # 같은 값도 고점
+        assert list(v35._rolling_peak_indices(values, 2)) == [3, 8]
+        assert len(v35._rolling_peak_indices(values[:3], 2)) == 0
+
+    def test_swing_low_indices(self):
+        values = np.array([5, 4, 3, 4, 5, 2, 2, 6, 7], dtype=float)
+        assert list(v35._swing_low_indices(values, 1)) == [2, 5, 6]
+        assert list(v35._swing_low_indices(values, 2)) == [2, 5, 6]
+
+
+def test_score_reuses_base_indicators(monkeypatch):
+    """OBV 는 calculate_score_v3_5 에서 1번만 계산"""
+    calls = []
+    original = ta.obv
+
+    def counting_obv(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(v35.ta, "obv", counting_obv)
+    for df in CASES[:10]:
+        calls.clear()
+        if v35.calculate_score_v3_5(df) is not None:
+            assert len(calls) == 1
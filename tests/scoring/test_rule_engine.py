@@ -0,0 +1,139 @@
+"""
+YAML 규칙 컴파일 + 전 종목 일괄 채점 테스트
+
+테스트 항목:
+1. 조건식 컴파일: 연쇄 비교, 산술, AND/OR 우선순위, _prev 대체, 없는 지표/None 처리
+2. 컴파일 규칙(패널) = ScoringConfig.calculate_all_scores(종목별 딕셔너리)
+3. score_universe('v2') = calculate_score_v2 (점수/그룹 점수/신호)
+4. score_universe('v4') = calculate_score_v4 (수급 데이터 유무 포함)
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scoring import ScoringCycle, scoring_v2, scoring_v4
+from scoring.config import compile_condition, load_scoring_config
+from scoring.rule_scoring import build_rule_panel, score_universe
+
+
+def _make(seed, n=130):
+    rng = np.random.default_rng(seed)
+    drift = rng.choice([-0.006, -0.002, 0.0, 0.003, 0.008])
+    close = rng.choice([1500, 12000, 80000]) * np.exp(
+        np.cumsum(rng.normal(drift, rng.choice([0.01, 0.025, 0.04]), n)))
+    open_ = close * (1 + rng.normal(0, 0.01, n))
+    volume = rng.integers(10_000, 3_000_000, n).astype(float)
+    volume[-1] *= rng.choice([0.5, 1, 1.6, 2.2, 2.7, 3.5, 6])
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + abs(rng.normal(0, 0.015, n))),
+        'Low': np.minimum(open_, close) * (1 - abs(rng.normal(0, 0.015, n))),
+        'Close': close,
+        'Volume': volume,
+    }, index=pd.bdate_range('2025-01-02', periods=n))
+
+
+@pytest.fixture(scope='module')
+def frames():
+    return {f"{i:06d}": _make(i) for i in range(24)}
+
+
+@pytest.fixture
+def no_projection():
+    """장중 예상 거래량은 기준 시각에 따라 달라지므로 장 마감 후 시점으로 고정"""
+    with ScoringCycle(datetime(2025, 7, 1, 18, 0)).activate():
+        yield
+
+
+def _assert_same(result, code, expected):
+    row = result.loc[code]
+    assert row['score'] == expected['score'], code
+    assert row['signals'] == expected['signals'], code
+    if not row['disqualified']:
+        for column in [c for c in result.columns if c.endswith('_score')]:
+            assert row[column] == expected[column], (code, column)
+
+
+class TestCompileCondition:
+
+    def test_operators(self):
+        ind = {'SMA_5': 3, 'SMA_20': 2, 'SMA_60': 1, 'close': 97, 'high_60d': 100, 'RSI': 65}
+        assert compile_condition("SMA_5 > SMA_20 > SMA_60").evaluate(ind)
+        assert not compile_condition("SMA_5 < SMA_20 < SMA_60").evaluate(ind)
+        assert compile_condition("close >= high_60d * 0.97").evaluate(ind)
+        assert not compile_condition("close >= high_60d - 2").evaluate(ind)
+        assert compile_condition("60 <= RSI <= 75").evaluate(ind)
+        # AND 가 OR 보다 우선
+        assert compile_condition("RSI > 90 AND RSI < 0 OR close > 0").evaluate(ind)
+        assert not compile_condition("RSI > 90 AND (RSI < 0 OR close > 0)").evaluate(ind)
+
+    def test_missing_and_prev(self):
+        cond = compile_condition("RSI > RSI_prev")
+        assert not cond.evaluate({'RSI': 70})               # RSI_prev 없으면 RSI 로 대체
+        assert cond.evaluate({'RSI': 70, 'RSI_prev': 60})
+        assert compile_condition("VOL_RATIO >= 0").evaluate({})   # 없는 지표 = 0
+        assert not compile_condition("MACD > -1").evaluate({'MACD': None})
+        assert cond.variables == {'RSI', 'RSI_prev'}
+        assert compile_condition("RSI > RSI_prev") is cond  # 1번만 파싱
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            compile_condition("RSI >> 3")
+
+
+@pytest.mark.parametrize("version", ['v2', 'v4'])
+def test_panel_matches_dict_evaluation(version):
+    config = load_scoring_config(version)
+    rng = np.random.default_rng(3)
+    columns = config.compile().variables
+    panel = pd.DataFrame(rng.normal(0, 50, (200, len(columns))), columns=columns,
+                         index=[f"{i:06d}" for i in range(200)])
+    panel['TRADING_VALUE'] = rng.choice([5e8, 2e9, 5e9, 2e10, 8e10], 200)
+    panel.iloc[::7, 0] = np.nan
+
+    result = config.compile().evaluate(panel)
+    for code, row in panel.iterrows():
+        expected = config.calculate_all_scores(row.to_dict())
+        got = result.loc[code]
+        assert got['score'] == expected['score']
+        assert got['signals'] == expected['signals']
+        assert bool(got['disqualified']) == expected['disqualified']
+        for column, value in expected['groups'].items():
+            assert got[column] == value
+
+
+def test_v2_parity(frames, no_projection):
+    result = score_universe(frames, 'v2')
+    assert set(result.index) == set(frames)
+    for code, df in frames.items():
+        _assert_same(result, code, scoring_v2.calculate_score_v2(df.copy()))
+    assert result['disqualified'].any() and (result['score'] > 0).any()
+
+
+def test_v4_parity(frames):
+    investor = {}
+    for i, code in enumerate(frames):
+        if i % 3:
+            investor[code] = {
+                'foreign_net': (i % 5 - 2) * 100,
+                'institution_net': (i % 4 - 1) * 50,
+                'daily': [{'foreign_net': 1 if (i + k) % 3 else -1} for k in range(i % 5)],
+            }
+
+    result = score_universe(frames, 'v4', investor_data=investor)
+    for code, df in frames.items():
+        _assert_same(result, code, scoring_v4.calculate_score_v4(df.copy(), investor.get(code)))
+
+    signals = {s for row in result['signals'] for s in row}
+    assert {'INST_FOREIGN_BUY', 'INST_FOREIGN_SELL'} <= signals
+
+    # 지표 패널은 한 번만 만들고 규칙만 바꿔 재채점 (A/B)
+    panel = build_rule_panel(frames, 'v4', investor_data=investor)
+    trial = load_scoring_config('v4')
+    trial.scoring_groups['supply'].rules[0].score = 0
+    rescored = trial.compile().evaluate(panel)
+    surged = result['signals'].apply(lambda s: 'VOLUME_2.5X' in s)
+    assert (rescored.loc[~surged, 'score'] == result.loc[~surged, 'score']).all()
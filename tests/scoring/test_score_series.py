@@ -0,0 +1,98 @@
+"""
+전 구간 점수 시계열 테스트
+
+테스트 항목:
+1. 날짜별로 잘라서 호출한 calculate_score_vX 와 동일한 결과
+2. 60일 미만 구간은 NaN
+3. start/end 범위 지정
+4. PrefixTA 프록시: 컨텍스트 밖에서는 pandas_ta 그대로
+"""
+
+import pytest
+
+from scoring import SCORING_FUNCTIONS, calculate_score_series
+from scoring.series import ta, iter_score_series
+
+
+def _point_in_time(df, version, start):
+    func = SCORING_FUNCTIONS[version]
+    results = []
+    for i in range(start, len(df)):
+        results.append(func(df.iloc[:i + 1].copy()))
+    return results
+
+
+class TestScoreSeriesEquivalence:
+    """날짜별 재계산과 동일성 검증"""
+
+    @pytest.mark.parametrize("version", ['v2', 'v4', 'v6', 'v7'])
+    def test_matches_point_in_time(self, sample_ohlcv_df, version):
+        """전 구간 시계열 = 날짜별 df[:날짜] 로 계산한 점수"""
+        df = sample_ohlcv_df
+        start = 80
+        series = calculate_score_series(df, version, start=df.index[start])
+        expected = _point_in_time(df, version, start)
+
+        assert list(series.index) == list(df.index[start:])
+        for (_, row), exp in zip(series.iterrows(), expected):
+            if exp is None:
+                assert row['result'] is None
+            else:
+                assert row['score'] == exp['score']
+                assert row['signals'] == exp['signals']
+
+    def test_short_prefix_is_nan(self, sample_ohlcv_df):
+        """60일 미만 구간은 점수 없음"""
+        series = calculate_score_series(sample_ohlcv_df, 'v2')
+        assert series['score'].iloc[:59].isna().all()
+        assert series['score'].iloc[59:].notna().any()
+
+    def test_date_range(self, sample_ohlcv_df):
+        """start/end 범위의 날짜만 반환"""
+        df = sample_ohlcv_df
+        series = calculate_score_series(df, 'v1', start=df.index[70], end=df.index[75])
+        assert list(series.index) == list(df.index[70:76])
+
+    def test_unknown_version(self, sample_ohlcv_df):
+        with pytest.raises(ValueError):
+            calculate_score_series(sample_ohlcv_df, 'v99')
+
+
+class TestPrefixTA:
+    """pandas_ta 프록시"""
+
+    def test_passthrough_outside_context(self, sample_ohlcv_df):
+        """컨텍스트 밖에서는 pandas_ta 결과 그대로"""
+        import pandas_ta
+        close = sample_ohlcv_df['Close']
+        assert ta.sma(close, length=5).equals(pandas_ta.sma(close, length=5))
+
+    def test_prefix_slices_reused(self, sample_ohlcv_df):
+        """접두 구간 호출은 전체 결과를 잘라서 반환 (직접 계산과 동일)"""
+        import pandas_ta
+        df = sample_ohlcv_df
+        with ta.full_history(df) as state:
+            for n in (30, 50, 70):
+                close = df['Close'].iloc[:n].copy()
+                result = ta.rsi(close, length=14)
+                assert result.equals(pandas_ta.rsi(close, length=14))
+        assert state.stats["sliced"] >= 1
+
+    def test_modified_input_not_reused(self, sample_ohlcv_df):
+        """값이 다른 Series 는 직접 계산"""
+        import pandas_ta
+        df = sample_ohlcv_df
+        with ta.full_history(df) as state:
+            close = df['Close'].iloc[:70] * 2
+            result = ta.sma(close, length=5)
+        assert result.equals(pandas_ta.sma(close, length=5))
+        assert state.stats["sliced"] == 0
+
+    def test_prepare_failure_yields_none(self, sample_ohlcv_df):
+        """지표 패널 계산 실패 시 모든 날짜 None"""
+        def bad_prepare(df):
+            raise ValueError("boom")
+
+        results = list(iter_score_series(sample_ohlcv_df, lambda d: {'score': 1},
+                                         prepare=bad_prepare, start=sample_ohlcv_df.index[-3]))
+        assert [r for _, r in results] == [None, None, None]
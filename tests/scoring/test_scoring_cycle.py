@@ -0,0 +1,104 @@
+"""
+스코어링 사이클 (ScoringCycle) 테스트
+
+테스트 항목:
+1. 예상 거래량 배수: 장 전/장 초반/장중/장 마감 후 (기존 공식과 동일)
+2. 시장 지수 등락 조회 (KOSPI/KOSDAQ)
+3. 같은 사이클이면 실행 시각과 무관하게 V2 점수 동일 (과거 장중 재현)
+4. ctx 에 실은 사이클은 스레드풀 작업자 안에서도 적용
+5. at(): 시장 지수는 유지하고 기준 시각만 변경
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scoring import IndicatorContext, ScoringCycle, calculate_score_v2, current_cycle
+from scoring.indicators import calculate_projected_volume
+
+DAY = datetime(2026, 1, 20)
+
+
+def _at(hour, minute=0, **kwargs):
+    return ScoringCycle(DAY.replace(hour=hour, minute=minute), **kwargs)
+
+
+@pytest.fixture
+def ohlcv():
+    rng = np.random.default_rng(11)
+    n = 130
+    close = 20000 * np.exp(np.cumsum(rng.normal(0.004, 0.015, n)))
+    open_ = close * (1 + rng.normal(0, 0.01, n))
+    volume = rng.integers(200000, 800000, n).astype(float)
+    volume[-1] = 300000
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + abs(rng.normal(0, 0.01, n))),
+        'Low': np.minimum(open_, close) * (1 - abs(rng.normal(0, 0.01, n))),
+        'Close': close,
+        'Volume': volume,
+    }, index=pd.bdate_range('2025-06-02', periods=n))
+
+
+@pytest.mark.parametrize("hour, minute, factor", [
+    (8, 30, 1.0),                 # 장 전
+    (9, 0, 390 / 1 * 0.7),        # 개장 직후 (최소 1분)
+    (9, 30, 390 / 30 * 0.7),      # 장 초반 보정
+    (11, 0, 390 / 120),
+    (15, 29, 390 / 389),
+    (15, 30, 1.0),                # 장 마감 후
+])
+def test_projection_factor(hour, minute, factor):
+    cycle = _at(hour, minute)
+    assert cycle.projection_factor == pytest.approx(factor)
+    assert cycle.project_volume(100000) == (int(100000 * factor) if cycle.in_session else 100000)
+    assert 0.0 <= cycle.session_fraction <= 1.0
+
+
+def test_index_change():
+    cycle = _at(10, market_index={'kospi': 0.5, 'kosdaq': -1.2})
+    assert cycle.index_change('KOSPI') == 0.5
+    assert cycle.index_change('KOSDAQ GLOBAL') == -1.2
+    assert _at(10).index_change('KOSDAQ') == 0.0
+
+
+def test_replay_independent_of_wall_clock(ohlcv, monkeypatch):
+    cycle = _at(10)
+    expected = calculate_score_v2(ohlcv.copy(), ctx=IndicatorContext(ohlcv, cycle=cycle))
+    assert expected['indicators']['volume_ratio'] == pytest.approx(
+        calculate_projected_volume(ohlcv, cycle)[1], rel=1e-6)
+
+    # 벽시계가 바뀌어도 (장 마감 후) 같은 사이클이면 같은 점수
+    monkeypatch.setattr(ScoringCycle, 'now', classmethod(lambda cls, market_index=None: _at(20)))
+    with cycle.activate():
+        assert repr(calculate_score_v2(ohlcv.copy())) == repr(expected)
+    assert repr(calculate_score_v2(ohlcv.copy())) != repr(expected)
+
+
+def test_cycle_carried_to_worker_threads(ohlcv):
+    cycle = _at(9, 45)
+    other = ohlcv.iloc[1:]
+
+    def work(df):
+        ctx = IndicatorContext(ohlcv, cycle=cycle)
+        result = calculate_score_v2(df, ctx=ctx)   # df 가 달라도 사이클은 적용
+        return result['indicators']['volume_ratio'], current_cycle() is cycle
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(work, [ohlcv.copy(), other]))
+
+    for (ratio, leaked), df in zip(results, [ohlcv, other]):
+        assert not leaked
+        assert ratio == pytest.approx(calculate_projected_volume(df, cycle)[1], rel=1e-6)
+
+
+def test_at_rebases_as_of():
+    cycle = _at(9, 5, market_index={'kospi': 0.4})
+    fetched = cycle.at(DAY.replace(hour=9, minute=20))
+    assert fetched.market_index == {'kospi': 0.4}
+    assert fetched.elapsed_minutes == 20
+    assert fetched.projection_factor == pytest.approx(390 / 20 * 0.7)
+    assert cycle.elapsed_minutes == 5
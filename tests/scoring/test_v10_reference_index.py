@@ -0,0 +1,103 @@
+"""
+V10 레퍼런스 컴파일 (CSR 인접 배열) 테스트
+
+테스트 항목:
+1. get_follower_opportunities = 기존 중첩 dict 루프 구현 (순서 포함)
+2. get_correlation = follower_to_leaders 선형 탐색
+3. set_reference 교체 시 인덱스 재컴파일
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scoring import score_v10_leader_follower as v10
+from scoring.correlation_engine import build_reference_map
+
+
+@pytest.fixture
+def reference():
+    rng = np.random.default_rng(11)
+    codes = [f"{i:06d}" for i in range(40)]
+    rows = []
+    for _ in range(300):
+        a, b = rng.choice(40, 2, replace=False)
+        leader, follower = (codes[a], codes[b]) if a < b else (codes[b], codes[a])
+        rows.append({
+            'leader_code': leader, 'leader_name': f"대장{leader[-2:]}", 'leader_cap': 0,
+            'follower_code': follower, 'follower_name': f"종속{follower[-2:]}", 'follower_cap': 0,
+            'correlation': round(float(rng.uniform(0.5, 0.95)), 2), 'cap_ratio': 0.5,
+        })
+    classified = pd.DataFrame(rows).drop_duplicates(['leader_code', 'follower_code'])
+    classified = classified.sort_values('correlation', ascending=False)
+    ref = build_reference_map(classified, min_corr=0.5)
+    v10.set_reference(ref)
+    yield ref
+    v10.set_reference(None)
+
+
+def _loop_opportunities(ref, today_changes, min_leader_change, max_follower_change):
+    """score_v10_leader_follower.get_follower_opportunities (기존)"""
+    opportunities = []
+    for leader_code, followers in ref.get('leader_to_followers', {}).items():
+        leader_change = today_changes.get(leader_code, 0)
+        if leader_change < min_leader_change:
+            continue
+        leader_name = leader_code
+        for pair in ref.get('all_pairs', []):
+            if pair['leader_code'] == leader_code:
+                leader_name = pair['leader_name']
+                break
+        for follower in followers:
+            follower_change = today_changes.get(follower['code'], 0)
+            if follower_change > max_follower_change:
+                continue
+            gap = leader_change - follower_change
+            correlation = follower['correlation']
+            score = 40
+            score += 20 if leader_change >= 10 else 16 if leader_change >= 7 else 12 if leader_change >= 5 \
+                else 8 if leader_change >= 3 else 0
+            score += 25 if correlation >= 0.8 else 20 if correlation >= 0.7 else 14 if correlation >= 0.6 \
+                else 8 if correlation >= 0.5 else 0
+            score += 15 if gap >= 8 else 12 if gap >= 6 else 8 if gap >= 4 else 4 if gap >= 2 else 0
+            opportunities.append({
+                'follower_code': follower['code'], 'follower_name': follower['name'],
+                'follower_change': follower_change, 'leader_code': leader_code, 'leader_name': leader_name,
+                'leader_change': leader_change, 'correlation': correlation, 'catchup_gap': gap,
+                'score': int(min(100, score)),
+            })
+    opportunities.sort(key=lambda x: (-x['score'], -x['catchup_gap']))
+    return opportunities
+
+
+def test_opportunities_match_loop(reference):
+    rng = np.random.default_rng(5)
+    codes = [f"{i:06d}" for i in range(40)]
+    for _ in range(5):
+        today_changes = {c: float(np.round(rng.normal(1, 4), 1)) for c in codes if rng.random() > 0.1}
+        result = v10.get_follower_opportunities(today_changes, min_leader_change=2.0, max_follower_change=2.0)
+        expected = _loop_opportunities(reference, today_changes, 2.0, 2.0)
+        assert result == expected
+
+    series = pd.Series(today_changes)
+    assert v10.get_follower_opportunities(series, 2.0, 2.0) == expected
+
+
+def test_correlation_lookup(reference):
+    for follower, leaders in reference['follower_to_leaders'].items():
+        for leader in leaders:
+            assert v10.get_correlation(leader['leader_code'], follower) == leader['correlation']
+    assert v10.get_correlation('999999', '000001') == 0.0
+
+
+def test_set_reference_recompiles(reference):
+    index = v10.get_reference_index()
+    assert v10.get_reference_index() is index
+
+    v10.set_reference({'leader_to_followers': {'000001': [{'code': '000002', 'name': 'B', 'correlation': 0.9}]},
+                       'all_pairs': [{'leader_code': '000001', 'leader_name': 'A'}]})
+    index = v10.get_reference_index()
+    assert list(index.codes) == ['000001', '000002']
+    assert index.indptr.tolist() == [0, 1]
+    opps = v10.get_follower_opportunities({'000001': 5.0, '000002': 0.0})
+    assert [(o['leader_name'], o['follower_name'], o['score']) for o in opps] == [('A', 'B', 40 + 12 + 25 + 8)]
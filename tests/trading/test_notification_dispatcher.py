@@ -0,0 +1,302 @@
+"""
+알림 디스패처 (SQLite 큐) 테스트
+
+테스트 항목:
+1. enqueue_push: 구독별 큐 적재, 디스패처가 전송 후 sent 처리
+2. 일시 오류 재시도 (백오프) / 최대 시도 초과 시 failed
+3. 만료 구독(GONE) 일괄 삭제 + 구독 없는 사용자 푸시 비활성화
+4. claim 중복 방지 + lease 만료 건 회수
+5. QueuedTelegramNotifier 는 네트워크 호출 없이 큐 적재만 (봇 토큰은 참조만 저장)
+6. 유효 시간이 지난 알림은 보내지 않고 expired
+7. 실행 중인 디스패처가 없으면 enqueue 한 프로세스가 백그라운드 디스패처 시작
+   (느린 전송 중에도 enqueue 는 바로 반환)
+8. alert_history 는 전송 성공 시에만 기록 (여러 기기여도 1건)
+9. 해석할 수 없는 토큰 참조의 텔레그램 건은 확보하지 않고 대기로 남김
+"""
+
+import threading
+import time
+
+import pytest
+
+from database.db_manager import DatabaseManager
+from trading.notifications import QueuedTelegramNotifier
+from trading.notifications import dispatcher as dispatcher_module
+from trading.notifications.dispatcher import (
+    GONE,
+    RETRY,
+    SENT,
+    NotificationDispatcher,
+    NotificationQueue,
+    TelegramProvider,
+    bot_token_ref,
+    enqueue_push,
+    enqueue_telegram,
+)
+
+
+class FakeProvider:
+    """채널 결과를 스크립트대로 반환"""
+
+    rate = 1000.0
+
+    def __init__(self, channel, results=None):
+        self.channel = channel
+        self.results = results or {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def send(self, job):
+        with self._lock:
+            self.calls.append(job['target'])
+            script = self.results.get(job['target'], [SENT])
+            result = script.pop(0) if len(script) > 1 else script[0]
+        return result, None if result == SENT else "error", None
+
+
+class SlowProvider(FakeProvider):
+    """전송마다 delay 초 지연 (느린 푸시 서버/텔레그램 API)"""
+
+    def __init__(self, channel, delay):
+        super().__init__(channel)
+        self.delay = delay
+
+    def send(self, job):
+        time.sleep(self.delay)
+        return super().send(job)
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(tmp_path / "notify.db")
+    for i in range(2):
+        db.create_user(f"n{i}@example.com", f"notify{i}", "hash", f"사용자{i}")
+    db.add_push_subscription(1, "https://push/a", "p1", "a1")
+    db.add_push_subscription(1, "https://push/b", "p2", "a2")
+    db.add_push_subscription(2, "https://push/c", "p3", "a3")
+    return db
+
+
+@pytest.fixture
+def queue(db, monkeypatch):
+    queue = NotificationQueue(db.db_path)
+    monkeypatch.setattr(dispatcher_module, '_queue', queue)
+    monkeypatch.setattr(dispatcher_module, '_dispatcher', None)
+    monkeypatch.setattr(queue, 'dispatcher_alive', lambda timeout=None: True)  # 전송은 테스트가 직접
+    return queue
+
+
+def _dispatcher(queue, db, provider, **kwargs):
+    return NotificationDispatcher(queue, providers={provider.channel: provider}, db=db, **kwargs)
+
+
+def test_enqueue_and_dispatch(db, queue):
+    assert enqueue_push(db, 1, "매수 체결", "삼성전자 10주", url="/stock/005930") == 2
+    assert enqueue_push(db, 2, "매도 체결", "SK하이닉스 5주") == 1
+    assert queue.stats()['pending'] == 3
+    assert queue.stats()['lag'] >= 0
+
+    provider = FakeProvider("webpush")
+    dispatcher = _dispatcher(queue, db, provider)
+    assert dispatcher.drain() == 3
+
+    assert sorted(provider.calls) == ["https://push/a", "https://push/b", "https://push/c"]
+    stats = dispatcher.stats()
+    assert stats['queue']['sent'] == 3 and stats['queue']['pending'] == 0
+    assert stats['queue']['lag'] == 0.0
+    assert stats['dispatcher']['sent'] == 3
+    dispatcher.stop()
+
+
+def test_retry_with_backoff_then_fail(db, queue):
+    enqueue_push(db, 1, "t", "b")
+    provider = FakeProvider("webpush", {"https://push/b": [RETRY]})
+
+    dispatcher = _dispatcher(queue, db, provider, backoff_base=60)
+    assert dispatcher.run_once() == 2
+    assert queue.stats()['pending'] == 1 and queue.stats()['sent'] == 1
+    assert dispatcher.run_once() == 0  # 백오프 대기 중
+
+    dispatcher = _dispatcher(queue, db, provider, backoff_base=0, max_attempts=3)
+    with dispatcher_module.pooled_connection(queue.db_path) as conn:
+        conn.execute("UPDATE notification_queue SET next_attempt_at = 0 WHERE status = 'pending'")
+    dispatcher.drain()
+
+    stats = queue.stats()
+    assert stats['sent'] == 1 and stats['failed'] == 1
+    assert provider.calls.count("https://push/b") == 3
+    dispatcher.stop()
+
+
+def test_gone_subscriptions_pruned(db, queue):
+    enqueue_push(db, 1, "t", "b")
+    enqueue_push(db, 2, "t", "b")
+    provider = FakeProvider("webpush", {"https://push/a": [GONE], "https://push/c": [GONE]})
+
+    dispatcher = _dispatcher(queue, db, provider)
+    dispatcher.drain()
+
+    assert dispatcher.stats()['dispatcher']['pruned'] == 2
+    assert [s['endpoint'] for s in db.get_all_push_subscriptions_for_user(1)] == ["https://push/b"]
+    assert db.get_push_settings(1)['enabled'] is True
+    assert db.get_push_settings(2) == {'enabled': False, 'subscription_count': 0}
+    dispatcher.stop()
+
+
+def test_claim_is_exclusive_and_lease_expires(db, queue):
+    enqueue_push(db, 1, "t", "b")
+    other = NotificationQueue(db.db_path)
+
+    first = queue.claim(limit=10, lease=60)
+    assert len(first) == 2
+    assert other.claim(limit=10) == []
+
+    # 전송 중 프로세스가 죽은 경우 - lease 만료 후 회수
+    with dispatcher_module.pooled_connection(queue.db_path) as conn:
+        conn.execute("UPDATE notification_queue SET lease_until = 0")
+    assert [job['id'] for job in other.claim(limit=10)] == [job['id'] for job in first]
+
+
+def test_queued_telegram_does_not_block(db, queue, monkeypatch):
+    def fail_post(*args, **kwargs):
+        raise AssertionError("매매 루프에서 네트워크 호출")
+
+    monkeypatch.setattr("trading.notifications.push_notifier.requests.post", fail_post)
+    notifier = QueuedTelegramNotifier(bot_token="token", chat_id="123")
+    assert notifier.send_buy_alert("005930", "삼성전자", 10, 70000) is True
+
+    jobs = queue.claim()
+    assert len(jobs) == 1
+    assert jobs[0]['channel'] == "telegram" and jobs[0]['target'] == "123"
+    assert "삼성전자" in jobs[0]['payload']['text']
+    assert 'bot_token' not in jobs[0]['payload']
+    assert "token" not in str(jobs[0]['payload'].values())
+    assert jobs[0]['payload']['token_ref'] == bot_token_ref("token")
+
+
+def test_telegram_token_resolved_from_config(monkeypatch):
+    monkeypatch.setattr(dispatcher_module, '_bot_tokens', {})
+    provider = TelegramProvider(bot_token="env-token")
+    assert provider.resolve_token(None) == "env-token"
+    assert provider.resolve_token(bot_token_ref("env-token")) == "env-token"
+    assert provider.resolve_token(bot_token_ref("other")) is None
+
+    dispatcher_module.register_bot_token("other")
+    assert provider.resolve_token(bot_token_ref("other")) == "other"
+
+    assert set(provider.token_refs()) == {bot_token_ref("env-token"), bot_token_ref("other")}
+
+    # 다른 프로세스가 등록한 토큰일 수 있음 - 영구 실패가 아닌 재시도
+    result, error, retry_after = provider.send({'target': "1", 'payload': {'text': "t", 'token_ref': "unknown"}})
+    assert result == RETRY and retry_after == dispatcher_module.UNRESOLVED_TOKEN_RETRY
+
+
+def test_unresolvable_token_ref_left_pending(db, queue, monkeypatch):
+    monkeypatch.setattr(dispatcher_module, '_bot_tokens', {})
+    queue.enqueue("telegram", "1", {'text': "트레이더 토큰", 'token_ref': bot_token_ref("trader-token")})
+    queue.enqueue("telegram", "2", {'text': "기본 토큰"})
+
+    provider = TelegramProvider(bot_token="api-token")
+    sent = []
+    monkeypatch.setattr(provider, 'send', lambda job: (sent.append(job['target']), (SENT, None, None))[1])
+    dispatcher = NotificationDispatcher(queue, providers={"telegram": provider}, db=db)
+    assert dispatcher.drain() == 1
+    assert sent == ["2"]
+    assert queue.stats()['pending'] == 1   # 토큰을 등록한 프로세스의 디스패처 몫
+
+    # 토큰을 가진 프로세스는 확보
+    dispatcher_module.register_bot_token("trader-token")
+    assert dispatcher.drain() == 1
+    assert sent == ["2", "1"]
+    dispatcher.stop()
+
+
+def test_expired_alerts_not_sent(db, queue):
+    enqueue_push(db, 1, "매수 체결", "삼성전자", ttl=60)
+    enqueue_push(db, 2, "매도 체결", "SK하이닉스", ttl=None)
+    with dispatcher_module.pooled_connection(queue.db_path) as conn:
+        conn.execute("UPDATE notification_queue SET expires_at = 1 WHERE expires_at IS NOT NULL")
+
+    provider = FakeProvider("webpush")
+    dispatcher = _dispatcher(queue, db, provider)
+    assert dispatcher.drain() == 1
+
+    assert provider.calls == ["https://push/c"]
+    stats = dispatcher.stats()
+    assert stats['queue']['expired'] == 2 and stats['queue']['sent'] == 1
+    assert stats['dispatcher']['expired'] == 2
+    dispatcher.stop()
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_background_delivery_without_dispatcher(db, queue, monkeypatch):
+    provider = FakeProvider("webpush")
+    local = _dispatcher(queue, db, provider)
+    monkeypatch.setattr(dispatcher_module, 'get_dispatcher', lambda: local)
+    monkeypatch.setattr(dispatcher_module, '_exit_drain_registered', True)
+
+    # 다른 프로세스의 디스패처가 살아 있으면 적재만
+    enqueue_push(db, 2, "t", "b")
+    assert queue.stats()['pending'] == 1 and not local.running
+
+    monkeypatch.setattr(queue, 'dispatcher_alive', lambda timeout=None: False)
+    try:
+        assert enqueue_push(db, 2, "t", "b") == 1
+        assert local.running
+        assert _wait_for(lambda: queue.stats()['sent'] == 2)
+        assert provider.calls == ["https://push/c", "https://push/c"]
+    finally:
+        local.stop()
+
+
+def test_enqueue_returns_while_slow_provider_sends(db, queue, monkeypatch):
+    provider = SlowProvider("telegram", delay=1.0)
+    local = _dispatcher(queue, db, provider)
+    monkeypatch.setattr(dispatcher_module, 'get_dispatcher', lambda: local)
+    monkeypatch.setattr(dispatcher_module, '_exit_drain_registered', True)
+    monkeypatch.setattr(queue, 'dispatcher_alive', lambda timeout=None: False)
+
+    try:
+        started = time.perf_counter()
+        assert enqueue_telegram("123", "매수 체결: 삼성전자 10주") == 1
+        assert time.perf_counter() - started < 0.5   # 전송(1초)을 기다리지 않음
+        assert provider.calls == []
+
+        assert _wait_for(lambda: queue.stats()['sent'] == 1)
+        assert provider.calls == ["123"]
+    finally:
+        local.stop()
+
+
+def test_heartbeat(db, tmp_path):
+    queue = NotificationQueue(db.db_path)
+    assert queue.dispatcher_alive() is False
+    queue.heartbeat("worker-1")
+    assert queue.dispatcher_alive() is True
+    assert queue.dispatcher_alive(timeout=0) is False
+    queue.clear_heartbeat("worker-1")
+    assert queue.dispatcher_alive() is False
+
+
+def test_alert_history_recorded_on_delivery(db, queue):
+    history = {'user_id': 1, 'stock_code': "005930", 'stock_name': "삼성전자",
+               'alert_type': "손실률 -5% 돌파", 'message': "현재가: 70,000원"}
+    enqueue_push(db, 1, "삼성전자", "현재가: 70,000원", history=history)
+    assert db.get_alert_history(1) == []
+
+    provider = FakeProvider("webpush", {"https://push/a": [GONE]})
+    dispatcher = _dispatcher(queue, db, provider)
+    dispatcher.drain()
+
+    records = db.get_alert_history(1)
+    assert len(records) == 1 and records[0]['stock_code'] == "005930"
+    assert dispatcher.stats()['dispatcher']['recorded'] == 1
+    dispatcher.stop()
@@ -0,0 +1,160 @@
+"""
+TradeLogger 조회 쿼리 테스트
+
+테스트 항목:
+1. 핫 쿼리 실행 계획 회귀 (trade_log / daily_performance / capital_events 풀스캔 금지)
+2. trade_daily_stats 집계 = trade_log 직접 집계
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from trading.trade_logger import TradeLogger
+
+
+HOT_TABLES = ("trade_log", "daily_performance", "capital_events", "trade_daily_stats")
+
+
+@pytest.fixture
+def trade_logger(tmp_path):
+    """거래 내역이 쌓인 TradeLogger"""
+    logger = TradeLogger(db_path=str(tmp_path / "auto_trade.db"))
+    rng = random.Random(42)
+    today = datetime.now()
+
+    with logger._get_connection() as conn:
+        for day in range(60):
+            date = (today - timedelta(days=day)).strftime("%Y-%m-%d")
+            for user_id in (1, 2, 3):
+                conn.execute(
+                    "INSERT INTO daily_performance (user_id, trade_date, total_assets) VALUES (?, ?, ?)",
+                    (user_id, date, 10_000_000 + rng.randint(-500_000, 500_000))
+                )
+                for i in range(5):
+                    side = rng.choice(["buy", "sell"])
+                    profit = rng.randint(-50_000, 80_000) if side == "sell" else None
+                    conn.execute("""
+                        INSERT INTO trade_log (user_id, trade_date, trade_time, stock_code, stock_name,
+                            side, quantity, price, amount, status, profit_loss, profit_rate)
+                        VALUES (?, ?, ?, ?, '', ?, 10, 10000, 100000, ?, ?, ?)
+                    """, (
+                        user_id, date, f"09:{i:02d}:00", f"{rng.randint(0, 50):06d}", side,
+                        rng.choice(["executed", "executed", "pending", "ordered"]),
+                        profit, profit / 1000 if profit else None,
+                    ))
+        for user_id in (1, 2, 3):
+            for day in range(60, 0, -10):
+                conn.execute(
+                    "INSERT INTO capital_events (user_id, event_date, event_type, amount) VALUES (?, ?, ?, ?)",
+                    (user_id, (today - timedelta(days=day)).strftime("%Y-%m-%d"),
+                     "deposit" if day % 20 == 0 else "withdraw", 1_000_000)
+                )
+        conn.execute("ANALYZE")
+    return logger
+
+
+def _capture_queries(logger, func):
+    """func 실행 중 발생한 SELECT 문 (바인딩 값 포함) 수집"""
+    queries = []
+    with logger._get_connection() as conn:
+        conn.set_trace_callback(queries.append)
+        try:
+            func()
+        finally:
+            conn.set_trace_callback(None)
+    return [q for q in queries if q.lstrip().upper().startswith("SELECT")]
+
+
+def _full_scans(logger, sql):
+    """실행 계획에서 핫 테이블 풀스캔 항목 반환"""
+    with logger._get_connection() as conn:
+        plan = [row["detail"] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+    return [d for d in plan if d.startswith("SCAN") and any(t in d for t in HOT_TABLES)]
+
+
+class TestQueryPlans:
+    """핫 쿼리 실행 계획 회귀 테스트"""
+
+    @pytest.mark.parametrize("name, call", [
+        ("get_trade_history", lambda lg: lg.get_trade_history(user_id=1, start_date="2026-01-01")),
+        ("get_today_traded_stocks", lambda lg: lg.get_today_traded_stocks(1)),
+        ("get_avg_buy_prices", lambda lg: lg.get_avg_buy_prices(1, ["000001", "000002"])),
+        ("get_first_buy_date", lambda lg: lg.get_first_buy_date(1, "000001")),
+        ("get_performance_summary", lambda lg: lg.get_performance_summary(user_id=1, days=30)),
+        ("calculate_twr", lambda lg: lg.calculate_twr(1, 11_000_000)),
+        ("get_previous_day_assets", lambda lg: lg.get_previous_day_assets(1)),
+    ])
+    def test_no_table_scan(self, trade_logger, name, call):
+        """사용자별 조회는 인덱스 SEARCH 로 처리"""
+        queries = _capture_queries(trade_logger, lambda: call(trade_logger))
+        assert queries, f"{name}: 실행된 SELECT 없음"
+
+        for sql in queries:
+            scans = _full_scans(trade_logger, sql)
+            assert not scans, f"{name}: 풀스캔 발생 {scans}\n{sql}"
+
+
+class TestTradeDailyStats:
+    """일별 체결 집계 테스트"""
+
+    def _expected_summary(self, logger, user_id, days):
+        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        trades = logger.get_trade_history(user_id=user_id, start_date=start_date)
+        executed = [t for t in trades if t.get("status") == "executed"]
+        profit_rates = [t["profit_rate"] for t in executed if t.get("profit_rate")]
+        return {
+            "total_trades": len(executed),
+            "buy_count": len([t for t in executed if t["side"] == "buy"]),
+            "sell_count": len([t for t in executed if t["side"] == "sell"]),
+            "win_count": len([t for t in executed if (t["profit_loss"] or 0) > 0]),
+            "loss_count": len([t for t in executed if (t["profit_loss"] or 0) < 0]),
+            "total_profit": sum(t["profit_loss"] or 0 for t in executed),
+            "avg_profit_rate": sum(profit_rates) / len(profit_rates) if profit_rates else 0,
+            "max_profit": max((t["profit_loss"] or 0 for t in executed), default=0),
+            "max_loss": min((t["profit_loss"] or 0 for t in executed), default=0),
+        }
+
+    def _actual_summary(self, logger, user_id, days):
+        summary = logger.get_performance_summary(user_id=user_id, days=days)
+        expected_keys = self._expected_summary(logger, user_id, days).keys()
+        return {k: summary[k] for k in expected_keys}
+
+    def test_summary_matches_trade_log(self, trade_logger):
+        """집계 테이블 기반 요약 = trade_log 직접 집계"""
+        for user_id in (1, 2, 3):
+            actual = self._actual_summary(trade_logger, user_id, 30)
+            expected = self._expected_summary(trade_logger, user_id, 30)
+            assert actual == pytest.approx(expected)
+
+    def test_triggers_follow_status_changes(self, trade_logger):
+        """상태 변경/삭제 시 집계 갱신"""
+        order_id = trade_logger.log_order(
+            "999999", "테스트", "sell", 1, 10000, order_no="T-1",
+            status="pending", profit_loss=123_456, profit_rate=12.3, user_id=1
+        )
+        before = self._actual_summary(trade_logger, 1, 30)
+
+        trade_logger.update_order_status("T-1", "executed", profit_loss=123_456, profit_rate=12.3)
+        after = self._actual_summary(trade_logger, 1, 30)
+        assert after["total_trades"] == before["total_trades"] + 1
+        assert after["max_profit"] == 123_456
+        assert after == pytest.approx(self._expected_summary(trade_logger, 1, 30))
+
+        with trade_logger._get_connection() as conn:
+            conn.execute("DELETE FROM trade_log WHERE id = ?", (order_id,))
+        assert self._actual_summary(trade_logger, 1, 30) == pytest.approx(before)
+
+    def test_rebuild_matches_incremental(self, trade_logger):
+        """재집계 결과 = 트리거 누적 결과"""
+        with trade_logger._get_connection() as conn:
+            incremental = [tuple(r)[2:] for r in conn.execute("SELECT * FROM trade_daily_stats ORDER BY 1, 2")]
+
+        trade_logger.rebuild_trade_daily_stats()
+
+        with trade_logger._get_connection() as conn:
+            rebuilt = [tuple(r)[2:] for r in conn.execute("SELECT * FROM trade_daily_stats ORDER BY 1, 2")]
+        assert len(rebuilt) == len(incremental)
+        for a, b in zip(rebuilt, incremental):
+            assert a == pytest.approx(b)
@@ -26,7 +26,7 @@ from trading.core.exceptions import (
     InsufficientFundsError,
 )
 from trading.risk_manager import RiskManager, TradingLimits
-from trading.notifications import BaseNotifier, TelegramNotifier, ConsoleNotifier
+from trading.notifications import BaseNotifier, QueuedTelegramNotifier, ConsoleNotifier
 
 
 @dataclass
@@ -94,7 +94,8 @@ class BaseTrader(ABC):
         if notifier:
             self.notifier = notifier
         elif self.config.telegram_notify:
-            self.notifier = TelegramNotifier(
+            # 큐 경유 전송 - 주문 처리가 텔레그램 응답을 기다리지 않음
+            self.notifier = QueuedTelegramNotifier(
                 bot_token=self.config.telegram_bot_token,
                 chat_id=self.config.telegram_chat_id
             )
@@ -3,11 +3,21 @@
 ATR 기반 목표가/손절가 계산, 트레일링 스탑, 포지션 한도 관리
 """
 
-import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
-from contextlib import contextmanager
+
+from database.connection_pool import pooled_connection
+from database.write_batcher import get_write_batcher
+
+
+TRAILING_STOP_UPDATE_SQL = """
+    UPDATE intraday_positions
+    SET trailing_high_price = ?,
+        trailing_stop_price = ?,
+        updated_at = ?
+    WHERE id = ? AND status = 'open'
+"""
 
 
 class PositionManager:
@@ -21,18 +31,38 @@ class PositionManager:
         if db_path is None:
             db_path = Path(__file__).parent.parent.parent / "database" / "auto_trade.db"
         self.db_path = Path(db_path)
+        self._writes = get_write_batcher(self.db_path)
         self._init_db()
 
-    @contextmanager
     def _get_connection(self):
-        """DB 연결 컨텍스트 매니저"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        finally:
-            conn.close()
+        """DB 연결 컨텍스트 매니저 (스레드별 풀 커넥션, 정상 종료 시 commit)"""
+        return pooled_connection(self.db_path)
+
+    def flush_writes(self) -> int:
+        """지연된 트레일링 스탑 업데이트 즉시 반영
+
+        Returns:
+            반영한 행 수
+        """
+        return self._writes.flush()
+
+    def _pending_trailing(self) -> Dict[int, tuple]:
+        """DB 미반영 트레일링 값 {position_id: (trailing_high, trailing_stop)}
+
+        대기열은 DB 파일별 공용 배치에 있으므로 같은 DB 의 다른 인스턴스가 올린 값도 포함.
+        DB 조회 전에 가져와야 그 사이 flush 된 값을 놓치지 않는다.
+        """
+        return {key[1]: params[:2] for key, params in self._writes.pending_rows(TRAILING_STOP_UPDATE_SQL).items()}
+
+    @staticmethod
+    def _apply_pending_trailing(pos: Dict, pending_trailing: Dict[int, tuple]) -> Dict:
+        """DB 미반영 트레일링 값 덮어쓰기 (트레일링 값은 증가만 하므로 큰 값 사용)"""
+        pending = pending_trailing.get(pos.get('id'))
+        if pending:
+            high, stop = pending
+            pos['trailing_high_price'] = max(pos.get('trailing_high_price') or 0, high)
+            pos['trailing_stop_price'] = max(pos.get('trailing_stop_price') or 0, stop)
+        return pos
 
     def _init_db(self):
         """장중 포지션 테이블 초기화"""
@@ -212,6 +242,7 @@ class PositionManager:
         # 목표가/손절가 계산
         exit_prices = self.calculate_exit_prices(entry_price, atr, strategy, strategy_config)
 
+        self.flush_writes()
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -250,6 +281,9 @@ class PositionManager:
         """
         now = datetime.now()
 
+        # 대기 중인 트레일링 업데이트를 먼저 반영 (청산 후 덮어쓰기 방지)
+        self.flush_writes()
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
@@ -295,6 +329,7 @@ class PositionManager:
         Returns:
             포지션 리스트
         """
+        pending = self._pending_trailing()
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
@@ -311,7 +346,7 @@ class PositionManager:
                     ORDER BY entry_time DESC
                 """, (user_id,))
 
-            return [dict(row) for row in cursor.fetchall()]
+            return [self._apply_pending_trailing(dict(row), pending) for row in cursor.fetchall()]
 
     def get_position_by_code(self, user_id: int, stock_code: str) -> Optional[Dict]:
         """
@@ -324,6 +359,7 @@ class PositionManager:
         Returns:
             포지션 정보 또는 None
         """
+        pending = self._pending_trailing()
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -331,7 +367,7 @@ class PositionManager:
                 WHERE user_id = ? AND stock_code = ? AND status = 'open'
             """, (user_id, stock_code))
             row = cursor.fetchone()
-            return dict(row) if row else None
+            return self._apply_pending_trailing(dict(row), pending) if row else None
 
     def update_trailing_stop(
         self,
@@ -349,7 +385,15 @@ class PositionManager:
 
         Returns:
             새 트레일링 스탑가 또는 None (업데이트 없음)
+
+        Note:
+            UPDATE 는 DB 파일별 공용 배치 대기열로 지연 반영된다. 같은 DB 를 쓰는
+            모든 인스턴스의 조회 메서드는 미반영 값을 덮어써서 반환하며, 청산/진입 시에는 먼저 flush 한다.
         """
+        pending_trailing = {}
+        pending = self._writes.pending_params(TRAILING_STOP_UPDATE_SQL, ("trailing_stop", position_id))
+        if pending:
+            pending_trailing[position_id] = pending[:2]
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM intraday_positions WHERE id = ?", (position_id,))
@@ -358,27 +402,25 @@ class PositionManager:
             if not row or row['status'] != 'open':
                 return None
 
-            trailing_high = row['trailing_high_price'] or row['entry_price']
-            current_trailing_stop = row['trailing_stop_price']
-
-            # 신고가 갱신 시
-            if current_price > trailing_high:
-                new_trailing_high = current_price
-                new_trailing_stop = int(current_price * (1 - trailing_pct))
-
-                # 기존 트레일링보다 높을 때만 업데이트 (절대 내리지 않음)
-                if current_trailing_stop is None or new_trailing_stop > current_trailing_stop:
-                    cursor.execute("""
-                        UPDATE intraday_positions
-                        SET trailing_high_price = ?,
-                            trailing_stop_price = ?,
-                            updated_at = ?
-                        WHERE id = ?
-                    """, (new_trailing_high, new_trailing_stop, datetime.now().isoformat(), position_id))
-
-                    return new_trailing_stop
+        pos = self._apply_pending_trailing(dict(row), pending_trailing)
+        trailing_high = pos['trailing_high_price'] or pos['entry_price']
+        current_trailing_stop = pos['trailing_stop_price']
+
+        # 신고가 갱신 시
+        if current_price > trailing_high:
+            new_trailing_high = current_price
+            new_trailing_stop = int(current_price * (1 - trailing_pct))
+
+            # 기존 트레일링보다 높을 때만 업데이트 (절대 내리지 않음)
+            if current_trailing_stop is None or new_trailing_stop > current_trailing_stop:
+                self._writes.add(
+                    TRAILING_STOP_UPDATE_SQL,
+                    (new_trailing_high, new_trailing_stop, datetime.now().isoformat(), position_id),
+                    key=("trailing_stop", position_id)
+                )
+                return new_trailing_stop
 
-            return current_trailing_stop
+        return current_trailing_stop
 
     def count_open_positions(self, user_id: int, strategy: str = None) -> int:
         """
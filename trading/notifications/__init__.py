@@ -8,6 +8,9 @@
     notifier = TelegramNotifier(bot_token, chat_id)
     notifier.send_message("매수 체결: 삼성전자 10주")
 
+    # 큐 경유 (매매 루프용 - 전송은 알림 디스패처)
+    notifier = QueuedTelegramNotifier(bot_token, chat_id)
+
     # 팩토리 함수
     notifier = get_notifier('telegram', config)
     notifier.send_trade_alert(trade_info)
@@ -16,6 +19,7 @@
 from .push_notifier import (
     BaseNotifier,
     TelegramNotifier,
+    QueuedTelegramNotifier,
     ConsoleNotifier,
     get_notifier,
     TradeAlert,
@@ -24,6 +28,7 @@ from .push_notifier import (
 __all__ = [
     'BaseNotifier',
     'TelegramNotifier',
+    'QueuedTelegramNotifier',
     'ConsoleNotifier',
     'get_notifier',
     'TradeAlert',
@@ -0,0 +1,762 @@
+"""
+비동기 알림 디스패처 (SQLite 큐 + 백그라운드 전송)
+
+목적:
+- 매매/알림 루프에서 웹 푸시·텔레그램을 직접 호출하지 않음 → 주문 지연이 푸시 서버 지연에 묶이지 않음
+- 어떤 프로세스든 enqueue 만 하면 (로컬 SQLite INSERT 1회), 디스패처가 모아서 전송
+- 채널별 속도 제한(토큰 버킷) + 동시 전송, 실패 시 지수 백오프 재시도
+- 만료된 웹 푸시 구독(404/410)은 사이클마다 일괄 삭제
+- 알림마다 유효 시간(expires_at) - 밀린 매매 알림은 늦게 보내지 않고 expired 처리
+- 텔레그램 봇 토큰은 큐에 저장하지 않음 (토큰 참조만 저장, 전송 시 설정/환경변수에서 해석)
+- 실행 중인 디스패처가 없으면 (단독 실행 스크립트) enqueue 한 프로세스가 백그라운드 디스패처를 띄움
+  (호출 스레드는 INSERT 직후 반환 - 주문 루프에서 HTTP 전송 안 함)
+- 해석할 수 없는 토큰 참조의 텔레그램 건은 확보하지 않음 (토큰을 등록한 프로세스의 디스패처가 전송)
+- 큐 지연(가장 오래된 대기 건 나이)/처리 건수 메트릭
+
+사용법:
+    from trading.notifications.dispatcher import enqueue_push, enqueue_telegram, start_dispatcher
+
+    enqueue_push(db, user_id, "매수 체결", "삼성전자 10주", url="/stock/005930")
+    enqueue_telegram(chat_id, "매수 체결: 삼성전자 10주")
+
+    start_dispatcher()          # API 서버 lifespan 등 상주 프로세스에서 1회
+    # 또는 단독 실행: python -m trading.notifications.dispatcher
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import requests
+
+from database.connection_pool import pooled_connection
+from services.rate_limit import TokenBucket
+
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent.parent / "database" / "stock_data.db"
+
+# 전송 결과
+SENT = "sent"          # 성공
+RETRY = "retry"        # 일시 오류 (재시도)
+FAILED = "failed"      # 영구 오류 (재시도 안 함)
+GONE = "gone"          # 만료된 웹 푸시 구독 (구독 삭제)
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BACKOFF_BASE = 2.0    # 초 (2, 4, 8, ...)
+DEFAULT_BACKOFF_MAX = 300.0   # 초
+DEFAULT_LEASE = 60.0          # 초 - 전송 중 프로세스가 죽으면 이 시간 뒤 다른 디스패처가 회수
+SENT_RETENTION = 86400.0      # 초 - 완료 건 보관 기간
+DEFAULT_ALERT_TTL = 900.0     # 초 - 알림 유효 시간 (이후에는 보내지 않음)
+HEARTBEAT_INTERVAL = 5.0      # 초 - 디스패처 생존 신호 주기
+HEARTBEAT_TIMEOUT = 30.0      # 초 - 이 시간 동안 신호가 없으면 디스패처 없음으로 판단
+UNRESOLVED_TOKEN_RETRY = 60.0 # 초 - 토큰 참조를 해석하지 못한 건의 재시도 대기
+EXIT_DRAIN_TIMEOUT = 10.0     # 초 - 스스로 띄운 디스패처가 프로세스 종료 전 남은 건을 보내는 최대 시간
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS notification_queue (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        channel TEXT NOT NULL,
+        target TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at REAL NOT NULL,
+        lease_until REAL,
+        claim_token TEXT,
+        created_at REAL NOT NULL,
+        sent_at REAL,
+        last_error TEXT,
+        expires_at REAL,
+        token_ref TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_notification_queue_status
+        ON notification_queue(status, next_attempt_at);
+    CREATE TABLE IF NOT EXISTS notification_dispatchers (
+        dispatcher_id TEXT PRIMARY KEY,
+        heartbeat_at REAL NOT NULL
+    );
+"""
+
+_bot_tokens: Dict[str, str] = {}   # 토큰 참조 → 토큰 (이 프로세스에서 enqueue 한 토큰)
+
+
+def bot_token_ref(bot_token: str) -> str:
+    """봇 토큰 참조 (큐에는 이 값만 저장)"""
+    return hashlib.sha256(bot_token.encode('utf-8')).hexdigest()[:16]
+
+
+def register_bot_token(bot_token: str) -> str:
+    """이 프로세스에서 토큰 참조를 해석할 수 있도록 등록"""
+    ref = bot_token_ref(bot_token)
+    _bot_tokens[ref] = bot_token
+    return ref
+
+
+class NotificationQueue:
+    """SQLite 기반 알림 큐 (프로세스 간 공유)
+
+    상태: pending → sending (lease) → sent / pending(재시도) / failed
+          pending → expired (유효 시간 경과)
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        with pooled_connection(self.db_path) as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(notification_queue)").fetchall()}
+            if 'expires_at' not in columns:
+                conn.execute("ALTER TABLE notification_queue ADD COLUMN expires_at REAL")
+            if 'token_ref' not in columns:
+                conn.execute("ALTER TABLE notification_queue ADD COLUMN token_ref TEXT")
+            # 이전 버전이 평문으로 적재한 봇 토큰 제거 (전송 시 기본 토큰 사용)
+            try:
+                conn.execute(
+                    "UPDATE notification_queue SET payload = json_remove(payload, '$.bot_token') "
+                    "WHERE channel = 'telegram' AND payload LIKE '%\"bot_token\"%'"
+                )
+            except sqlite3.OperationalError:
+                pass  # json1 확장 없음
+            try:
+                conn.execute(
+                    "UPDATE notification_queue SET token_ref = json_extract(payload, '$.token_ref') "
+                    "WHERE channel = 'telegram' AND token_ref IS NULL AND status IN ('pending', 'sending') "
+                    "AND payload LIKE '%\"token_ref\"%'"
+                )
+            except sqlite3.OperationalError:
+                pass
+
+    def enqueue(self, channel: str, target: str, payload: dict, ttl: Optional[float] = None) -> int:
+        """알림 1건 추가"""
+        return self.enqueue_many([(channel, target, payload)], ttl=ttl)
+
+    def enqueue_many(self, items: Iterable, ttl: Optional[float] = None) -> int:
+        """알림 여러 건 추가 (단일 트랜잭션)
+
+        Args:
+            items: (channel, target, payload) 반복자
+            ttl: 유효 시간 (초, None이면 만료 없음) - 지나면 보내지 않고 expired
+        """
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        rows = [(channel, str(target), json.dumps(payload, ensure_ascii=False), now, now, expires_at,
+                 payload.get('token_ref'))
+                for channel, target, payload in items]
+        if not rows:
+            return 0
+        with pooled_connection(self.db_path) as conn:
+            conn.executemany(
+                "INSERT INTO notification_queue "
+                "(channel, target, payload, next_attempt_at, created_at, expires_at, token_ref) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def expire(self) -> int:
+        """유효 시간이 지난 대기 건 expired 처리 (전송하지 않음)"""
+        now = time.time()
+        with pooled_connection(self.db_path) as conn:
+            cursor = conn.execute("""
+                UPDATE notification_queue SET status = 'expired', lease_until = NULL, last_error = 'expired'
+                WHERE expires_at IS NOT NULL AND expires_at < ?
+                  AND (status = 'pending' OR (status = 'sending' AND lease_until < ?))
+            """, (now, now))
+            return cursor.rowcount
+
+    def claim(self, limit: int = 100, lease: float = DEFAULT_LEASE,
+              token_refs: Optional[Iterable[str]] = None) -> List[dict]:
+        """전송할 알림 확보 (다른 디스패처와 중복 전송 방지)
+
+        대기 중이며 재시도 시각이 지난 건 + lease 가 만료된 전송 중 건을 가져온다.
+
+        Args:
+            token_refs: 이 디스패처가 해석할 수 있는 토큰 참조 (None이면 제한 없음)
+                - 목록에 없는 참조의 건은 남겨 두어 토큰을 가진 프로세스가 전송
+        """
+        now = time.time()
+        token = uuid.uuid4().hex
+        ref_filter, ref_params = "", []
+        if token_refs is not None:
+            token_refs = list(token_refs)
+            placeholders = ", ".join("?" * len(token_refs))
+            ref_filter = f" AND (token_ref IS NULL OR token_ref IN ({placeholders}))" if token_refs \
+                else " AND token_ref IS NULL"
+            ref_params = token_refs
+        with pooled_connection(self.db_path) as conn:
+            conn.execute(f"""
+                UPDATE notification_queue SET status = 'sending', lease_until = ?, claim_token = ?
+                WHERE id IN (
+                    SELECT id FROM notification_queue
+                    WHERE ((status = 'pending' AND next_attempt_at <= ?)
+                       OR (status = 'sending' AND lease_until < ?))
+                      AND (expires_at IS NULL OR expires_at >= ?){ref_filter}
+                    ORDER BY id LIMIT ?
+                )
+            """, (now + lease, token, now, now, now, *ref_params, limit))
+            rows = conn.execute(
+                "SELECT id, channel, target, payload, attempts, created_at FROM notification_queue "
+                "WHERE claim_token = ? AND status = 'sending' ORDER BY id",
+                (token,)
+            ).fetchall()
+
+        jobs = []
+        for row in rows:
+            job = dict(row)
+            job['payload'] = json.loads(job['payload'])
+            jobs.append(job)
+        return jobs
+
+    def mark_sent(self, ids: List[int]):
+        """전송 완료"""
+        if not ids:
+            return
+        now = time.time()
+        with pooled_connection(self.db_path) as conn:
+            conn.executemany(
+                "UPDATE notification_queue SET status = 'sent', sent_at = ?, attempts = attempts + 1, "
+                "lease_until = NULL, last_error = NULL WHERE id = ?",
+                [(now, job_id) for job_id in ids]
+            )
+
+    def mark_retry(self, retries: List[tuple]):
+        """재시도 예약
+
+        Args:
+            retries: (id, 다음 시도 시각, 오류 메시지)
+        """
+        if not retries:
+            return
+        with pooled_connection(self.db_path) as conn:
+            conn.executemany(
+                "UPDATE notification_queue SET status = 'pending', attempts = attempts + 1, "
+                "next_attempt_at = ?, lease_until = NULL, last_error = ? WHERE id = ?",
+                [(next_at, error, job_id) for job_id, next_at, error in retries]
+            )
+
+    def mark_failed(self, failures: List[tuple]):
+        """영구 실패
+
+        Args:
+            failures: (id, 오류 메시지)
+        """
+        if not failures:
+            return
+        with pooled_connection(self.db_path) as conn:
+            conn.executemany(
+                "UPDATE notification_queue SET status = 'failed', attempts = attempts + 1, "
+                "lease_until = NULL, last_error = ? WHERE id = ?",
+                [(error, job_id) for job_id, error in failures]
+            )
+
+    def purge(self, older_than: float = SENT_RETENTION) -> int:
+        """오래된 완료/실패/만료 건 삭제"""
+        cutoff = time.time() - older_than
+        with pooled_connection(self.db_path) as conn:
+            cursor = conn.execute(
+                "DELETE FROM notification_queue WHERE status IN ('sent', 'failed', 'expired') AND created_at < ?",
+                (cutoff,)
+            )
+            return cursor.rowcount
+
+    def heartbeat(self, dispatcher_id: str):
+        """디스패처 생존 신호"""
+        with pooled_connection(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO notification_dispatchers (dispatcher_id, heartbeat_at) VALUES (?, ?)",
+                (dispatcher_id, time.time())
+            )
+
+    def clear_heartbeat(self, dispatcher_id: str):
+        with pooled_connection(self.db_path) as conn:
+            conn.execute("DELETE FROM notification_dispatchers WHERE dispatcher_id = ?", (dispatcher_id,))
+
+    def dispatcher_alive(self, timeout: float = HEARTBEAT_TIMEOUT) -> bool:
+        """어떤 프로세스든 최근 생존 신호를 보낸 디스패처가 있는지"""
+        with pooled_connection(self.db_path, commit=False) as conn:
+            row = conn.execute(
+                "SELECT MAX(heartbeat_at) AS latest FROM notification_dispatchers"
+            ).fetchone()
+        return row['latest'] is not None and time.time() - row['latest'] < timeout
+
+    def stats(self) -> dict:
+        """큐 상태 (건수 + 지연)
+
+        Returns:
+            pending/sending/sent/failed/expired 건수, lag (가장 오래된 대기 건 나이, 초)
+        """
+        now = time.time()
+        with pooled_connection(self.db_path, commit=False) as conn:
+            counts = {row['status']: row['cnt'] for row in conn.execute(
+                "SELECT status, COUNT(*) AS cnt FROM notification_queue GROUP BY status"
+            ).fetchall()}
+            oldest = conn.execute(
+                "SELECT MIN(created_at) AS oldest FROM notification_queue WHERE status IN ('pending', 'sending')"
+            ).fetchone()['oldest']
+
+        result = {status: counts.get(status, 0) for status in ('pending', 'sending', 'sent', 'failed', 'expired')}
+        result['lag'] = round(now - oldest, 3) if oldest else 0.0
+        return result
+
+
+class WebPushProvider:
+    """웹 푸시 전송 (구독 1건 = 큐 1건)"""
+
+    channel = "webpush"
+    rate = 50.0
+
+    def __init__(self, vapid_private_key: str = None, vapid_email: str = None):
+        self.vapid_private_key = vapid_private_key or os.getenv("VAPID_PRIVATE_KEY", "")
+        self.vapid_email = vapid_email or os.getenv("VAPID_EMAIL", "mailto:admin@example.com")
+
+    def send(self, job: dict) -> tuple:
+        """
+        Returns:
+            (결과, 오류 메시지, 재시도 대기 초 또는 None)
+        """
+        from pywebpush import webpush, WebPushException
+
+        payload = job['payload']
+        try:
+            webpush(
+                subscription_info={
+                    "endpoint": job['target'],
+                    "keys": {"p256dh": payload['p256dh'], "auth": payload['auth']}
+                },
+                data=json.dumps(payload['message']),
+                vapid_private_key=self.vapid_private_key,
+                vapid_claims={"sub": self.vapid_email},
+                timeout=10
+            )
+            return SENT, None, None
+        except WebPushException as e:
+            status_code = getattr(e.response, 'status_code', None)
+            if status_code in (404, 410):
+                return GONE, str(e), None
+            if status_code is None or status_code == 429 or status_code >= 500:
+                return RETRY, str(e), None
+            return FAILED, str(e), None
+        except Exception as e:
+            return RETRY, str(e), None
+
+
+class TelegramProvider:
+    """텔레그램 메시지 전송 (봇 토큰은 설정/환경변수에서 해석, 큐에는 참조만)"""
+
+    channel = "telegram"
+    rate = 25.0  # 봇 전체 초당 30건 제한보다 낮게
+
+    def __init__(self, bot_token: str = None):
+        self.bot_token = bot_token or os.getenv("TELEGRAM_BOT_TOKEN", "")
+
+    def resolve_token(self, token_ref: Optional[str]) -> Optional[str]:
+        """토큰 참조 → 토큰 (참조 없으면 기본 토큰, 해석 불가면 None)"""
+        if not token_ref:
+            return self.bot_token or None
+        if self.bot_token and bot_token_ref(self.bot_token) == token_ref:
+            return self.bot_token
+        return _bot_tokens.get(token_ref)
+
+    def token_refs(self) -> List[str]:
+        """이 프로세스에서 해석 가능한 토큰 참조 (큐 확보 필터용)"""
+        refs = set(_bot_tokens)
+        if self.bot_token:
+            refs.add(bot_token_ref(self.bot_token))
+        return sorted(refs)
+
+    def send(self, job: dict) -> tuple:
+        """
+        Returns:
+            (결과, 오류 메시지, 재시도 대기 초 또는 None)
+        """
+        payload = job['payload']
+        bot_token = self.resolve_token(payload.get('token_ref'))
+        if not bot_token:
+            if not payload.get('token_ref'):
+                return FAILED, "bot_token 없음", None
+            # 다른 프로세스가 등록한 토큰일 수 있음 - 버리지 않고 대기 (유효 시간이 지나면 expired)
+            return RETRY, "토큰 참조 해석 실패 (토큰을 등록한 프로세스 대기)", UNRESOLVED_TOKEN_RETRY
+
+        try:
+            response = requests.post(
+                f"https://api.telegram.org/bot{bot_token}/sendMessage",
+                data={
+                    'chat_id': job['target'],
+                    'text': payload['text'],
+                    'parse_mode': payload.get('parse_mode', 'HTML')
+                },
+                timeout=10
+            )
+        except Exception as e:
+            return RETRY, str(e), None
+
+        if response.status_code == 200:
+            return SENT, None, None
+        if response.status_code == 429:
+            try:
+                retry_after = response.json().get('parameters', {}).get('retry_after')
+            except ValueError:
+                retry_after = None
+            return RETRY, "429 Too Many Requests", retry_after
+        if response.status_code >= 500:
+            return RETRY, f"HTTP {response.status_code}", None
+        return FAILED, f"HTTP {response.status_code}", None
+
+
+class NotificationDispatcher:
+    """큐에서 알림을 꺼내 채널별 속도 제한 하에 동시 전송"""
+
+    def __init__(
+        self,
+        queue: NotificationQueue = None,
+        providers: Optional[Dict[str, object]] = None,
+        workers: int = 8,
+        batch_size: int = 100,
+        poll_interval: float = 0.5,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        db=None
+    ):
+        """
+        Args:
+            queue: 알림 큐 (None이면 기본 DB)
+            providers: {채널: provider} (None이면 웹 푸시 + 텔레그램)
+            workers: 동시 전송 스레드 수
+            batch_size: 사이클당 최대 처리 건수
+            poll_interval: 큐가 비었을 때 대기 (초)
+            max_attempts: 최대 시도 횟수 (초과 시 failed)
+            db: 만료 구독 정리용 DatabaseManager (None이면 기본 DB)
+        """
+        self.queue = queue or NotificationQueue()
+        if providers is None:
+            providers = {p.channel: p for p in (WebPushProvider(), TelegramProvider())}
+        self.providers = providers
+        self.limiters = {channel: TokenBucket(getattr(p, 'rate', 10.0)) for channel, p in providers.items()}
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._db = db
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {"sent": 0, "retried": 0, "failed": 0, "expired": 0, "pruned": 0, "recorded": 0, "cycles": 0}
+        self._last_purge = 0.0
+        self._last_heartbeat = 0.0
+        self.dispatcher_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def _send_one(self, job: dict) -> tuple:
+        provider = self.providers.get(job['channel'])
+        if provider is None:
+            return FAILED, f"알 수 없는 채널: {job['channel']}", None
+        self.limiters[job['channel']].acquire()
+        try:
+            return provider.send(job)
+        except Exception as e:
+            return RETRY, str(e), None
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self.backoff_max, self.backoff_base * (2 ** attempts))
+
+    def _get_db(self):
+        if self._db is None:
+            from database.db_manager import DatabaseManager
+            self._db = DatabaseManager()
+        return self._db
+
+    def _prune_subscriptions(self, endpoints: List[str]) -> int:
+        if not endpoints:
+            return 0
+        return self._get_db().remove_push_subscriptions_by_endpoint(endpoints)
+
+    def _record_history(self, histories: List[dict]) -> int:
+        """전송 완료된 알림의 alert_history 기록 (여러 기기 전송 건은 1번만 - 일별 유니크 인덱스)"""
+        recorded = 0
+        for history in histories:
+            try:
+                recorded += bool(self._get_db().add_alert_history(**history))
+            except Exception as e:
+                print(f"[알림] 알림 기록 저장 오류: {e}")
+        return recorded
+
+    def _token_refs(self) -> Optional[List[str]]:
+        """해석 가능한 텔레그램 토큰 참조 (토큰 참조를 다루는 provider가 없으면 None = 제한 없음)"""
+        provider = self.providers.get(TelegramProvider.channel)
+        if provider is None or not hasattr(provider, 'token_refs'):
+            return None
+        return provider.token_refs()
+
+    def run_once(self) -> int:
+        """1 사이클: 확보 → 동시 전송 → 결과 일괄 반영
+
+        Returns:
+            처리한 건수
+        """
+        expired = self.queue.expire()
+        if expired:
+            with self._lock:
+                self._stats["expired"] += expired
+
+        jobs = self.queue.claim(self.batch_size, token_refs=self._token_refs())
+        if not jobs:
+            return 0
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="notify")
+        results = list(self._executor.map(self._send_one, jobs))
+
+        now = time.time()
+        sent, retries, failures, gone, histories = [], [], [], [], []
+        for job, (result, error, retry_after) in zip(jobs, results):
+            if result == SENT:
+                sent.append(job['id'])
+                if job['payload'].get('history'):
+                    histories.append(job['payload']['history'])
+            elif result == GONE:
+                failures.append((job['id'], error))
+                gone.append(job['target'])
+            elif result == RETRY and job['attempts'] + 1 < self.max_attempts:
+                delay = retry_after if retry_after else self._backoff(job['attempts'])
+                retries.append((job['id'], now + delay, error))
+            else:
+                failures.append((job['id'], error))
+
+        self.queue.mark_sent(sent)
+        self.queue.mark_retry(retries)
+        self.queue.mark_failed(failures)
+        pruned = self._prune_subscriptions(gone)
+        recorded = self._record_history(histories)
+
+        with self._lock:
+            self._stats["sent"] += len(sent)
+            self._stats["retried"] += len(retries)
+            self._stats["failed"] += len(failures)
+            self._stats["pruned"] += pruned
+            self._stats["recorded"] += recorded
+            self._stats["cycles"] += 1
+        return len(jobs)
+
+    def drain(self, timeout: float = 30.0) -> int:
+        """현재 전송 가능한 건이 없을 때까지 처리 (테스트/단독 실행용)"""
+        deadline = time.time() + timeout
+        total = 0
+        while time.time() < deadline:
+            processed = self.run_once()
+            if processed == 0:
+                break
+            total += processed
+        return total
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                if time.time() - self._last_heartbeat > HEARTBEAT_INTERVAL:
+                    self.queue.heartbeat(self.dispatcher_id)
+                    self._last_heartbeat = time.time()
+                processed = self.run_once()
+                if time.time() - self._last_purge > 3600:
+                    self.queue.purge()
+                    self._last_purge = time.time()
+            except Exception as e:
+                print(f"[알림] 디스패처 오류: {e}")
+                processed = 0
+            if processed < self.batch_size:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def wake(self):
+        """같은 프로세스에서 enqueue 직후 즉시 처리 요청"""
+        self._wake.set()
+
+    def start(self):
+        """백그라운드 전송 스레드 시작"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="notification-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """전송 스레드 종료"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+            self._last_heartbeat = 0.0
+            try:
+                self.queue.clear_heartbeat(self.dispatcher_id)
+            except Exception:
+                pass
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stats(self) -> dict:
+        """큐 상태 + 이 디스패처 처리 건수"""
+        with self._lock:
+            counters = dict(self._stats)
+        return {"queue": self.queue.stats(), "dispatcher": counters, "running": self.running}
+
+
+# ==================== 전역 인스턴스 ====================
+
+_queue: Optional[NotificationQueue] = None
+_dispatcher: Optional[NotificationDispatcher] = None
+_init_lock = threading.Lock()
+_exit_drain_registered = False
+
+
+def get_notification_queue() -> NotificationQueue:
+    """기본 알림 큐"""
+    global _queue
+    if _queue is None:
+        with _init_lock:
+            if _queue is None:
+                _queue = NotificationQueue()
+    return _queue
+
+
+def get_dispatcher() -> NotificationDispatcher:
+    """기본 디스패처 (시작은 start_dispatcher)"""
+    global _dispatcher
+    if _dispatcher is None:
+        with _init_lock:
+            if _dispatcher is None:
+                _dispatcher = NotificationDispatcher(get_notification_queue())
+    return _dispatcher
+
+
+def start_dispatcher() -> NotificationDispatcher:
+    """기본 디스패처 백그라운드 시작"""
+    dispatcher = get_dispatcher()
+    dispatcher.start()
+    return dispatcher
+
+
+def stop_dispatcher():
+    """기본 디스패처 종료"""
+    if _dispatcher is not None:
+        _dispatcher.stop()
+
+
+def _deliver():
+    """같은 프로세스 디스패처는 깨우고, 어디에도 디스패처가 없으면 (단독 실행) 백그라운드로 시작
+
+    전송은 항상 디스패처 스레드에서 - 호출 스레드 (주문 루프 등) 는 INSERT 직후 반환.
+    """
+    if _dispatcher is not None and _dispatcher.running:
+        _dispatcher.wake()
+        return
+    if get_notification_queue().dispatcher_alive():
+        return
+    global _exit_drain_registered
+    try:
+        start_dispatcher().wake()
+    except Exception as e:
+        print(f"[알림] 디스패처 시작 오류: {e}")
+        return
+    if not _exit_drain_registered:
+        _exit_drain_registered = True
+        atexit.register(_drain_at_exit)
+
+
+def _drain_at_exit():
+    """단독 실행 스크립트 종료 시 남은 알림 전송 (데몬 스레드는 종료와 함께 끊기므로)"""
+    if _dispatcher is None:
+        return
+    try:
+        _dispatcher.stop()
+        _dispatcher.drain(timeout=EXIT_DRAIN_TIMEOUT)
+    except Exception as e:
+        print(f"[알림] 종료 전 전송 오류: {e}")
+
+
+def enqueue_push(db, user_id: int, title: str, body: str, url: str = None,
+                 ttl: Optional[float] = DEFAULT_ALERT_TTL, history: Optional[dict] = None) -> int:
+    """사용자의 모든 웹 푸시 구독에 알림 예약 (전송은 디스패처)
+
+    Args:
+        db: DatabaseManager
+        user_id: 사용자 ID
+        ttl: 유효 시간 (초, None이면 만료 없음)
+        history: 전송 성공 시 기록할 alert_history
+            (DatabaseManager.add_alert_history 인자: user_id, stock_code, alert_type, message, stock_name)
+
+    Returns:
+        예약된 구독 수
+    """
+    subscriptions = db.get_all_push_subscriptions_for_user(user_id)
+    message = {
+        "title": title,
+        "body": body,
+        "icon": "/icons/icon-192x192.png",
+        "badge": "/icons/icon-72x72.png",
+        "url": url or "/"
+    }
+    extra = {'history': history} if history else {}
+    count = get_notification_queue().enqueue_many(
+        ((WebPushProvider.channel, sub['endpoint'],
+          {'p256dh': sub['p256dh'], 'auth': sub['auth'], 'user_id': user_id, 'message': message, **extra})
+         for sub in subscriptions),
+        ttl=ttl
+    )
+    if count:
+        _deliver()
+    return count
+
+
+def enqueue_telegram(chat_id, text: str, parse_mode: str = "HTML", bot_token: str = None,
+                     ttl: Optional[float] = DEFAULT_ALERT_TTL) -> int:
+    """텔레그램 메시지 예약 (전송은 디스패처)
+
+    bot_token 은 큐에 저장하지 않는다 - 참조만 저장하고 전송 시 설정/환경변수 토큰으로 해석.
+    """
+    payload = {'text': text, 'parse_mode': parse_mode}
+    if bot_token:
+        payload['token_ref'] = register_bot_token(bot_token)
+    count = get_notification_queue().enqueue(TelegramProvider.channel, chat_id, payload, ttl=ttl)
+    _deliver()
+    return count
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="알림 큐 디스패처")
+    parser.add_argument("--stats", action="store_true", help="큐 상태만 출력")
+    parser.add_argument("--once", action="store_true", help="대기 건만 처리 후 종료")
+    args = parser.parse_args()
+
+    if args.stats:
+        print(json.dumps(get_notification_queue().stats(), indent=2))
+    elif args.once:
+        dispatcher = get_dispatcher()
+        print(f"[알림] {dispatcher.drain()}건 처리")
+        print(json.dumps(dispatcher.stats(), indent=2, ensure_ascii=False))
+    else:
+        dispatcher = start_dispatcher()
+        print("[알림] 디스패처 실행 중 (Ctrl+C 종료)")
+        try:
+            while True:
+                time.sleep(60)
+                print(f"[알림] {dispatcher.stats()}")
+        except KeyboardInterrupt:
+            stop_dispatcher()
@@ -7,7 +7,7 @@
 - 표준 알림 인터페이스 제공
 
 지원 채널:
-- Telegram (기본)
+- Telegram (기본, QueuedTelegramNotifier 는 알림 디스패처 경유)
 - Console (개발/테스트용)
 """
 
@@ -291,6 +291,30 @@ class TelegramNotifier(BaseNotifier):
             return False
 
 
+class QueuedTelegramNotifier(TelegramNotifier):
+    """텔레그램 알림 (큐 적재 후 즉시 반환, 전송은 알림 디스패처)
+
+    매매 루프의 주문 처리 지연이 텔레그램 응답 시간에 묶이지 않도록 사용.
+    봇 토큰은 큐에 저장하지 않고 참조만 남긴다 (디스패처가 설정/환경변수 토큰으로 해석).
+    """
+
+    def send_message(self, message: str) -> bool:
+        """알림 큐에 메시지 적재"""
+        if not self.enabled:
+            return True
+
+        if not self.bot_token or not self.chat_id:
+            print("텔레그램 설정 누락 (bot_token 또는 chat_id)")
+            return False
+
+        try:
+            from .dispatcher import enqueue_telegram
+            return enqueue_telegram(self.chat_id, message, bot_token=self.bot_token) > 0
+        except Exception as e:
+            print(f"텔레그램 큐 적재 오류: {e}")
+            return False
+
+
 class ConsoleNotifier(BaseNotifier):
     """콘솔 출력 알림 (개발/테스트용)"""
 
@@ -332,6 +356,7 @@ def get_notifier(
 
     Args:
         notifier_type: 'telegram', 'console', 'multi'
+            (telegram 설정에 queued=True 면 QueuedTelegramNotifier)
         config: 설정 딕셔너리
 
     Returns:
@@ -340,7 +365,8 @@ def get_notifier(
     config = config or {}
 
     if notifier_type == 'telegram':
-        return TelegramNotifier(
+        notifier_cls = QueuedTelegramNotifier if config.get('queued') else TelegramNotifier
+        return notifier_cls(
             bot_token=config.get('bot_token'),
             chat_id=config.get('chat_id'),
             enabled=config.get('enabled', True)
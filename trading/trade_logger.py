@@ -13,12 +13,44 @@ from datetime import datetime, timedelta
 logger = logging.getLogger(__name__)
 from pathlib import Path
 from typing import Dict, List, Optional
-from contextlib import contextmanager
 from enum import Enum
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+from database.connection_pool import pooled_connection
+from database.write_batcher import get_write_batcher
+
+
+TRADE_LOG_INSERT_SQL = """
+    INSERT INTO trade_log (
+        trade_date, trade_time, stock_code, stock_name,
+        side, quantity, price, amount, order_no, order_type,
+        trade_reason, status, profit_loss, profit_rate, user_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# trade_daily_stats 집계식 (get_performance_summary 의 파이썬 집계와 동일한 정의)
+TRADE_DAILY_STATS_SELECT = """
+    SELECT user_id, trade_date,
+           COUNT(*),
+           SUM(side = 'buy'),
+           SUM(side = 'sell'),
+           SUM(COALESCE(profit_loss, 0) > 0),
+           SUM(COALESCE(profit_loss, 0) < 0),
+           SUM(COALESCE(profit_loss, 0)),
+           COALESCE(SUM(CASE WHEN profit_rate IS NOT NULL AND profit_rate != 0 THEN profit_rate END), 0),
+           SUM(profit_rate IS NOT NULL AND profit_rate != 0),
+           MAX(COALESCE(profit_loss, 0)),
+           MIN(COALESCE(profit_loss, 0))
+    FROM trade_log
+"""
+
+PEAK_PROFIT_UPDATE_SQL = """
+    UPDATE holdings SET peak_profit_rate = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE user_id = ? AND stock_code = ?
+"""
+
 
 def get_encryption_key() -> bytes:
     """암호화 키 생성/조회 (환경변수 또는 파일 기반)"""
@@ -93,18 +125,20 @@ class TradeLogger:
 
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
+        self._writes = get_write_batcher(self.db_path)
         self._init_db()
 
-    @contextmanager
     def _get_connection(self):
-        """DB 연결 컨텍스트 매니저"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        finally:
-            conn.close()
+        """DB 연결 컨텍스트 매니저 (스레드별 풀 커넥션, 정상 종료 시 commit)"""
+        return pooled_connection(self.db_path)
+
+    def flush_writes(self) -> int:
+        """지연된 쓰기(trade_log, 고점 수익률) 즉시 반영
+
+        Returns:
+            반영한 행 수
+        """
+        return self._writes.flush()
 
     def _init_db(self):
         """DB 테이블 초기화"""
@@ -340,6 +374,18 @@ class TradeLogger:
                 except Exception as e:
                     logger.warning(f"user_id 컬럼 추가 실패 ({table}): {e}")
 
+            # holdings 컬럼 추가 (기존 테이블 호환)
+            holdings_columns = [
+                ("market", "TEXT DEFAULT 'KOSDAQ'"),
+                ("peak_profit_rate", "REAL DEFAULT 0"),  # 트레일링 스탑용 고점 수익률
+            ]
+            for col_name, col_type in holdings_columns:
+                try:
+                    cursor.execute(f"ALTER TABLE holdings ADD COLUMN {col_name} {col_type}")
+                    logger.debug(f"holdings 컬럼 추가됨: {col_name}")
+                except sqlite3.OperationalError:
+                    pass  # 이미 존재하는 컬럼 (정상)
+
             # 인덱스 생성
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_trade_log_date ON trade_log(trade_date)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_trade_log_stock ON trade_log(stock_code)")
@@ -353,6 +399,108 @@ class TradeLogger:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_settings_user ON auto_trade_settings(user_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_perf_user ON daily_performance(user_id)")
 
+            # daily_performance 컬럼 추가 (기존 테이블 호환 - save_daily_performance 에서 사용)
+            for col_name in ("d2_cash", "holdings_value"):
+                try:
+                    cursor.execute(f"ALTER TABLE daily_performance ADD COLUMN {col_name} INTEGER")
+                except sqlite3.OperationalError:
+                    pass  # 이미 존재하는 컬럼 (정상)
+
+            # 복합/커버링 인덱스 (사용자별 기간 조회 쿼리 형태에 맞춤)
+            # - get_trade_history / get_performance_summary: user_id + 기간 + 최신순 정렬
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trade_log_user_date ON trade_log(user_id, trade_date, trade_time)")
+            # - get_today_traded_stocks: user_id + 당일 + executed → stock_code (커버링)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trade_log_user_date_status ON trade_log(user_id, trade_date, status, stock_code)")
+            # - get_avg_buy_prices / get_first_buy_date: user_id + side + 종목 + 기간 (커버링)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_trade_log_user_side_stock
+                ON trade_log(user_id, side, stock_code, trade_date, status, price, quantity)
+            """)
+            # - calculate_twr / 일별 자산 그래프: user_id + 날짜 → 자산 (커버링)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_daily_perf_user_date_assets
+                ON daily_performance(user_id, trade_date, total_assets, d2_cash, holdings_value)
+            """)
+            # - get_capital_events / get_capital_summary: user_id + 날짜순 (합계는 커버링)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_capital_events_user_date
+                ON capital_events(user_id, event_date, event_type, amount)
+            """)
+
+            self._init_trade_daily_stats(cursor)
+
+    def _init_trade_daily_stats(self, cursor):
+        """
+        사용자별 일별 체결 집계 테이블 + 유지 트리거
+
+        trade_log 에 executed 거래가 추가/변경/삭제되면 해당 (user_id, trade_date) 행만
+        트리거로 재집계한다. get_performance_summary 는 trade_log 대신 이 테이블을 합산한다.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS trade_daily_stats (
+                user_id INTEGER NOT NULL,
+                trade_date TEXT NOT NULL,
+                trade_count INTEGER DEFAULT 0,
+                buy_count INTEGER DEFAULT 0,
+                sell_count INTEGER DEFAULT 0,
+                win_count INTEGER DEFAULT 0,
+                loss_count INTEGER DEFAULT 0,
+                total_profit INTEGER DEFAULT 0,
+                profit_rate_sum REAL DEFAULT 0,
+                profit_rate_count INTEGER DEFAULT 0,
+                max_profit INTEGER DEFAULT 0,
+                max_loss INTEGER DEFAULT 0,
+                PRIMARY KEY (user_id, trade_date)
+            )
+        """)
+
+        def refresh(ref: str) -> str:
+            return f"""
+                DELETE FROM trade_daily_stats WHERE user_id = {ref}.user_id AND trade_date = {ref}.trade_date;
+                INSERT INTO trade_daily_stats {TRADE_DAILY_STATS_SELECT}
+                    WHERE user_id = {ref}.user_id AND trade_date = {ref}.trade_date AND status = 'executed'
+                    GROUP BY user_id, trade_date;
+            """
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_trade_daily_stats_insert
+            AFTER INSERT ON trade_log
+            WHEN NEW.user_id IS NOT NULL AND NEW.status = 'executed'
+            BEGIN {refresh("NEW")} END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_trade_daily_stats_update
+            AFTER UPDATE ON trade_log
+            WHEN OLD.status = 'executed' OR NEW.status = 'executed'
+            BEGIN {refresh("OLD")} {refresh("NEW")} END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_trade_daily_stats_delete
+            AFTER DELETE ON trade_log
+            WHEN OLD.user_id IS NOT NULL AND OLD.status = 'executed'
+            BEGIN {refresh("OLD")} END
+        """)
+
+        # 최초 생성 시 기존 trade_log 로 채우기
+        cursor.execute("SELECT 1 FROM trade_daily_stats LIMIT 1")
+        if cursor.fetchone() is None:
+            self._rebuild_trade_daily_stats(cursor)
+
+    def _rebuild_trade_daily_stats(self, cursor):
+        """trade_daily_stats 전체 재집계"""
+        cursor.execute("DELETE FROM trade_daily_stats")
+        cursor.execute(f"""
+            INSERT INTO trade_daily_stats {TRADE_DAILY_STATS_SELECT}
+            WHERE user_id IS NOT NULL AND status = 'executed'
+            GROUP BY user_id, trade_date
+        """)
+
+    def rebuild_trade_daily_stats(self):
+        """일별 체결 집계 재생성 (트리거 이전 데이터 복구용)"""
+        self.flush_writes()
+        with self._get_connection() as conn:
+            self._rebuild_trade_daily_stats(conn.cursor())
+
     def log_order(
         self,
         stock_code: str,
@@ -366,8 +514,9 @@ class TradeLogger:
         status: str = "pending",
         profit_loss: int = None,
         profit_rate: float = None,
-        user_id: int = None
-    ) -> int:
+        user_id: int = None,
+        defer: bool = False
+    ) -> Optional[int]:
         """
         주문 기록
 
@@ -384,38 +533,40 @@ class TradeLogger:
             profit_loss: 실현 손익 (매도 시)
             profit_rate: 수익률 (매도 시)
             user_id: 사용자 ID
+            defer: True면 배치 대기열에 넣고 나중에 일괄 기록 (즉시 조회 불필요한 기록용)
+                   False(기본)면 대기열을 먼저 flush 한 뒤 동기 기록 (주문 기록)
 
         Returns:
-            생성된 레코드 ID
+            생성된 레코드 ID (defer=True면 None)
         """
         now = datetime.now()
         amount = price * quantity if price else 0
+        params = (
+            now.strftime("%Y-%m-%d"),
+            now.strftime("%H:%M:%S"),
+            stock_code,
+            stock_name,
+            side,
+            quantity,
+            price,
+            amount,
+            order_no,
+            order_type,
+            trade_reason,
+            status,
+            profit_loss,
+            profit_rate,
+            user_id
+        )
 
+        if defer:
+            self._writes.add(TRADE_LOG_INSERT_SQL, params)
+            return None
+
+        self.flush_writes()
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO trade_log (
-                    trade_date, trade_time, stock_code, stock_name,
-                    side, quantity, price, amount, order_no, order_type,
-                    trade_reason, status, profit_loss, profit_rate, user_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                now.strftime("%Y-%m-%d"),
-                now.strftime("%H:%M:%S"),
-                stock_code,
-                stock_name,
-                side,
-                quantity,
-                price,
-                amount,
-                order_no,
-                order_type,
-                trade_reason,
-                status,
-                profit_loss,
-                profit_rate,
-                user_id
-            ))
+            cursor.execute(TRADE_LOG_INSERT_SQL, params)
             return cursor.lastrowid
 
     def update_order_status(
@@ -436,6 +587,7 @@ class TradeLogger:
             profit_loss: 손익 금액
             profit_rate: 손익률
         """
+        self.flush_writes()
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
@@ -474,6 +626,7 @@ class TradeLogger:
             market: 시장 구분 (KOSPI/KOSDAQ)
         """
         now = datetime.now()
+        self._clear_pending_peaks(stock_code)
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
@@ -495,6 +648,7 @@ class TradeLogger:
 
     def remove_holding(self, stock_code: str):
         """보유 종목 삭제"""
+        self._clear_pending_peaks(stock_code)
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM holdings WHERE stock_code = ?", (stock_code,))
@@ -571,31 +725,38 @@ class TradeLogger:
             SELECT peak_profit_rate FROM holdings
             WHERE user_id = ? AND stock_code = ?
         """
+        # 아직 DB에 반영되지 않은 고점 (공용 배치 대기열 - 같은 DB 의 다른 인스턴스가 올린 값 포함)
+        # DB 조회 전에 가져와야 그 사이 flush 된 값을 놓치지 않음
+        pending = self._writes.pending_params(PEAK_PROFIT_UPDATE_SQL, ("peak_profit_rate", user_id, stock_code))
+        peak = 0.0
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, [user_id, stock_code])
             row = cursor.fetchone()
             if row and row['peak_profit_rate']:
-                return float(row['peak_profit_rate'])
-        return 0.0
+                peak = float(row['peak_profit_rate'])
+
+        # 고점은 증가만 하므로 큰 값 사용
+        return max(peak, pending[0] if pending else 0.0)
 
     def update_peak_profit_rate(self, user_id: int, stock_code: str, peak_rate: float):
         """
-        종목의 고점 수익률 업데이트
+        종목의 고점 수익률 업데이트 (배치 대기열 경유, 같은 종목은 마지막 값만 반영)
 
         Args:
             user_id: 사용자 ID
             stock_code: 종목코드
             peak_rate: 새 고점 수익률 (%)
         """
-        query = """
-            UPDATE holdings SET peak_profit_rate = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE user_id = ? AND stock_code = ?
-        """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, [peak_rate, user_id, stock_code])
-            conn.commit()
+        self._writes.add(
+            PEAK_PROFIT_UPDATE_SQL,
+            (peak_rate, user_id, stock_code),
+            key=("peak_profit_rate", user_id, stock_code)
+        )
+
+    def _clear_pending_peaks(self, stock_code: str):
+        """보유 종목 추가/삭제 전 대기 중인 고점 반영 (이후 덮어쓰기 방지)"""
+        self.flush_writes()
 
     def get_trade_history(
         self,
@@ -640,6 +801,7 @@ class TradeLogger:
 
         query += " ORDER BY trade_date DESC, trade_time DESC"
 
+        self.flush_writes()
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
@@ -682,6 +844,7 @@ class TradeLogger:
               AND status = 'executed'
         """
 
+        self.flush_writes()
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, (user_id, today))
@@ -874,37 +1037,44 @@ class TradeLogger:
         if not performances:
             return empty_result
 
-        # 기간 내 거래 내역
-        trades = self.get_trade_history(user_id=user_id, start_date=start_date)
-        executed_trades = [t for t in trades if t.get("status") == "executed"]
-
-        # 수익/손실 거래 분리
-        winning_trades = [t for t in executed_trades if (t.get("profit_loss") or 0) > 0]
-        losing_trades = [t for t in executed_trades if (t.get("profit_loss") or 0) < 0]
-
-        total_profit = sum(t.get("profit_loss") or 0 for t in executed_trades)
-        win_rate = len(winning_trades) / len(executed_trades) if executed_trades else 0
-
-        # 평균 수익률 계산
-        profit_rates = [t.get("profit_rate") or 0 for t in executed_trades if t.get("profit_rate")]
-        avg_profit_rate = sum(profit_rates) / len(profit_rates) if profit_rates else 0
-
-        # 최대 수익/손실
-        max_profit = max([t.get("profit_loss") or 0 for t in executed_trades]) if executed_trades else 0
-        max_loss = min([t.get("profit_loss") or 0 for t in executed_trades]) if executed_trades else 0
+        # 기간 내 체결 집계 (trade_daily_stats 합산)
+        self.flush_writes()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT COALESCE(SUM(trade_count), 0) AS trade_count,
+                       COALESCE(SUM(buy_count), 0) AS buy_count,
+                       COALESCE(SUM(sell_count), 0) AS sell_count,
+                       COALESCE(SUM(win_count), 0) AS win_count,
+                       COALESCE(SUM(loss_count), 0) AS loss_count,
+                       COALESCE(SUM(total_profit), 0) AS total_profit,
+                       COALESCE(SUM(profit_rate_sum), 0) AS profit_rate_sum,
+                       COALESCE(SUM(profit_rate_count), 0) AS profit_rate_count,
+                       COALESCE(MAX(max_profit), 0) AS max_profit,
+                       COALESCE(MIN(max_loss), 0) AS max_loss
+                FROM trade_daily_stats
+                WHERE user_id = ? AND trade_date >= ?
+            """, (user_id, start_date))
+            stats = dict(cursor.fetchone())
+
+        trade_count = stats["trade_count"]
+        win_rate = stats["win_count"] / trade_count if trade_count else 0
+        avg_profit_rate = (
+            stats["profit_rate_sum"] / stats["profit_rate_count"] if stats["profit_rate_count"] else 0
+        )
 
         return {
             "period_days": days,
-            "total_trades": len(executed_trades),
-            "buy_count": len([t for t in executed_trades if t.get("side") == "buy"]),
-            "sell_count": len([t for t in executed_trades if t.get("side") == "sell"]),
-            "win_count": len(winning_trades),
-            "loss_count": len(losing_trades),
-            "total_profit": total_profit,
+            "total_trades": trade_count,
+            "buy_count": stats["buy_count"],
+            "sell_count": stats["sell_count"],
+            "win_count": stats["win_count"],
+            "loss_count": stats["loss_count"],
+            "total_profit": stats["total_profit"],
             "win_rate": win_rate,
             "avg_profit_rate": avg_profit_rate,
-            "max_profit": max_profit,
-            "max_loss": max_loss,
+            "max_profit": stats["max_profit"],
+            "max_loss": stats["max_loss"],
             "latest_assets": performances[0].get("total_assets") if performances else 0,
             "latest_holdings": performances[0].get("holdings_count") if performances else 0,
             "daily_summary": performances[:7] if performances else []
@@ -2565,16 +2735,9 @@ class BuySuggestionManager:
         # TradeLogger와 동일한 DB 사용 (테이블 생성은 TradeLogger에서 담당)
         self._ensure_table()
 
-    @contextmanager
     def _get_connection(self):
-        """DB 연결 컨텍스트 매니저"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        finally:
-            conn.close()
+        """DB 연결 컨텍스트 매니저 (스레드별 풀 커넥션, 정상 종료 시 commit)"""
+        return pooled_connection(self.db_path)
 
     def _ensure_table(self):
         """테이블 존재 확인 및 생성"""
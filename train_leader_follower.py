@@ -10,6 +10,12 @@ V10 Leader-Follower 상관관계 학습기
     python train_leader_follower.py --months 12  # 12개월 데이터
     python train_leader_follower.py --top 300    # 상위 300종목만
     python train_leader_follower.py --min-corr 0.6  # 상관계수 0.6 이상만
+    python train_leader_follower.py --window 120    # 최근 120거래일 상관계수
+    python train_leader_follower.py --months 24 --walk-forward  # 날짜별 레퍼런스 (백테스트용)
+
+워크포워드 레퍼런스는 시점별 시가총액(종가 × 현재 발행주식수 추정)으로 그날의 상위 N 종목과
+대장주를 정한다. 이를 위해 현재 시총 상위 N × WALK_FORWARD_POOL 종목을 후보로 조회한다
+(상장폐지 종목은 여전히 빠져 있음).
 """
 
 import os
@@ -18,18 +24,25 @@ import json
 import pickle
 import argparse
 from datetime import datetime, timedelta
-from collections import defaultdict
 
 import pandas as pd
 import numpy as np
 from pykrx import stock as pykrx
 import FinanceDataReader as fdr
 
+from scoring.correlation_engine import (
+    build_reference_map, classify_pairs, correlation_matrix, correlation_pairs, estimate_caps_by_date,
+    walk_forward_references,
+)
+
 # 프로젝트 경로
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 MODELS_DIR = os.path.join(PROJECT_ROOT, "models")
 os.makedirs(MODELS_DIR, exist_ok=True)
 
+# 워크포워드 후보 종목 배수 (과거 시점 상위 N 종목이 현재 상위 N 밖으로 밀려난 경우 포함)
+WALK_FORWARD_POOL = 2
+
 # 업종 코드 매핑 (KRX 업종)
 SECTOR_MAP = {
     "반도체": ["반도체", "전자부품", "IT부품"],
@@ -111,40 +124,25 @@ def get_price_data(tickers: list, months: int = 6) -> dict:
     return price_data
 
 
-def calculate_all_correlations(price_data: dict, min_corr: float = 0.4) -> pd.DataFrame:
-    """모든 종목 쌍의 상관계수 계산"""
+def build_returns_frame(price_data: dict) -> pd.DataFrame:
+    """종목별 일별 수익률 → (날짜 × 종목) 수익률 (상장 전/거래 없는 날은 NaN)"""
+    return pd.DataFrame({ticker: df['returns'].dropna() for ticker, df in price_data.items()}).sort_index()
+
+
+def calculate_all_correlations(price_data: dict, min_corr: float = 0.4, window: int = None) -> pd.DataFrame:
+    """모든 종목 쌍의 상관계수 계산 (window: 최근 N거래일만 사용)"""
     tickers = list(price_data.keys())
     n = len(tickers)
 
     print(f"[3/5] {n}개 종목 간 상관계수 계산 중 ({n*(n-1)//2} 쌍)...")
 
-    # 수익률 데이터프레임 생성
-    returns_dict = {}
-    for ticker in tickers:
-        returns_dict[ticker] = price_data[ticker]['returns'].dropna()
-
-    returns_df = pd.DataFrame(returns_dict)
-
-    # 상관계수 행렬 계산
-    corr_matrix = returns_df.corr()
-
-    # 상관계수 쌍 추출
-    pairs = []
-    for i, ticker1 in enumerate(tickers):
-        for j, ticker2 in enumerate(tickers):
-            if i >= j:  # 중복 제거
-                continue
-
-            corr = corr_matrix.loc[ticker1, ticker2]
-            if pd.notna(corr) and corr >= min_corr:
-                pairs.append({
-                    'ticker1': ticker1,
-                    'ticker2': ticker2,
-                    'correlation': round(corr, 4)
-                })
+    returns_df = build_returns_frame(price_data)
+    if window:
+        returns_df = returns_df.iloc[-window:]
 
-    pairs_df = pd.DataFrame(pairs)
-    pairs_df = pairs_df.sort_values('correlation', ascending=False)
+    # 상관계수 행렬 (쌍별 결측 제외) → 상삼각 쌍 추출
+    corr = correlation_matrix(returns_df.to_numpy(dtype=float))
+    pairs_df = correlation_pairs(corr, tickers, min_corr=min_corr)
 
     print(f"    → 상관계수 {min_corr} 이상: {len(pairs_df)}쌍 발견")
     return pairs_df
@@ -154,39 +152,7 @@ def classify_leader_follower(pairs_df: pd.DataFrame, market_caps: pd.DataFrame)
     """시가총액 기준으로 대장주/종속주 분류"""
     print(f"[4/5] 대장주-종속주 분류 중...")
 
-    cap_dict = market_caps.set_index('ticker')['시가총액'].to_dict()
-    name_dict = market_caps.set_index('ticker')['name'].to_dict()
-
-    results = []
-    for _, row in pairs_df.iterrows():
-        t1, t2, corr = row['ticker1'], row['ticker2'], row['correlation']
-
-        cap1 = cap_dict.get(t1, 0)
-        cap2 = cap_dict.get(t2, 0)
-
-        # 시가총액이 큰 쪽이 대장주
-        if cap1 >= cap2:
-            leader, follower = t1, t2
-            leader_cap, follower_cap = cap1, cap2
-        else:
-            leader, follower = t2, t1
-            leader_cap, follower_cap = cap2, cap1
-
-        # 시가총액 비율 (대장주 대비 종속주)
-        cap_ratio = follower_cap / leader_cap if leader_cap > 0 else 0
-
-        results.append({
-            'leader_code': leader,
-            'leader_name': name_dict.get(leader, leader),
-            'leader_cap': leader_cap,
-            'follower_code': follower,
-            'follower_name': name_dict.get(follower, follower),
-            'follower_cap': follower_cap,
-            'correlation': corr,
-            'cap_ratio': round(cap_ratio, 4)
-        })
-
-    results_df = pd.DataFrame(results)
+    results_df = classify_pairs(pairs_df, market_caps)
     print(f"    → {len(results_df)}개 대장주-종속주 쌍 분류 완료")
     return results_df
 
@@ -195,60 +161,52 @@ def build_reference(classified_df: pd.DataFrame, min_corr: float = 0.5) -> dict:
     """최종 레퍼런스 생성"""
     print(f"[5/5] 레퍼런스 생성 중 (상관계수 {min_corr} 이상)...")
 
-    # 상관계수 필터링
-    filtered = classified_df[classified_df['correlation'] >= min_corr].copy()
-
-    # 대장주별로 종속주 그룹핑
-    leader_map = defaultdict(list)
-
-    for _, row in filtered.iterrows():
-        leader_map[row['leader_code']].append({
-            'code': row['follower_code'],
-            'name': row['follower_name'],
-            'correlation': row['correlation'],
-            'cap_ratio': row['cap_ratio']
-        })
-
-    # 대장주별 종속주 정렬 (상관계수 높은 순)
-    for leader in leader_map:
-        leader_map[leader] = sorted(
-            leader_map[leader],
-            key=lambda x: x['correlation'],
-            reverse=True
-        )[:10]  # 대장주당 최대 10개 종속주
-
-    # 종속주 → 대장주 역매핑
-    follower_to_leader = {}
-    for leader, followers in leader_map.items():
-        leader_name = filtered[filtered['leader_code'] == leader]['leader_name'].iloc[0] \
-            if len(filtered[filtered['leader_code'] == leader]) > 0 else leader
-
-        for f in followers:
-            if f['code'] not in follower_to_leader:
-                follower_to_leader[f['code']] = []
-            follower_to_leader[f['code']].append({
-                'leader_code': leader,
-                'leader_name': leader_name,
-                'correlation': f['correlation']
-            })
-
-    # 메타데이터
-    reference = {
-        'version': '1.0',
-        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'min_correlation': min_corr,
-        'total_leaders': len(leader_map),
-        'total_followers': len(follower_to_leader),
-        'total_pairs': len(filtered),
-        'leader_to_followers': dict(leader_map),
-        'follower_to_leaders': follower_to_leader,
-        'all_pairs': filtered.to_dict('records')
-    }
+    reference = build_reference_map(classified_df, min_corr=min_corr)
 
-    print(f"    → 대장주 {len(leader_map)}개, 종속주 {len(follower_to_leader)}개")
+    print(f"    → 대장주 {reference['total_leaders']}개, 종속주 {reference['total_followers']}개")
     return reference
 
 
+def build_walk_forward(price_data: dict, market_caps: pd.DataFrame, window: int, calc_corr: float,
+                       min_corr: float, step: int = 1, universe_size: int = None) -> dict:
+    """
+    워크포워드 백테스트용 날짜별 레퍼런스 {YYYYMMDD: reference}
+
+    각 레퍼런스는 해당 날짜 종가까지의 수익률과 그 날짜 시가총액(추정)만 사용 (다음 거래일 채점용).
+
+    Args:
+        universe_size: 날짜별 시총 상위 N 종목만 사용 (None이면 후보 전체)
+    """
+    returns_df = build_returns_frame(price_data)
+    close_df = pd.DataFrame({ticker: df['Close'] for ticker, df in price_data.items()}).sort_index()
+    caps_by_date = estimate_caps_by_date(close_df, market_caps)
+    min_periods = min(window or 60, 60)
+    start = returns_df.index[min(min_periods, len(returns_df) - 1)]
+
+    print(f"[W] 워크포워드 레퍼런스 생성 중 (창 {window or '누적'}일, {step}일 간격)...")
+    references = {
+        date.strftime('%Y%m%d'): reference
+        for date, reference in walk_forward_references(
+            returns_df, market_caps, window=window, calc_corr=calc_corr, min_corr=min_corr,
+            min_periods=min_periods, start=start, step=step,
+            caps_by_date=caps_by_date, universe_size=universe_size,
+        )
+    }
+    print(f"    → {len(references)}개 날짜 레퍼런스 생성")
+    return references
+
+
+def save_walk_forward(references: dict, output_dir: str = None):
+    """날짜별 레퍼런스 저장"""
+    if output_dir is None:
+        output_dir = MODELS_DIR
+
+    path = os.path.join(output_dir, 'v10_leader_follower_walkforward.pkl')
+    with open(path, 'wb') as f:
+        pickle.dump(references, f)
+    print(f"    → 저장: {path}")
+
+
 def save_reference(reference: dict, output_dir: str = None):
     """레퍼런스 저장"""
     if output_dir is None:
@@ -317,6 +275,9 @@ def main():
     parser.add_argument('--top', type=int, default=500, help='분석 대상 종목 수 (기본: 500)')
     parser.add_argument('--min-corr', type=float, default=0.5, help='최소 상관계수 (기본: 0.5)')
     parser.add_argument('--calc-corr', type=float, default=0.4, help='계산 시 최소 상관계수 (기본: 0.4)')
+    parser.add_argument('--window', type=int, default=None, help='상관계수 창 (거래일, 기본: 전체 기간)')
+    parser.add_argument('--walk-forward', action='store_true', help='날짜별 레퍼런스도 생성 (워크포워드 백테스트용)')
+    parser.add_argument('--step', type=int, default=1, help='워크포워드 레퍼런스 간격 (거래일, 기본: 1)')
     args = parser.parse_args()
 
     print("=" * 70)
@@ -327,15 +288,18 @@ def main():
     print(f"최소 상관계수: {args.min_corr}")
     print()
 
-    # 1. 시가총액 상위 종목 조회
-    market_caps = get_market_cap_ranking(top_n=args.top)
-    tickers = market_caps['ticker'].tolist()
+    # 1. 시가총액 상위 종목 조회 (워크포워드는 과거 시점 상위 종목까지 후보로)
+    pool_size = args.top * WALK_FORWARD_POOL if args.walk_forward else args.top
+    pool_caps = get_market_cap_ranking(top_n=pool_size)
+    market_caps = pool_caps.head(args.top)
+    tickers = pool_caps['ticker'].tolist()
 
     # 2. 가격 데이터 수집
-    price_data = get_price_data(tickers, months=args.months)
+    pool_data = get_price_data(tickers, months=args.months)
+    price_data = {ticker: pool_data[ticker] for ticker in market_caps['ticker'] if ticker in pool_data}
 
     # 3. 상관계수 계산
-    pairs_df = calculate_all_correlations(price_data, min_corr=args.calc_corr)
+    pairs_df = calculate_all_correlations(price_data, min_corr=args.calc_corr, window=args.window)
 
     # 4. 대장주-종속주 분류
     classified_df = classify_leader_follower(pairs_df, market_caps)
@@ -346,6 +310,11 @@ def main():
     # 6. 저장
     save_reference(reference)
 
+    if args.walk_forward:
+        references = build_walk_forward(pool_data, pool_caps, args.window, args.calc_corr,
+                                         args.min_corr, step=args.step, universe_size=args.top)
+        save_walk_forward(references)
+
     # 7. 요약 출력
     print_summary(reference)
 